@@ -0,0 +1,255 @@
+"""
+Benchmark das análises vetorizadas (AnalyticsGames).
+
+Compara as análises de AnalyticsGames (proporção de gêneros por ano e grupo, jogos indie e não indie,
+entrada e saída de jogos entre os anos e jogos em comum entre mais vendidos e mais jogados) com as mesmas
+análises feitas com laços sobre os dicionários aninhados do data.json. Os dados são os de
+`arquivos/data.json` multiplicados pelo fator informado: cada jogo é repetido com nomes diferentes em
+cada cópia. Os resultados das duas formas são comparados.
+
+O tempo de AnalyticsGames é mostrado separado em carga (uma única vez) e análises.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_analytics.py --scale 100
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from analytics.analytics_games import TABLES, AnalyticsGames # pylint: disable=wrong-import-position
+from load.load_dados import GENRES_REMOVE # pylint: disable=wrong-import-position
+
+DATA_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'arquivos', 'data.json')
+
+
+def dados_escalados(scale):
+    """
+    Lê o data.json e repete cada jogo `scale` vezes, com nomes diferentes.
+
+    Args:
+        scale (int): Fator de multiplicação dos dados.
+
+    Returns:
+        Dict: Dados no formato do data.json, com as categorias renomeadas para os nomes das tabelas.
+    """
+    with open(DATA_JSON, 'r', encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    return {
+        TABLES[categoria]: {
+            ano: {
+                tier: {f"{game} #{copia}": genres for copia in range(scale) for game, genres in games.items()}
+                for tier, games in groups.items()
+            }
+            for ano, groups in years.items()
+        }
+        for categoria, years in dados.items()
+    }
+
+
+def genre_share_laco(years):
+    """
+    Proporção dos jogos de cada ano e grupo que têm cada gênero, com laços.
+
+    Args:
+        years (Dict): Anos de uma categoria.
+
+    Returns:
+        Dict[Tuple[int, str, str], float]: Proporção de cada (ano, grupo, gênero) presente.
+    """
+    resultado = {}
+    for ano, groups in years.items():
+        for tier, games in groups.items():
+            contagens = Counter(genre for genres in games.values() for genre in genres['genre']
+                                if genre not in GENRES_REMOVE)
+            for genre, contagem in contagens.items():
+                resultado[(int(ano), tier, genre)] = contagem / len(games)
+    return resultado
+
+
+def indie_counts_laco(years):
+    """
+    Jogos indie e não indie de cada ano e grupo, com laços.
+
+    Args:
+        years (Dict): Anos de uma categoria.
+
+    Returns:
+        Dict[Tuple[int, str], Tuple[int, int]]: (indie, não indie) de cada (ano, grupo).
+    """
+    resultado = {}
+    for ano, groups in years.items():
+        for tier, games in groups.items():
+            indies = sum(1 for genres in games.values() if "Indie" in genres['genre'])
+            resultado[(int(ano), tier)] = (indies, len(games) - indies)
+    return resultado
+
+
+def titulos_por_ano(years):
+    """
+    Jogos de cada ano, com laços.
+
+    Args:
+        years (Dict): Anos de uma categoria.
+
+    Returns:
+        Dict[int, Set[str]]: Jogos de cada ano.
+    """
+    titulos = defaultdict(set)
+    for ano, groups in years.items():
+        for games in groups.values():
+            titulos[int(ano)].update(games)
+    return titulos
+
+
+def churn_laco(years):
+    """
+    Entrada e saída de jogos de um ano para o seguinte, com laços.
+
+    Args:
+        years (Dict): Anos de uma categoria.
+
+    Returns:
+        Dict[int, Tuple[int, int, int]]: (entraram, saíram, ficaram) de cada ano a partir do segundo.
+    """
+    titulos = titulos_por_ano(years)
+    anos = sorted(titulos)
+    return {atual: (len(titulos[atual] - titulos[anterior]), len(titulos[anterior] - titulos[atual]),
+                    len(titulos[atual] & titulos[anterior]))
+            for anterior, atual in zip(anos, anos[1:])}
+
+
+def overlap_laco(years_a, years_b):
+    """
+    Jogos em comum entre duas categorias, por ano, com laços.
+
+    Args:
+        years_a (Dict): Anos da primeira categoria.
+        years_b (Dict): Anos da segunda categoria.
+
+    Returns:
+        Dict[int, int]: Quantidade de jogos nas duas categorias em cada ano presente nas duas.
+    """
+    titulos_a, titulos_b = titulos_por_ano(years_a), titulos_por_ano(years_b)
+    return {ano: len(titulos_a[ano] & titulos_b[ano]) for ano in sorted(titulos_a.keys() & titulos_b.keys())}
+
+
+def analises_laco(dados):
+    """
+    Faz todas as análises com laços.
+
+    Args:
+        dados (Dict): Dados de todas as categorias.
+
+    Returns:
+        Dict: Resultado de cada análise.
+    """
+    return {
+        'genre_share': {c: genre_share_laco(years) for c, years in dados.items()},
+        'indie_counts': {c: indie_counts_laco(years) for c, years in dados.items()},
+        'churn': {c: churn_laco(years) for c, years in dados.items()},
+        'overlap': overlap_laco(dados['best_sellers'], dados['most_played']),
+    }
+
+
+def analises_vetorizadas(analytics, categorias):
+    """
+    Faz todas as análises com AnalyticsGames.
+
+    Args:
+        analytics (AnalyticsGames): Dados carregados.
+        categorias (Iterable[str]): Categorias.
+
+    Returns:
+        Dict: Resultado (pandas.DataFrame) de cada análise.
+    """
+    return {
+        'genre_share': {c: analytics.genre_share(c) for c in categorias},
+        'indie_counts': {c: analytics.indie_counts(c) for c in categorias},
+        'churn': {c: analytics.churn(c) for c in categorias},
+        'overlap': analytics.overlap('best_sellers', 'most_played'),
+    }
+
+
+def formato_laco(vetorizado):
+    """
+    Converte os resultados de `analises_vetorizadas` para o formato de `analises_laco`.
+
+    Args:
+        vetorizado (Dict): Resultado de `analises_vetorizadas`.
+
+    Returns:
+        Dict: Resultado de cada análise, no formato de `analises_laco`.
+    """
+    return {
+        'genre_share': {
+            categoria: {(int(ano), tier, genre): valor for (ano, tier, genre), valor in share.stack().items() if valor > 0}
+            for categoria, share in vetorizado['genre_share'].items()},
+        'indie_counts': {
+            categoria: {(int(ano), tier): (int(linha.indie), int(linha.non_indie)) for (ano, tier), linha in indie.iterrows()}
+            for categoria, indie in vetorizado['indie_counts'].items()},
+        'churn': {
+            categoria: {int(ano): (int(linha.entered), int(linha.exited), int(linha.retained)) for ano, linha in churn.iterrows()}
+            for categoria, churn in vetorizado['churn'].items()},
+        'overlap': {int(ano): int(both) for ano, both in vetorizado['overlap']['both'].items()},
+    }
+
+
+def iguais(vetorizado, laco):
+    """
+    Compara os resultados das duas formas, com tolerância nas proporções.
+
+    Args:
+        vetorizado (Dict): Resultado de `analises_vetorizadas`.
+        laco (Dict): Resultado de `analises_laco`.
+
+    Returns:
+        bool: Se os resultados são iguais.
+    """
+    vetorizado = formato_laco(vetorizado)
+    for categoria, share in laco['genre_share'].items():
+        outro = vetorizado['genre_share'][categoria]
+        if share.keys() != outro.keys() or any(abs(share[k] - outro[k]) > 1e-9 for k in share):
+            return False
+    return all(vetorizado[nome] == laco[nome] for nome in ('indie_counts', 'churn', 'overlap'))
+
+
+def main():
+    """
+    Gera os dados escalados e imprime o tempo de cada forma de análise.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', type=int, default=100, help="Fator de multiplicação do data.json.")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições das análises (usa o menor tempo).")
+    args = parser.parse_args()
+
+    dados = dados_escalados(args.scale)
+    jogos = sum(len(games) for years in dados.values() for groups in years.values() for games in groups.values())
+    print(f"dados: {args.scale}x data.json, {jogos} posições de jogos")
+
+    inicio = time.perf_counter()
+    analytics = AnalyticsGames.from_data(dados.items())
+    carga = time.perf_counter() - inicio
+
+    tempos_laco, tempos_vetorizado = [], []
+    for _ in range(args.repeat):
+        inicio = time.perf_counter()
+        laco = analises_laco(dados)
+        tempos_laco.append(time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        vetorizado = analises_vetorizadas(analytics, dados)
+        tempos_vetorizado.append(time.perf_counter() - inicio)
+
+    print(f"{'forma':>12} {'carga (s)':>10} {'análises (s)':>13}")
+    print(f"{'laços':>12} {'-':>10} {min(tempos_laco):>13.3f}")
+    print(f"{'vetorizada':>12} {carga:>10.3f} {min(tempos_vetorizado):>13.3f}")
+    print(f"resultados iguais: {iguais(vetorizado, laco)}")
+
+
+if __name__ == '__main__':
+    main()
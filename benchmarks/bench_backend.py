@@ -0,0 +1,61 @@
+"""
+Benchmark dos backends de busca das páginas dos jogos.
+
+Compara a latência por página de DaoRequestsHtml (HTTP sem navegador) com a de DaoGetHtml (Selenium),
+buscando as páginas servidas por um FixtureServer local.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_backend.py --pages 30
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from fixture_server import FixtureServer # pylint: disable=wrong-import-position
+from dao.dao_get_html import DaoGetHtml # pylint: disable=wrong-import-position
+from dao.dao_requests_html import DaoRequestsHtml # pylint: disable=wrong-import-position
+
+
+def medir(dao, urls):
+    """
+    Busca as URLs com o backend informado.
+
+    Args:
+        dao: Backend com o método `get_html(url)`.
+        urls (List[str]): URLs a serem buscadas.
+
+    Returns:
+        float: Tempo médio por página, em milissegundos.
+    """
+    dao.get_html(urls[0]) # Aquecimento: abre o navegador / a conexão
+    inicio = time.perf_counter()
+    for url in urls:
+        dao.get_html(url)
+    return (time.perf_counter() - inicio) / len(urls) * 1000
+
+
+def main():
+    """
+    Executa o benchmark e imprime a latência média de cada backend.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=30, help="Quantidade de páginas buscadas.")
+    args = parser.parse_args()
+    with FixtureServer() as server:
+        urls = [server.url_game(i % len(server.games)) for i in range(args.pages)]
+        fast = DaoRequestsHtml()
+        navegador = DaoGetHtml()
+        try:
+            print(f"requests: {medir(fast, urls):8.1f} ms/página")
+            print(f"selenium: {medir(navegador, urls):8.1f} ms/página")
+        finally:
+            fast.quit_sessions()
+            navegador.quit_navegador()
+
+
+if __name__ == '__main__':
+    main()
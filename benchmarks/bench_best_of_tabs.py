@@ -0,0 +1,88 @@
+"""
+Benchmark da busca das páginas BestOf com uma única abertura por ano.
+
+Busca as abas (mais vendidos, melhores lançamentos e mais jogados) das páginas BestOf servidas por um
+FixtureServer local, em que as abas são trocadas pelo script da página, como na Steam. Compara a busca de
+cada aba com uma abertura completa da página (`DaoGetHtml.get_html`) com a busca de todas as abas de um
+ano com uma única abertura (`DaoGetHtml.get_html_tabs`), e confere que as listas extraídas são iguais nos
+dois modos e iguais às extraídas das mesmas abas geradas como páginas estáticas.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_best_of_tabs.py --latency 0.3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from fixture_server import FixtureServer, load_best_of_tabs, render_best_of_page # pylint: disable=wrong-import-position
+from dao.dao_get_html import DaoGetHtml # pylint: disable=wrong-import-position
+from dao.page_readiness import PageReadiness # pylint: disable=wrong-import-position
+from extract.extraction_spec import SPEC # pylint: disable=wrong-import-position
+from extract.html_extract import HtmlExtractor # pylint: disable=wrong-import-position
+from transform.html_transform import LISTS_PAGES # pylint: disable=wrong-import-position
+
+
+def medir(server, anos, abas, quiet):
+    """
+    Busca e extrai todas as abas de todos os anos em uma nova sessão do navegador.
+
+    Args:
+        server (FixtureServer): Servidor com as páginas BestOf.
+        anos (Dict): Abas de cada ano, no formato de `fixture_server.load_best_of_tabs`.
+        abas (bool): True para buscar as abas de um ano com uma única abertura da página.
+        quiet (float): Tempo sem novos cartões para considerar uma aba carregada.
+
+    Returns:
+        Tuple[float, Dict, Dict]: Tempo (s), listas extraídas por (página, ano) e resumo das esperas.
+    """
+    extractor = HtmlExtractor()
+    navegador = DaoGetHtml(readiness=PageReadiness(quiet=quiet))
+    listas = {}
+    try:
+        navegador.get_html(server.url_game(0)) # Aquecimento: abre o navegador
+        navegador.readiness.stats.clear()
+        inicio = time.perf_counter()
+        for year, tabs in anos.items():
+            urls = [server.url_best_of(year, tab) for tab in tabs]
+            respostas = navegador.get_html_tabs(urls) if abas else map(navegador.get_html, urls)
+            for (page, _), response in zip(tabs.values(), respostas):
+                listas[(page, year)] = extractor.extract_games(response['content_html'], page, year)
+        tempo = time.perf_counter() - inicio
+    finally:
+        navegador.quit_navegador()
+    return tempo, listas, navegador.readiness.summary()
+
+
+def main():
+    """
+    Executa o benchmark e imprime o tempo e as aberturas de página de cada modo.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.3, help="Atraso, em segundos, de cada resposta do servidor.")
+    parser.add_argument('--best-of-kb', type=int, default=500, help="Tamanho aproximado do conteúdo extra das páginas BestOf.")
+    parser.add_argument('--quiet', type=float, default=0.5, help="Tempo sem novos cartões para considerar uma aba carregada.")
+    args = parser.parse_args()
+    anos = load_best_of_tabs({page: SPEC.urls(page) for page in LISTS_PAGES})
+    extractor = HtmlExtractor()
+    esperado = {(page, year): extractor.extract_games(render_best_of_page(groups), page, year)
+                for year, tabs in anos.items() for page, groups in tabs.values()}
+    server_tabs = {year: {tab: groups for tab, (_, groups) in tabs.items()} for year, tabs in anos.items()}
+    with FixtureServer(latency=args.latency, filler_kb=args.best_of_kb, best_of=server_tabs) as server:
+        resultados = {}
+        for nome, abas in (("uma página por aba", False), ("uma página por ano", True)):
+            tempo, listas, resumo = medir(server, anos, abas, args.quiet)
+            resultados[nome] = listas
+            aberturas = resumo.get('best_of', {}).get('pages', 0)
+            trocas = resumo.get('best_of_tab', {}).get('pages', 0)
+            print(f"{nome:>20}: {tempo:6.2f} s, {aberturas:>2} aberturas de página, {trocas:>2} trocas de aba, "
+                  f"listas iguais às das páginas estáticas: {'sim' if listas == esperado else 'não'}")
+    iguais = len({repr(sorted(listas.items())) for listas in resultados.values()}) == 1
+    print(f"listas iguais nos dois modos: {'sim' if iguais else 'não'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""
+Benchmark do ETL completo contra um servidor local, sem acessar a Steam.
+
+Executa `src/main.py` (extração, transformação e gravação das tabelas) em um processo separado, com as
+páginas servidas por um FixtureServer local (`ETL_BASE_URL`), e mede o tempo total, as páginas por
+segundo, o pico de memória (RSS) do processo do ETL e o tempo de cada etapa (`arquivos/metrics.json` do
+ETL). As páginas servidas são geradas a partir de `arquivos/data.json` ou gravadas da Steam com o
+comando `record`; em ambos os casos, alguns jogos exigem a confirmação de idade. Com os cookies de
+verificação de idade, esses jogos são abertos diretamente, e `agecheck_slow_path` conta as páginas que
+ainda passaram pelo formulário do aviso (`DaoGetHtml.go_page_of_game_when_warning_age`).
+
+Comandos:
+    record: Executa o ETL uma vez contra a Steam, gravando as páginas BestOf e dos jogos em um cache de
+        páginas (precisa de acesso à Steam e do Chrome). O navegador é usado em todas as páginas
+        (`ETL_BACKEND=selenium`), para que os avisos de idade sejam gravados.
+    run: Executa o ETL contra o servidor local (ou contra `--base-url`) e grava o resultado em
+        `<saida>/results.json`, junto com os arquivos gerados pelo ETL.
+    compare: Compara dois resultados e aponta as regressões acima da tolerância; termina com código 1
+        se houver alguma.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_etl.py record --fixtures benchmarks/fixtures
+    python benchmarks/bench_etl.py run --out /tmp/bench_etl/base --fixtures benchmarks/fixtures
+    python benchmarks/bench_etl.py run --out /tmp/bench_etl/novo --env ETL_POOL_SIZE=4
+    python benchmarks/bench_etl.py run --out /tmp/bench_etl/completo --env ETL_BACKEND=selenium --env ETL_BROWSER_LEAN=0
+    python benchmarks/bench_etl.py compare /tmp/bench_etl/base/results.json /tmp/bench_etl/novo/results.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+PASTA_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, PASTA_SRC)
+
+from fixture_server import FixtureServer, load_best_of_tabs # pylint: disable=wrong-import-position
+from extract.extraction_spec import SPEC # pylint: disable=wrong-import-position
+from transform.html_transform import LISTS_PAGES # pylint: disable=wrong-import-position
+
+# Métricas comparadas: nome, caminho em results.json e se um valor maior é melhor
+METRICAS_COMPARADAS = (
+    ("wall_s", ("wall_s",), False),
+    ("pages_per_s", ("pages_per_s",), True),
+    ("peak_rss_mb", ("peak_rss_mb",), False),
+    ("transfer_kb_per_page", ("transfer_kb_per_page",), False),
+)
+
+
+def run_etl(env, args_main=()):
+    """
+    Executa `src/main.py` em um processo separado, com as variáveis de ambiente informadas.
+
+    Args:
+        env (Dict[str, str]): Variáveis de ambiente somadas às do processo atual.
+        args_main (Sequence[str]): Argumentos de `main.py`.
+
+    Returns:
+        Tuple[int, float, float]: Código de saída, tempo total (s) e pico de memória (MB) do processo do ETL.
+    """
+    inicio = time.perf_counter()
+    processo = subprocess.run([sys.executable, 'main.py', *args_main], cwd=PASTA_SRC,
+                              env={**os.environ, **env}, check=False)
+    tempo = time.perf_counter() - inicio
+    # ru_maxrss dos processos filhos terminados, em KB no Linux
+    pico = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return processo.returncode, tempo, pico
+
+
+def record(args):
+    """
+    Executa o ETL contra a Steam, gravando as páginas em um cache de páginas.
+
+    Args:
+        args (argparse.Namespace): Argumentos do comando `record`.
+    """
+    with tempfile.TemporaryDirectory() as pasta:
+        codigo, tempo, _ = run_etl({
+            "ETL_CACHE_DIR": os.path.abspath(args.fixtures),
+            "ETL_CACHE_TTL": "0",
+            "ETL_CACHE_MAX_MB": "100000",
+            "ETL_BACKEND": "selenium",
+            "ETL_OUTPUT_DIR": pasta,
+            "ETL_JOURNAL": os.path.join(pasta, "journal.jsonl"),
+            "ETL_METRICS": "",
+        })
+    print(f"Páginas gravadas em {args.fixtures} em {tempo:.0f}s (código de saída {codigo}).")
+    sys.exit(codigo)
+
+
+def run(args):
+    """
+    Executa o ETL contra o servidor local e grava o resultado em `<saida>/results.json`.
+
+    Args:
+        args (argparse.Namespace): Argumentos do comando `run`.
+    """
+    saida = os.path.abspath(args.out)
+    os.makedirs(saida, exist_ok=True)
+    for arquivo in ("data.json", "journal.jsonl", "metrics.json"):
+        if os.path.exists(os.path.join(saida, arquivo)):
+            os.remove(os.path.join(saida, arquivo))
+    env = {
+        "ETL_OUTPUT_DIR": saida,
+        "ETL_CACHE_DIR": "",
+        "ETL_OFFLINE": "0",
+        "ETL_JOURNAL": os.path.join(saida, "journal.jsonl"),
+        "ETL_METRICS": os.path.join(saida, "metrics.json"),
+    }
+    if args.fixtures:
+        # As páginas gravadas têm uma aba por página, sem os scripts da Steam
+        env["ETL_BESTOF_TABS"] = "0"
+    env.update(variavel.split("=", 1) for variavel in args.env)
+    server = None
+    if args.base_url:
+        env["ETL_BASE_URL"] = args.base_url
+    else:
+        best_of = None
+        if not args.fixtures:
+            anos = load_best_of_tabs({page: SPEC.urls(page) for page in LISTS_PAGES})
+            best_of = {year: {tab: groups for tab, (_, groups) in tabs.items()} for year, tabs in anos.items()}
+        server = FixtureServer(latency=args.latency, filler_kb=args.filler_kb, best_of=best_of,
+                               agecheck_every=args.agecheck_every, fixtures_dir=args.fixtures,
+                               asset_kb=args.asset_kb)
+        server.start()
+        env["ETL_BASE_URL"] = server.url_base()
+    try:
+        codigo, tempo, pico = run_etl(env)
+    finally:
+        if server:
+            server.stop()
+    metricas = {}
+    if os.path.exists(env["ETL_METRICS"]):
+        with open(env["ETL_METRICS"], 'r', encoding='utf-8') as arquivo:
+            metricas = json.load(arquivo)
+    contadores = metricas.get("counters", {})
+    paginas = contadores.get("navegador.pages", 0) + contadores.get("http.requests", 0)
+    paginas_navegador = contadores.get("navegador.pages", 0)
+    resultado = {
+        "label": args.label or os.path.basename(saida),
+        "returncode": codigo,
+        "wall_s": round(tempo, 3),
+        "pages": paginas,
+        "pages_served": server.served if server else None,
+        "pages_per_s": round(paginas / tempo, 3) if tempo else 0.0,
+        "peak_rss_mb": round(pico, 1),
+        # Bytes transferidos pelo navegador por página aberta, com as imagens, fontes e vídeos não bloqueados
+        "transfer_kb_per_page": round(contadores.get("navegador.transfer_bytes", 0) / paginas_navegador / 1024, 1)
+                                if paginas_navegador else 0.0,
+        "assets_served": server.assets_served if server else None,
+        "agecheck_slow_path": contadores.get("navegador.agecheck_slow_path", 0),
+        "browser_restarts": contadores.get("navegador.restarts", 0),
+        "browser_timeouts": contadores.get("navegador.timeouts", 0),
+        "browser_peak_rss_mb": metricas.get("peaks", {}).get("navegador.rss_mb"),
+        "stages": {name: stage["wall_s"] for name, stage in metricas.get("stages", {}).items()},
+        "counters": contadores,
+        "latencies": {name: {chave: histograma.get(chave) for chave in ("count", "p50_ms", "p90_ms")}
+                      for name, histograma in metricas.get("histograms", {}).items()},
+    }
+    with open(os.path.join(saida, "results.json"), 'w', encoding='utf-8') as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"{resultado['label']}: {tempo:.1f}s, {paginas} páginas ({resultado['pages_per_s']:.2f} páginas/s), "
+          f"pico de memória {pico:.0f} MB, {resultado['transfer_kb_per_page']:.0f} KB transferidos por página "
+          f"no navegador, código de saída {codigo}")
+    for name, segundos in resultado["stages"].items():
+        print(f"    etapa {name:<14} {segundos:8.2f}s")
+    print(f"Resultado gravado em {os.path.join(saida, 'results.json')}")
+    sys.exit(codigo)
+
+
+def compare(args):
+    """
+    Compara dois resultados e aponta as regressões acima da tolerância.
+
+    Args:
+        args (argparse.Namespace): Argumentos do comando `compare`.
+    """
+    with open(args.base, 'r', encoding='utf-8') as arquivo:
+        base = json.load(arquivo)
+    with open(args.new, 'r', encoding='utf-8') as arquivo:
+        novo = json.load(arquivo)
+    # Resultados anteriores podem não ter todas as métricas
+    comparadas = [(name, base[chave[0]], novo[chave[0]], maior_melhor) for name, chave, maior_melhor in METRICAS_COMPARADAS
+                  if chave[0] in base and chave[0] in novo]
+    for name in base.get("stages", {}):
+        if name in novo.get("stages", {}):
+            comparadas.append((f"stage.{name}", base["stages"][name], novo["stages"][name], False))
+    regressoes = 0
+    print(f"{'métrica':<24} {base['label']:>12} {novo['label']:>12} {'variação':>9}")
+    for name, valor_base, valor_novo, maior_melhor in comparadas:
+        variacao = (valor_novo - valor_base) / valor_base if valor_base else 0.0
+        pior = -variacao if maior_melhor else variacao
+        # Etapas muito curtas variam demais para serem comparadas
+        regressao = pior > args.threshold and max(valor_base, valor_novo) >= args.min_seconds \
+            if name.startswith("stage.") else pior > args.threshold
+        regressoes += regressao
+        print(f"{name:<24} {valor_base:>12.2f} {valor_novo:>12.2f} {variacao:>+8.1%}"
+              f"{'  REGRESSÃO' if regressao else ''}")
+    print(f"{regressoes} regressões acima de {args.threshold:.0%}.")
+    sys.exit(1 if regressoes else 0)
+
+
+def main():
+    """
+    Executa o comando informado: `record`, `run` ou `compare`.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    parser_record = comandos.add_parser("record", help="Grava as páginas da Steam.")
+    parser_record.add_argument('--fixtures', default='benchmarks/fixtures', help="Pasta das páginas gravadas.")
+    parser_run = comandos.add_parser("run", help="Executa o ETL contra o servidor local.")
+    parser_run.add_argument('--out', required=True, help="Pasta dos arquivos gerados e de results.json.")
+    parser_run.add_argument('--fixtures', default=None, help="Pasta das páginas gravadas; sem ela, as páginas são geradas.")
+    parser_run.add_argument('--base-url', default=None, help="Endereço de um servidor já em execução, no lugar do servidor local.")
+    parser_run.add_argument('--latency', type=float, default=0.05, help="Atraso, em segundos, de cada resposta do servidor local.")
+    parser_run.add_argument('--filler-kb', type=int, default=200, help="Tamanho aproximado do conteúdo extra das páginas geradas.")
+    parser_run.add_argument('--asset-kb', type=int, default=60,
+                            help="Tamanho de cada imagem, fonte e vídeo das páginas geradas (KB).")
+    parser_run.add_argument('--agecheck-every', type=int, default=10, help="Um a cada N jogos gerados exige a confirmação de idade.")
+    parser_run.add_argument('--env', action='append', default=[], metavar='VARIAVEL=VALOR',
+                            help="Variável de ambiente do ETL, por exemplo ETL_POOL_SIZE=4 (pode ser repetido).")
+    parser_run.add_argument('--label', default=None, help="Nome do resultado. Por padrão, o nome da pasta de saída.")
+    parser_compare = comandos.add_parser("compare", help="Compara dois resultados.")
+    parser_compare.add_argument('base', help="results.json de referência.")
+    parser_compare.add_argument('new', help="results.json a comparar.")
+    parser_compare.add_argument('--threshold', type=float, default=0.10, help="Piora relativa tolerada (0.10 = 10%%).")
+    parser_compare.add_argument('--min-seconds', type=float, default=0.5,
+                                help="Etapas mais curtas do que isso não são apontadas como regressão.")
+    args = parser.parse_args()
+    {"record": record, "run": run, "compare": compare}[args.comando](args)
+
+
+if __name__ == '__main__':
+    main()
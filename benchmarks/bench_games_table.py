@@ -0,0 +1,108 @@
+"""
+Benchmark da memória das listas de jogos (GamesTable).
+
+Compara a memória ocupada pelas listas de jogos preenchidas no formato antigo de HtmlTransform.lists_games,
+dicionários aninhados com um dicionário {"genre": [...], "app_id": id} e uma lista novos por posição de
+jogo, com a de GamesTable, em que as posições são colunas de `array` e os textos são guardados uma única
+vez. Os dados são os de `arquivos/data.json` multiplicados pelo fator informado: cada jogo é repetido com
+nomes diferentes em cada cópia, como se as listas fossem maiores.
+
+Os dicionários aninhados são lidos com `json.loads` do texto dos dados, como seriam montados a partir das
+páginas. A memória é medida com tracemalloc. Os dados de GamesTable também são comparados com os
+originais, para conferir que a volta ao formato do data.json é exata.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_games_table.py --scale 10 100
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from transform.games_table import GamesTable # pylint: disable=wrong-import-position
+
+DATA_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'arquivos', 'data.json')
+
+
+def texto_escalado(dados, scale):
+    """
+    Repete cada jogo do data.json `scale` vezes, com nomes diferentes, e retorna o texto JSON.
+
+    Os jogos sem ID do aplicativo (data.json antigos) recebem um ID sintético.
+
+    Args:
+        dados (Dict): Dados do data.json.
+        scale (int): Fator de multiplicação dos dados.
+
+    Returns:
+        str: Texto JSON dos dados escalados.
+    """
+    app_ids = {}
+    for years in dados.values():
+        for groups in years.values():
+            for games in groups.values():
+                for game, info in games.items():
+                    info.setdefault("app_id", app_ids.setdefault(game, len(app_ids) + 10))
+    return json.dumps({
+        categoria: {
+            ano: {
+                tier: {f"{game} #{copia}": info for copia in range(scale) for game, info in games.items()}
+                for tier, games in groups.items()
+            }
+            for ano, groups in years.items()
+        }
+        for categoria, years in dados.items()
+    }, ensure_ascii=False)
+
+
+def medir(funcao):
+    """
+    Executa uma função e mede a memória que o seu resultado continua ocupando.
+
+    Args:
+        funcao (Callable): Função sem argumentos.
+
+    Returns:
+        Tuple[Any, float, float]: Resultado, memória ocupada (MB) e tempo (s).
+    """
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    tempo = time.perf_counter() - inicio
+    gc.collect()
+    memoria = tracemalloc.get_traced_memory()[0] / 1024 ** 2
+    tracemalloc.stop()
+    return resultado, memoria, tempo
+
+
+def main():
+    """
+    Imprime a memória e o tempo de montagem de cada formato para cada fator de multiplicação.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', type=int, nargs='+', default=[10, 100], help="Fatores de multiplicação do data.json.")
+    args = parser.parse_args()
+    with open(DATA_JSON, 'r', encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    print(f"{'fator':>6} {'posições':>9} {'dicts (MB)':>11} {'GamesTable (MB)':>16} {'redução':>8} "
+          f"{'montagem (s)':>13} {'volta exata':>12}")
+    for scale in args.scale:
+        texto = texto_escalado(dados, scale)
+        aninhado, memoria_aninhado, _ = medir(lambda: json.loads(texto)) # pylint: disable=cell-var-from-loop
+        table, memoria_table, tempo = medir(
+            lambda: GamesTable.from_data((c, y.items()) for c, y in aninhado.items())) # pylint: disable=cell-var-from-loop
+        exata = {c: dict(table.iter_years(c)) for c in aninhado} == aninhado
+        print(f"{scale:>6} {len(table):>9} {memoria_aninhado:>11.1f} {memoria_table:>16.1f} "
+              f"{memoria_aninhado / memoria_table:>7.1f}x {tempo:>13.2f} {str(exata):>12}")
+        del aninhado, table
+
+
+if __name__ == '__main__':
+    main()
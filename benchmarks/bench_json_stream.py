@@ -0,0 +1,124 @@
+"""
+Benchmark da leitura do data.json (JsonStreamReader).
+
+Gera um data.json sintético do tamanho informado (com JsonStreamWriter, ano por ano) e compara a leitura
+antiga, com `json.load` do arquivo inteiro, com a leitura incremental de JsonStreamReader. Nas duas, as
+linhas dos CSVs são geradas por LoadDados e contadas.
+
+Cada medição roda em um processo separado, para que o pico de memória (RSS) de uma não afete a outra.
+Com `json.load`, o pico cresce com o tamanho do arquivo; com JsonStreamReader, ele fica limitado ao
+tamanho de um ano.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_json_stream.py --mb 500
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from load.json_stream import JsonStreamReader, JsonStreamWriter # pylint: disable=wrong-import-position
+from load.load_dados import LoadDados # pylint: disable=wrong-import-position
+
+CATEGORIAS = ["best sellers", "best releases", "most played"]
+GENEROS = ["Action", "Adventure", "Indie", "RPG", "Strategy", "Simulation", "Casual", "Free to Play"]
+GRUPOS = ["Platinum", "Gold", "Silver", "Bronze"]
+# Tamanho aproximado de um jogo no data.json, com a indentação
+BYTES_POR_JOGO = 220
+
+
+def gerar_arquivo(caminho, megabytes, mb_por_ano):
+    """
+    Gera um data.json sintético, escrevendo um ano de cada vez.
+
+    Args:
+        caminho (str): Caminho do arquivo.
+        megabytes (int): Tamanho aproximado do arquivo, em MB.
+        mb_por_ano (int): Tamanho aproximado de cada ano, em MB.
+    """
+    jogos_por_ano = mb_por_ano * 1024 ** 2 // BYTES_POR_JOGO
+    anos_por_categoria = max(1, megabytes // (mb_por_ano * len(CATEGORIAS)))
+
+    def anos(categoria):
+        for ano in range(anos_por_categoria):
+            groups = {}
+            for i in range(jogos_por_ano):
+                genres = [GENEROS[(i + j) % len(GENEROS)] for j in range(3)]
+                groups.setdefault(GRUPOS[i % len(GRUPOS)], {})[f"{categoria} jogo {ano}-{i}"] = {"genre": genres}
+            yield str(1900 + ano), groups
+
+    with JsonStreamWriter(caminho) as writer:
+        for categoria in CATEGORIAS:
+            writer.write_category(categoria, anos(categoria))
+
+
+def rss_pico_mb():
+    """
+    Retorna o pico de memória (RSS) do processo atual, em MB.
+
+    Returns:
+        float: Pico de memória, em MB.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def medir(metodo, caminho):
+    """
+    Lê o arquivo e gera as linhas dos CSVs no processo atual, imprimindo o resultado em JSON.
+
+    Args:
+        metodo (str): 'json_load' ou 'stream'.
+        caminho (str): Caminho do data.json.
+    """
+    load_data = LoadDados()
+    base = rss_pico_mb()
+    inicio = time.perf_counter()
+    linhas = 0
+    if metodo == 'json_load':
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+        for years in dados.values():
+            linhas += sum(1 for _ in load_data.load_data_best_sellers_csv(years))
+    else:
+        for _, years in JsonStreamReader(caminho).categories():
+            linhas += sum(1 for _ in load_data.load_data_best_sellers_csv(years))
+    tempo = time.perf_counter() - inicio
+    print(json.dumps({"tempo": tempo, "pico_mb": rss_pico_mb() - base, "linhas": linhas}))
+
+
+def main():
+    """
+    Gera o arquivo sintético e imprime o tempo e o pico de memória de cada leitura.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mb', type=int, default=500, help="Tamanho aproximado do data.json sintético (MB).")
+    parser.add_argument('--mb-por-ano', type=int, default=5, help="Tamanho aproximado de cada ano (MB).")
+    parser.add_argument('--medir', nargs=2, metavar=('METODO', 'ARQUIVO'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.medir:
+        medir(*args.medir)
+        return
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'data.json')
+        inicio = time.perf_counter()
+        gerar_arquivo(caminho, args.mb, args.mb_por_ano)
+        tamanho = os.path.getsize(caminho) / 1024 ** 2
+        print(f"arquivo sintético: {tamanho:.0f} MB, gerado em {time.perf_counter() - inicio:.1f}s")
+        print(f"{'leitura':>10} {'tempo (s)':>10} {'linhas':>10} {'pico RSS (MB)':>14}")
+        for metodo in ('json_load', 'stream'):
+            saida = subprocess.run([sys.executable, __file__, '--medir', metodo, caminho],
+                                   check=True, capture_output=True, text=True).stdout
+            resultado = json.loads(saida)
+            print(f"{metodo:>10} {resultado['tempo']:>10.2f} {resultado['linhas']:>10} "
+                  f"{resultado['pico_mb']:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark da geração dos arquivos CSV (LoadDados).
+
+Compara a geração antiga, que montava o CSV inteiro em uma string (`string_csv += row`) e depois a dividia
+em linhas e colunas para o `csv.writer`, com a geração atual, em que LoadDados gera as linhas uma a uma
+diretamente para o `csv.writer`. Os dados são sintéticos, no formato de `arquivos/data.json`, com a
+quantidade de linhas informada.
+
+Cada medição roda em um processo separado, para que o pico de memória (RSS) de uma não afete a outra.
+O pico mostrado é o acréscimo sobre a memória já ocupada pelos dados sintéticos. Com a geração atual, o
+tempo cresce linearmente com a quantidade de linhas e o pico de memória fica constante.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_load_csv.py --rows 10000 100000 1000000
+"""
+
+import argparse
+import csv
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from load.load_dados import LoadDados # pylint: disable=wrong-import-position
+
+GENEROS = ["Action", "Adventure", "Indie", "RPG", "Strategy", "Simulation", "Casual", "Utilities"]
+GRUPOS = ["Platinum", "Gold", "Silver", "Bronze"]
+
+
+def dados_sinteticos(rows):
+    """
+    Gera dados no formato de data.json com aproximadamente `rows` linhas de CSV.
+
+    Args:
+        rows (int): Quantidade aproximada de linhas.
+
+    Returns:
+        Dict: Dados no formato {ano: {grupo: {jogo: {"genre": [generos]}}}}.
+    """
+    dados = {}
+    for i in range(rows // 3):
+        ano = str(2020 + i % 4)
+        grupo = GRUPOS[(i // 4) % len(GRUPOS)]
+        genres = [GENEROS[(i + j) % len(GENEROS)] for j in range(3)]
+        dados.setdefault(ano, {}).setdefault(grupo, {})[f"Jogo {i}"] = {"genre": genres}
+    return dados
+
+
+def csv_antigo(dados):
+    """
+    Geração antiga: monta o CSV inteiro em uma string.
+
+    Args:
+        dados (Dict): Dados no formato de data.json.
+
+    Returns:
+        str: CSV com o cabeçalho.
+    """
+    genres_remove = ["Animation & Modeling", "Design & Illustration", "Photo Editing", "Utilities"]
+    string_csv = "year;rank;game;genre;is_indie\n"
+    for ano, games_per_rank in dados.items():
+        for rank, games in games_per_rank.items():
+            for game, genres in games.items():
+                for genre in genres['genre']:
+                    if genre in genres_remove:
+                        continue
+                    if "Indie" in genres['genre']:
+                        row = f"{ano};{rank};{game};{genre};True\n"
+                    else:
+                        row = f"{ano};{rank};{game};{genre};False\n"
+                    string_csv += row
+    return string_csv
+
+
+def salvar_antigo(dados, caminho):
+    """
+    Salva o CSV como main.save_csv fazia: divide a string em linhas e colunas para o `csv.writer`.
+
+    Args:
+        dados (Dict): Dados no formato de data.json.
+        caminho (str): Caminho do arquivo CSV.
+    """
+    rows = csv_antigo(dados).split('\n')
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo_csv:
+        escritor_csv = csv.writer(arquivo_csv, delimiter=';')
+        for row in rows:
+            if row == "":
+                continue
+            escritor_csv.writerow(row.split(';'))
+
+
+def salvar_atual(dados, caminho):
+    """
+    Salva o CSV como main.save_csv faz: as linhas de LoadDados vão direto para o `csv.writer`.
+
+    Args:
+        dados (Dict): Dados no formato de data.json.
+        caminho (str): Caminho do arquivo CSV.
+    """
+    load_data = LoadDados()
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo_csv:
+        escritor_csv = csv.writer(arquivo_csv, delimiter=';')
+        escritor_csv.writerow(load_data.header_best_sellers_and_best_releases)
+        escritor_csv.writerows(load_data.load_data_best_sellers_csv(dados))
+
+
+def rss_pico_mb():
+    """
+    Retorna o pico de memória (RSS) do processo atual, em MB.
+
+    Returns:
+        float: Pico de memória, em MB.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def medir(metodo, rows):
+    """
+    Mede uma geração do CSV no processo atual e imprime o resultado em JSON.
+
+    Args:
+        metodo (str): 'antigo' ou 'atual'.
+        rows (int): Quantidade aproximada de linhas.
+    """
+    dados = dados_sinteticos(rows)
+    base = rss_pico_mb()
+    salvar = salvar_antigo if metodo == 'antigo' else salvar_atual
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'bench.csv')
+        inicio = time.perf_counter()
+        salvar(dados, caminho)
+        tempo = time.perf_counter() - inicio
+        tamanho = os.path.getsize(caminho)
+    print(json.dumps({"tempo": tempo, "pico_mb": rss_pico_mb() - base, "bytes": tamanho}))
+
+
+def main():
+    """
+    Executa o benchmark e imprime o tempo e o pico de memória de cada geração.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help="Quantidades aproximadas de linhas.")
+    parser.add_argument('--medir', nargs=2, metavar=('METODO', 'LINHAS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.medir:
+        medir(args.medir[0], int(args.medir[1]))
+        return
+    print(f"{'linhas':>9} {'método':>7} {'tempo (s)':>10} {'µs/linha':>9} {'pico RSS (MB)':>14}")
+    for rows in args.rows:
+        for metodo in ('antigo', 'atual'):
+            saida = subprocess.run([sys.executable, __file__, '--medir', metodo, str(rows)],
+                                   check=True, capture_output=True, text=True).stdout
+            resultado = json.loads(saida)
+            print(f"{rows:>9} {metodo:>7} {resultado['tempo']:>10.2f} "
+                  f"{resultado['tempo'] / rows * 1e6:>9.2f} {resultado['pico_mb']:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
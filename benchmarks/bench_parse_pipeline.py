@@ -0,0 +1,88 @@
+"""
+Benchmark da análise do HTML em processos separados (ParsePipeline).
+
+Preenche os gêneros de uma lista de jogos servidos por um FixtureServer local com HtmlTransform, usando
+o motor 'async' e o backend 'requests', com a análise feita na própria thread de busca (0 processos) e
+com quantidades diferentes de processos analisadores. Com páginas grandes, a análise em processos deixa
+as threads de busca livres e usa mais de um núcleo da CPU.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_parse_pipeline.py --pages 100 --game-kb 300 --workers 0 2 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from fixture_server import FixtureServer # pylint: disable=wrong-import-position
+from config.config_etl import ConfigEtl # pylint: disable=wrong-import-position
+from transform.html_transform import HtmlTransform # pylint: disable=wrong-import-position
+
+
+def medir(server, pages, workers, max_in_flight):
+    """
+    Preenche os gêneros das páginas com a quantidade de processos analisadores informada.
+
+    Args:
+        server (FixtureServer): Servidor com as páginas dos jogos.
+        pages (int): Quantidade de páginas.
+        workers (int): Quantidade de processos analisadores; 0 analisa na própria thread.
+        max_in_flight (int): Quantidade máxima de páginas buscadas ao mesmo tempo.
+
+    Returns:
+        Tuple[float, float]: Tempo total, em segundos, e tempo de espera por um analisador livre.
+    """
+    config = ConfigEtl()
+    config.cache_dir = ""
+    config.backend = "requests"
+    config.engine = "async"
+    config.rate_per_host = 0
+    config.max_in_flight = max_in_flight
+    config.parse_workers = workers
+    config.parse_queue = max(1, workers * 2)
+    transform = HtmlTransform(config)
+    transform.lists_games.set_list('list_game_best_sellers_per_year', '2023', {
+        'Platinum': {f"jogo {i}": server.url_game(i % len(server.games)) for i in range(pages)}
+    })
+    try:
+        # Aquecimento: inicia os processos analisadores
+        if workers:
+            transform.parser.parse('extract_game_information', "<html></html>")
+        inicio = time.perf_counter()
+        transform.fill_list_game_information_best_sellers()
+        tempo = time.perf_counter() - inicio
+    finally:
+        transform.quit_transform()
+    if transform.failures:
+        raise transform.failures[0][-1]
+    return tempo, transform.parser.blocked_s
+
+
+def main():
+    """
+    Executa o benchmark e imprime o tempo de cada quantidade de processos analisadores.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=100, help="Quantidade de páginas de jogos.")
+    parser.add_argument('--game-kb', type=int, default=300, help="Tamanho aproximado de cada página de jogo.")
+    parser.add_argument('--latency', type=float, default=0.05, help="Latência simulada por página (s).")
+    parser.add_argument('--max-in-flight', type=int, default=8, help="Páginas buscadas ao mesmo tempo.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 2, 4],
+                        help="Quantidades de processos analisadores (0 analisa na própria thread).")
+    args = parser.parse_args()
+    print(f"núcleos da CPU: {os.cpu_count()}")
+    print(f"{'processos':>9} {'tempo (s)':>10} {'páginas/s':>10} {'espera (s)':>11} {'ganho':>6}")
+    with FixtureServer(latency=args.latency, filler_kb=args.game_kb) as server:
+        tempo_base = None
+        for workers in args.workers:
+            tempo, espera = medir(server, args.pages, workers, args.max_in_flight)
+            tempo_base = tempo_base or tempo
+            print(f"{workers:>9} {tempo:>10.2f} {args.pages / tempo:>10.1f} {espera:>11.2f} "
+                  f"{tempo_base / tempo:>5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
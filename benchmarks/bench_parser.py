@@ -0,0 +1,123 @@
+"""
+Benchmark da análise (parse) do HTML das páginas.
+
+Compara a extração antiga, que criava duas árvores completas com `html.parser` para cada página de jogo
+(uma para verificar o aviso de idade e outra para os gêneros) e uma árvore completa para cada página
+BestOf, com a extração atual de HtmlExtractor: uma única árvore por página de jogo, com `lxml` quando
+instalado, e apenas os grupos de jogos analisados nas páginas BestOf. Mede o tempo e o pico de memória.
+
+As páginas são geradas a partir de `arquivos/data.json` pelas funções de `fixture_server.py`.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_parser.py --games 100 --game-kb 300 --best-of-kb 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bs4 import BeautifulSoup # pylint: disable=wrong-import-position
+from fixture_server import ( # pylint: disable=wrong-import-position
+    load_best_of_groups, load_games, render_best_of_page, render_game_page
+)
+from extract.extraction_spec import SPEC # pylint: disable=wrong-import-position
+from extract.html_extract import PARSER_HTML, TEXT_WARNING_AGE, HtmlExtractor # pylint: disable=wrong-import-position
+
+
+def game_page_antigo(html):
+    """
+    Extração antiga de uma página de jogo: duas árvores completas com `html.parser`.
+
+    Args:
+        html (str): HTML da página do jogo.
+
+    Returns:
+        Tuple[bool, List[str]]: Se a página não tem o aviso de idade e os gêneros do jogo.
+    """
+    valid = BeautifulSoup(html, 'html.parser').find('div', string=TEXT_WARNING_AGE) is None
+    genre_element = BeautifulSoup(html, 'html.parser').find('b', string='Genre:')
+    genres = []
+    if genre_element:
+        genres = [genre.text.strip() for genre in genre_element.find_next_sibling('span').find_all('a')]
+    return valid, genres
+
+
+def best_of_antigo(html):
+    """
+    Extração antiga de uma página BestOf: uma árvore completa com `html.parser`.
+
+    Args:
+        html (str): HTML da página BestOf.
+
+    Returns:
+        Dict[str, Dict[str, str]]: Grupos no formato {grupo: {jogo: url}}.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    groups = {}
+    for group in soup.find_all(class_=SPEC.selectors['groups']):
+        name_group = group.find(class_=SPEC.selectors['name_group']).text
+        groups[name_group] = {
+            game.find(class_=SPEC.selectors['game_image']).get('alt'): game.find('a').get('href')
+            for game in group.find_all(class_=SPEC.selectors['game_card'])
+        }
+    return groups
+
+
+def medir(funcao, paginas):
+    """
+    Executa a função em todas as páginas, medindo o tempo e, em uma segunda passada (o tracemalloc
+    atrasa a execução), o pico de memória ao analisar uma página.
+
+    Args:
+        funcao (Callable[[str], Any]): Função de extração.
+        paginas (List[str]): HTML das páginas.
+
+    Returns:
+        Tuple[float, float, List]: Tempo médio por página (ms), pico de memória (MB) e resultados.
+    """
+    inicio = time.perf_counter()
+    resultados = [funcao(pagina) for pagina in paginas]
+    duracao = time.perf_counter() - inicio
+    tracemalloc.start()
+    funcao(paginas[0])
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracao / len(paginas) * 1000, pico / 1024 / 1024, resultados
+
+
+def main():
+    """
+    Executa o benchmark e imprime o tempo e o pico de memória de cada extração.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--games', type=int, default=100, help="Quantidade de páginas de jogos analisadas.")
+    parser.add_argument('--game-kb', type=int, default=300, help="Tamanho aproximado de cada página de jogo.")
+    parser.add_argument('--best-of-kb', type=int, default=2000, help="Tamanho aproximado de cada página BestOf.")
+    args = parser.parse_args()
+    extractor = HtmlExtractor()
+    games = load_games()
+    paginas_jogos = [render_game_page(games[i % len(games)], args.game_kb) for i in range(args.games)]
+    paginas_best_of = [
+        render_best_of_page(load_best_of_groups(category, year), args.best_of_kb)
+        for category, year in [('best sellers', '2023'), ('most played', '2023'), ('best releases', '2022')]
+    ]
+    print(f"parser atual: {PARSER_HTML}")
+    casos = [
+        ("jogos", paginas_jogos, game_page_antigo, extractor.extract_game_page),
+        ("best_of", paginas_best_of, best_of_antigo, lambda html: dict(extractor._groups(html))), # pylint: disable=protected-access
+    ]
+    for nome, paginas, antigo, atual in casos:
+        tempo_antigo, memoria_antiga, esperado = medir(antigo, paginas)
+        tempo_atual, memoria_atual, obtido = medir(atual, paginas)
+        iguais = "sim" if esperado == obtido else "NÃO"
+        print(f"{nome:8s} antigo: {tempo_antigo:8.1f} ms/página {memoria_antiga:7.1f} MB | "
+              f"atual: {tempo_atual:8.1f} ms/página {memoria_atual:7.1f} MB | "
+              f"{tempo_antigo / tempo_atual:4.1f}x | resultados iguais: {iguais}")
+
+
+if __name__ == '__main__':
+    main()
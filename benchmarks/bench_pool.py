@@ -0,0 +1,59 @@
+"""
+Benchmark do pool de navegadores (DaoPoolHtml).
+
+Busca as páginas de jogos servidas por um FixtureServer local com pools de tamanhos diferentes e
+mostra o ganho de velocidade em relação a um único navegador. Como a latência é simulada no servidor,
+o ganho esperado é quase linear até o tamanho do pool.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_pool.py --pages 40 --latency 0.3 --sizes 1 2 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from fixture_server import FixtureServer # pylint: disable=wrong-import-position
+from dao.dao_pool_html import DaoPoolHtml # pylint: disable=wrong-import-position
+from extract.html_extract import HtmlExtractor # pylint: disable=wrong-import-position
+
+
+def main():
+    """
+    Executa o benchmark e imprime o tempo e o ganho de velocidade de cada tamanho de pool.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=40, help="Quantidade de páginas buscadas.")
+    parser.add_argument('--latency', type=float, default=0.3, help="Latência simulada por página (s).")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 2, 4], help="Tamanhos de pool.")
+    args = parser.parse_args()
+
+    extractor = HtmlExtractor()
+
+    def handler(dao, url):
+        return extractor.extract_game_information(dao.get_html(url)['content_html'])
+
+    with FixtureServer(latency=args.latency) as server:
+        tasks = [(i, server.url_game(i % len(server.games))) for i in range(args.pages)]
+        tempo_base = None
+        print(f"{'pool':>4} {'tempo (s)':>10} {'páginas/s':>10} {'ganho':>6}")
+        for size in args.sizes:
+            pool = DaoPoolHtml(pool_size=size)
+            try:
+                inicio = time.perf_counter()
+                resultados = dict(pool.map_tasks(tasks, handler))
+                tempo = time.perf_counter() - inicio
+            finally:
+                pool.quit_navegadores()
+            erros = [r for r in resultados.values() if isinstance(r, Exception)]
+            if erros:
+                raise erros[0]
+            tempo_base = tempo_base or tempo
+            print(f"{size:>4} {tempo:>10.2f} {args.pages / tempo:>10.1f} {tempo_base / tempo:>5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark do controle da concorrência (CrawlScheduler) do motor 'async'.
+
+Busca as páginas de jogos servidas por um FixtureServer local que limita as requisições como a loja
+(respostas 429 acima de `--max-rps` páginas por segundo e, ao acaso, em `--error-rate` das páginas) e cuja
+latência cresce com a quantidade de páginas servidas ao mesmo tempo. Compara concorrências fixas com a
+concorrência adaptativa (AIMD): tempo total, respostas 429 recebidas, falhas e o limite final.
+
+Em cada execução, algumas páginas são buscadas na fila das listas ('list') ao mesmo tempo que as páginas
+dos jogos; o tempo até elas terminarem mostra que a descoberta das listas não espera pelas páginas dos jogos.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_scheduler.py --pages 600 --max-rps 80 --fixed 4 16 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from fixture_server import FixtureServer # pylint: disable=wrong-import-position
+from dao.crawl_scheduler import CrawlScheduler # pylint: disable=wrong-import-position
+from dao.dao_async_html import DaoAsyncHtml, HttpStatusError, STATUS_RETENTATIVA # pylint: disable=wrong-import-position
+from dao.dao_requests_html import DaoRequestsHtml # pylint: disable=wrong-import-position
+from extract.html_extract import HtmlExtractor # pylint: disable=wrong-import-position
+
+
+def executar(server : FixtureServer, scheduler : CrawlScheduler, tasks, listas, max_retries : int):
+    """
+    Busca as páginas dos jogos e, ao mesmo tempo, as páginas da fila das listas.
+
+    Args:
+        server (FixtureServer): Servidor local.
+        scheduler (CrawlScheduler): Controle da concorrência avaliado.
+        tasks (List[Tuple[int, str]]): Pares (chave, url) das páginas dos jogos.
+        listas (List[Tuple[int, str]]): Pares (chave, url) buscados na fila das listas.
+        max_retries (int): Novas tentativas em respostas 429/5xx.
+
+    Returns:
+        Dict: Tempo total, tempo até as listas terminarem, falhas, respostas 429 e o resumo de `scheduler`.
+    """
+    requests_html = DaoRequestsHtml(timeout=30, pool_maxsize=scheduler.maximum)
+    extractor = HtmlExtractor()
+    crawler = DaoAsyncHtml(scheduler.maximum, max_retries=max_retries, backoff=0.2, scheduler=scheduler)
+    falhas = []
+    listas_prontas = []
+    throttled_antes = server.throttled
+
+    def buscar(url):
+        response = requests_html.get_html(url)
+        if response['status_code'] in STATUS_RETENTATIVA:
+            raise HttpStatusError(response['status_code'], url)
+        return extractor.extract_game_information(response['content_html'])
+
+    def on_result(_, resultado):
+        if isinstance(resultado, Exception):
+            falhas.append(resultado)
+
+    def on_list(chave, resultado):
+        on_result(chave, resultado)
+        listas_prontas.append(time.perf_counter())
+
+    async def buscar_tudo():
+        await asyncio.gather(
+            crawler.crawl_tasks(tasks, buscar, on_result, anomaly=lambda url, genres: not genres),
+            crawler.crawl_tasks(listas, buscar, on_list, lane='list'),
+        )
+
+    inicio = time.perf_counter()
+    try:
+        asyncio.run(buscar_tudo())
+    finally:
+        requests_html.quit_sessions()
+    return {
+        "tempo_s": time.perf_counter() - inicio,
+        "listas_s": max(listas_prontas, default=inicio) - inicio,
+        "falhas": len(falhas),
+        "paginas": len(tasks) - len(falhas),
+        "throttled": server.throttled - throttled_antes,
+        **scheduler.summary(),
+    }
+
+
+def main():
+    """
+    Executa o benchmark e imprime, para cada concorrência, o tempo, as páginas obtidas por segundo (sem as
+    falhas), as respostas 429 e o limite final.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=600, help="Quantidade de páginas de jogos buscadas.")
+    parser.add_argument('--lists', type=int, default=6, help="Quantidade de páginas buscadas na fila das listas.")
+    parser.add_argument('--latency', type=float, default=0.1, help="Latência simulada por página (s).")
+    parser.add_argument('--latency-per-inflight', type=float, default=0.01,
+                        help="Latência somada por página servida ao mesmo tempo (s).")
+    parser.add_argument('--max-rps', type=float, default=80, help="Páginas por segundo acima das quais o servidor responde 429.")
+    parser.add_argument('--error-rate', type=float, default=0.005, help="Fração das páginas respondidas com 429 ao acaso.")
+    parser.add_argument('--fixed', type=int, nargs='+', default=[4, 16, 64], help="Concorrências fixas comparadas.")
+    parser.add_argument('--maximum', type=int, default=64, help="Maior concorrência do modo adaptativo.")
+    parser.add_argument('--target-p95', type=float, default=0.5, help="Latência p95 alvo do modo adaptativo (s).")
+    parser.add_argument('--rate-per-host', type=float, default=0, help="Requisições por segundo por host; 0 desativa.")
+    parser.add_argument('--max-retries', type=int, default=3, help="Novas tentativas em respostas 429/5xx.")
+    args = parser.parse_args()
+
+    with FixtureServer(latency=args.latency, latency_per_inflight=args.latency_per_inflight, max_rps=args.max_rps,
+                       error_rate=args.error_rate) as server:
+        jogos = len(server.games)
+        tasks = [(i, server.url_game(i % jogos)) for i in range(args.pages)]
+        listas = [(i, server.url_game((args.pages + i) % jogos)) for i in range(args.lists)]
+        cenarios = [(f"fixa {n}", CrawlScheduler(n, maximum=n, adaptive=False, rate_per_host=args.rate_per_host))
+                    for n in args.fixed]
+        cenarios.append(("adaptativa", CrawlScheduler(4, maximum=args.maximum, target_p95=args.target_p95,
+                                                      window=10, rate_per_host=args.rate_per_host)))
+        print(f"{'concorrência':>13} {'tempo (s)':>10} {'páginas/s':>10} {'listas (s)':>11} {'429':>5} "
+              f"{'falhas':>7} {'limite':>7}")
+        for nome, scheduler in cenarios:
+            resultado = executar(server, scheduler, tasks, listas, args.max_retries)
+            print(f"{nome:>13} {resultado['tempo_s']:>10.2f} {resultado['paginas'] / resultado['tempo_s']:>10.1f} "
+                  f"{resultado['listas_s']:>11.2f} {resultado['throttled']:>5} {resultado['falhas']:>7} "
+                  f"{resultado['limit']:>3} ({resultado['min_limit']}-{scheduler.maximum})")
+            time.sleep(1) # Esvazia a janela de `max_rps` do servidor entre os cenários
+
+
+if __name__ == '__main__':
+    main()
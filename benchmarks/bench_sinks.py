@@ -0,0 +1,96 @@
+"""
+Benchmark dos destinos de LoadDados (SinkCsv e SinkParquet).
+
+Grava as três tabelas (best_sellers, best_releases e most_played) em CSV e em Parquet, a partir de
+`arquivos/data.json` replicado `--scale` vezes (cada cópia com anos diferentes), e compara o tamanho dos
+arquivos, o tempo de gravação e o tempo de leitura: o CSV lido com `csv.reader` e o Parquet com
+`pyarrow.parquet.read_table`.
+
+Precisa do pacote opcional pyarrow (`pip install pyarrow`).
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_sinks.py --scale 200
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pyarrow.parquet as pq # pylint: disable=wrong-import-position
+from load.load_dados import LoadDados # pylint: disable=wrong-import-position
+from load.sink_csv import SinkCsv # pylint: disable=wrong-import-position
+from load.sink_parquet import SinkParquet # pylint: disable=wrong-import-position
+
+PASTA_ARQUIVOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'arquivos')
+
+
+def dados_replicados(scale):
+    """
+    Carrega o data.json e replica cada categoria `scale` vezes, com anos diferentes em cada cópia.
+
+    Args:
+        scale (int): Quantidade de cópias.
+
+    Returns:
+        Dict: Dados no formato de data.json.
+    """
+    with open(os.path.join(PASTA_ARQUIVOS, 'data.json'), 'r', encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    return {
+        category: {str(int(year) - 100 * copia): groups for copia in range(scale) for year, groups in years.items()}
+        for category, years in dados.items()
+    }
+
+
+def ler_csv(caminho):
+    """
+    Lê todas as linhas de um CSV.
+
+    Args:
+        caminho (str): Caminho do CSV.
+
+    Returns:
+        int: Quantidade de linhas lidas (sem o cabeçalho).
+    """
+    with open(caminho, 'r', newline='', encoding='utf-8') as arquivo_csv:
+        return sum(1 for _ in csv.reader(arquivo_csv, delimiter=';')) - 1
+
+
+def main():
+    """
+    Executa o benchmark e imprime o tamanho e os tempos de cada destino.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', type=int, default=200, help="Quantidade de cópias do data.json.")
+    args = parser.parse_args()
+    dados = dados_replicados(args.scale)
+    load_data = LoadDados()
+    tabelas = [
+        ('best_sellers', load_data.header_best_sellers_and_best_releases, dados['best sellers']),
+        ('best_releases', load_data.header_best_sellers_and_best_releases, dados['best releases']),
+        ('most_played', load_data.header_most_played, dados['most played']),
+    ]
+    print(f"{'tabela':>14} {'destino':>8} {'tamanho (KB)':>13} {'gravação (s)':>13} {'leitura (s)':>12} "
+          f"{'registros':>10}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for name_table, header, years in tabelas:
+            for sink, ler in ((SinkCsv(pasta), ler_csv), (SinkParquet(pasta), lambda c: pq.read_table(c).num_rows)):
+                inicio = time.perf_counter()
+                caminho, = load_data.load(name_table, header, years, [sink])
+                sink.finish()
+                gravacao = time.perf_counter() - inicio
+                inicio = time.perf_counter()
+                registros = ler(caminho)
+                leitura = time.perf_counter() - inicio
+                print(f"{name_table:>14} {sink.extension:>8} {os.path.getsize(caminho) / 1024:>13.1f} "
+                      f"{gravacao:>13.2f} {leitura:>12.3f} {registros:>10}")
+
+
+if __name__ == '__main__':
+    main()
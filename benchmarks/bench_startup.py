@@ -0,0 +1,97 @@
+"""
+Benchmark da inicialização do ETL.
+
+Mede, em processos novos (sem módulos já carregados), o tempo de importação de `main` (o caminho que
+apenas grava as tabelas em CSV) e de `transform.html_transform` (o caminho da extração, com o Selenium,
+o requests e o BeautifulSoup), confere que os módulos pesados não são carregados por `import main` e mede
+a localização do chromedriver com `DriverResolver`, com o caminho já guardado (sem acesso à rede).
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_startup.py --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PASTA_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Módulos que não devem ser carregados apenas para gravar as tabelas em CSV
+MODULOS_PESADOS = ('selenium', 'bs4', 'requests', 'lxml', 'pyarrow', 'webdriver_manager')
+
+SCRIPT_IMPORTACAO = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+tempo = time.perf_counter() - inicio
+print(json.dumps({{"s": tempo, "pesados": [m for m in {pesados!r} if m in sys.modules]}}))
+"""
+
+SCRIPT_RESOLVER = """
+import json, time
+from dao.driver_resolver import DriverResolver
+inicio = time.perf_counter()
+resolver = DriverResolver(cache_path={cache!r})
+caminho = resolver.resolve()
+print(json.dumps({{"s": time.perf_counter() - inicio, "source": resolver.source, "path": caminho}}))
+"""
+
+
+def run_python(script):
+    """
+    Executa um script em um processo Python novo, na pasta `src`, e lê o JSON que ele imprime.
+
+    Args:
+        script (str): Código executado.
+
+    Returns:
+        Dict: JSON impresso pelo script.
+    """
+    saida = subprocess.run([sys.executable, '-c', script], cwd=PASTA_SRC, capture_output=True, text=True, check=True)
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def measure_import(modulo, repeat):
+    """
+    Mede a importação de um módulo em processos novos.
+
+    Args:
+        modulo (str): Nome do módulo, por exemplo 'main'.
+        repeat (int): Quantidade de processos.
+
+    Returns:
+        Tuple[float, List[str]]: Mediana do tempo de importação (s) e módulos pesados carregados.
+    """
+    resultados = [run_python(SCRIPT_IMPORTACAO.format(modulo=modulo, pesados=MODULOS_PESADOS)) for _ in range(repeat)]
+    return statistics.median(resultado["s"] for resultado in resultados), resultados[-1]["pesados"]
+
+
+def main():
+    """
+    Executa o benchmark e imprime os tempos de importação e de localização do chromedriver.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help="Quantidade de processos por medição.")
+    args = parser.parse_args()
+
+    for modulo in ("main", "transform.html_transform"):
+        tempo, pesados = measure_import(modulo, args.repeat)
+        print(f"import {modulo:<26} {tempo * 1000:8.1f} ms   módulos pesados: {', '.join(pesados) or 'nenhum'}")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        # Um executável qualquer faz o papel do chromedriver guardado em uma execução anterior
+        cache = os.path.join(pasta, "chromedriver.json")
+        with open(cache, 'w', encoding='utf-8') as arquivo:
+            json.dump({"path": sys.executable}, arquivo)
+        tempos = [run_python(SCRIPT_RESOLVER.format(cache=cache)) for _ in range(args.repeat)]
+    print(f"DriverResolver.resolve (caminho guardado) {statistics.median(t['s'] for t in tempos) * 1000:8.2f} ms"
+          f"   origem: {tempos[-1]['source']}")
+    print("Sem o caminho guardado, o ChromeDriverManager consulta a rede a cada execução.")
+
+
+if __name__ == '__main__':
+    main()
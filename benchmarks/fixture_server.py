@@ -0,0 +1,621 @@
+"""
+Módulo fixture_server: Servidor HTTP local que imita as páginas de jogos da Steam.
+
+Usado pelos benchmarks para medir o ETL sem acessar a Steam. As páginas dos jogos são geradas a partir
+do arquivo `arquivos/data.json` e cada resposta pode ser atrasada para simular a latência da rede.
+
+O servidor também pode servir páginas BestOf com abas trocadas no navegador (`/sale/BestOf<ano>?tab=<aba>`),
+como as da Steam: os jogos de todas as abas vêm em um JSON embutido na página, e um script exibe a aba da
+URL ao carregar a página e a cada evento `popstate`, com os cartões de jogos chegando aos poucos.
+
+Alguns jogos podem exigir a confirmação de idade (`agecheck_every`): sem o cookie `birthtime`, o servidor
+redireciona a página do jogo para `/agecheck/app/<id>/`, que responde com um aviso de idade com a mesma
+estrutura do da Steam, cujo botão grava o cookie e recarrega a página, como espera
+`DaoGetHtml.go_page_of_game_when_warning_age`. Com o cookie, o aviso redireciona de volta para o jogo.
+
+As páginas geradas também pedem imagens, uma fonte e um vídeo (`asset_kb` cada), como as capas,
+capturas de tela e trailers das páginas da Steam, para medir o que o navegador deixa de baixar com o
+perfil enxuto (`BrowserProfile`).
+
+Para testar o controle da concorrência (CrawlScheduler), o servidor pode limitar as requisições como a
+loja: acima de `max_rps` páginas por segundo ou, ao acaso, em uma fração `error_rate` das páginas, ele
+responde 429 com `Retry-After`; e a latência de cada página pode crescer com a quantidade de páginas
+sendo servidas ao mesmo tempo (`latency_per_inflight`), como em um servidor sobrecarregado.
+
+As páginas são servidas com o cabeçalho ETag (o hash do HTML), e uma requisição condicional
+(`If-None-Match`) com o mesmo ETag recebe 304, sem o HTML, como nos servidores da Steam.
+
+Em vez das páginas geradas, o servidor pode servir páginas gravadas da Steam (`fixtures_dir`): um cache
+de páginas (CacheHtml) preenchido por uma execução do ETL contra a Steam. A URL pedida ao servidor é
+convertida na URL da Steam e procurada no cache; as páginas que passaram pelo aviso de idade são
+servidas com o aviso até o cookie ser gravado.
+
+Exemplo de uso:
+    >>> from fixture_server import FixtureServer
+    >>> with FixtureServer(latency=0.2) as server:
+    ...     print(server.url_game(0))
+    http://127.0.0.1:8123/app/0/
+
+Classes:
+    FixtureServer: Servidor HTTP local com páginas de jogos geradas a partir de data.json.
+"""
+
+import hashlib
+import html
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+PASTA_ARQUIVOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'arquivos')
+URL_STEAM = "https://store.steampowered.com"
+TEXTO_AVISO_IDADE = 'Please enter your birth date to continue:'
+# Scripts das páginas gravadas, removidos para que elas não acessem a Steam
+RE_SCRIPT = re.compile(r'<script\b.*?</script>', re.IGNORECASE | re.DOTALL)
+# Conteúdo sem jogos repetido para aproximar o tamanho das páginas reais
+SECAO_EXTRA = (
+    '<div class="sale_section"><div class="sale_nav"><a href="#">Home</a><a href="#">News</a></div>'
+    '<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.</p>'
+    '<script>window.dados = {"itens": [1, 2, 3, 4, 5, 6, 7, 8]};</script></div>'
+)
+# Recursos pesados das páginas de jogos geradas, que a extração não usa
+RECURSOS_JOGO = (
+    '<style>@font-face {font-family: Motiva; src: url(/fonts/motiva.woff2);} body {font-family: Motiva;}</style>'
+    '<img src="/img/header.jpg"><img src="/img/ss_1.jpg"><img src="/img/ss_2.jpg"><img src="/img/ss_3.jpg">'
+    '<video src="/video/trailer.webm" preload="auto" autoplay muted></video>'
+)
+# Tipo de conteúdo dos recursos servidos, pela extensão
+TIPOS_RECURSOS = {'.jpg': 'image/jpeg', '.woff2': 'font/woff2', '.webm': 'video/webm'}
+# Exibe a aba da URL e acrescenta os cartões de jogos aos poucos, como a página BestOf da Steam
+SCRIPT_ABAS_BEST_OF = """
+const ABAS = %s, LOTE = %d, INTERVALO_MS = %d;
+let geracao = 0;
+function exibir() {
+    const grupos = ABAS[new URLSearchParams(location.search).get('tab') || '1'] || [];
+    const raiz = document.getElementById('best_of');
+    const atual = ++geracao;
+    const fila = [];
+    raiz.textContent = '';
+    for (const [nome, jogos] of grupos) {
+        const grupo = document.createElement('div');
+        grupo.className = '_2NfLqUpH_h0Ba0jlv9M9ZE';
+        const titulo = document.createElement('div');
+        titulo.className = '_3FRxVBrTtFQLhmHRstBbC_';
+        titulo.textContent = nome;
+        grupo.appendChild(titulo);
+        raiz.appendChild(grupo);
+        for (const [jogo, url] of jogos) fila.push([grupo, jogo, url]);
+    }
+    (function lote() {
+        if (atual !== geracao) return;
+        for (const [grupo, jogo, url] of fila.splice(0, LOTE)) {
+            const cartao = document.createElement('div');
+            cartao.className = '_2yyhUHhk3d1DRpG4Sx9_og';
+            const link = document.createElement('a');
+            link.href = url;
+            const imagem = document.createElement('img');
+            imagem.className = 'cODQhXeXS-Yn-vLIBNwyW';
+            imagem.alt = jogo;
+            imagem.src = 'capsule.jpg';
+            link.appendChild(imagem);
+            cartao.appendChild(link);
+            grupo.appendChild(cartao);
+        }
+        if (fila.length) setTimeout(lote, INTERVALO_MS);
+    })();
+}
+window.addEventListener('popstate', exibir);
+exibir();
+"""
+
+
+def load_games(path : str = os.path.join(PASTA_ARQUIVOS, 'data.json')) -> List[Dict]:
+    """
+    Carrega a lista de jogos únicos (nome e gêneros) do arquivo data.json.
+
+    Args:
+        path (str): Caminho do arquivo data.json.
+
+    Returns:
+        List[Dict]: Lista de dicionários no formato {'name': 'jogo', 'genre': ['genero', ...]}.
+    """
+    with open(path, 'r', encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    games = {}
+    for years in dados.values():
+        for groups in years.values():
+            for games_group in groups.values():
+                for name_game, info in games_group.items():
+                    games.setdefault(name_game, info['genre'])
+    return [{'name': name, 'genre': genres} for name, genres in games.items()]
+
+
+def render_filler(filler_kb : int) -> str:
+    """
+    Gera conteúdo sem jogos (menus, textos e scripts) com o tamanho aproximado informado.
+
+    Args:
+        filler_kb (int): Tamanho aproximado, em KB.
+
+    Returns:
+        str: HTML do conteúdo extra.
+    """
+    return SECAO_EXTRA * (filler_kb * 1024 // len(SECAO_EXTRA))
+
+
+def render_game_page(game : Dict, filler_kb : int = 0) -> str:
+    """
+    Gera o HTML de uma página de jogo com o bloco de gêneros usado por HtmlExtractor.
+
+    Args:
+        game (Dict): Dicionário no formato {'name': 'jogo', 'genre': ['genero', ...]}.
+        filler_kb (int): Quantidade aproximada, em KB, de conteúdo extra antes do bloco de gêneros.
+
+    Returns:
+        str: HTML da página do jogo.
+    """
+    links = ", ".join(f'<a href="#">{html.escape(genre)}</a>' for genre in game['genre'])
+    return (
+        "<html><head><title>{0}</title></head><body>{2}{3}"
+        '<div class="details_block"><b>Title:</b> {0}<br>'
+        "<b>Genre:</b> <span>{1}</span><br></div>"
+        "</body></html>"
+    ).format(html.escape(game['name']), links, RECURSOS_JOGO, render_filler(filler_kb))
+
+
+def load_best_of_groups(category : str, year : str, base_url : str = "https://store.steampowered.com",
+                        path : str = os.path.join(PASTA_ARQUIVOS, 'data.json')) -> Dict[str, Dict[str, str]]:
+    """
+    Monta os grupos de uma página BestOf a partir do arquivo data.json.
+
+    Args:
+        category (str): Categoria em data.json ('best sellers', 'best releases' ou 'most played').
+        year (str): Ano da lista.
+        base_url (str): Endereço usado nos links das páginas dos jogos.
+        path (str): Caminho do arquivo data.json.
+
+    Returns:
+        Dict[str, Dict[str, str]]: Grupos no formato {grupo: {jogo: url}}.
+    """
+    with open(path, 'r', encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    indices = {game['name']: indice for indice, game in enumerate(load_games(path))}
+    return {
+        name_group: {name_game: f"{base_url}/app/{indices[name_game]}/" for name_game in games}
+        for name_group, games in dados[category][year].items()
+    }
+
+
+def render_best_of_page(groups : Dict[str, Dict[str, str]], filler_kb : int = 0) -> str:
+    """
+    Gera o HTML de uma página BestOf com as mesmas classes CSS usadas por HtmlExtractor.
+
+    Args:
+        groups (Dict[str, Dict[str, str]]): Grupos no formato {grupo: {jogo: url}}.
+        filler_kb (int): Quantidade aproximada, em KB, de conteúdo extra (menus, scripts e seções sem
+            jogos), para imitar o tamanho das páginas reais.
+
+    Returns:
+        str: HTML da página BestOf.
+    """
+    partes = ["<html><head><title>Best of</title></head><body>", render_filler(filler_kb)]
+    for name_group, games in groups.items():
+        partes.append('<div class="_2NfLqUpH_h0Ba0jlv9M9ZE">')
+        partes.append(f'<div class="_3FRxVBrTtFQLhmHRstBbC_">{html.escape(name_group)}</div>')
+        for name_game, url in games.items():
+            partes.append(
+                '<div class="_2yyhUHhk3d1DRpG4Sx9_og">'
+                f'<a href="{html.escape(url)}"><img class="cODQhXeXS-Yn-vLIBNwyW" '
+                f'alt="{html.escape(name_game)}" src="capsule.jpg"></a></div>'
+            )
+        partes.append('</div>')
+    partes.append("</body></html>")
+    return "".join(partes)
+
+
+def load_best_of_tabs(pages_urls : Dict[str, Dict[str, str]],
+                      path : str = os.path.join(PASTA_ARQUIVOS, 'data.json')) -> Dict[str, Dict[str, Tuple[str, Dict]]]:
+    """
+    Monta as abas de cada página BestOf a partir das URLs de cada tipo de página e do data.json.
+
+    Args:
+        pages_urls (Dict[str, Dict[str, str]]): URL de cada tipo de página ('best_sellers',
+            'best_releases' ou 'most_played') por ano, por exemplo {page: SPEC.urls(page)}.
+        path (str): Caminho do arquivo data.json.
+
+    Returns:
+        Dict[str, Dict[str, Tuple[str, Dict]]]: Por ano, {aba: (página, {grupo: {jogo: url}})}.
+    """
+    anos = {}
+    for page, urls in pages_urls.items():
+        for year, url in urls.items():
+            tab = parse_qs(urlsplit(url).query).get('tab', ['1'])[0]
+            anos.setdefault(year, {})[tab] = (page, load_best_of_groups(page.replace('_', ' '), year, path=path))
+    return anos
+
+
+def render_agecheck_page() -> str:
+    """
+    Gera o HTML de um aviso de idade com a mesma estrutura do aviso da Steam nos elementos usados por
+    `DaoGetHtml.go_page_of_game_when_warning_age` (o terceiro `select` e o botão `view_product_page_btn`).
+    O botão grava o cookie `birthtime` e recarrega a página.
+
+    Returns:
+        str: HTML do aviso de idade.
+    """
+    def vazios(quantidade):
+        return '<div></div>' * quantidade
+
+    anos = "".join(f'<option value="{ano}">{ano}</option>' for ano in range(1900, 2025))
+    selects = ('<select name="ageDay"><option value="1">1</option></select>'
+               '<select name="ageMonth"><option value="January">January</option></select>'
+               f'<select name="ageYear">{anos}</select>')
+    # /html/body/div[1]/div[7]/div[6]/div/div[2]/div/div[1]/div[2]/select[3]
+    return ('<html><head><title>Aviso de idade</title></head><body>'
+            f'<div>{vazios(6)}<div>{vazios(5)}<div><div>{vazios(1)}<div><div>'
+            f'<div><div>{TEXTO_AVISO_IDADE}</div><div>{selects}</div></div>'
+            '</div></div></div></div></div></div>'
+            '<a id="view_product_page_btn" href="#" onclick="document.cookie = \'birthtime=946684801; path=/\'; '
+            'location.reload(); return false;">View Page</a></body></html>')
+
+
+def render_best_of_tabs_page(tabs : Dict[str, Dict[str, Dict[str, str]]], filler_kb : int = 0, lote : int = 40,
+                             intervalo_ms : int = 50) -> str:
+    """
+    Gera o HTML de uma página BestOf com abas trocadas no navegador: os grupos de todas as abas vêm em
+    um JSON embutido, e o script da página exibe a aba do parâmetro `tab` da URL.
+
+    Args:
+        tabs (Dict[str, Dict[str, Dict[str, str]]]): Grupos de cada aba, no formato {aba: {grupo: {jogo: url}}}.
+        filler_kb (int): Quantidade aproximada, em KB, de conteúdo extra.
+        lote (int): Quantidade de cartões de jogos acrescentados de cada vez.
+        intervalo_ms (int): Intervalo, em milissegundos, entre os lotes de cartões.
+
+    Returns:
+        str: HTML da página BestOf.
+    """
+    abas = {tab: [[name_group, list(games.items())] for name_group, games in groups.items()]
+            for tab, groups in tabs.items()}
+    # Evita que um nome de jogo com '</' encerre o script
+    script = SCRIPT_ABAS_BEST_OF % (json.dumps(abas).replace('</', '<\\/'), lote, intervalo_ms)
+    return (f"<html><head><title>Best of</title></head><body>{render_filler(filler_kb)}"
+            f'<div id="best_of"></div><script>{script}</script></body></html>')
+
+
+class FixtureServer:
+    """
+    Classe FixtureServer: Servidor HTTP local com páginas de jogos geradas a partir de data.json ou
+    gravadas da Steam.
+
+    Attributes:
+        latency (float): Atraso, em segundos, aplicado a cada resposta.
+        filler_kb (int): Quantidade aproximada, em KB, de conteúdo extra em cada página de jogo.
+        games (List[Dict]): Jogos servidos, na ordem dos seus índices em `/app/<indice>/`.
+        best_of (Dict[str, Dict[str, Dict]]): Grupos de cada aba das páginas BestOf servidas, por ano, no
+            formato {ano: {aba: {grupo: {jogo: url}}}}.
+        agecheck_every (int): Um a cada `agecheck_every` jogos gerados exige a confirmação de idade; 0
+            desativa o aviso.
+        fixtures (CacheHtml): Páginas gravadas da Steam, ou None para servir as páginas geradas.
+        asset_kb (int): Tamanho, em KB, de cada imagem, fonte ou vídeo servido.
+        max_rps (float): Páginas por segundo acima das quais o servidor responde 429; 0 desativa o limite.
+        error_rate (float): Fração das páginas respondidas com 429 ao acaso.
+        latency_per_inflight (float): Atraso, em segundos, somado a cada resposta para cada outra página
+            sendo servida ao mesmo tempo.
+        served (int): Quantidade de páginas servidas.
+        throttled (int): Quantidade de respostas 429.
+        not_modified (int): Quantidade de respostas 304 às requisições condicionais.
+        peak_in_flight (int): Maior quantidade de páginas servidas ao mesmo tempo.
+        assets_served (int): Quantidade de imagens, fontes e vídeos servidos.
+        assets_bytes (int): Bytes das imagens, fontes e vídeos servidos.
+        port (int): Porta em que o servidor escuta.
+
+    Methods:
+        page: Retorna o código de status e o HTML da resposta a um caminho.
+        throttle: Indica se uma página deve ser respondida com 429.
+        conditional: Calcula o ETag de uma página e indica se a requisição condicional recebe 304.
+        load: Gerenciador de contexto que conta as páginas sendo servidas e aplica a latência.
+        asset: Retorna o conteúdo de uma imagem, fonte ou vídeo.
+        start: Inicia o servidor em uma thread.
+        stop: Encerra o servidor.
+        url_base: Retorna o endereço do servidor, que substitui o da Steam nas URLs.
+        url_game: Retorna a URL da página de um jogo.
+        url_best_of: Retorna a URL de uma aba de uma página BestOf.
+    """
+
+    def __init__(self, latency : float = 0.0, port : int = 0, filler_kb : int = 0,
+                 best_of : Dict[str, Dict[str, Dict]] = None, agecheck_every : int = 0,
+                 fixtures_dir : Optional[str] = None, asset_kb : int = 60, max_rps : float = 0.0,
+                 error_rate : float = 0.0, latency_per_inflight : float = 0.0, seed : int = 0) -> None:
+        """
+        Construtor da classe FixtureServer.
+
+        Args:
+            latency (float): Atraso, em segundos, aplicado a cada resposta.
+            port (int): Porta do servidor. Com 0, uma porta livre é escolhida.
+            filler_kb (int): Quantidade aproximada, em KB, de conteúdo extra em cada página de jogo.
+            best_of (Dict[str, Dict[str, Dict]]): Grupos de cada aba das páginas BestOf, por ano, no
+                formato {ano: {aba: {grupo: {jogo: url}}}}. Por padrão, nenhuma página BestOf.
+            agecheck_every (int): Um a cada `agecheck_every` jogos gerados exige a confirmação de idade.
+            fixtures_dir (Optional[str]): Pasta de um cache de páginas (CacheHtml) gravado da Steam. Com
+                ela, as páginas gravadas são servidas no lugar das geradas.
+            asset_kb (int): Tamanho, em KB, de cada imagem, fonte ou vídeo servido.
+            max_rps (float): Páginas por segundo acima das quais o servidor responde 429; 0 desativa.
+            error_rate (float): Fração das páginas respondidas com 429 ao acaso.
+            latency_per_inflight (float): Atraso somado a cada resposta para cada outra página em andamento.
+            seed (int): Semente dos 429 ao acaso, para que as execuções sejam comparáveis.
+        """
+        self.latency = latency
+        self.filler_kb = filler_kb
+        self.games = load_games()
+        self.best_of = best_of or {}
+        self.agecheck_every = agecheck_every
+        self.fixtures = None
+        if fixtures_dir:
+            from dao.dao_cache_html import CacheHtml # pylint: disable=import-outside-toplevel
+            self.fixtures = CacheHtml(fixtures_dir, ttl=0, offline=True)
+        self.asset_kb = asset_kb
+        self.max_rps = max_rps
+        self.error_rate = error_rate
+        self.latency_per_inflight = latency_per_inflight
+        self._aleatorio = random.Random(seed)
+        self._recentes = deque()
+        self._em_andamento = 0
+        self.served = 0
+        self.throttled = 0
+        self.not_modified = 0
+        self.peak_in_flight = 0
+        self.assets_served = 0
+        self.assets_bytes = 0
+        self._lock = threading.Lock()
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Responde às requisições com as páginas geradas."""
+
+            def do_GET(self): # pylint: disable=invalid-name
+                """Responde a uma requisição GET."""
+                recurso = fixture.asset(self.path)
+                if recurso:
+                    time.sleep(fixture.latency)
+                    status, tipo, corpo = 200, *recurso
+                elif fixture.throttle():
+                    self.send_response(429)
+                    self.send_header('Retry-After', '1')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                else:
+                    with fixture.load():
+                        status, pagina = fixture.page(self.path, self.headers.get('Cookie', ''))
+                    tipo, corpo = 'text/html; charset=utf-8', pagina.encode('utf-8')
+                    if status == 302:
+                        self.send_response(status)
+                        self.send_header('Location', pagina)
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+                    etag, inalterada = fixture.conditional(corpo, self.headers.get('If-None-Match'))
+                    if status == 200 and inalterada:
+                        self.send_response(304)
+                        self.send_header('ETag', etag)
+                        self.end_headers()
+                        return
+                self.send_response(status)
+                if not recurso:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Type', tipo)
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, format, *args): # pylint: disable=redefined-builtin
+                """Não imprime o log de cada requisição."""
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = None
+
+    def page(self, path : str, cookies : str = "") -> Tuple[int, str]:
+        """
+        Retorna o código de status e o HTML da resposta a um caminho.
+
+        Args:
+            path (str): Caminho pedido, com os parâmetros, por exemplo '/app/3/' ou '/sale/BestOf2023?tab=1'.
+            cookies (str): Cabeçalho `Cookie` da requisição.
+
+        Returns:
+            Tuple[int, str]: Código de status HTTP e HTML da página; nos redirecionamentos (302), o caminho
+                de destino no lugar do HTML.
+        """
+        idade_confirmada = 'birthtime=' in cookies
+        status, pagina = 404, "<html><body>Not found</body></html>"
+        if self.fixtures is not None:
+            status, pagina = self._recorded_page(path, idade_confirmada)
+        else:
+            partes = urlsplit(path).path.strip('/').split('/')
+            aviso = partes[0] == 'agecheck'
+            if aviso:
+                partes = partes[1:]
+            if len(partes) >= 2 and partes[0] == 'app' and partes[1].isdigit() and int(partes[1]) < len(self.games):
+                indice = int(partes[1])
+                restrito = self.agecheck_every and indice % self.agecheck_every == 0
+                if restrito and not idade_confirmada:
+                    # Como a Steam: a página do jogo redireciona para o aviso de idade
+                    status, pagina = (200, render_agecheck_page()) if aviso else (302, f"/agecheck/app/{indice}/")
+                elif aviso:
+                    status, pagina = 302, f"/app/{indice}/"
+                else:
+                    status, pagina = 200, render_game_page(self.games[indice], self.filler_kb)
+            elif len(partes) == 2 and partes[0] == 'sale' and partes[1][len('BestOf'):] in self.best_of:
+                # A aba (`tab`) é escolhida pelo script da página, como na Steam
+                status, pagina = 200, render_best_of_tabs_page(self.best_of[partes[1][len('BestOf'):]], self.filler_kb)
+        with self._lock:
+            self.served += 1
+        return status, pagina
+
+    def throttle(self) -> bool:
+        """
+        Indica se uma página deve ser respondida com 429: quando já foram servidas `max_rps` páginas no
+        último segundo ou, ao acaso, com a probabilidade `error_rate`. As páginas respondidas com 429 não
+        contam no limite.
+
+        Returns:
+            bool: True se a página deve ser respondida com 429.
+        """
+        agora = time.monotonic()
+        with self._lock:
+            while self._recentes and agora - self._recentes[0] >= 1:
+                self._recentes.popleft()
+            limitado = bool(self.max_rps) and len(self._recentes) >= self.max_rps
+            limitado = limitado or (self.error_rate > 0 and self._aleatorio.random() < self.error_rate)
+            if limitado:
+                self.throttled += 1
+            else:
+                self._recentes.append(agora)
+        return limitado
+
+    @contextmanager
+    def load(self):
+        """
+        Gerenciador de contexto que conta as páginas sendo servidas ao mesmo tempo e espera a latência da
+        resposta: `latency` mais `latency_per_inflight` para cada outra página em andamento.
+        """
+        with self._lock:
+            self._em_andamento += 1
+            carga = self._em_andamento
+            self.peak_in_flight = max(self.peak_in_flight, carga)
+        try:
+            time.sleep(self.latency + self.latency_per_inflight * (carga - 1))
+            yield
+        finally:
+            with self._lock:
+                self._em_andamento -= 1
+
+    def conditional(self, corpo : bytes, if_none_match : Optional[str]) -> Tuple[str, bool]:
+        """
+        Calcula o ETag de uma página e indica se uma requisição condicional pode receber 304.
+
+        Args:
+            corpo (bytes): HTML da página.
+            if_none_match (Optional[str]): Cabeçalho `If-None-Match` da requisição.
+
+        Returns:
+            Tuple[str, bool]: ETag da página e se ele é igual ao de `if_none_match`.
+        """
+        etag = f'"{hashlib.sha1(corpo).hexdigest()[:16]}"'
+        inalterada = if_none_match == etag
+        if inalterada:
+            with self._lock:
+                self.not_modified += 1
+        return etag, inalterada
+
+    def asset(self, path : str) -> Optional[Tuple[str, bytes]]:
+        """
+        Retorna o conteúdo de uma imagem, fonte ou vídeo, com o tamanho `asset_kb`.
+
+        Args:
+            path (str): Caminho pedido, por exemplo '/img/ss_1.jpg' ou '/app/3/capsule.jpg'.
+
+        Returns:
+            Optional[Tuple[str, bytes]]: Tipo e conteúdo do recurso, ou None se o caminho não for de um recurso.
+        """
+        tipo = TIPOS_RECURSOS.get(os.path.splitext(urlsplit(path).path)[1])
+        if tipo is None:
+            return None
+        corpo = bytes(self.asset_kb * 1024)
+        with self._lock:
+            self.assets_served += 1
+            self.assets_bytes += len(corpo)
+        return tipo, corpo
+
+    def _recorded_page(self, path : str, idade_confirmada : bool) -> Tuple[int, str]:
+        """
+        Procura a página gravada da Steam correspondente a um caminho.
+
+        Args:
+            path (str): Caminho pedido, com os parâmetros.
+            idade_confirmada (bool): Se a requisição tem o cookie da confirmação de idade.
+
+        Returns:
+            Tuple[int, str]: Código de status HTTP e HTML da página; 404 se ela não foi gravada.
+        """
+        from dao.dao_cache_html import CacheMissError # pylint: disable=import-outside-toplevel
+        url = URL_STEAM + path
+        try:
+            pagina = self.fixtures.get(url)
+        except CacheMissError:
+            return 404, "<html><body>Not found</body></html>"
+        try:
+            depois_do_aviso = self.fixtures.get(url, "agecheck")
+        except CacheMissError:
+            depois_do_aviso = None
+        if depois_do_aviso is not None or TEXTO_AVISO_IDADE in pagina:
+            if not idade_confirmada:
+                return 200, render_agecheck_page()
+            pagina = depois_do_aviso or pagina
+        if '/sale/BestOf' in path:
+            # A página gravada já tem todos os cartões; os scripts da Steam não são executados
+            pagina = RE_SCRIPT.sub('', pagina)
+        return 200, pagina
+
+    def start(self):
+        """
+        Inicia o servidor em uma thread.
+        """
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Encerra o servidor.
+        """
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def url_base(self) -> str:
+        """
+        Retorna o endereço do servidor, que substitui o da Steam nas URLs (`ETL_BASE_URL`).
+
+        Returns:
+            str: Endereço do servidor, por exemplo 'http://127.0.0.1:8123'.
+        """
+        return f"http://127.0.0.1:{self.port}"
+
+    def url_game(self, index : int) -> str:
+        """
+        Retorna a URL da página de um jogo.
+
+        Args:
+            index (int): Índice do jogo em `games`.
+
+        Returns:
+            str: URL da página do jogo no servidor local.
+        """
+        return f"http://127.0.0.1:{self.port}/app/{index}/"
+
+    def url_best_of(self, year : str, tab : str) -> str:
+        """
+        Retorna a URL de uma aba de uma página BestOf.
+
+        Args:
+            year (str): Ano da página.
+            tab (str): Aba da página.
+
+        Returns:
+            str: URL da aba no servidor local.
+        """
+        return f"http://127.0.0.1:{self.port}/sale/BestOf{year}?tab={tab}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,359 @@
+"""
+Módulo analytics_games: Análises vetorizadas dos dados dos jogos com NumPy e pandas.
+
+Os dados são carregados uma única vez, do data.json ou dos CSVs gravados por LoadDados, em duas tabelas
+do pandas com códigos categóricos para categoria, grupo (tier), jogo e gênero:
+
+    rankings: Uma linha por posição de jogo (category, year, tier, game, is_indie).
+    genres: Uma linha por gênero de cada posição (ranking, genre), em que `ranking` é a linha de `rankings`.
+
+A junção das duas tem uma linha por linha dos arquivos CSV. As análises são agregações vetorizadas sobre
+essas tabelas, sem laços em Python por jogo.
+
+Depende dos pacotes opcionais `numpy` e `pandas` (`pip install pandas`).
+
+Exemplo de uso:
+    >>> from analytics.analytics_games import AnalyticsGames
+    >>> analytics = AnalyticsGames.from_json('../arquivos/data.json')
+    >>> analytics.genre_share('best_sellers').loc[(2020, 'Gold'), 'Action']
+    0.75
+    >>> analytics.overlap('best_sellers', 'most_played')
+
+Classes:
+    AnalyticsGames: Uma classe que fornece análises vetorizadas dos dados dos jogos.
+"""
+
+import os
+from typing import Dict, Iterable, Tuple
+from load.json_stream import JsonStreamReader
+from load.load_dados import DadosCategoria, LoadDados
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = None
+    pd = None
+
+# Nome da tabela de cada categoria do data.json, o mesmo dos arquivos CSV
+TABLES = {'best sellers': 'best_sellers', 'best releases': 'best_releases', 'most played': 'most_played'}
+
+
+def _codigo(codigos : Dict[str, int], valor : str) -> int:
+    """
+    Retorna o código de um valor, cadastrando-o se for novo.
+
+    Args:
+        codigos (Dict[str, int]): Códigos dos valores, na ordem em que apareceram.
+        valor (str): Valor, por exemplo o nome de um jogo.
+
+    Returns:
+        int: Código do valor.
+    """
+    codigo = codigos.get(valor)
+    if codigo is None:
+        codigo = codigos[valor] = len(codigos)
+    return codigo
+
+
+def _categorico(codigos, categorias : Dict[str, int]):
+    """
+    Monta uma coluna categórica a partir dos códigos, com as categorias na ordem em que apareceram.
+
+    Args:
+        codigos (List[int]): Códigos dos valores.
+        categorias (Dict[str, int]): Códigos de cada categoria.
+
+    Returns:
+        pandas.Categorical: Coluna categórica.
+    """
+    return pd.Categorical.from_codes(np.asarray(codigos, dtype=np.int32), categories=list(categorias))
+
+
+class AnalyticsGames:
+    """
+    Classe AnalyticsGames: Fornece análises vetorizadas dos dados dos jogos.
+
+    As categorias são os nomes das tabelas: 'best_sellers', 'best_releases' e 'most_played'. Os jogos
+    compartilham os mesmos códigos em todas as categorias e anos.
+
+    Attributes:
+        rankings (pandas.DataFrame): Uma linha por posição de jogo (category, year, tier, game, is_indie).
+        genres (pandas.DataFrame): Uma linha por gênero de cada posição (ranking, genre).
+
+    Methods:
+        from_data: Carrega os dados de pares (categoria, anos), como os do data.json.
+        from_json: Carrega os dados do data.json.
+        from_csv: Carrega os dados dos arquivos CSV gravados por LoadDados.
+        genre_share: Proporção dos jogos de cada ano e grupo que têm cada gênero.
+        indie_counts: Quantidade de jogos indie e não indie por ano e grupo.
+        churn: Entrada e saída de jogos de um ano para o seguinte.
+        overlap: Jogos em comum entre duas categorias, por ano.
+    """
+
+    def __init__(self, rankings, genres) -> None:
+        """
+        Construtor da classe AnalyticsGames.
+
+        Args:
+            rankings (pandas.DataFrame): Uma linha por posição de jogo, com as colunas category, year, tier,
+                game e is_indie.
+            genres (pandas.DataFrame): Uma linha por gênero de cada posição, com as colunas ranking (número
+                da linha em `rankings`) e genre.
+
+        Raises:
+            ImportError: Se os pacotes `numpy` e `pandas` não estiverem instalados.
+        """
+        if pd is None:
+            raise ImportError("As análises precisam dos pacotes numpy e pandas (pip install pandas)")
+        self.rankings = rankings.reset_index(drop=True)
+        self.genres = genres.reset_index(drop=True)
+        self._years = self.rankings['year'].to_numpy()
+        self._codes = {coluna: self.rankings[coluna].cat.codes.to_numpy() for coluna in ('category', 'tier', 'game')}
+        self._is_indie = self.rankings['is_indie'].to_numpy()
+        self._genre_rankings = self.genres['ranking'].to_numpy()
+        self._genre_codes = self.genres['genre'].cat.codes.to_numpy()
+
+    @classmethod
+    def from_data(cls, dados : Iterable[Tuple[str, DadosCategoria]]) -> 'AnalyticsGames':
+        """
+        Carrega os dados de pares (categoria, anos), lendo cada jogo uma única vez.
+
+        Os gêneros de `GENRES_REMOVE` ficam de fora, como nos arquivos CSV.
+
+        Args:
+            dados (Iterable[Tuple[str, DadosCategoria]]): Pares (categoria, anos), por exemplo os itens do
+                data.json ou `JsonStreamReader.categories()`. As categorias podem ser as do data.json
+                ('best sellers') ou os nomes das tabelas ('best_sellers').
+
+        Returns:
+            AnalyticsGames: As análises dos dados.
+        """
+        load_data = LoadDados()
+        categorias, tiers, games, genres = {}, {}, {}, {}
+        colunas = {'category': [], 'year': [], 'tier': [], 'game': [], 'is_indie': []}
+        rankings_genres, codigos_genres = [], []
+        for category, years in dados:
+            codigo_category = _codigo(categorias, TABLES.get(category, category))
+            for ano, tier, game, genres_game, is_indie, _ in load_data.iter_games(years):
+                ranking = len(colunas['game'])
+                colunas['category'].append(codigo_category)
+                colunas['year'].append(int(ano))
+                colunas['tier'].append(_codigo(tiers, tier))
+                colunas['game'].append(_codigo(games, game))
+                colunas['is_indie'].append(is_indie)
+                for genre in genres_game:
+                    rankings_genres.append(ranking)
+                    codigos_genres.append(_codigo(genres, genre))
+        rankings = pd.DataFrame({
+            'category': _categorico(colunas['category'], categorias),
+            'year': np.asarray(colunas['year'], dtype=np.int16),
+            'tier': _categorico(colunas['tier'], tiers),
+            'game': _categorico(colunas['game'], games),
+            'is_indie': np.asarray(colunas['is_indie'], dtype=bool),
+        })
+        genres_frame = pd.DataFrame({
+            'ranking': np.asarray(rankings_genres, dtype=np.int32),
+            'genre': _categorico(codigos_genres, genres),
+        })
+        return cls(rankings, genres_frame)
+
+    @classmethod
+    def from_json(cls, caminho : str = '../arquivos/data.json') -> 'AnalyticsGames':
+        """
+        Carrega os dados do data.json, lendo um ano de cada vez com JsonStreamReader.
+
+        Args:
+            caminho (str): Caminho do data.json.
+
+        Returns:
+            AnalyticsGames: As análises dos dados.
+        """
+        return cls.from_data(JsonStreamReader(caminho).categories())
+
+    @classmethod
+    def from_csv(cls, pasta : str = '../arquivos') -> 'AnalyticsGames':
+        """
+        Carrega os dados dos arquivos CSV gravados por LoadDados (uma linha por gênero de cada jogo).
+
+        Os jogos sem nenhum gênero não aparecem nos CSVs e, portanto, ficam de fora.
+
+        Args:
+            pasta (str): Pasta dos arquivos CSV.
+
+        Returns:
+            AnalyticsGames: As análises dos dados.
+        """
+        tabelas = []
+        for name_table in TABLES.values():
+            caminho = os.path.join(pasta, f"{name_table}.csv")
+            if not os.path.exists(caminho):
+                continue
+            tabela = pd.read_csv(caminho, sep=';', dtype=str, keep_default_na=False)
+            tabela.columns = ['year', 'tier', 'game', 'genre', 'is_indie']
+            tabela.insert(0, 'category', name_table)
+            tabelas.append(tabela)
+        linhas = pd.concat(tabelas, ignore_index=True)
+        for coluna in ('category', 'tier', 'game', 'genre'):
+            linhas[coluna] = pd.Categorical(linhas[coluna], categories=pd.unique(linhas[coluna]))
+        linhas['year'] = linhas['year'].astype(np.int16)
+        linhas['is_indie'] = linhas['is_indie'].to_numpy() == 'True'
+        linhas['ranking'] = linhas.groupby(['category', 'year', 'tier', 'game'], sort=False, observed=True).ngroup()
+        rankings = linhas.drop_duplicates('ranking')[['category', 'year', 'tier', 'game', 'is_indie']]
+        return cls(rankings, linhas[['ranking', 'genre']])
+
+    def _mask(self, category : str):
+        """
+        Retorna as posições de uma categoria.
+
+        Args:
+            category (str): Categoria, por exemplo 'best_sellers'.
+
+        Returns:
+            numpy.ndarray: Máscara booleana das linhas de `rankings` da categoria.
+
+        Raises:
+            KeyError: Se a categoria não estiver nos dados.
+        """
+        return self._codes['category'] == self.rankings['category'].cat.categories.get_loc(category)
+
+    def _cells(self, mask):
+        """
+        Numera as células (ano, grupo) das posições selecionadas.
+
+        Args:
+            mask (numpy.ndarray): Máscara das linhas de `rankings`.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray, int]: Os anos, em ordem, a célula de cada posição
+                selecionada (ano * quantidade de grupos + grupo) e a quantidade de células.
+        """
+        years, indices = np.unique(self._years[mask], return_inverse=True)
+        tiers = len(self.rankings['tier'].cat.categories)
+        return years, indices * tiers + self._codes['tier'][mask], len(years) * tiers
+
+    def _index(self, years, cells):
+        """
+        Monta o índice (year, tier) das células.
+
+        Args:
+            years (numpy.ndarray): Anos, em ordem.
+            cells (numpy.ndarray): Células (ano * quantidade de grupos + grupo).
+
+        Returns:
+            pandas.MultiIndex: Índice (year, tier).
+        """
+        tiers = self.rankings['tier'].cat.categories
+        return pd.MultiIndex.from_arrays([years[cells // len(tiers)], tiers[cells % len(tiers)]], names=['year', 'tier'])
+
+    def _presence(self, category : str):
+        """
+        Monta a matriz de presença dos jogos de uma categoria em cada ano.
+
+        Args:
+            category (str): Categoria, por exemplo 'best_sellers'.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: Os anos, em ordem, e a matriz booleana (jogos x anos) em
+                que cada linha é o código de um jogo.
+        """
+        mask = self._mask(category)
+        years, indices = np.unique(self._years[mask], return_inverse=True)
+        presence = np.zeros((len(self.rankings['game'].cat.categories), len(years)), dtype=bool)
+        presence[self._codes['game'][mask], indices] = True
+        return years, presence
+
+    def genre_share(self, category : str = 'best_sellers'):
+        """
+        Calcula a proporção dos jogos de cada ano e grupo que têm cada gênero.
+
+        Args:
+            category (str): Categoria, por exemplo 'best_sellers'.
+
+        Returns:
+            pandas.DataFrame: Proporções (de 0 a 1), com índice (year, tier) e uma coluna por gênero.
+        """
+        mask = self._mask(category)
+        years, cells, total_cells = self._cells(mask)
+        totais = np.bincount(cells, minlength=total_cells)
+        # Célula de cada posição de `rankings`, para levar a célula a cada gênero
+        cell_of = np.full(len(mask), -1, dtype=np.int64)
+        cell_of[mask] = cells
+        genre_cells = cell_of[self._genre_rankings]
+        do_category = genre_cells >= 0
+        genres = self.genres['genre'].cat.categories
+        contagens = np.bincount(genre_cells[do_category] * len(genres) + self._genre_codes[do_category],
+                                minlength=total_cells * len(genres)).reshape(total_cells, len(genres))
+        linhas = np.flatnonzero(totais)
+        colunas = np.flatnonzero(contagens.sum(axis=0))
+        return pd.DataFrame(contagens[np.ix_(linhas, colunas)] / totais[linhas, None],
+                            index=self._index(years, linhas), columns=pd.Index(genres[colunas], name='genre'))
+
+    def indie_counts(self, category : str = 'best_sellers'):
+        """
+        Conta os jogos indie e não indie de cada ano e grupo.
+
+        Args:
+            category (str): Categoria, por exemplo 'best_sellers'.
+
+        Returns:
+            pandas.DataFrame: Colunas indie, non_indie e indie_share, com índice (year, tier).
+        """
+        mask = self._mask(category)
+        years, cells, total_cells = self._cells(mask)
+        totais = np.bincount(cells, minlength=total_cells)
+        indies = np.bincount(cells[self._is_indie[mask]], minlength=total_cells)
+        linhas = np.flatnonzero(totais)
+        return pd.DataFrame({
+            'indie': indies[linhas],
+            'non_indie': totais[linhas] - indies[linhas],
+            'indie_share': indies[linhas] / totais[linhas],
+        }, index=self._index(years, linhas))
+
+    def churn(self, category : str = 'best_sellers'):
+        """
+        Calcula a entrada e a saída de jogos de uma categoria de um ano para o seguinte.
+
+        Args:
+            category (str): Categoria, por exemplo 'best_sellers'.
+
+        Returns:
+            pandas.DataFrame: A partir do segundo ano, as colunas titles (jogos no ano), entered (jogos
+                que não estavam no ano anterior), exited (jogos do ano anterior que saíram), retained e
+                churn (proporção dos jogos do ano anterior que saíram).
+        """
+        years, presence = self._presence(category)
+        anterior, atual = presence[:, :-1], presence[:, 1:]
+        titles = presence.sum(axis=0)
+        exited = (anterior & ~atual).sum(axis=0)
+        return pd.DataFrame({
+            'titles': titles[1:],
+            'entered': (atual & ~anterior).sum(axis=0),
+            'exited': exited,
+            'retained': (anterior & atual).sum(axis=0),
+            'churn': exited / np.maximum(titles[:-1], 1),
+        }, index=pd.Index(years[1:], name='year'))
+
+    def overlap(self, category_a : str = 'best_sellers', category_b : str = 'most_played'):
+        """
+        Calcula os jogos em comum entre duas categorias, nos anos presentes nas duas.
+
+        Args:
+            category_a (str): Primeira categoria, por exemplo 'best_sellers'.
+            category_b (str): Segunda categoria, por exemplo 'most_played'.
+
+        Returns:
+            pandas.DataFrame: Colunas com a quantidade de jogos de cada categoria, both (jogos nas duas) e
+                jaccard (jogos nas duas / jogos em pelo menos uma), com índice year.
+        """
+        years_a, presence_a = self._presence(category_a)
+        years_b, presence_b = self._presence(category_b)
+        years, indices_a, indices_b = np.intersect1d(years_a, years_b, return_indices=True)
+        presence_a, presence_b = presence_a[:, indices_a], presence_b[:, indices_b]
+        both = (presence_a & presence_b).sum(axis=0)
+        return pd.DataFrame({
+            category_a: presence_a.sum(axis=0),
+            category_b: presence_b.sum(axis=0),
+            'both': both,
+            'jaccard': both / np.maximum((presence_a | presence_b).sum(axis=0), 1),
+        }, index=pd.Index(years, name='year'))
@@ -0,0 +1,179 @@
+"""
+Módulo config_etl: Centraliza as configurações do ETL.
+
+As configurações são lidas de variáveis de ambiente (ou de um arquivo `.env` na pasta de execução),
+com valores padrão que reproduzem o comportamento original do ETL.
+
+Exemplo de uso:
+    >>> from config.config_etl import ConfigEtl
+    >>> config = ConfigEtl()
+    >>> config.pool_size
+    1
+
+Classes:
+    ConfigEtl: Uma classe que agrupa as configurações do ETL.
+"""
+
+import os
+from dotenv import load_dotenv
+
+# Endereço da loja da Steam, usado nas URLs das páginas BestOf e dos jogos
+URL_STEAM = "https://store.steampowered.com"
+
+
+class ConfigEtl:
+    """
+    Classe ConfigEtl: Agrupa as configurações do ETL.
+
+    Attributes:
+        pool_size (int): Quantidade de sessões do navegador usadas para buscar as páginas dos jogos
+            (variável de ambiente `ETL_POOL_SIZE`).
+        queue_size (int): Tamanho máximo da fila de páginas aguardando um navegador livre
+            (variável de ambiente `ETL_QUEUE_SIZE`).
+        backend (str): Como as páginas dos jogos são buscadas: 'requests' tenta primeiro uma requisição
+            HTTP sem navegador e só usa o Selenium quando necessário; 'selenium' usa sempre o navegador
+            (variável de ambiente `ETL_BACKEND`).
+        http_timeout (float): Tempo máximo, em segundos, de cada requisição HTTP sem navegador
+            (variável de ambiente `ETL_HTTP_TIMEOUT`).
+        engine (str): Como as páginas dos jogos são distribuídas: 'async' usa DaoAsyncHtml e 'pool' usa
+            a fila de DaoPoolHtml (variável de ambiente `ETL_ENGINE`).
+        max_in_flight (int): Quantidade máxima de páginas buscadas ao mesmo tempo pelo motor 'async'
+            (variável de ambiente `ETL_MAX_IN_FLIGHT`).
+        rate_per_host (float): Quantidade máxima de requisições por segundo a um mesmo host; 0 desativa
+            o limite (variável de ambiente `ETL_RATE_PER_HOST`).
+        max_retries (int): Quantidade máxima de novas tentativas em respostas 429/5xx
+            (variável de ambiente `ETL_MAX_RETRIES`).
+        adaptive (bool): Se o motor 'async' ajusta a quantidade de páginas buscadas ao mesmo tempo (AIMD) pela
+            latência, pelas respostas 429/503 e pelas anomalias; sem isso, ela fica fixa em `max_in_flight`
+            (variável de ambiente `ETL_ADAPTIVE`).
+        min_in_flight (int): Menor quantidade de páginas buscadas ao mesmo tempo no modo adaptativo
+            (variável de ambiente `ETL_MIN_IN_FLIGHT`).
+        initial_in_flight (int): Quantidade inicial de páginas buscadas ao mesmo tempo no modo adaptativo
+            (variável de ambiente `ETL_INITIAL_IN_FLIGHT`).
+        target_p95 (float): Latência p95, em segundos, das páginas dos jogos acima da qual a concorrência é
+            reduzida (variável de ambiente `ETL_TARGET_P95`).
+        rate_burst (float): Rajada máxima de requisições a um mesmo host, acima do ritmo de `rate_per_host`
+            (variável de ambiente `ETL_RATE_BURST`).
+        cache_dir (str): Pasta do cache em disco das páginas; vazio desativa o cache
+            (variável de ambiente `ETL_CACHE_DIR`).
+        cache_ttl (float): Tempo, em segundos, em que uma página do cache é válida; 0 não expira
+            (variável de ambiente `ETL_CACHE_TTL`).
+        cache_max_bytes (int): Tamanho máximo do cache, em bytes (variável de ambiente `ETL_CACHE_MAX_MB`,
+            em megabytes).
+        offline (bool): Se True, as páginas são servidas apenas do cache, sem acessar a Steam
+            (variável de ambiente `ETL_OFFLINE`).
+        journal_path (str): Caminho do diário da extração, usado para retomar uma extração interrompida
+            (variável de ambiente `ETL_JOURNAL`).
+        ready_timeout (float): Tempo máximo, em segundos, de espera por uma página aberta no navegador
+            (variável de ambiente `ETL_READY_TIMEOUT`).
+        ready_quiet (float): Tempo, em segundos, sem novos cartões de jogos para considerar uma página
+            BestOf completa (variável de ambiente `ETL_READY_QUIET`).
+        parse_workers (int): Quantidade de processos que analisam o HTML das páginas; 0 analisa na própria
+            thread de busca (variável de ambiente `ETL_PARSE_WORKERS`).
+        parse_queue (int): Quantidade máxima de páginas aguardando análise
+            (variável de ambiente `ETL_PARSE_QUEUE`).
+        parsed_results (str): Arquivo dos resultados das análises, pelo hash do conteúdo das páginas, para
+            reaproveitar a análise das páginas que não mudaram; vazio desativa (variável de ambiente
+            `ETL_PARSED_RESULTS`, por padrão `parsed.json` na pasta do cache).
+        sinks (List[str]): Destinos em que as tabelas são gravadas, entre 'csv', 'parquet', 'sqlite' e 'delta'
+            (variável de ambiente `ETL_SINKS`, separados por vírgula; por padrão, apenas 'csv').
+        best_of_tabs (bool): Se cada página BestOf é aberta uma única vez por ano, trocando as abas das
+            categorias no próprio navegador (variável de ambiente `ETL_BESTOF_TABS`).
+        metrics_path (str): Caminho do resumo das medições do ETL em JSON, ou vazio para não gravá-lo
+            (variável de ambiente `ETL_METRICS`).
+        output_dir (str): Pasta do data.json e das tabelas gravadas (variável de ambiente `ETL_OUTPUT_DIR`).
+        base_url (str): Endereço usado no lugar de `URL_STEAM` nas páginas buscadas, por exemplo um servidor
+            local com páginas gravadas (variável de ambiente `ETL_BASE_URL`).
+        chromedriver_path (str): Caminho fixo do chromedriver; vazio procura o caminho guardado, o PATH e,
+            por fim, o ChromeDriverManager (variável de ambiente `ETL_CHROMEDRIVER`).
+        chromedriver_cache (str): Arquivo em que o caminho do chromedriver resolvido é guardado entre as
+            execuções; vazio não guarda (variável de ambiente `ETL_CHROMEDRIVER_CACHE`).
+        browser_lean (bool): Se o navegador carrega as páginas no modo enxuto, sem esperar nem baixar as
+            imagens, os vídeos e as fontes (variável de ambiente `ETL_BROWSER_LEAN`).
+        browser_profile_dir (str): Pasta dos perfis persistentes do Chrome, reaproveitados entre as execuções
+            com os cookies de verificação de idade; vazio usa um perfil temporário
+            (variável de ambiente `ETL_BROWSER_PROFILE_DIR`).
+        page_load_timeout (float): Tempo máximo, em segundos, do carregamento de uma página no navegador; depois
+            dele, o navegador é reaberto e a página pedida de novo (variável de ambiente `ETL_PAGE_LOAD_TIMEOUT`).
+        script_timeout (float): Tempo máximo, em segundos, dos scripts executados no navegador
+            (variável de ambiente `ETL_SCRIPT_TIMEOUT`).
+        browser_max_pages (int): Páginas abertas depois das quais o navegador é reciclado; 0 desativa
+            (variável de ambiente `ETL_BROWSER_MAX_PAGES`).
+        browser_max_rss_mb (float): Memória, em MB, dos processos do Chrome acima da qual o navegador é
+            reciclado; 0 desativa (variável de ambiente `ETL_BROWSER_MAX_RSS_MB`).
+        browser_retries (int): Novas tentativas de uma página depois de um tempo esgotado ou de uma queda do
+            navegador (variável de ambiente `ETL_BROWSER_RETRIES`).
+
+    Methods:
+        rebase_url: Troca o endereço da Steam de uma URL por `base_url`.
+    """
+
+    def __init__(self) -> None:
+        """
+        Construtor da classe ConfigEtl.
+
+        Carrega o arquivo `.env`, se existir, e lê as variáveis de ambiente.
+        """
+        load_dotenv()
+        self.pool_size = max(1, int(os.getenv("ETL_POOL_SIZE", "1")))
+        self.queue_size = max(1, int(os.getenv("ETL_QUEUE_SIZE", str(self.pool_size * 2))))
+        self.backend = os.getenv("ETL_BACKEND", "requests").lower()
+        if self.backend not in ("requests", "selenium"):
+            raise ValueError(f"ETL_BACKEND inválido: {self.backend!r} (use 'requests' ou 'selenium')")
+        self.http_timeout = float(os.getenv("ETL_HTTP_TIMEOUT", "10"))
+        self.engine = os.getenv("ETL_ENGINE", "async").lower()
+        if self.engine not in ("async", "pool"):
+            raise ValueError(f"ETL_ENGINE inválido: {self.engine!r} (use 'async' ou 'pool')")
+        self.max_in_flight = max(1, int(os.getenv("ETL_MAX_IN_FLIGHT", str(self.pool_size * 4))))
+        self.rate_per_host = float(os.getenv("ETL_RATE_PER_HOST", "10"))
+        self.max_retries = int(os.getenv("ETL_MAX_RETRIES", "3"))
+        self.adaptive = os.getenv("ETL_ADAPTIVE", "1").lower() in ("1", "true", "sim")
+        self.min_in_flight = max(1, min(self.max_in_flight, int(os.getenv("ETL_MIN_IN_FLIGHT", "1"))))
+        self.initial_in_flight = max(self.min_in_flight, min(self.max_in_flight, int(os.getenv(
+            "ETL_INITIAL_IN_FLIGHT", str(max(1, self.max_in_flight // 2))))))
+        self.target_p95 = float(os.getenv("ETL_TARGET_P95", "3"))
+        self.rate_burst = max(1.0, float(os.getenv("ETL_RATE_BURST", "1")))
+        self.cache_dir = os.getenv("ETL_CACHE_DIR", "../arquivos/cache")
+        self.cache_ttl = float(os.getenv("ETL_CACHE_TTL", str(24 * 60 * 60)))
+        self.cache_max_bytes = int(float(os.getenv("ETL_CACHE_MAX_MB", "500")) * 1024 ** 2)
+        self.offline = os.getenv("ETL_OFFLINE", "0").lower() in ("1", "true", "sim")
+        if self.offline and not self.cache_dir:
+            raise ValueError("ETL_OFFLINE exige um cache (ETL_CACHE_DIR)")
+        self.journal_path = os.getenv("ETL_JOURNAL", "../arquivos/journal.jsonl")
+        self.ready_timeout = float(os.getenv("ETL_READY_TIMEOUT", "15"))
+        self.ready_quiet = float(os.getenv("ETL_READY_QUIET", "0.8"))
+        self.parse_workers = max(0, int(os.getenv("ETL_PARSE_WORKERS", str(min(4, os.cpu_count() or 1)))))
+        self.parse_queue = max(1, int(os.getenv("ETL_PARSE_QUEUE", str(max(1, self.parse_workers * 2)))))
+        self.parsed_results = os.getenv("ETL_PARSED_RESULTS",
+                                        os.path.join(self.cache_dir, "parsed.json") if self.cache_dir else "")
+        self.sinks = [sink.strip().lower() for sink in os.getenv("ETL_SINKS", "csv").split(",") if sink.strip()]
+        invalidos = set(self.sinks) - {"csv", "parquet", "sqlite", "delta"}
+        if invalidos or not self.sinks:
+            raise ValueError(f"ETL_SINKS inválido: {os.getenv('ETL_SINKS')!r} (use 'csv', 'parquet', 'sqlite' e/ou 'delta')")
+        self.best_of_tabs = os.getenv("ETL_BESTOF_TABS", "1").lower() in ("1", "true", "sim")
+        self.metrics_path = os.getenv("ETL_METRICS", "../arquivos/metrics.json")
+        self.output_dir = os.getenv("ETL_OUTPUT_DIR", "../arquivos")
+        self.base_url = os.getenv("ETL_BASE_URL", URL_STEAM).rstrip("/")
+        self.chromedriver_path = os.getenv("ETL_CHROMEDRIVER", "")
+        self.chromedriver_cache = os.getenv("ETL_CHROMEDRIVER_CACHE", "../arquivos/chromedriver.json")
+        self.browser_lean = os.getenv("ETL_BROWSER_LEAN", "1").lower() in ("1", "true", "sim")
+        self.browser_profile_dir = os.getenv("ETL_BROWSER_PROFILE_DIR", "../arquivos/chrome_profile")
+        self.page_load_timeout = float(os.getenv("ETL_PAGE_LOAD_TIMEOUT", "30"))
+        self.script_timeout = float(os.getenv("ETL_SCRIPT_TIMEOUT", str(self.ready_timeout + 5)))
+        self.browser_max_pages = max(0, int(os.getenv("ETL_BROWSER_MAX_PAGES", "200")))
+        self.browser_max_rss_mb = float(os.getenv("ETL_BROWSER_MAX_RSS_MB", "1500"))
+        self.browser_retries = max(0, int(os.getenv("ETL_BROWSER_RETRIES", "1")))
+
+    def rebase_url(self, url : str) -> str:
+        """
+        Troca o endereço da Steam de uma URL por `base_url`. As demais URLs não são alteradas.
+
+        Args:
+            url (str): URL de uma página da Steam, por exemplo 'https://store.steampowered.com/app/570/'.
+
+        Returns:
+            str: URL com o endereço `base_url`, por exemplo 'http://127.0.0.1:8123/app/570/'.
+        """
+        if self.base_url != URL_STEAM and url.startswith(URL_STEAM):
+            return self.base_url + url[len(URL_STEAM):]
+        return url
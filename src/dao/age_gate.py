@@ -0,0 +1,97 @@
+"""
+Módulo age_gate: Evita o aviso de idade da Steam com os cookies de verificação de idade.
+
+Sem os cookies de verificação de idade, a Steam redireciona as páginas de jogos com restrição de idade
+para `/agecheck/app/<id>/`, um formulário de data de nascimento. Este módulo oferece a classe AgeGate, que
+grava esses cookies uma única vez em cada sessão (do navegador, pelo Chrome DevTools Protocol, ou do
+`requests`) e converte as URLs do aviso de idade na URL da página do jogo, para que as páginas sejam
+abertas diretamente. O formulário (`DaoGetHtml.go_page_of_game_when_warning_age`) fica apenas como
+alternativa, caso a Steam ainda exiba o aviso.
+
+Exemplo de uso:
+    >>> from dao.age_gate import AgeGate
+    >>> age_gate = AgeGate()
+    >>> age_gate.content_url("https://store.steampowered.com/agecheck/app/1174180/")
+    'https://store.steampowered.com/app/1174180/'
+    >>> age_gate.apply(navegador)
+
+Classes:
+    AgeGate: Uma classe que grava os cookies de verificação de idade e converte as URLs do aviso de idade.
+"""
+
+import re
+import time
+from urllib.parse import urlsplit
+from config.config_etl import URL_STEAM
+
+# Cookies que a Steam grava depois que o usuário informa a data de nascimento (01/01/2000)
+COOKIES_IDADE = {
+    'birthtime': '946684801',
+    'lastagecheckage': '1-January-2000',
+    'wants_mature_content': '1',
+}
+# Caminho do aviso de idade de um jogo, por exemplo /agecheck/app/1174180/
+RE_AVISO_IDADE = re.compile(r'/agecheck/app/(\d+)')
+# Validade dos cookies gravados no navegador, para que durem entre as execuções com um perfil persistente
+VALIDADE_COOKIES_S = 365 * 24 * 60 * 60
+
+
+class AgeGate:
+    """
+    Classe AgeGate: Grava os cookies de verificação de idade e converte as URLs do aviso de idade.
+
+    Attributes:
+        base_url (str): Endereço da loja em que os cookies são gravados, por padrão o da Steam.
+        domain (str): Host de `base_url`, por exemplo 'store.steampowered.com'.
+
+    Methods:
+        content_url: Converte a URL do aviso de idade de um jogo na URL da página do jogo.
+        apply: Grava os cookies de verificação de idade em um navegador aberto.
+        apply_session: Grava os cookies de verificação de idade em uma sessão do `requests`.
+    """
+
+    def __init__(self, base_url : str = URL_STEAM) -> None:
+        """
+        Construtor da classe AgeGate.
+
+        Args:
+            base_url (str): Endereço da loja, por exemplo `ConfigEtl.base_url`.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.domain = urlsplit(self.base_url).hostname
+
+    @staticmethod
+    def content_url(url : str) -> str:
+        """
+        Converte a URL do aviso de idade de um jogo na URL da página do jogo. As demais URLs não são alteradas.
+
+        Args:
+            url (str): URL de uma página, por exemplo 'https://store.steampowered.com/agecheck/app/570/'.
+
+        Returns:
+            str: URL da página do jogo, por exemplo 'https://store.steampowered.com/app/570/'.
+        """
+        return RE_AVISO_IDADE.sub(r'/app/\1', url, count=1)
+
+    def apply(self, navegador):
+        """
+        Grava os cookies de verificação de idade em um navegador aberto, sem abrir nenhuma página.
+
+        Args:
+            navegador (webdriver.Chrome): Navegador aberto.
+        """
+        validade = time.time() + VALIDADE_COOKIES_S
+        for nome, valor in COOKIES_IDADE.items():
+            navegador.execute_cdp_cmd("Network.setCookie", {
+                "name": nome, "value": valor, "url": self.base_url, "path": "/", "expires": validade,
+            })
+
+    def apply_session(self, session):
+        """
+        Grava os cookies de verificação de idade em uma sessão do `requests`.
+
+        Args:
+            session (requests.Session): Sessão HTTP.
+        """
+        for nome, valor in COOKIES_IDADE.items():
+            session.cookies.set(nome, valor, domain=self.domain)
@@ -0,0 +1,180 @@
+"""
+Módulo browser_profile: Configura o navegador para baixar apenas o necessário para a extração.
+
+A extração usa apenas o HTML das páginas (o texto alternativo e os links dos cartões de jogos e o bloco
+"Genre:"), mas o navegador baixa também as imagens, os vídeos, as fontes e os scripts de análise de cada
+página. Este módulo oferece a classe BrowserProfile, que, no modo enxuto:
+    - usa a estratégia de carregamento `eager`, em que `navegador.get` volta assim que o HTML foi
+      analisado, sem esperar as imagens e os demais recursos; a espera pelo conteúdo continua com
+      PageReadiness;
+    - bloqueia, pelo Chrome DevTools Protocol (`Network.setBlockedURLs`), as imagens, os vídeos, as fontes
+      e os rastreadores, além de desativar as imagens nas preferências do Chrome;
+    - desativa a GPU e as extensões.
+
+Em qualquer modo, os cookies de verificação de idade (AgeGate) são gravados assim que o navegador abre,
+e cada sessão pode usar uma pasta de perfil do Chrome persistente (`user_data_dir`), reaproveitada entre
+as execuções com os cookies e o cache do navegador.
+
+Com o modo enxuto ligado ou desligado, os bytes transferidos pela rede e as requisições bloqueadas de cada
+página são lidos do log de desempenho do Chrome e somados às medições ('navegador.transfer_bytes',
+'navegador.requests' e 'navegador.blocked_requests'), para comparar as duas configurações.
+
+Exemplo de uso:
+    >>> from dao.browser_profile import BrowserProfile
+    >>> profile = BrowserProfile(lean=True, user_data_dir="../arquivos/chrome_profile")
+    >>> navegador = webdriver.Chrome(service=servico, options=profile.options(profile.claim_dir()))
+    >>> profile.apply(navegador)
+    >>> navegador.get(url)
+    >>> profile.record_transfer(navegador)
+    48213
+
+Classes:
+    BrowserProfile: Uma classe que configura o navegador e mede os bytes transferidos por página.
+"""
+
+import json
+import os
+import threading
+from typing import Optional, Sequence
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from dao.age_gate import AgeGate
+from metrics.metrics_etl import METRICS
+
+# Recursos bloqueados no modo enxuto, no formato de `Network.setBlockedURLs` ('*' casa com qualquer texto).
+# As URLs da Steam têm parâmetros depois da extensão (capsule_231x87.jpg?t=1700000000).
+PADROES_BLOQUEADOS = (
+    # Imagens
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.ico*",
+    # Vídeos dos trailers
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.mpd*", "*.m4s*", "*video.akamai.steamstatic.com*",
+    "*video.cloudflare.steamstatic.com*",
+    # Fontes
+    "*.woff*", "*.ttf*", "*.otf*",
+    # Rastreadores
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+)
+
+
+class BrowserProfile:
+    """
+    Classe BrowserProfile: Configura o navegador e mede os bytes transferidos por página.
+
+    Attributes:
+        lean (bool): Se o modo enxuto (carregamento `eager` e bloqueio dos recursos pesados) está ligado.
+        blocked_patterns (Tuple[str, ...]): Padrões das URLs bloqueadas no modo enxuto.
+        user_data_dir (str): Pasta dos perfis persistentes do Chrome, uma subpasta por sessão, ou vazio para
+            um perfil temporário.
+        age_gate (AgeGate): Cookies de verificação de idade gravados em cada navegador aberto.
+
+    Methods:
+        claim_dir: Reserva a pasta de perfil de uma nova sessão do navegador.
+        options: Retorna as opções do Chrome do perfil.
+        apply: Grava os cookies de verificação de idade e bloqueia os recursos pesados em um navegador aberto.
+        record_transfer: Soma às medições os bytes transferidos desde a última chamada.
+    """
+
+    def __init__(self, lean : bool = True, blocked_patterns : Sequence[str] = PADROES_BLOQUEADOS,
+                 user_data_dir : str = "", age_gate : Optional[AgeGate] = None) -> None:
+        """
+        Construtor da classe BrowserProfile.
+
+        Args:
+            lean (bool): Se o modo enxuto está ligado. Desligado, o navegador carrega a página completa,
+                como antes, e apenas os bytes transferidos são medidos.
+            blocked_patterns (Sequence[str]): Padrões das URLs bloqueadas no modo enxuto.
+            user_data_dir (str): Pasta dos perfis persistentes do Chrome. Vazio usa um perfil temporário.
+            age_gate (AgeGate): Cookies de verificação de idade. Por padrão, os da loja da Steam.
+        """
+        self.lean = lean
+        self.blocked_patterns = tuple(blocked_patterns)
+        self.user_data_dir = user_data_dir
+        self.age_gate = age_gate or AgeGate()
+        self._sessoes = 0
+        self._lock = threading.Lock()
+
+    def claim_dir(self) -> Optional[str]:
+        """
+        Reserva a pasta de perfil de uma nova sessão do navegador. O Chrome não permite dois navegadores
+        abertos com a mesma pasta, então cada sessão tem a sua, e a mesma sessão a reaproveita ao reabrir
+        o navegador.
+
+        Returns:
+            Optional[str]: Pasta do perfil da sessão, por exemplo '../arquivos/chrome_profile/session-0', ou
+                None quando `user_data_dir` é vazio.
+        """
+        if not self.user_data_dir:
+            return None
+        with self._lock:
+            indice = self._sessoes
+            self._sessoes += 1
+        return os.path.join(self.user_data_dir, f"session-{indice}")
+
+    def options(self, profile_dir : Optional[str] = None) -> Options:
+        """
+        Retorna as opções do Chrome do perfil, sempre em segundo plano e com o log de desempenho da rede
+        ativado para medir os bytes transferidos.
+
+        Args:
+            profile_dir (Optional[str]): Pasta do perfil persistente da sessão (`claim_dir`), ou None para
+                um perfil temporário.
+
+        Returns:
+            Options: Opções do Chrome.
+        """
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+        if profile_dir:
+            chrome_options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+        if self.lean:
+            chrome_options.page_load_strategy = "eager"
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--disable-extensions")
+            chrome_options.add_argument("--mute-audio")
+            chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        return chrome_options
+
+    def apply(self, navegador : webdriver.Chrome):
+        """
+        Grava os cookies de verificação de idade, uma única vez por sessão, e bloqueia os recursos pesados
+        em um navegador aberto com `options`. Sem o modo enxuto, apenas os cookies são gravados.
+
+        Args:
+            navegador (webdriver.Chrome): Navegador aberto.
+        """
+        self.age_gate.apply(navegador)
+        if not self.lean:
+            return
+        navegador.execute_cdp_cmd("Network.enable", {})
+        navegador.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(self.blocked_patterns)})
+
+    def record_transfer(self, navegador : webdriver.Chrome) -> int:
+        """
+        Lê o log de desempenho do navegador e soma às medições os bytes transferidos, as requisições
+        terminadas e as bloqueadas desde a última chamada.
+
+        Args:
+            navegador (webdriver.Chrome): Navegador aberto com `options`.
+
+        Returns:
+            int: Bytes transferidos desde a última chamada; 0 se o log não estiver disponível.
+        """
+        try:
+            entradas = navegador.get_log("performance")
+        except WebDriverException:
+            return 0
+        transferidos = requisicoes = bloqueadas = 0
+        for entrada in entradas:
+            mensagem = json.loads(entrada["message"])["message"]
+            if mensagem["method"] == "Network.loadingFinished":
+                transferidos += int(mensagem["params"].get("encodedDataLength", 0))
+                requisicoes += 1
+            elif mensagem["method"] == "Network.loadingFailed" and mensagem["params"].get("blockedReason"):
+                bloqueadas += 1
+        METRICS.count('navegador.transfer_bytes', transferidos)
+        METRICS.count('navegador.requests', requisicoes)
+        METRICS.count('navegador.blocked_requests', bloqueadas)
+        return transferidos
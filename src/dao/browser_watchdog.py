@@ -0,0 +1,195 @@
+"""
+Módulo browser_watchdog: Supervisiona o navegador de cada sessão durante as execuções longas.
+
+Com o tempo, o Chrome acumula memória, e um único `navegador.get` travado pode parar o ETL inteiro, porque
+o WebDriver não tem tempo máximo de carregamento por padrão. Este módulo oferece a classe BrowserWatchdog,
+usada por DaoGetHtml, que:
+    - define os tempos máximos de carregamento das páginas e de execução dos scripts em cada navegador;
+    - indica quando o navegador deve ser reciclado (fechado e reaberto): depois de `max_pages` páginas ou
+      quando a árvore de processos do Chrome passa de `max_rss_mb` de memória (RSS);
+    - identifica as falhas em que o navegador caiu, para que ele seja reaberto e a página pedida de novo;
+    - encerra à força a árvore de processos de um navegador travado.
+
+A memória do Chrome é medida com o pacote opcional `psutil` (`requirements-optional.txt`); sem ele, o
+navegador é reciclado apenas pela quantidade de páginas, com um aviso (uma única vez) se `max_rss_mb` estiver
+definido. Os reinícios, os tempos esgotados, as falhas do navegador e o
+pico de memória são somados às medições ('navegador.restarts', 'navegador.timeouts',
+'navegador.crashes' e o pico 'navegador.rss_mb').
+
+Exemplo de uso:
+    >>> from dao.browser_watchdog import BrowserWatchdog
+    >>> watchdog = BrowserWatchdog(page_load_timeout=30, max_pages=200, max_rss_mb=1500)
+    >>> watchdog.configure(navegador)
+    >>> watchdog.should_recycle(navegador, paginas=200)
+    True
+
+Classes:
+    BrowserWatchdog: Uma classe que define os tempos máximos do navegador e decide quando reciclá-lo.
+"""
+
+import warnings
+from typing import List
+from selenium import webdriver
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+from urllib3.exceptions import HTTPError
+from metrics.metrics_etl import METRICS
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# O aviso da falta do `psutil` é dado uma única vez, mesmo com um watchdog por sessão do pool
+_avisos = {'psutil': False}
+
+# Trechos das mensagens do chromedriver quando o Chrome caiu ou a aba travou
+TEXTOS_QUEDA = ("chrome not reachable", "disconnected", "tab crashed", "session deleted", "target window already closed")
+
+
+class BrowserWatchdog:
+    """
+    Classe BrowserWatchdog: Define os tempos máximos do navegador e decide quando reciclá-lo.
+
+    Attributes:
+        page_load_timeout (float): Tempo máximo, em segundos, do carregamento de uma página.
+        script_timeout (float): Tempo máximo, em segundos, de um script assíncrono, como a espera dos
+            cartões de jogos.
+        max_pages (int): Quantidade de páginas abertas depois da qual o navegador é reciclado; 0 desativa.
+        max_rss_mb (float): Memória (RSS) da árvore de processos do Chrome, em MB, acima da qual o navegador
+            é reciclado; 0 desativa. Precisa do `psutil`.
+        retries (int): Quantidade de vezes que uma página é pedida de novo, em um navegador reaberto, depois
+            de um tempo esgotado ou de uma falha do navegador.
+
+    Methods:
+        configure: Define os tempos máximos em um navegador recém-aberto.
+        rss_mb: Retorna a memória (RSS) da árvore de processos do navegador.
+        should_recycle: Indica se o navegador deve ser fechado e reaberto antes da próxima página.
+        is_crash: Indica se um erro do WebDriver significa que o navegador caiu.
+        kill: Encerra à força a árvore de processos do navegador.
+    """
+
+    def __init__(self, page_load_timeout : float = 30.0, script_timeout : float = 20.0, max_pages : int = 200,
+                 max_rss_mb : float = 1500.0, retries : int = 1) -> None:
+        """
+        Construtor da classe BrowserWatchdog.
+
+        Args:
+            page_load_timeout (float): Tempo máximo, em segundos, do carregamento de uma página.
+            script_timeout (float): Tempo máximo, em segundos, de um script assíncrono.
+            max_pages (int): Páginas abertas antes de reciclar o navegador; 0 desativa.
+            max_rss_mb (float): Memória, em MB, acima da qual o navegador é reciclado; 0 desativa.
+            retries (int): Novas tentativas de uma página depois de um tempo esgotado ou de uma falha.
+        """
+        self.page_load_timeout = page_load_timeout
+        self.script_timeout = script_timeout
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.retries = retries
+        if max_rss_mb and psutil is None and not _avisos['psutil']:
+            _avisos['psutil'] = True
+            warnings.warn(f"O limite de memória do navegador ({max_rss_mb:g} MB) é ignorado sem o pacote 'psutil' "
+                          "(pip install -r requirements-optional.txt); o navegador será reciclado apenas pela "
+                          "quantidade de páginas.", RuntimeWarning, stacklevel=2)
+
+    def configure(self, navegador : webdriver.Chrome):
+        """
+        Define os tempos máximos de carregamento e de execução dos scripts em um navegador recém-aberto.
+
+        Args:
+            navegador (webdriver.Chrome): Navegador aberto.
+        """
+        navegador.set_page_load_timeout(self.page_load_timeout)
+        navegador.set_script_timeout(self.script_timeout)
+
+    @staticmethod
+    def _processos(navegador : webdriver.Chrome) -> List:
+        """
+        Retorna os processos do chromedriver e do Chrome aberto por ele.
+
+        Args:
+            navegador (webdriver.Chrome): Navegador aberto.
+
+        Returns:
+            List[psutil.Process]: Processos da árvore do navegador; vazia sem o `psutil` ou se o processo
+                do chromedriver não existir mais.
+        """
+        processo = getattr(getattr(navegador, 'service', None), 'process', None)
+        if psutil is None or processo is None:
+            return []
+        try:
+            raiz = psutil.Process(processo.pid)
+            return [raiz, *raiz.children(recursive=True)]
+        except psutil.Error:
+            return []
+
+    def rss_mb(self, navegador : webdriver.Chrome) -> float:
+        """
+        Retorna a memória (RSS) da árvore de processos do navegador e a registra no pico 'navegador.rss_mb'.
+
+        Args:
+            navegador (webdriver.Chrome): Navegador aberto.
+
+        Returns:
+            float: Memória, em MB; 0 sem o `psutil`.
+        """
+        total = 0
+        for processo in self._processos(navegador):
+            try:
+                total += processo.memory_info().rss
+            except psutil.Error:
+                pass # O processo terminou durante a medição
+        rss = total / 1024 ** 2
+        if rss:
+            METRICS.peak('navegador.rss_mb', rss)
+        return rss
+
+    def should_recycle(self, navegador : webdriver.Chrome, paginas : int) -> bool:
+        """
+        Indica se o navegador deve ser fechado e reaberto antes da próxima página.
+
+        Args:
+            navegador (webdriver.Chrome): Navegador aberto.
+            paginas (int): Páginas abertas por este navegador.
+
+        Returns:
+            bool: True se o navegador passou de `max_pages` páginas ou de `max_rss_mb` de memória.
+        """
+        if self.max_pages and paginas >= self.max_pages:
+            return True
+        rss = self.rss_mb(navegador)
+        return bool(self.max_rss_mb) and rss > self.max_rss_mb
+
+    @staticmethod
+    def is_crash(erro : Exception) -> bool:
+        """
+        Indica se um erro do WebDriver significa que o navegador caiu (e não, por exemplo, que a página não
+        existe).
+
+        Args:
+            erro (Exception): Erro de uma chamada ao navegador.
+
+        Returns:
+            bool: True se a sessão do navegador não existe mais ou se o chromedriver não responde.
+        """
+        if isinstance(erro, (InvalidSessionIdException, HTTPError, ConnectionError)):
+            return True
+        mensagem = (getattr(erro, 'msg', None) or str(erro)).lower() if isinstance(erro, WebDriverException) else ""
+        return any(texto in mensagem for texto in TEXTOS_QUEDA)
+
+    def kill(self, navegador : webdriver.Chrome):
+        """
+        Encerra à força a árvore de processos do navegador, sem esperar o WebDriver, que pode estar travado.
+
+        Args:
+            navegador (webdriver.Chrome): Navegador travado.
+        """
+        processos = self._processos(navegador)
+        for processo in reversed(processos):
+            try:
+                processo.kill()
+            except psutil.Error:
+                pass
+        if not processos:
+            processo = getattr(getattr(navegador, 'service', None), 'process', None)
+            if processo is not None:
+                processo.kill()
@@ -0,0 +1,317 @@
+"""
+Módulo crawl_scheduler: Controle adaptativo da concorrência e do ritmo das buscas.
+
+Uma concorrência fixa ou é lenta demais ou faz a loja limitar as requisições (429). Este módulo oferece a
+classe CrawlScheduler, usada por DaoAsyncHtml, que controla quantas páginas são buscadas ao mesmo tempo
+com AIMD (aumento aditivo, redução multiplicativa):
+    - a cada `window` páginas de jogos terminadas, se o p95 da latência ficou abaixo de `target_p95`, o
+      limite aumenta em `increase`; se ficou acima, o limite é multiplicado por `decrease`;
+    - respostas 429/503 e anomalias (aviso de idade, página sem gêneros) reduzem o limite na hora, uma
+      única vez para as buscas que já estavam em andamento quando a redução aconteceu.
+
+Cada host também tem um balde de fichas (TokenBucket) com `rate_per_host` requisições por segundo e
+rajadas de até `burst` requisições. As buscas são separadas em filas de prioridade (`LANES`): quando há
+vaga, as páginas BestOf ('list') passam na frente das páginas dos jogos ('game'), então a descoberta das
+listas nunca espera pelas páginas dos jogos. Apenas a latência das páginas dos jogos entra no p95, já que
+as páginas BestOf demoram bem mais.
+
+Exemplo de uso:
+    >>> from dao.crawl_scheduler import CrawlScheduler
+    >>> scheduler = CrawlScheduler(initial=4, maximum=16, rate_per_host=10)
+    >>> async with scheduler.slot(url, 'game') as vez:
+    ...     html = await buscar(url)
+    ...     scheduler.record(vez, latencia, status_code=200)
+    >>> scheduler.limit
+    5
+
+Classes:
+    TokenBucket: Uma classe que limita o ritmo das requisições a um host.
+    CrawlScheduler: Uma classe que controla a concorrência das buscas com AIMD e filas de prioridade.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from metrics.metrics_etl import METRICS
+
+# Filas de prioridade, da mais para a menos prioritária
+LANES = ('list', 'game')
+# Respostas que indicam que a loja está limitando as requisições
+STATUS_LIMITADO = {429, 503}
+
+
+class TokenBucket:
+    """
+    Classe TokenBucket: Limita o ritmo das requisições a um host.
+
+    Attributes:
+        rate (float): Fichas repostas por segundo (requisições por segundo).
+        burst (float): Quantidade máxima de fichas acumuladas (tamanho da rajada).
+
+    Methods:
+        acquire: Corrotina que espera uma ficha e a consome.
+    """
+
+    def __init__(self, rate : float, burst : float = 1.0) -> None:
+        """
+        Construtor da classe TokenBucket.
+
+        Args:
+            rate (float): Requisições por segundo.
+            burst (float): Tamanho máximo da rajada. O balde começa cheio.
+        """
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._fichas = self.burst
+        self._atualizado = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Corrotina que espera uma ficha e a consome. As esperas são atendidas na ordem de chegada.
+        """
+        async with self._lock:
+            while True:
+                agora = time.monotonic()
+                self._fichas = min(self.burst, self._fichas + (agora - self._atualizado) * self.rate)
+                self._atualizado = agora
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return
+                await asyncio.sleep((1 - self._fichas) / self.rate)
+
+
+class CrawlScheduler:
+    """
+    Classe CrawlScheduler: Controla a concorrência das buscas com AIMD e filas de prioridade.
+
+    Deve ser usada por um único laço de eventos do asyncio por vez. O limite aprendido continua valendo
+    entre laços diferentes (por exemplo, a busca das listas e depois a dos jogos); as filas e os baldes
+    de fichas são recriados a cada laço.
+
+    Attributes:
+        minimum (int): Menor limite de buscas simultâneas.
+        maximum (int): Maior limite de buscas simultâneas.
+        adaptive (bool): Se o limite se ajusta; sem isso, o limite fica fixo em `initial`.
+        target_p95 (float): Latência p95, em segundos, acima da qual o limite é reduzido.
+        window (int): Quantidade de páginas de jogos terminadas entre dois ajustes pela latência.
+        increase (float): Quanto o limite aumenta a cada janela com latência boa.
+        decrease (float): Fator aplicado ao limite em cada redução.
+        rate_per_host (float): Requisições por segundo a um mesmo host; 0 desativa o balde de fichas.
+        burst (float): Tamanho máximo da rajada de requisições a um mesmo host.
+        limit (int): Limite atual de buscas simultâneas.
+        in_flight (int): Buscas em andamento.
+
+    Methods:
+        slot: Gerenciador de contexto assíncrono que espera uma vaga e uma ficha do host.
+        record: Registra o resultado de uma busca e ajusta o limite.
+        summary: Retorna o resumo do controle da concorrência.
+    """
+
+    def __init__(self, initial : int = 4, minimum : int = 1, maximum : int = 32, adaptive : bool = True,
+                 target_p95 : float = 3.0, window : int = 20, increase : float = 1.0, decrease : float = 0.5,
+                 rate_per_host : float = 10.0, burst : Optional[float] = None) -> None:
+        """
+        Construtor da classe CrawlScheduler.
+
+        Args:
+            initial (int): Limite inicial de buscas simultâneas.
+            minimum (int): Menor limite.
+            maximum (int): Maior limite.
+            adaptive (bool): Se o limite se ajusta com AIMD.
+            target_p95 (float): Latência p95, em segundos, acima da qual o limite é reduzido.
+            window (int): Páginas de jogos terminadas entre dois ajustes pela latência.
+            increase (float): Aumento aditivo do limite.
+            decrease (float): Fator multiplicativo da redução do limite.
+            rate_per_host (float): Requisições por segundo a um mesmo host; 0 desativa o limite.
+            burst (Optional[float]): Tamanho da rajada por host. Por padrão, uma requisição.
+        """
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.adaptive = adaptive
+        self.target_p95 = target_p95
+        self.window = max(1, window)
+        self.increase = increase
+        self.decrease = decrease
+        self.rate_per_host = rate_per_host
+        self.burst = burst or 1.0
+        self._limite = float(max(self.minimum, min(initial, self.maximum)))
+        self.in_flight = 0
+        self._filas = {lane: deque() for lane in LANES}
+        self._baldes = {}
+        self._latencias = []
+        self._sequencia = 0 # Número da última vaga concedida
+        self._sequencia_reducao = 0 # Vagas concedidas até a última redução
+        self._aumentos = 0
+        self._reducoes = 0
+        self._limitadas = 0
+        self._anomalias = 0
+        self._menor_limite = self.limit
+        self._loop = None
+
+    @property
+    def limit(self) -> int:
+        """
+        Limite atual de buscas simultâneas.
+
+        Returns:
+            int: Limite, entre `minimum` e `maximum`.
+        """
+        return int(self._limite)
+
+    def _bucket(self, url : str) -> Optional[TokenBucket]:
+        """
+        Retorna o balde de fichas do host da URL, criando-o na primeira requisição ao host.
+
+        Args:
+            url (str): URL que será requisitada.
+
+        Returns:
+            Optional[TokenBucket]: Balde do host, ou None se `rate_per_host` for 0.
+        """
+        if not self.rate_per_host:
+            return None
+        host = urlsplit(url).netloc
+        balde = self._baldes.get(host)
+        if balde is None:
+            balde = self._baldes[host] = TokenBucket(self.rate_per_host, self.burst)
+        return balde
+
+    def _conceder(self):
+        """
+        Concede as vagas livres às buscas em espera, das filas mais prioritárias para as menos.
+        """
+        for lane in LANES:
+            fila = self._filas[lane]
+            while fila and self.in_flight < self.limit:
+                espera = fila.popleft()
+                if not espera.done():
+                    self.in_flight += 1
+                    espera.set_result(None)
+
+    def _liberar(self):
+        """
+        Devolve uma vaga e a concede à próxima busca em espera.
+        """
+        self.in_flight -= 1
+        self._conceder()
+
+    @asynccontextmanager
+    async def slot(self, url : str, lane : str = 'game') -> AsyncIterator[Tuple[int, str]]:
+        """
+        Gerenciador de contexto assíncrono que espera uma vaga na fila `lane` e uma ficha do host da URL.
+
+        Args:
+            url (str): URL que será buscada.
+            lane (str): Fila de prioridade: 'list' ou 'game'.
+
+        Yields:
+            Tuple[int, str]: Identificação da vaga, repassada a `record`.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Novo laço de eventos: as esperas e os baldes do laço anterior não valem mais
+            self._loop = loop
+            self._filas = {lane: deque() for lane in LANES}
+            self._baldes = {}
+            self.in_flight = 0
+        espera = loop.create_future()
+        self._filas[lane].append(espera)
+        self._conceder()
+        try:
+            await espera
+        except asyncio.CancelledError:
+            if espera.done() and not espera.cancelled():
+                self._liberar() # A vaga foi concedida junto com o cancelamento
+            elif espera in self._filas[lane]:
+                self._filas[lane].remove(espera)
+            raise
+        try:
+            balde = self._bucket(url)
+            if balde:
+                await balde.acquire()
+            self._sequencia += 1
+            yield self._sequencia, lane
+        finally:
+            self._liberar()
+
+    def record(self, vez : Tuple[int, str], latency : float, status_code : Optional[int] = None,
+               anomaly : bool = False):
+        """
+        Registra o resultado de uma busca e ajusta o limite.
+
+        Args:
+            vez (Tuple[int, str]): Identificação da vaga, recebida de `slot`.
+            latency (float): Duração da busca, em segundos.
+            status_code (Optional[int]): Código de status HTTP da resposta, ou None se não for conhecido.
+            anomaly (bool): Se a página veio com uma anomalia, como o aviso de idade ou sem gêneros.
+        """
+        sequencia, lane = vez
+        if status_code in STATUS_LIMITADO or anomaly:
+            if anomaly:
+                self._anomalias += 1
+                METRICS.count('scheduler.anomalies')
+            else:
+                self._limitadas += 1
+                METRICS.count('scheduler.throttled')
+            # As buscas iniciadas antes da última redução já foram consideradas por ela
+            if sequencia > self._sequencia_reducao:
+                self._reduzir()
+            return
+        if lane != LANES[-1] or (status_code or 200) >= 400:
+            return
+        self._latencias.append(latency)
+        if len(self._latencias) < self.window:
+            return
+        p95 = sorted(self._latencias)[math.ceil(0.95 * len(self._latencias)) - 1]
+        self._latencias = []
+        if p95 > self.target_p95:
+            self._reduzir()
+        else:
+            self._aumentar()
+
+    def _aumentar(self):
+        """
+        Aumenta o limite em `increase`, até `maximum`.
+        """
+        if not self.adaptive or self._limite >= self.maximum:
+            return
+        self._limite = min(float(self.maximum), self._limite + self.increase)
+        self._aumentos += 1
+        METRICS.count('scheduler.increases')
+        METRICS.peak('scheduler.limit', self.limit)
+        self._conceder()
+
+    def _reduzir(self):
+        """
+        Multiplica o limite por `decrease`, até `minimum`. As buscas já em andamento terminam normalmente.
+        """
+        self._sequencia_reducao = self._sequencia
+        if not self.adaptive or self._limite <= self.minimum:
+            return
+        self._limite = max(float(self.minimum), self._limite * self.decrease)
+        self._latencias = []
+        self._reducoes += 1
+        self._menor_limite = min(self._menor_limite, self.limit)
+        METRICS.count('scheduler.decreases')
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Retorna o resumo do controle da concorrência.
+
+        Returns:
+            Dict[str, Any]: 'limit' (limite atual), 'min_limit' (menor limite atingido), 'increases',
+                'decreases', 'throttled' (respostas 429/503) e 'anomalies'.
+        """
+        return {
+            "limit": self.limit,
+            "min_limit": self._menor_limite,
+            "increases": self._aumentos,
+            "decreases": self._reducoes,
+            "throttled": self._limitadas,
+            "anomalies": self._anomalias,
+        }
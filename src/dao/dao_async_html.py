@@ -0,0 +1,186 @@
+"""
+Módulo dao_async_html: Busca concorrente das páginas dos jogos com asyncio.
+
+Este módulo oferece a classe DaoAsyncHtml, que recebe pares (chave, url), por exemplo as páginas únicas
+de DedupGames.tasks, e busca as páginas com novas tentativas, com espera aleatória, quando o servidor
+responde 429 ou 5xx. A quantidade de requisições simultâneas, o ritmo por host e a prioridade
+entre as páginas BestOf e as páginas dos jogos são controlados por CrawlScheduler; por padrão, com um
+limite fixo de `max_in_flight` páginas.
+
+A busca de cada página é feita por uma função bloqueante (por exemplo, usando DaoRequestsHtml ou uma
+sessão de DaoGetHtml), executada em threads. Para pedir uma nova tentativa, a função levanta
+HttpStatusError com o código de status recebido.
+
+Exemplo de uso:
+    >>> from dao.dao_async_html import DaoAsyncHtml
+    >>> crawler = DaoAsyncHtml(max_in_flight=8, rate_per_host=5)
+    >>> crawler = DaoAsyncHtml(scheduler=CrawlScheduler(initial=4, maximum=16)) # concorrência adaptativa
+    >>> tasks = [('jogo', 'https://example.com/1')]
+    >>> crawler.run_tasks(tasks, buscar, lambda chave, resultado: print(chave, resultado))
+    jogo [...]
+
+Classes:
+    HttpStatusError: Exceção que indica uma resposta HTTP que deve ser tentada novamente.
+    DaoAsyncHtml: Uma classe que busca as páginas dos jogos de forma concorrente.
+"""
+
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Iterable, Optional, Tuple
+from dao.crawl_scheduler import CrawlScheduler
+
+STATUS_RETENTATIVA = {429, 500, 502, 503, 504}
+
+
+class HttpStatusError(Exception):
+    """
+    Exceção HttpStatusError: Indica uma resposta HTTP com código de status de erro.
+
+    Attributes:
+        status_code (int): Código de status HTTP recebido.
+        url (str): URL da requisição.
+    """
+
+    def __init__(self, status_code : int, url : str) -> None:
+        super().__init__(f"HTTP {status_code} em {url}")
+        self.status_code = status_code
+        self.url = url
+
+
+class DaoAsyncHtml:
+    """
+    Classe DaoAsyncHtml: Busca as páginas dos jogos de forma concorrente.
+
+    Attributes:
+        max_in_flight (int): Quantidade máxima de páginas sendo buscadas ao mesmo tempo.
+        rate_per_host (float): Quantidade máxima de requisições por segundo a um mesmo host.
+        max_retries (int): Quantidade máxima de novas tentativas em respostas 429/5xx.
+        backoff (float): Espera base, em segundos, antes de uma nova tentativa; dobra a cada tentativa.
+        scheduler (CrawlScheduler): Controle da concorrência, do ritmo por host e das filas de prioridade.
+
+    Methods:
+        crawl_tasks: Corrotina que busca as páginas de uma lista de pares (chave, url).
+        run_tasks: Executa `crawl_tasks` de forma bloqueante.
+    """
+
+    def __init__(self, max_in_flight : int = 8, rate_per_host : float = 10.0,
+                 max_retries : int = 3, backoff : float = 1.0, scheduler : Optional[CrawlScheduler] = None) -> None:
+        """
+        Construtor da classe DaoAsyncHtml.
+
+        Args:
+            max_in_flight (int): Quantidade máxima de páginas sendo buscadas ao mesmo tempo.
+            rate_per_host (float): Quantidade máxima de requisições por segundo a um mesmo host.
+                Com 0, não há limite.
+            max_retries (int): Quantidade máxima de novas tentativas em respostas 429/5xx.
+            backoff (float): Espera base, em segundos, antes de uma nova tentativa.
+            scheduler (Optional[CrawlScheduler]): Controle da concorrência. Por padrão, um limite fixo de
+                `max_in_flight` páginas e `rate_per_host` requisições por segundo.
+        """
+        self.max_in_flight = max(1, max_in_flight)
+        self.rate_per_host = rate_per_host
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.scheduler = scheduler or CrawlScheduler(self.max_in_flight, maximum=self.max_in_flight, adaptive=False,
+                                                     rate_per_host=rate_per_host)
+
+    async def _buscar(self, executor : ThreadPoolExecutor, fetch : Callable[[str], Any], url : str, lane : str,
+                      anomaly : Optional[Callable[[str, Any], bool]]) -> Any:
+        """
+        Busca uma URL, tentando novamente, com espera aleatória, em respostas 429/5xx.
+
+        A vaga de `scheduler` é devolvida durante a espera antes de uma nova tentativa, e a latência, o
+        código de status das respostas de erro e as anomalias de cada busca são repassados a ele.
+
+        Args:
+            executor (ThreadPoolExecutor): Threads onde a função bloqueante é executada.
+            fetch (Callable[[str], Any]): Função bloqueante que busca e processa a URL.
+            url (str): URL a ser buscada.
+            lane (str): Fila de prioridade da busca: 'list' ou 'game'.
+            anomaly (Optional[Callable[[str, Any], bool]]): Indica se o resultado de uma página é uma anomalia.
+
+        Returns:
+            Any: Resultado de `fetch(url)`.
+        """
+        loop = asyncio.get_running_loop()
+        tentativa = 0
+        while True:
+            async with self.scheduler.slot(url, lane) as vez:
+                inicio = time.monotonic()
+                try:
+                    resultado = await loop.run_in_executor(executor, fetch, url)
+                except HttpStatusError as erro:
+                    self.scheduler.record(vez, time.monotonic() - inicio, erro.status_code)
+                    if erro.status_code not in STATUS_RETENTATIVA or tentativa >= self.max_retries:
+                        raise
+                else:
+                    anomalia = bool(anomaly and anomaly(url, resultado))
+                    self.scheduler.record(vez, time.monotonic() - inicio, anomaly=anomalia)
+                    return resultado
+            espera = self.backoff * 2 ** tentativa
+            await asyncio.sleep(random.uniform(espera / 2, espera))
+            tentativa += 1
+
+    async def crawl_tasks(self, tasks : Iterable[Tuple[Hashable, str]], fetch : Callable[[str], Any],
+                          on_result : Callable[[Hashable, Any], None], lane : str = 'game',
+                          anomaly : Optional[Callable[[str, Any], bool]] = None):
+        """
+        Corrotina que busca as páginas de uma lista de pares (chave, url).
+
+        `on_result` é chamada assim que cada página termina, então os resultados já entregues não se
+        perdem se a busca for cancelada. Uma exceção ao buscar uma página é entregue como resultado
+        dela, sem interromper as demais.
+
+        Args:
+            tasks (Iterable[Tuple[Hashable, str]]): Pares (chave, url) a serem buscados.
+            fetch (Callable[[str], Any]): Função bloqueante que busca e processa uma URL.
+            on_result (Callable[[Hashable, Any], None]): Função chamada com a chave e o resultado de
+                cada página.
+            lane (str): Fila de prioridade das páginas em `scheduler`: 'list' (páginas BestOf) ou 'game'.
+            anomaly (Optional[Callable[[str, Any], bool]]): Função que recebe a URL e o resultado de uma
+                página e indica uma anomalia (por exemplo, o aviso de idade ou nenhum gênero), que reduz a
+                concorrência como uma resposta 429.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.scheduler.maximum)
+
+        async def tarefa(chave, url):
+            try:
+                resultado = await self._buscar(executor, fetch, url, lane, anomaly)
+            except asyncio.CancelledError:
+                raise
+            except Exception as erro: # pylint: disable=broad-exception-caught
+                resultado = erro
+            on_result(chave, resultado)
+
+        tarefas = [asyncio.create_task(tarefa(chave, url)) for chave, url in tasks]
+        try:
+            await asyncio.gather(*tarefas)
+        finally:
+            for pendente in tarefas:
+                pendente.cancel()
+            await asyncio.gather(*tarefas, return_exceptions=True)
+            # Espera as buscas em andamento (limitadas pelo tempo máximo de carregamento das páginas) para que
+            # os navegadores não sejam fechados enquanto ainda são usados pelas threads
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run_tasks(self, tasks : Iterable[Tuple[Hashable, str]], fetch : Callable[[str], Any],
+                  on_result : Callable[[Hashable, Any], None], lane : str = 'game',
+                  anomaly : Optional[Callable[[str, Any], bool]] = None):
+        """
+        Executa `crawl_tasks` de forma bloqueante.
+
+        Com Ctrl-C, as requisições pendentes são canceladas e KeyboardInterrupt é levantada depois que
+        os resultados já entregues foram repassados a `on_result` e as buscas em andamento terminaram.
+
+        Args:
+            tasks (Iterable[Tuple[Hashable, str]]): Pares (chave, url) a serem buscados.
+            fetch (Callable[[str], Any]): Função bloqueante que busca e processa uma URL.
+            on_result (Callable[[Hashable, Any], None]): Função chamada com a chave e o resultado de
+                cada página.
+            lane (str): Fila de prioridade das páginas: 'list' ou 'game'.
+            anomaly (Optional[Callable[[str, Any], bool]]): Função que indica se o resultado de uma página é
+                uma anomalia.
+        """
+        asyncio.run(self.crawl_tasks(tasks, fetch, on_result, lane, anomaly))
@@ -0,0 +1,346 @@
+"""
+Módulo dao_cache_html: Cache em disco das páginas HTML buscadas.
+
+Este módulo oferece a classe CacheHtml, que guarda o HTML de cada página compactado (gzip) em disco,
+endereçado pelo hash da URL normalizada e do idioma (parâmetro `l` da Steam, por exemplo
+`l=brazilian`). Cada entrada guarda o momento da busca, expira depois de um TTL configurável e as
+entradas menos usadas são removidas quando o cache passa do limite de bytes.
+
+Cada entrada também guarda o hash do conteúdo (`content_hash`) e, quando o servidor os envia, os
+cabeçalhos ETag e Last-Modified da resposta. Depois que a entrada expira, eles permitem uma requisição
+condicional (`validators`): se o servidor responder 304 (não modificada), a página guardada volta a valer
+(`revalidate`) sem ser baixada de novo, e o hash igual permite reaproveitar a análise anterior da página.
+
+No modo offline, o cache é a única fonte das páginas: as entradas não expiram e uma página ausente
+levanta CacheMissError, então a extração pode ser repetida e depurada sem acessar a Steam.
+
+Exemplo de uso:
+    >>> from dao.dao_cache_html import CacheHtml
+    >>> cache = CacheHtml("../arquivos/cache", ttl=86400, max_bytes=500 * 1024 ** 2)
+    >>> cache.put("https://store.steampowered.com/app/570/", "<html>...</html>")
+    >>> cache.get("https://store.steampowered.com/app/570/?snr=1_7")
+    '<html>...</html>'
+    >>> cache.validators("https://store.steampowered.com/app/570/")
+    {'hash': '5f2b...', 'etag': None, 'last_modified': None}
+    >>> cache.close()
+
+Funções:
+    content_hash: Retorna o hash do conteúdo de uma página.
+
+Classes:
+    CacheMissError: Exceção levantada no modo offline quando a página não está no cache.
+    CacheHtml: Uma classe que guarda em disco o HTML das páginas buscadas.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from metrics.metrics_etl import METRICS
+
+# Parâmetros que não mudam o conteúdo da página (rastreamento de navegação da Steam)
+PARAMETROS_IGNORADOS = {'snr'}
+# Intervalo mínimo, em segundos, entre duas gravações do índice durante a execução
+INTERVALO_GRAVACAO_INDICE = 5.0
+
+
+def content_hash(html : str) -> str:
+    """
+    Retorna o hash do conteúdo de uma página, usado para saber se ela mudou entre duas buscas.
+
+    Args:
+        html (str): HTML da página.
+
+    Returns:
+        str: Hash SHA-256 do HTML, em hexadecimal.
+    """
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+class CacheMissError(Exception):
+    """
+    Exceção CacheMissError: Indica que uma página não está no cache no modo offline.
+
+    Attributes:
+        url (str): URL da página procurada.
+    """
+
+    def __init__(self, url : str) -> None:
+        super().__init__(f"Página fora do cache (modo offline): {url}")
+        self.url = url
+
+
+class CacheHtml:
+    """
+    Classe CacheHtml: Guarda em disco o HTML das páginas buscadas.
+
+    Attributes:
+        path (str): Pasta do cache.
+        ttl (float): Tempo, em segundos, em que uma entrada é considerada válida. Com 0, não expira.
+        max_bytes (int): Tamanho máximo, em bytes, dos arquivos do cache.
+        offline (bool): Se True, as páginas são servidas apenas do cache.
+        default_locale (str): Idioma usado na chave quando a URL não tem o parâmetro `l`.
+        hits (int): Quantidade de páginas servidas pelo cache.
+        misses (int): Quantidade de páginas que não estavam no cache (ou tinham expirado).
+
+    Methods:
+        normalize_url: Normaliza uma URL para compor a chave do cache.
+        key: Retorna a chave (hash) de uma URL.
+        get: Retorna o HTML guardado para uma URL, se existir e não tiver expirado.
+        put: Guarda o HTML de uma URL.
+        validators: Retorna o hash, o ETag e o Last-Modified guardados para uma URL, mesmo expirada.
+        revalidate: Renova uma entrada expirada depois de uma resposta 304 e retorna o HTML guardado.
+        close: Grava o índice do cache em disco.
+    """
+
+    def __init__(self, path : str, ttl : float = 86400, max_bytes : int = 500 * 1024 ** 2,
+                 offline : bool = False, default_locale : str = "english") -> None:
+        """
+        Construtor da classe CacheHtml.
+
+        Args:
+            path (str): Pasta do cache. É criada se não existir.
+            ttl (float): Tempo, em segundos, em que uma entrada é considerada válida. Com 0, não expira.
+            max_bytes (int): Tamanho máximo, em bytes, dos arquivos do cache.
+            offline (bool): Se True, as páginas são servidas apenas do cache.
+            default_locale (str): Idioma usado na chave quando a URL não tem o parâmetro `l`.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.default_locale = default_locale
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._path_index = os.path.join(path, "index.json")
+        self._ultima_gravacao = 0.0
+        os.makedirs(path, exist_ok=True)
+        self._index = {}
+        if os.path.exists(self._path_index):
+            with open(self._path_index, 'r', encoding='utf-8') as arquivo:
+                self._index = json.load(arquivo)
+        # Soma dos tamanhos das entradas, mantida a cada inclusão e remoção para `_evict` não somar o índice
+        self._total_bytes = sum(entrada['size'] for entrada in self._index.values())
+
+    @staticmethod
+    def normalize_url(url : str) -> str:
+        """
+        Normaliza uma URL para compor a chave do cache.
+
+        O esquema e o host ficam em minúsculas, o fragmento e os parâmetros de rastreamento são
+        removidos e os demais parâmetros são ordenados.
+
+        Args:
+            url (str): URL a ser normalizada.
+
+        Returns:
+            str: URL normalizada.
+        """
+        partes = urlsplit(url)
+        parametros = sorted((nome, valor) for nome, valor in parse_qsl(partes.query, keep_blank_values=True)
+                            if nome not in PARAMETROS_IGNORADOS)
+        return urlunsplit((partes.scheme.lower(), partes.netloc.lower(), partes.path or '/',
+                           urlencode(parametros), ''))
+
+    def key(self, url : str, variant : str = "") -> str:
+        """
+        Retorna a chave (hash) de uma URL.
+
+        Args:
+            url (str): URL da página.
+            variant (str): Variação da página, por exemplo 'agecheck' para a página aberta depois do
+                aviso de idade.
+
+        Returns:
+            str: Hash SHA-256 da URL normalizada, do idioma e da variação.
+        """
+        locale = dict(parse_qsl(urlsplit(url).query)).get('l', self.default_locale)
+        texto = f"{self.normalize_url(url)}|{locale}|{variant}"
+        return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+    def _arquivo(self, chave : str) -> str:
+        """
+        Retorna o caminho do arquivo de uma entrada.
+
+        Args:
+            chave (str): Chave da entrada.
+
+        Returns:
+            str: Caminho do arquivo compactado.
+        """
+        return os.path.join(self.path, f"{chave}.html.gz")
+
+    @METRICS.timed('cache.get')
+    def get(self, url : str, variant : str = "") -> Optional[str]:
+        """
+        Retorna o HTML guardado para uma URL, se existir e não tiver expirado.
+
+        Args:
+            url (str): URL da página.
+            variant (str): Variação da página.
+
+        Returns:
+            Optional[str]: HTML guardado, ou None se a página não estiver no cache.
+
+        Raises:
+            CacheMissError: No modo offline, se a página não estiver no cache.
+        """
+        chave = self.key(url, variant)
+        with self._lock:
+            entrada = self._index.get(chave)
+            valida = entrada is not None and (
+                self.offline or not self.ttl or time.time() - entrada['fetched_at'] <= self.ttl)
+            if valida:
+                try:
+                    with gzip.open(self._arquivo(chave), 'rt', encoding='utf-8') as arquivo:
+                        html = arquivo.read()
+                except OSError:
+                    self._remove(chave)
+                    valida = False
+            if not valida:
+                self.misses += 1
+                if self.offline:
+                    raise CacheMissError(url)
+                return None
+            entrada['last_access'] = time.time()
+            self.hits += 1
+            return html
+
+    @METRICS.timed('cache.put')
+    def put(self, url : str, html : str, variant : str = "", etag : Optional[str] = None,
+            last_modified : Optional[str] = None) -> str:
+        """
+        Guarda o HTML de uma URL, removendo as entradas menos usadas se o limite de bytes for excedido.
+
+        Args:
+            url (str): URL da página.
+            html (str): HTML da página.
+            variant (str): Variação da página.
+            etag (Optional[str]): Cabeçalho ETag da resposta, se houver.
+            last_modified (Optional[str]): Cabeçalho Last-Modified da resposta, se houver.
+
+        Returns:
+            str: Hash do conteúdo da página (`content_hash`).
+        """
+        chave = self.key(url, variant)
+        hash_conteudo = content_hash(html)
+        dados = gzip.compress(html.encode('utf-8'))
+        arquivo_temporario = f"{self._arquivo(chave)}.{threading.get_ident()}.tmp"
+        with open(arquivo_temporario, 'wb') as arquivo:
+            arquivo.write(dados)
+        os.replace(arquivo_temporario, self._arquivo(chave))
+        agora = time.time()
+        with self._lock:
+            self._remove(chave)
+            self._total_bytes += len(dados)
+            self._index[chave] = {
+                "url": url,
+                "variant": variant,
+                "fetched_at": agora,
+                "last_access": agora,
+                "size": len(dados),
+                "hash": hash_conteudo,
+                "etag": etag,
+                "last_modified": last_modified,
+            }
+            self._evict()
+            if agora - self._ultima_gravacao >= INTERVALO_GRAVACAO_INDICE:
+                self._save_index()
+        return hash_conteudo
+
+    def validators(self, url : str, variant : str = "") -> Optional[Dict[str, Optional[str]]]:
+        """
+        Retorna o hash, o ETag e o Last-Modified guardados para uma URL, mesmo que a entrada tenha expirado,
+        para uma requisição condicional.
+
+        Args:
+            url (str): URL da página.
+            variant (str): Variação da página.
+
+        Returns:
+            Optional[Dict[str, Optional[str]]]: {'hash': hash, 'etag': ETag, 'last_modified': Last-Modified},
+                com None nos cabeçalhos que o servidor não enviou (e no hash das entradas antigas), ou None
+                se a página não estiver no cache.
+        """
+        with self._lock:
+            entrada = self._index.get(self.key(url, variant))
+            if entrada is None:
+                return None
+            return {campo: entrada.get(campo) for campo in ("hash", "etag", "last_modified")}
+
+    def revalidate(self, url : str, variant : str = "") -> Optional[str]:
+        """
+        Renova uma entrada expirada depois que o servidor respondeu 304 (não modificada) a uma requisição
+        condicional, e retorna o HTML guardado.
+
+        Args:
+            url (str): URL da página.
+            variant (str): Variação da página.
+
+        Returns:
+            Optional[str]: HTML guardado, ou None se a entrada não existir mais.
+        """
+        chave = self.key(url, variant)
+        with self._lock:
+            entrada = self._index.get(chave)
+            if entrada is None:
+                return None
+            try:
+                with gzip.open(self._arquivo(chave), 'rt', encoding='utf-8') as arquivo:
+                    html = arquivo.read()
+            except OSError:
+                self._remove(chave)
+                return None
+            entrada['fetched_at'] = entrada['last_access'] = time.time()
+            entrada.setdefault('hash', content_hash(html))
+            self.hits += 1
+            return html
+
+    def _evict(self):
+        """
+        Remove as entradas usadas há mais tempo até o cache caber em `max_bytes`. As entradas só são
+        ordenadas quando o total passa do limite.
+        """
+        if self._total_bytes <= self.max_bytes:
+            return
+        for chave, _ in sorted(self._index.items(), key=lambda item: item[1]['last_access']):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(self._arquivo(chave))
+            except FileNotFoundError:
+                pass
+            self._remove(chave)
+
+    def _remove(self, chave : str):
+        """
+        Remove uma entrada do índice, se existir, e desconta o seu tamanho do total do cache.
+
+        Args:
+            chave (str): Chave da entrada.
+        """
+        entrada = self._index.pop(chave, None)
+        if entrada is not None:
+            self._total_bytes -= entrada['size']
+
+    def _save_index(self):
+        """
+        Grava o índice do cache em disco, substituindo o arquivo anterior de uma só vez.
+        """
+        arquivo_temporario = f"{self._path_index}.tmp"
+        with open(arquivo_temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(self._index, arquivo)
+        os.replace(arquivo_temporario, self._path_index)
+        self._ultima_gravacao = time.time()
+
+    def close(self):
+        """
+        Grava o índice do cache em disco, com os horários de último acesso atualizados.
+        """
+        with self._lock:
+            self._save_index()
@@ -9,21 +9,33 @@ Exemplo de uso:
     >>> dao_get_html = DaoGetHtml()
     >>> response = dao_get_html.get_html("https://example.com")
     >>> print(response)
-    {'content_html': '<html>...</html>'}
+    {'content_html': '<html>...</html>', 'content_hash': '9c1e...'}
 
 Classes:
     DaoGetHtml: Uma classe que oferece uma interface para realizar requisições web.
 """
 
-import time
-from typing import Dict
+from typing import Dict, Iterable, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException, WebDriverException
+from urllib3.exceptions import HTTPError
+from dao.age_gate import AgeGate
+from dao.browser_profile import BrowserProfile
+from dao.browser_watchdog import BrowserWatchdog
+from dao.dao_cache_html import CacheHtml, content_hash
+from dao.driver_resolver import DriverResolver
+from dao.page_readiness import PageReadiness
+from metrics.metrics_etl import METRICS
 
+# Troca a aba de uma página BestOf no próprio navegador: muda a URL e avisa a página, como o botão voltar
+SCRIPT_TROCAR_ABA = """
+history.pushState(history.state, '', arguments[0]);
+window.dispatchEvent(new PopStateEvent('popstate', {state: history.state}));
+"""
 
 
 class DaoGetHtml:
@@ -33,28 +45,104 @@ class DaoGetHtml:
     
     Attributes:
         navegador (WebDriver): Instância do WebDriver do Selenium para interagir com o navegador.
+            O navegador só é aberto no primeiro acesso a este atributo.
+        cache (CacheHtml): Cache em disco das páginas, ou None para sempre usar o navegador.
+        readiness (PageReadiness): Espera cada página aberta ficar pronta para a extração.
+        resolver (DriverResolver): Localiza o chromedriver sem acessar a rede a cada execução.
+        profile (BrowserProfile): Opções do navegador e bloqueio dos recursos que a extração não usa.
+        watchdog (BrowserWatchdog): Tempos máximos do navegador e quando reciclá-lo.
     
     Methods:
         get_html: Realiza uma requisição HTTP GET para a URL fornecida e retorna o conteúdo HTML.
+        tab_page: Retorna a URL de uma página BestOf sem o parâmetro da aba.
+        get_html_tabs: Obtém o HTML de várias abas de uma mesma página BestOf, abrindo a página uma única vez.
+        switch_tab: Troca a aba da página BestOf aberta no navegador, sem abrir a página de novo.
+        open_page: Abre a URL no navegador e espera o conteúdo da página carregar.
+        page_source: Retorna o HTML da página aberta no navegador.
         go_page_of_game_when_warning_age: Navega para a página do jogo quando há um aviso de idade.
-        scroll_page: Rola a página até o final para garantir o carregamento completo do conteúdo.
+        restart_navegador: Fecha o navegador, que é reaberto no próximo uso.
         quit_navegador: Fecha o navegador e encerra a instância do WebDriver.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, cache : Optional[CacheHtml] = None, readiness : Optional[PageReadiness] = None,
+                 resolver : Optional[DriverResolver] = None, profile : Optional[BrowserProfile] = None,
+                 watchdog : Optional[BrowserWatchdog] = None) -> None:
         """
         Construtor da classe HttpRequester.
         
+        O WebDriver do Selenium só é criado quando o navegador é usado pela primeira vez.
+
+        Args:
+            cache (CacheHtml): Cache em disco consultado antes de abrir cada página.
+            readiness (PageReadiness): Espera das páginas, que pode ser compartilhada entre sessões para
+                somar as estatísticas. Por padrão, uma nova instância.
+            resolver (DriverResolver): Localiza o chromedriver, compartilhado entre sessões para resolvê-lo
+                uma única vez. Por padrão, uma nova instância, sem caminho guardado.
+            profile (BrowserProfile): Perfil do navegador, com os cookies de verificação de idade. Por padrão,
+                o modo enxuto, com um perfil temporário do Chrome.
+            watchdog (BrowserWatchdog): Tempos máximos do navegador e quando reciclá-lo. Por padrão, o tempo
+                máximo dos scripts acompanha o tempo máximo de espera das páginas.
+        """
+        self._navegador = None
+        self.cache = cache
+        self.readiness = readiness or PageReadiness()
+        self.resolver = resolver or DriverResolver()
+        self.profile = profile or BrowserProfile()
+        # O script que espera os cartões de jogos pode levar até o tempo máximo de espera da página
+        self.watchdog = watchdog or BrowserWatchdog(script_timeout=self.readiness.timeout + 5)
+        self._paginas = 0 # Páginas abertas pelo navegador atual, para reciclá-lo
+        self._pasta_perfil = None # Pasta do perfil do Chrome desta sessão, reservada ao abrir o navegador
+        self._ultima_url = None # Última URL pedida em get_html
+        self._url_aberta = None # URL aberta de fato no navegador
+
+    @property
+    def navegador(self) -> webdriver.Chrome:
+        """
+        Instância do WebDriver do Selenium, criada no primeiro acesso.
+
+        Returns:
+            webdriver.Chrome: Navegador aberto por esta sessão.
+        """
+        if self._navegador is None:
+            self._navegador = self.open_navegador()
+        return self._navegador
+
+    def open_navegador(self) -> webdriver.Chrome:
+        """
         Inicializa o WebDriver do Selenium e abre o navegador.
+
+        O chromedriver é localizado por `resolver`, sem acessar a rede quando o caminho já é conhecido. Se
+        o chromedriver guardado não funcionar com o Chrome instalado, ele é resolvido novamente com o
+        ChromeDriverManager. As opções do navegador e os recursos bloqueados vêm de `profile`.
+
+        Returns:
+            webdriver.Chrome: Navegador aberto.
         """
         # Criar navegador
-        servico = Service(ChromeDriverManager().install())
+        with METRICS.timer('navegador.driver_resolve'):
+            caminho = self.resolver.resolve()
         ## Configurar as opções do Chrome para executar em segundo plano
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
+        if self._pasta_perfil is None:
+            self._pasta_perfil = self.profile.claim_dir()
+        chrome_options = self.profile.options(self._pasta_perfil)
         #navegador = webdriver.Chrome(service=servico, options=chrome_options) # Deixar invisivel
         #navegador = webdriver.Chrome(service=servico)  # Deixar visivel
-        self.navegador = webdriver.Chrome(service=servico, options=chrome_options)
+        try:
+            with METRICS.timer('navegador.start'):
+                navegador = webdriver.Chrome(service=Service(caminho), options=chrome_options)
+        except SessionNotCreatedException:
+            if self.resolver.source in ('manager', 'pinned'):
+                raise
+            # Chromedriver guardado incompatível com o Chrome instalado
+            self.resolver.invalidate()
+            with METRICS.timer('navegador.driver_resolve'):
+                caminho = self.resolver.resolve()
+            navegador = webdriver.Chrome(service=Service(caminho), options=chrome_options)
+        self.profile.apply(navegador)
+        METRICS.mark_once('startup.first_browser')
+        self.watchdog.configure(navegador)
+        self._paginas = 0
+        return navegador
 
     def get_html(self, url : str) -> Dict[int, str]:
         """
@@ -64,24 +152,162 @@ class DaoGetHtml:
             url (str): A URL da página da qual se deseja obter o conteúdo HTML.
 
         Returns:
-            Dict: Um dicionário contendo o conteúdo HTML.
+            Dict: Um dicionário contendo o conteúdo HTML e o hash do conteúdo.
                 Exemplo:
                 {
                     "content_html": "<html>...</html>",
+                    "content_hash": "9c1e...",
                 }
         """
-        self.navegador.get(url) # Abra a página desejada
-        time.sleep(0.2) # Esperar pagina carregar
-        self.scroll_page() # Scroll até o final da página
-        time.sleep(0.5)
-        html_content = self.navegador.page_source
+        self._ultima_url = url
+        if self.cache:
+            html_content = self.cache.get(url)
+            if html_content is not None:
+                return {
+                    "content_html": html_content,
+                    "content_hash": content_hash(html_content)
+                }
+        self.open_page(url)
+        html_content = self.page_source()
+        METRICS.mark_once('startup.first_fetch')
+        hash_conteudo = self.cache.put(url, html_content) if self.cache else content_hash(html_content)
         return {
-            "content_html": html_content
+            "content_html": html_content,
+            "content_hash": hash_conteudo
         }
 
+    @staticmethod
+    def tab_page(url : str) -> str:
+        """
+        Retorna a URL de uma página BestOf sem o parâmetro da aba (`tab`). As abas de uma mesma página têm
+        a mesma URL sem a aba.
+
+        Args:
+            url (str): URL de uma aba, por exemplo 'https://store.steampowered.com/sale/BestOf2023?l=brazilian&tab=1'.
+
+        Returns:
+            str: URL sem a aba, por exemplo 'https://store.steampowered.com/sale/BestOf2023?l=brazilian'.
+        """
+        partes = urlsplit(url)
+        query = urlencode([(chave, valor) for chave, valor in parse_qsl(partes.query) if chave != 'tab'])
+        return partes._replace(query=query, fragment='').geturl()
+
+    def get_html_tabs(self, urls : Iterable[str]) -> Iterator[Dict[str, str]]:
+        """
+        Obtém o HTML de várias abas de uma mesma página BestOf, abrindo a página uma única vez.
+
+        A primeira aba que não está no cache é aberta por completo; as demais são trocadas no próprio
+        navegador (`switch_tab`). Se a troca não funcionar, a aba é aberta por completo.
+
+        Args:
+            urls (Iterable[str]): URLs das abas, todas com a mesma `tab_page`.
+
+        Returns:
+            Iterator[Dict[str, str]]: O conteúdo de cada aba, na ordem das URLs, no formato de `get_html`.
+                Cada aba é devolvida assim que é obtida.
+        """
+        aberta = False
+        for url in urls:
+            self._ultima_url = url
+            html_content = self.cache.get(url) if self.cache else None
+            if html_content is None:
+                if not (aberta and self.switch_tab(url)):
+                    self.open_page(url)
+                aberta = True
+                html_content = self.page_source()
+                METRICS.mark_once('startup.first_fetch')
+                hash_conteudo = self.cache.put(url, html_content) if self.cache else content_hash(html_content)
+            else:
+                hash_conteudo = content_hash(html_content)
+            yield {
+                "content_html": html_content,
+                "content_hash": hash_conteudo
+            }
+
+    def switch_tab(self, url : str) -> bool:
+        """
+        Troca a aba da página BestOf aberta no navegador, sem abrir a página de novo, e espera os jogos
+        da nova aba carregarem.
+
+        Args:
+            url (str): URL da nova aba, da mesma página BestOf aberta.
+
+        Returns:
+            bool: True se a nova aba foi exibida; False se a página não trocou de aba.
+        """
+        anterior = self.readiness.signature(self.navegador)
+        with METRICS.timer('navegador.tab_switch'):
+            self.navegador.execute_script(SCRIPT_TROCAR_ABA, url)
+            trocou = self.readiness.wait_tab(self.navegador, anterior)
+        if trocou:
+            self._url_aberta = url
+        METRICS.count('navegador.tab_switches' if trocou else 'navegador.tab_switch_failures')
+        return trocou
+
+    def open_page(self, url : str):
+        """
+        Abre a URL no navegador e espera o conteúdo da página carregar. As URLs do aviso de idade de um
+        jogo são abertas diretamente na página do jogo, já que os cookies de verificação de idade foram
+        gravados ao abrir o navegador.
+
+        Antes de abrir a página, o navegador é reciclado se passou do limite de páginas ou de memória de
+        `watchdog`. Se o carregamento passar do tempo máximo ou o navegador cair, o navegador é encerrado à
+        força e a página é pedida de novo em um navegador novo, até `watchdog.retries` vezes.
+
+        Args:
+            url (str): A URL da página a ser aberta.
+
+        Raises:
+            TimeoutException: Se o carregamento passou do tempo máximo em todas as tentativas.
+            WebDriverException: Se o navegador caiu em todas as tentativas, ou em outros erros do WebDriver.
+        """
+        if self._navegador is not None and self.watchdog.should_recycle(self._navegador, self._paginas):
+            self.restart_navegador()
+        tentativa = 0
+        while True:
+            try:
+                with METRICS.timer('navegador.page_load'):
+                    self.navegador.get(AgeGate.content_url(url)) # Abra a página desejada
+                break
+            except (WebDriverException, HTTPError) as erro:
+                if isinstance(erro, TimeoutException):
+                    METRICS.count('navegador.timeouts')
+                elif self.watchdog.is_crash(erro):
+                    METRICS.count('navegador.crashes')
+                else:
+                    raise
+                if tentativa >= self.watchdog.retries:
+                    raise
+                tentativa += 1
+                # Página travada ou navegador caído: encerrar e pedir a página de novo em um navegador novo
+                self.restart_navegador(forcar=True)
+        self._paginas += 1
+        self._url_aberta = url
+        METRICS.count('navegador.pages')
+        with METRICS.timer('navegador.ready_wait'):
+            self.readiness.wait(self.navegador, url) # Esperar o conteúdo da pagina carregar
+
+    def page_source(self) -> str:
+        """
+        Retorna o HTML da página aberta no navegador e soma o seu tamanho aos bytes obtidos pelo navegador,
+        junto com os bytes transferidos pela rede para carregá-la.
+
+        Returns:
+            str: HTML da página aberta.
+        """
+        html_content = self.navegador.page_source
+        METRICS.count('navegador.bytes', len(html_content.encode('utf-8')))
+        self.profile.record_transfer(self.navegador)
+        return html_content
+
     def go_page_of_game_when_warning_age(self):
         """
         Navega para a página do jogo quando há um aviso de idade.
+
+        Usa a página pedida na última chamada de get_html. Se ela veio do cache, o navegador abre a
+        página antes de responder ao aviso de idade. Com os cookies de verificação de idade gravados ao
+        abrir o navegador, o aviso não deve aparecer; este caminho lento, que preenche o formulário, fica
+        apenas como alternativa e é contado em 'navegador.agecheck_slow_path'.
         
         Returns:
             Returns:
@@ -91,6 +317,16 @@ class DaoGetHtml:
                     "content_html": "<html>...</html>",
                 }
         """
+        METRICS.count('navegador.agecheck')
+        if self.cache:
+            html_content = self.cache.get(self._ultima_url, "agecheck")
+            if html_content is not None:
+                return {
+                    "content_html": html_content
+                }
+        METRICS.count('navegador.agecheck_slow_path')
+        if self._url_aberta != self._ultima_url:
+            self.open_page(self._ultima_url)
         # Encontrar o elemento select
         xpath_element = '/html/body/div[1]/div[7]/div[6]/div/div[2]/div/div[1]/div[2]/select[3]'
         select_element = self.navegador.find_element(By.XPATH ,xpath_element)
@@ -99,33 +335,40 @@ class DaoGetHtml:
         # Clicar no botão para ir para a poagina do jogo
         select_button = self.navegador.find_element(By.XPATH ,'//*[@id="view_product_page_btn"]')
         select_button.click()
-        time.sleep(0.2)
-        self.scroll_page()
-        html_content = self.navegador.page_source
-        time.sleep(0.5)
+        self._url_aberta = None
+        with METRICS.timer('navegador.agecheck_wait'):
+            self.readiness.wait(self.navegador, self._ultima_url, 'game_agecheck')
+        html_content = self.page_source()
+        if self.cache:
+            self.cache.put(self._ultima_url, html_content, "agecheck")
         return {
             "content_html": html_content
         }
 
-    def scroll_page(self):
+    def restart_navegador(self, forcar : bool = False):
         """
-        Rola a página até o final para garantir o carregamento completo do conteúdo.
+        Fecha o navegador, que é reaberto no próximo uso, e soma o reinício às medições.
+
+        Args:
+            forcar (bool): Se a árvore de processos do navegador é encerrada à força antes, porque o
+                navegador pode estar travado.
         """
-        intervalo = 0.1  # Intervalo de 0.2 segundo entre cada rolagem
-        incremento = 500  # Quantidade de pixels a rolar a cada vez
-        posicao_anterior = -1 # Defina a posição inicial da barra de rolagem
-        while True:
-            # Execute o script JavaScript para rolar a página em incrementos de 500 pixels
-            self.navegador.execute_script(f"window.scrollBy(0, {incremento});")
-            time.sleep(intervalo)
-            # Obtenha a posição atual da barra de rolagem
-            posicao_atual = self.navegador.execute_script("return window.scrollY")
-            if posicao_atual == posicao_anterior:
-                break
-            posicao_anterior = posicao_atual
+        navegador, self._navegador = self._navegador, None
+        self._url_aberta = None
+        if navegador is None:
+            return
+        if forcar:
+            self.watchdog.kill(navegador)
+        try:
+            navegador.quit()
+        except (WebDriverException, HTTPError, ConnectionError):
+            pass # O navegador já foi encerrado
+        METRICS.count('navegador.restarts')
 
     def quit_navegador(self):
         """
-        Fecha o navegador e encerra a instância do WebDriver.
+        Fecha o navegador e encerra a instância do WebDriver, se ele chegou a ser aberto.
         """
-        self.navegador.quit()
+        if self._navegador is not None:
+            self._navegador.quit()
+            self._navegador = None
@@ -0,0 +1,150 @@
+"""
+Módulo dao_pool_html: Um conjunto de sessões do navegador para buscar várias páginas em paralelo.
+
+Este módulo oferece a classe DaoPoolHtml, que mantém N instâncias de DaoGetHtml, cada uma usada por
+uma única thread de trabalho, alimentadas por uma fila de tamanho limitado.
+
+Exemplo de uso:
+    >>> from dao.dao_pool_html import DaoPoolHtml
+    >>> pool = DaoPoolHtml(pool_size=4)
+    >>> tarefas = [("jogo 1", "https://example.com/1"), ("jogo 2", "https://example.com/2")]
+    >>> for chave, resultado in pool.map_tasks(tarefas, lambda dao, url: dao.get_html(url)):
+    ...     print(chave, resultado)
+    >>> pool.quit_navegadores()
+
+Classes:
+    DaoPoolHtml: Uma classe que distribui requisições entre várias sessões do navegador.
+"""
+
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Tuple
+from dao.dao_cache_html import CacheHtml
+from dao.browser_profile import BrowserProfile
+from dao.browser_watchdog import BrowserWatchdog
+from dao.dao_get_html import DaoGetHtml
+from dao.driver_resolver import DriverResolver
+from dao.page_readiness import PageReadiness
+
+
+class DaoPoolHtml:
+    """
+    Classe DaoPoolHtml: Distribui requisições entre várias sessões do navegador.
+
+    Cada sessão (DaoGetHtml) pertence a uma única thread de trabalho, então os passos que dependem
+    da página aberta no navegador (como o aviso de idade) continuam na mesma sessão.
+
+    Attributes:
+        pool_size (int): Quantidade de sessões do navegador.
+        queue_size (int): Tamanho máximo da fila de tarefas pendentes.
+        sessions (List[DaoGetHtml]): Sessões do navegador, uma por thread de trabalho.
+        readiness (PageReadiness): Espera das páginas compartilhada pelas sessões.
+
+    Methods:
+        session: Empresta uma sessão livre do navegador, esperando se todas estiverem em uso.
+        map_tasks: Executa as tarefas nas sessões do navegador e devolve os resultados conforme terminam.
+        quit_navegadores: Fecha todas as sessões do navegador.
+    """
+
+    def __init__(self, pool_size : int = 1, queue_size : int = None, cache : CacheHtml = None,
+                 readiness : PageReadiness = None, resolver : DriverResolver = None,
+                 profile : BrowserProfile = None, watchdog : BrowserWatchdog = None) -> None:
+        """
+        Construtor da classe DaoPoolHtml.
+
+        Args:
+            pool_size (int): Quantidade de sessões do navegador a serem abertas.
+            queue_size (int): Tamanho máximo da fila de tarefas. Por padrão, o dobro de `pool_size`.
+            cache (CacheHtml): Cache em disco compartilhado pelas sessões, ou None.
+            readiness (PageReadiness): Espera das páginas compartilhada pelas sessões.
+            resolver (DriverResolver): Localiza o chromedriver uma única vez para todas as sessões.
+            profile (BrowserProfile): Perfil do navegador usado por todas as sessões, cada uma com a sua
+                pasta de perfil do Chrome.
+            watchdog (BrowserWatchdog): Tempos máximos e reciclagem do navegador de todas as sessões.
+        """
+        self.pool_size = max(1, pool_size)
+        self.queue_size = queue_size or self.pool_size * 2
+        self.readiness = readiness or PageReadiness()
+        resolver = resolver or DriverResolver()
+        self.sessions = [DaoGetHtml(cache, self.readiness, resolver, profile, watchdog) for _ in range(self.pool_size)]
+        self._livres = queue.Queue()
+        for session in self.sessions:
+            self._livres.put(session)
+
+    @contextmanager
+    def session(self) -> Iterator[DaoGetHtml]:
+        """
+        Empresta uma sessão livre do navegador, esperando se todas estiverem em uso.
+
+        A sessão fica exclusiva de quem a pegou até o fim do bloco `with`.
+
+        Returns:
+            Iterator[DaoGetHtml]: Sessão do navegador emprestada.
+        """
+        session = self._livres.get()
+        try:
+            yield session
+        finally:
+            self._livres.put(session)
+
+    def map_tasks(self, tasks : Iterable[Tuple[Any, str]],
+                  handler : Callable[[DaoGetHtml, str], Any]) -> Iterator[Tuple[Any, Any]]:
+        """
+        Executa as tarefas nas sessões do navegador e devolve os resultados conforme terminam.
+
+        As tarefas são colocadas em uma fila limitada por uma thread alimentadora, então a fila nunca
+        guarda mais do que `queue_size` tarefas pendentes. Uma exceção levantada por `handler` não
+        interrompe as demais tarefas: ela é devolvida como resultado da tarefa correspondente.
+
+        Args:
+            tasks (Iterable[Tuple[Any, str]]): Pares (chave, url) a serem processados.
+            handler (Callable[[DaoGetHtml, str], Any]): Função chamada com a sessão e a URL da tarefa.
+
+        Returns:
+            Iterator[Tuple[Any, Any]]: Pares (chave, resultado), na ordem em que as tarefas terminam.
+        """
+        fim = object()
+        fila_tarefas = queue.Queue(maxsize=self.queue_size)
+        fila_resultados = queue.Queue()
+
+        def alimentar():
+            for task in tasks:
+                fila_tarefas.put(task)
+            for _ in self.sessions:
+                fila_tarefas.put(fim)
+
+        def trabalhar():
+            with self.session() as session:
+                while True:
+                    task = fila_tarefas.get()
+                    if task is fim:
+                        fila_resultados.put(fim)
+                        return
+                    chave, url = task
+                    try:
+                        resultado = handler(session, url)
+                    except Exception as erro: # pylint: disable=broad-exception-caught
+                        resultado = erro
+                    fila_resultados.put((chave, resultado))
+
+        threads = [threading.Thread(target=alimentar, daemon=True)]
+        threads += [threading.Thread(target=trabalhar, daemon=True) for _ in self.sessions]
+        for thread in threads:
+            thread.start()
+        trabalhadores_ativos = len(self.sessions)
+        while trabalhadores_ativos:
+            item = fila_resultados.get()
+            if item is fim:
+                trabalhadores_ativos -= 1
+                continue
+            yield item
+        for thread in threads:
+            thread.join()
+
+    def quit_navegadores(self):
+        """
+        Fecha todas as sessões do navegador.
+        """
+        for session in self.sessions:
+            session.quit_navegador()
@@ -0,0 +1,170 @@
+"""
+Módulo dao_requests_html: Requisições HTTP leves, sem navegador, para as páginas estáticas da Steam.
+
+As páginas dos jogos trazem o bloco de gêneros no HTML renderizado pelo servidor, então não precisam
+do Selenium. Este módulo oferece a classe DaoRequestsHtml, com a mesma interface de DaoGetHtml.get_html,
+usando uma `requests.Session` por thread, com conexões reaproveitadas (keep-alive) e os cookies de
+verificação de idade da Steam já definidos.
+
+Com o cache, uma página expirada é pedida com uma requisição condicional (`If-None-Match` e
+`If-Modified-Since`, a partir do ETag e do Last-Modified guardados); se o servidor responder 304, a
+página guardada é usada sem ser baixada de novo. Cada resposta traz o hash do conteúdo (`content_hash`),
+que permite reaproveitar a análise das páginas que não mudaram.
+
+Exemplo de uso:
+    >>> from dao.dao_requests_html import DaoRequestsHtml
+    >>> dao_requests_html = DaoRequestsHtml()
+    >>> response = dao_requests_html.get_html("https://store.steampowered.com/app/730/")
+    >>> print(response)
+    {'content_html': '<html>...</html>', 'status_code': 200, 'content_hash': '9c1e...'}
+
+Classes:
+    DaoRequestsHtml: Uma classe que realiza requisições HTTP sem abrir um navegador.
+"""
+
+import threading
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from dao.age_gate import AgeGate
+from dao.dao_cache_html import CacheHtml, content_hash
+from metrics.metrics_etl import METRICS
+
+
+class DaoRequestsHtml:
+    """
+    Classe DaoRequestsHtml: Realiza requisições HTTP sem abrir um navegador.
+
+    Cada thread usa a sua própria `requests.Session`, que mantém as conexões abertas entre as
+    requisições e já envia os cookies de verificação de idade.
+
+    Attributes:
+        timeout (float): Tempo máximo, em segundos, de cada requisição.
+        pool_maxsize (int): Quantidade máxima de conexões mantidas abertas por host em cada sessão.
+        cache (CacheHtml): Cache em disco consultado antes de cada requisição, ou None.
+        age_gate (AgeGate): Cookies de verificação de idade gravados em cada sessão.
+
+    Methods:
+        get_html: Realiza uma requisição HTTP GET para a URL fornecida e retorna o conteúdo HTML.
+        quit_sessions: Fecha as sessões HTTP abertas.
+    """
+
+    def __init__(self, timeout : float = 10.0, pool_maxsize : int = 10,
+                 cache : Optional[CacheHtml] = None, age_gate : Optional[AgeGate] = None) -> None:
+        """
+        Construtor da classe DaoRequestsHtml.
+
+        Args:
+            timeout (float): Tempo máximo, em segundos, de cada requisição.
+            pool_maxsize (int): Quantidade máxima de conexões mantidas abertas por host em cada sessão.
+            cache (CacheHtml): Cache em disco consultado antes de cada requisição. Apenas respostas com
+                status 200 são guardadas.
+            age_gate (AgeGate): Cookies de verificação de idade. Por padrão, os da loja da Steam.
+        """
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.cache = cache
+        self.age_gate = age_gate or AgeGate()
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        """
+        Retorna a sessão HTTP da thread atual, criando-a na primeira chamada.
+
+        Returns:
+            requests.Session: Sessão HTTP da thread atual.
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers['Accept-Language'] = 'en-US,en;q=0.9'
+            self.age_gate.apply_session(session)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def get_html(self, url : str) -> Dict[str, str]:
+        """
+        Realiza uma requisição HTTP GET para a URL fornecida e retorna o conteúdo HTML.
+
+        Args:
+            url (str): A URL da página da qual se deseja obter o conteúdo HTML.
+
+        Returns:
+            Dict: Um dicionário contendo o conteúdo HTML, o código de status HTTP e o hash do conteúdo.
+                Uma página revalidada com 304 é devolvida com o status 200.
+                Exemplo:
+                {
+                    "content_html": "<html>...</html>",
+                    "status_code": 200,
+                    "content_hash": "9c1e...",
+                }
+        """
+        cabecalhos = {}
+        if self.cache:
+            html_content = self.cache.get(url)
+            if html_content is not None:
+                return {
+                    "content_html": html_content,
+                    "status_code": 200,
+                    "content_hash": content_hash(html_content)
+                }
+            validadores = self.cache.validators(url) or {}
+            if validadores.get('etag'):
+                cabecalhos['If-None-Match'] = validadores['etag']
+            if validadores.get('last_modified'):
+                cabecalhos['If-Modified-Since'] = validadores['last_modified']
+        response = self._get(url, cabecalhos)
+        if response.status_code == 304:
+            html_content = self.cache.revalidate(url) if self.cache else None
+            if html_content is not None:
+                METRICS.count('http.not_modified')
+                return {
+                    "content_html": html_content,
+                    "status_code": 200,
+                    "content_hash": content_hash(html_content)
+                }
+            response = self._get(url, {}) # A entrada sumiu do cache: a página é baixada por completo
+        if self.cache and response.status_code == 200:
+            hash_conteudo = self.cache.put(url, response.text, etag=response.headers.get('ETag'),
+                                           last_modified=response.headers.get('Last-Modified'))
+        else:
+            hash_conteudo = content_hash(response.text)
+        return {
+            "content_html": response.text,
+            "status_code": response.status_code,
+            "content_hash": hash_conteudo
+        }
+
+    def _get(self, url : str, cabecalhos : Dict[str, str]) -> requests.Response:
+        """
+        Realiza a requisição HTTP GET e registra as medições.
+
+        Args:
+            url (str): URL da página.
+            cabecalhos (Dict[str, str]): Cabeçalhos extras, como os da requisição condicional.
+
+        Returns:
+            requests.Response: Resposta do servidor.
+        """
+        with METRICS.timer('http.get'):
+            response = self._session().get(AgeGate.content_url(url), timeout=self.timeout, headers=cabecalhos)
+        METRICS.count('http.requests')
+        METRICS.mark_once('startup.first_fetch')
+        METRICS.count('http.bytes', len(response.content))
+        return response
+
+    def quit_sessions(self):
+        """
+        Fecha as sessões HTTP abertas.
+        """
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
@@ -0,0 +1,137 @@
+"""
+Módulo driver_resolver: Localiza o chromedriver sem acessar a rede a cada execução.
+
+`ChromeDriverManager().install()` consulta a internet para descobrir e conferir a versão do chromedriver
+toda vez que é chamado. Este módulo oferece a classe DriverResolver, que procura o chromedriver, nesta
+ordem, em:
+    1. um caminho fixo configurado (`ETL_CHROMEDRIVER`);
+    2. o caminho resolvido em uma execução anterior, guardado em um arquivo JSON (`ETL_CHROMEDRIVER_CACHE`);
+    3. o `PATH` do sistema;
+e só usa o ChromeDriverManager (com acesso à rede) quando nenhum deles existe, guardando o caminho
+encontrado para as próximas execuções. Se o chromedriver guardado não funcionar com o Chrome instalado
+(por exemplo, depois de uma atualização do Chrome), `invalidate` descarta o caminho guardado e o
+próximo `resolve` usa o ChromeDriverManager novamente.
+
+O caminho é resolvido uma única vez por processo e compartilhado pelas sessões do navegador.
+
+Exemplo de uso:
+    >>> from dao.driver_resolver import DriverResolver
+    >>> resolver = DriverResolver(cache_path="../arquivos/chromedriver.json")
+    >>> resolver.resolve()
+    '/home/usuario/.wdm/drivers/chromedriver/linux64/120.0.6099.109/chromedriver'
+
+Classes:
+    DriverResolver: Uma classe que localiza o chromedriver, guardando o caminho entre as execuções.
+"""
+
+import json
+import os
+import shutil
+import threading
+from typing import Optional, Tuple
+
+
+class DriverResolver:
+    """
+    Classe DriverResolver: Localiza o chromedriver, guardando o caminho entre as execuções.
+
+    Attributes:
+        pinned_path (str): Caminho fixo do chromedriver, ou vazio.
+        cache_path (str): Arquivo JSON em que o caminho resolvido é guardado, ou vazio para não guardar.
+        source (str): De onde veio o último caminho resolvido: 'pinned', 'cache', 'path' ou 'manager'.
+
+    Methods:
+        resolve: Retorna o caminho do chromedriver, resolvendo-o na primeira chamada.
+        invalidate: Descarta o caminho resolvido e o guardado, para que o próximo `resolve` use o
+            ChromeDriverManager.
+    """
+
+    def __init__(self, pinned_path : str = "", cache_path : str = "") -> None:
+        """
+        Construtor da classe DriverResolver.
+
+        Args:
+            pinned_path (str): Caminho fixo do chromedriver, usado sem nenhuma verificação de versão.
+            cache_path (str): Arquivo JSON em que o caminho resolvido é guardado.
+        """
+        self.pinned_path = pinned_path
+        self.cache_path = cache_path
+        self.source = None
+        self._path = None
+        self._usar_manager = False
+        self._lock = threading.Lock()
+
+    def resolve(self) -> str:
+        """
+        Retorna o caminho do chromedriver, resolvendo-o na primeira chamada.
+
+        Returns:
+            str: Caminho do executável do chromedriver.
+        """
+        with self._lock:
+            if self._path is None:
+                self._path, self.source = self._resolver()
+            return self._path
+
+    def invalidate(self):
+        """
+        Descarta o caminho resolvido e o guardado, para que o próximo `resolve` use o ChromeDriverManager.
+        """
+        with self._lock:
+            self._path = None
+            self._usar_manager = True
+            if self.cache_path and os.path.exists(self.cache_path):
+                os.remove(self.cache_path)
+
+    def _resolver(self) -> Tuple[str, str]:
+        """
+        Procura o chromedriver no caminho fixo, no caminho guardado, no PATH e, por fim, com o
+        ChromeDriverManager.
+
+        Returns:
+            Tuple[str, str]: Caminho do chromedriver e de onde ele veio.
+        """
+        if not self._usar_manager:
+            if self.pinned_path and os.path.exists(self.pinned_path):
+                return self.pinned_path, 'pinned'
+            guardado = self._ler_cache()
+            if guardado:
+                return guardado, 'cache'
+            no_path = shutil.which('chromedriver')
+            if no_path:
+                return no_path, 'path'
+        # Importado só aqui: o ChromeDriverManager é lento para importar e acessa a rede
+        from webdriver_manager.chrome import ChromeDriverManager # pylint: disable=import-outside-toplevel
+        caminho = ChromeDriverManager().install()
+        self._usar_manager = False
+        self._gravar_cache(caminho)
+        return caminho, 'manager'
+
+    def _ler_cache(self) -> Optional[str]:
+        """
+        Lê o caminho guardado em uma execução anterior.
+
+        Returns:
+            Optional[str]: Caminho guardado, ou None se não houver um ou se o arquivo não existir mais.
+        """
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as arquivo:
+                caminho = json.load(arquivo).get('path')
+        except (OSError, ValueError):
+            return None
+        return caminho if caminho and os.path.exists(caminho) else None
+
+    def _gravar_cache(self, caminho : str):
+        """
+        Guarda o caminho resolvido para as próximas execuções.
+
+        Args:
+            caminho (str): Caminho do chromedriver.
+        """
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        with open(self.cache_path, 'w', encoding='utf-8') as arquivo:
+            json.dump({'path': caminho}, arquivo)
@@ -0,0 +1,280 @@
+"""
+Módulo page_readiness: Espera uma página aberta no navegador ficar pronta para a extração.
+
+Em vez de pausas fixas e de rolar a página aos poucos até a barra de rolagem parar, este módulo oferece
+a classe PageReadiness, que espera por eventos de acordo com o tipo da página:
+    - 'best_of' (páginas BestOfAAAA): espera o primeiro grupo de jogos aparecer e então executa um script
+      com MutationObserver e IntersectionObserver, que rola até o fim a cada novo cartão de jogo e
+      responde quando os cartões param de chegar;
+    - 'best_of_tab' (outra aba de uma página BestOf já aberta, trocada no navegador): espera os grupos
+      da aba anterior serem substituídos e então espera os cartões como em 'best_of' (`wait_tab`);
+    - 'game' (páginas dos jogos): espera o bloco 'Genre:' ou o aviso de idade aparecer, ou o documento
+      terminar de carregar sem eles (página sem gêneros), para não esperar até o tempo máximo;
+    - 'game_agecheck' (página do jogo depois de responder ao aviso de idade): espera o bloco 'Genre:';
+    - 'default': espera o documento terminar de carregar.
+Todas as esperas têm um tempo máximo. A classe também registra, por tipo de página, o tempo esperado e
+uma estimativa do tempo que as pausas fixas e a rolagem antigas gastariam.
+
+Exemplo de uso:
+    >>> from dao.page_readiness import PageReadiness
+    >>> readiness = PageReadiness(timeout=15)
+    >>> navegador.get(url)
+    >>> readiness.wait(navegador, url)
+    >>> readiness.summary()
+    {'best_of': {'pages': 12, 'wait_s': 30.1, 'legacy_s': 95.4, 'saved_s': 65.3}, ...}
+
+Classes:
+    PageReadiness: Uma classe que espera as páginas ficarem prontas e mede o tempo economizado.
+"""
+
+import math
+import threading
+import time
+from typing import Dict
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from extract.extraction_spec import SPEC
+
+# Classes CSS dos grupos e dos cartões dos jogos, lidas da especificação da extração (config/extraction_spec.json)
+CLASSE_GRUPOS = SPEC.selectors['groups']
+CLASSE_CARTAO_JOGO = SPEC.selectors['game_card']
+XPATH_GENERO = "//b[normalize-space()='Genre:']"
+XPATH_AVISO_IDADE = "//div[contains(text(), 'Please enter your birth date to continue')]"
+
+# Custo das esperas antigas: 0.2s + 0.5s fixos e 0.1s a cada 500px rolados (mais a checagem final)
+PAUSAS_FIXAS_ANTIGAS = 0.7
+PAUSA_ROLAGEM_ANTIGA = 0.1
+PIXELS_ROLAGEM_ANTIGA = 500
+
+# Assinatura dos grupos de jogos exibidos: o primeiro jogo de cada grupo, ou vazia enquanto algum grupo não tem jogos
+SCRIPT_ASSINATURA_GRUPOS = """
+const imagens = Array.from(document.querySelectorAll(arguments[0])).map(grupo => grupo.querySelector('img[alt]'));
+return imagens.every(Boolean) ? imagens.map(imagem => imagem.alt).join('|') : '';
+"""
+
+# Rola até o fim sempre que chegam novos cartões e responde quando eles param de chegar
+SCRIPT_CARTOES_PREGUICOSOS = """
+const [seletor, silencioMs, limiteMs] = arguments;
+const responder = arguments[arguments.length - 1];
+const contar = () => document.querySelectorAll(seletor).length;
+const rolarAteOFim = () => window.scrollTo(0, document.documentElement.scrollHeight);
+let ultimo = contar();
+let temporizador = null;
+const sentinela = document.createElement('div');
+document.body.appendChild(sentinela);
+const intersecao = new IntersectionObserver(entradas => {
+    if (entradas.some(entrada => entrada.isIntersecting)) { rolarAteOFim(); }
+});
+const mutacoes = new MutationObserver(() => {
+    const atual = contar();
+    if (atual !== ultimo) {
+        ultimo = atual;
+        document.body.appendChild(sentinela);
+        rolarAteOFim();
+        reagendar();
+    }
+});
+const terminar = () => {
+    mutacoes.disconnect();
+    intersecao.disconnect();
+    clearTimeout(temporizador);
+    clearTimeout(limite);
+    sentinela.remove();
+    responder(contar());
+};
+const reagendar = () => { clearTimeout(temporizador); temporizador = setTimeout(terminar, silencioMs); };
+const limite = setTimeout(terminar, limiteMs);
+mutacoes.observe(document.body, {childList: true, subtree: true});
+intersecao.observe(sentinela);
+rolarAteOFim();
+reagendar();
+"""
+
+
+class PageReadiness:
+    """
+    Classe PageReadiness: Espera as páginas ficarem prontas e mede o tempo economizado.
+
+    Attributes:
+        timeout (float): Tempo máximo, em segundos, de espera por página.
+        quiet (float): Tempo, em segundos, sem novos cartões de jogos para considerar uma página
+            'best_of' completa.
+        stats (Dict[str, Dict[str, float]]): Por tipo de página: páginas, tempo esperado e tempo estimado
+            das esperas antigas.
+
+    Methods:
+        page_type: Identifica o tipo de uma página pela URL.
+        wait: Espera a página aberta no navegador ficar pronta.
+        signature: Retorna a assinatura dos grupos de jogos exibidos em uma página BestOf.
+        wait_tab: Espera uma nova aba de uma página BestOf substituir a aba anterior.
+        summary: Retorna o resumo do tempo esperado e economizado por tipo de página.
+    """
+
+    def __init__(self, timeout : float = 15.0, quiet : float = 0.8) -> None:
+        """
+        Construtor da classe PageReadiness.
+
+        Args:
+            timeout (float): Tempo máximo, em segundos, de espera por página.
+            quiet (float): Tempo, em segundos, sem novos cartões de jogos para considerar uma página
+                'best_of' completa.
+        """
+        self.timeout = timeout
+        self.quiet = quiet
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def page_type(url : str) -> str:
+        """
+        Identifica o tipo de uma página pela URL.
+
+        Args:
+            url (str): URL da página.
+
+        Returns:
+            str: 'best_of', 'game' ou 'default'. O tipo 'game_agecheck' é informado diretamente a `wait`.
+        """
+        if '/sale/BestOf' in url:
+            return 'best_of'
+        if '/app/' in url or '/agecheck/' in url:
+            return 'game'
+        return 'default'
+
+    def wait(self, navegador : WebDriver, url : str, page_type : str = None) -> float:
+        """
+        Espera a página aberta no navegador ficar pronta.
+
+        Se o tempo máximo for atingido, a espera termina sem erro e a página é usada como estiver.
+
+        Args:
+            navegador (WebDriver): Navegador com a página aberta.
+            url (str): URL da página, usada para identificar o tipo.
+            page_type (str): Tipo da página. Por padrão, identificado pela URL.
+
+        Returns:
+            float: Tempo esperado, em segundos.
+        """
+        page_type = page_type or self.page_type(url)
+        inicio = time.perf_counter()
+        try:
+            if page_type == 'best_of':
+                self._wait_best_of(navegador)
+            elif page_type == 'game_agecheck':
+                WebDriverWait(navegador, self.timeout).until(
+                    EC.presence_of_element_located((By.XPATH, XPATH_GENERO)))
+            elif page_type == 'game':
+                # O bloco 'Genre:' vem no HTML da página: com o documento carregado sem ele, não vai aparecer
+                WebDriverWait(navegador, self.timeout).until(EC.any_of(
+                    EC.presence_of_element_located((By.XPATH, XPATH_GENERO)),
+                    EC.presence_of_element_located((By.XPATH, XPATH_AVISO_IDADE)),
+                    self._document_complete
+                ))
+            else:
+                WebDriverWait(navegador, self.timeout).until(self._document_complete)
+        except TimeoutException:
+            pass
+        esperado = time.perf_counter() - inicio
+        self._record(navegador, page_type, esperado)
+        return esperado
+
+    @staticmethod
+    def _document_complete(navegador : WebDriver) -> bool:
+        """
+        Indica se o documento aberto no navegador terminou de carregar.
+
+        Args:
+            navegador (WebDriver): Navegador com a página aberta.
+
+        Returns:
+            bool: True se `document.readyState` for 'complete'.
+        """
+        return navegador.execute_script("return document.readyState") == "complete"
+
+    @staticmethod
+    def signature(navegador : WebDriver) -> str:
+        """
+        Retorna a assinatura dos grupos de jogos exibidos em uma página BestOf (o primeiro jogo de cada
+        grupo), para saber quando a troca de aba terminou.
+
+        Args:
+            navegador (WebDriver): Navegador com a página aberta.
+
+        Returns:
+            str: Assinatura dos grupos exibidos.
+        """
+        return navegador.execute_script(SCRIPT_ASSINATURA_GRUPOS, f".{CLASSE_GRUPOS}")
+
+    def wait_tab(self, navegador : WebDriver, anterior : str) -> bool:
+        """
+        Espera uma nova aba de uma página BestOf substituir a aba anterior e carregar os cartões de jogos.
+
+        Args:
+            navegador (WebDriver): Navegador com a página aberta, depois do pedido de troca de aba.
+            anterior (str): Assinatura (`signature`) dos grupos da aba anterior.
+
+        Returns:
+            bool: True se os grupos da nova aba apareceram; False se o tempo máximo foi atingido e a página
+                deve ser aberta por completo.
+        """
+        inicio = time.perf_counter()
+        try:
+            WebDriverWait(navegador, self.timeout).until(
+                lambda driver: self.signature(driver) not in ("", anterior))
+            self._wait_best_of(navegador, inicio)
+            trocou = True
+        except TimeoutException:
+            trocou = False
+        self._record(navegador, 'best_of_tab', time.perf_counter() - inicio)
+        return trocou
+
+    def _wait_best_of(self, navegador : WebDriver, inicio : float = None):
+        """
+        Espera uma página BestOf carregar todos os cartões de jogos.
+
+        Args:
+            navegador (WebDriver): Navegador com a página aberta.
+            inicio (float): Início da espera (`time.perf_counter`), para descontar do tempo máximo o tempo
+                já esperado. Por padrão, agora.
+        """
+        inicio = time.perf_counter() if inicio is None else inicio
+        WebDriverWait(navegador, max(0.0, self.timeout - (time.perf_counter() - inicio))).until(
+            EC.presence_of_element_located((By.CLASS_NAME, CLASSE_GRUPOS)))
+        restante = max(0.0, self.timeout - (time.perf_counter() - inicio))
+        navegador.execute_async_script(SCRIPT_CARTOES_PREGUICOSOS, f".{CLASSE_CARTAO_JOGO}",
+                                       int(self.quiet * 1000), int(restante * 1000))
+
+    def _record(self, navegador : WebDriver, page_type : str, esperado : float):
+        """
+        Registra o tempo esperado e estima o tempo que as esperas antigas gastariam na mesma página.
+
+        Args:
+            navegador (WebDriver): Navegador com a página aberta.
+            page_type (str): Tipo da página.
+            esperado (float): Tempo esperado, em segundos.
+        """
+        altura, altura_janela = navegador.execute_script(
+            "return [document.documentElement.scrollHeight, window.innerHeight]")
+        passos = math.ceil(max(0, altura - altura_janela) / PIXELS_ROLAGEM_ANTIGA) + 1
+        antigo = PAUSAS_FIXAS_ANTIGAS + passos * PAUSA_ROLAGEM_ANTIGA
+        with self._lock:
+            stats = self.stats.setdefault(page_type, {"pages": 0, "wait_s": 0.0, "legacy_s": 0.0})
+            stats["pages"] += 1
+            stats["wait_s"] += esperado
+            stats["legacy_s"] += antigo
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Retorna o resumo do tempo esperado e economizado por tipo de página.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Por tipo de página: 'pages', 'wait_s', 'legacy_s' e 'saved_s'.
+        """
+        with self._lock:
+            return {
+                page_type: {**stats, "saved_s": stats["legacy_s"] - stats["wait_s"]}
+                for page_type, stats in self.stats.items()
+            }
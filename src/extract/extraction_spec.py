@@ -0,0 +1,195 @@
+"""
+Módulo extraction_spec: Especificação declarativa da extração das páginas BestOf.
+
+As regras de cada página (tipo de página e ano) ficam no arquivo `config/extraction_spec.json`: a URL, o
+idioma (locale) da página, os nomes de grupos a renomear ou ignorar e a expressão regular que monta o
+nome do grupo (por exemplo, '200,000 jogadores' vira '200000' nos mais jogados). As classes CSS das
+páginas também ficam no arquivo. Para extrair um novo ano, basta acrescentar a página no arquivo.
+
+A especificação é lida e compilada uma única vez, na importação do módulo (`SPEC`).
+
+Exemplo de uso:
+    >>> from extract.extraction_spec import SPEC
+    >>> SPEC.page('most_played', '2023').group_name('300,000 jogadores')
+    '300000'
+    >>> SPEC.urls('best_sellers')['2023']
+    'https://store.steampowered.com/sale/BestOf2023?l=brazilian&tab=1'
+
+Classes:
+    PageSpec: Uma classe com as regras compiladas de uma página BestOf.
+    ExtractionSpec: Uma classe com as regras de todas as páginas BestOf.
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterable, Optional
+from bs4 import SoupStrainer
+
+CAMINHO_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'extraction_spec.json')
+SELECTORS = ('groups', 'name_group', 'game_card', 'game_image')
+
+
+class PageSpec:
+    """
+    Classe PageSpec: Regras compiladas de uma página BestOf (tipo de página e ano).
+
+    Attributes:
+        page (str): Tipo da página, por exemplo 'best_sellers'.
+        year (str): Ano da página.
+        url (str): URL da página.
+        locale (str): Idioma da página, por exemplo 'brazilian'.
+        rename (Dict[str, str]): Nomes de grupos a renomear, do idioma e da página.
+        skip (frozenset): Nomes de grupos a ignorar.
+        group_pattern (re.Pattern): Expressão regular aplicada ao nome do grupo, ou None.
+        group_format (str): Formato do nome do grupo, com os grupos da expressão regular ({0} é o texto
+            encontrado).
+
+    Methods:
+        group_name: Retorna o nome final de um grupo, ou None se o grupo deve ser ignorado.
+    """
+
+    __slots__ = ('page', 'year', 'url', 'locale', 'rename', 'skip', 'group_pattern', 'group_format')
+
+    def __init__(self, page : str, year : str, url : str, locale : str, rename : Dict[str, str],
+                 skip : Iterable[str] = (), group_pattern : Optional[str] = None, group_format : str = "{0}") -> None:
+        """
+        Construtor da classe PageSpec.
+
+        Args:
+            page (str): Tipo da página, por exemplo 'best_sellers'.
+            year (str): Ano da página.
+            url (str): URL da página.
+            locale (str): Idioma da página.
+            rename (Dict[str, str]): Nomes de grupos a renomear.
+            skip (Iterable[str]): Nomes de grupos a ignorar.
+            group_pattern (Optional[str]): Expressão regular aplicada ao nome do grupo.
+            group_format (str): Formato do nome do grupo quando a expressão regular é encontrada.
+        """
+        self.page = page
+        self.year = year
+        self.url = url
+        self.locale = locale
+        self.rename = rename
+        self.skip = frozenset(skip)
+        self.group_pattern = re.compile(group_pattern) if group_pattern else None
+        self.group_format = group_format
+
+    def group_name(self, name_group : str) -> Optional[str]:
+        """
+        Retorna o nome final de um grupo: renomeado, ignorado ou montado pela expressão regular.
+
+        Args:
+            name_group (str): Nome do grupo na página.
+
+        Returns:
+            Optional[str]: Nome do grupo, ou None se o grupo deve ser ignorado.
+        """
+        name_group = self.rename.get(name_group, name_group)
+        if name_group in self.skip:
+            return None
+        if self.group_pattern:
+            match = self.group_pattern.search(name_group)
+            if match:
+                name_group = self.group_format.format(match.group(), *match.groups())
+        return name_group
+
+
+class ExtractionSpec:
+    """
+    Classe ExtractionSpec: Regras de todas as páginas BestOf, compiladas uma única vez.
+
+    Attributes:
+        selectors (Dict[str, str]): Classes CSS dos grupos, dos nomes dos grupos, dos cartões dos jogos e
+            das imagens dos jogos.
+        classes_groups (List[str]): Classes CSS percorridas pela extração, na ordem grupo, nome, cartão.
+        strainer (SoupStrainer): Filtro que analisa apenas os grupos de jogos das páginas.
+        pages (Dict[str, Dict[str, PageSpec]]): Regras de cada tipo de página e ano.
+
+    Methods:
+        from_file: Lê e compila a especificação de um arquivo JSON.
+        page: Retorna as regras de uma página.
+        urls: Retorna as URLs de um tipo de página, por ano.
+    """
+
+    def __init__(self, spec : Dict) -> None:
+        """
+        Construtor da classe ExtractionSpec.
+
+        Args:
+            spec (Dict): Especificação no formato de `config/extraction_spec.json`.
+
+        Raises:
+            ValueError: Se faltar uma classe CSS ou se uma página usar um idioma não especificado.
+        """
+        faltando = [nome for nome in SELECTORS if nome not in spec['selectors']]
+        if faltando:
+            raise ValueError(f"Especificação sem as classes CSS: {', '.join(faltando)}")
+        self.selectors = spec['selectors']
+        self.classes_groups = [self.selectors['groups'], self.selectors['name_group'], self.selectors['game_card']]
+        self.strainer = SoupStrainer(class_=self.selectors['groups'])
+        locales = spec.get('locales', {})
+        self.pages = {}
+        for page, regras in spec['pages'].items():
+            self.pages[page] = {}
+            for year, regras_ano in regras['years'].items():
+                locale = regras_ano.get('locale', 'english')
+                if locale not in locales:
+                    raise ValueError(f"Idioma não especificado na página {page} {year}: {locale}")
+                pattern = {**regras.get('group_pattern', {}), **regras_ano.get('group_pattern', {})}
+                self.pages[page][year] = PageSpec(
+                    page, year, regras_ano['url'], locale,
+                    rename={**locales[locale].get('rename', {}), **regras.get('rename', {}),
+                            **regras_ano.get('rename', {})},
+                    skip=[*regras.get('skip', []), *regras_ano.get('skip', [])],
+                    group_pattern=pattern.get('regex'),
+                    group_format=pattern.get('format', "{0}"),
+                )
+
+    @classmethod
+    def from_file(cls, caminho : str = CAMINHO_SPEC) -> 'ExtractionSpec':
+        """
+        Lê e compila a especificação de um arquivo JSON.
+
+        Args:
+            caminho (str): Caminho do arquivo.
+
+        Returns:
+            ExtractionSpec: A especificação compilada.
+        """
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            return cls(json.load(arquivo))
+
+    def page(self, page : str, year : str) -> PageSpec:
+        """
+        Retorna as regras de uma página.
+
+        Args:
+            page (str): Tipo da página, por exemplo 'best_sellers'.
+            year (str): Ano da página.
+
+        Returns:
+            PageSpec: Regras da página.
+
+        Raises:
+            KeyError: Se a página não estiver na especificação.
+        """
+        try:
+            return self.pages[page][str(year)]
+        except KeyError as erro:
+            raise KeyError(f"Página não especificada: {page} {year}") from erro
+
+    def urls(self, page : str) -> Dict[str, str]:
+        """
+        Retorna as URLs de um tipo de página, por ano.
+
+        Args:
+            page (str): Tipo da página, por exemplo 'best_sellers'.
+
+        Returns:
+            Dict[str, str]: URL de cada ano, na ordem da especificação.
+        """
+        return {year: spec.url for year, spec in self.pages.get(page, {}).items()}
+
+
+SPEC = ExtractionSpec.from_file()
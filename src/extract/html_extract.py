@@ -1,222 +1,197 @@
 """
 Módulo html_extractor: Fornece métodos para extrair informações de páginas HTML.
 
-Este módulo contém a classe HtmlExtractor, que oferece métodos para extrair informações específicas de páginas HTML, 
-como os nomes e links dos jogos mais vendidos, mais jogados e melhores lançamentos, 
+Este módulo contém a classe HtmlExtractor, que oferece métodos para extrair informações específicas de páginas HTML,
+como os nomes e links dos jogos mais vendidos, mais jogados e melhores lançamentos,
 bem como os gêneros de um jogo específico e verificações de página de jogo.
 
+Cada documento é analisado uma única vez, com o parser `lxml` quando ele está instalado (e o
+`html.parser` da biblioteca padrão caso contrário). As páginas BestOf, que são muito grandes, são
+analisadas parcialmente: apenas os grupos de jogos entram na árvore. Os grupos de todas as páginas BestOf
+são extraídos pelo mesmo método, `extract_games`, que aplica as regras de cada página descritas na
+especificação da extração (`extract.extraction_spec`).
+
 Classes:
     HtmlExtractor: Uma classe que fornece métodos para extrair informações de páginas HTML.
 
 """
-import re
-from typing import Dict, List
-from bs4 import BeautifulSoup
+from typing import Dict, Iterator, List, Tuple, Union
+from bs4 import BeautifulSoup, SoupStrainer
+from extract.extraction_spec import SPEC, ExtractionSpec
+
+try:
+    import lxml # pylint: disable=unused-import
+    PARSER_HTML = 'lxml'
+except ImportError:
+    PARSER_HTML = 'html.parser'
+
+TEXT_WARNING_AGE = 'Please enter your birth date to continue:'
 
 
 class HtmlExtractor:
     """
     Classe HtmlExtractor: Fornece métodos para extrair informações de páginas HTML.
 
+    Attributes:
+        spec (ExtractionSpec): Especificação da extração das páginas BestOf.
+
     Methods:
-        extract_games_best_sellers: Extrai nomes e links dos jogos mais vendidos em cada ano.
-        extract_games_most_played: Extrai nomes e links dos jogos mais jogados em cada ano.
-        extract_games_best_releases: Extrai nomes e links dos jogos que tiveram melhores lançamentos em cada ano.
+        parse: Analisa um documento HTML uma única vez, com o parser mais rápido disponível.
+        extract_games: Extrai os nomes e links dos jogos de cada grupo de uma página BestOf.
+        extract_game_page: Verifica o aviso de idade e extrai os gêneros de uma página de jogo, com uma única análise.
         extract_game_information: Extrai os gêneros de um jogo a partir de sua página HTML.
         verify_page_game: Verifica se uma página de jogo contém uma mensagem de aviso de idade.
+        may_have_warning_age: Verificação rápida, sem análise do HTML, de que a página pode ter o aviso de idade.
     """
 
-    def extract_games_best_sellers(self, html : str) -> Dict[str, Dict]:
+    def __init__(self, spec : ExtractionSpec = SPEC) -> None:
         """
-        Extração dos nomes e links dos jogos mais vendidos em cada ano.
+        Construtor da classe HtmlExtractor.
 
         Args:
-            html (str): HTML para extração das informações.
+            spec (ExtractionSpec): Especificação da extração das páginas BestOf. Por padrão, a de
+                `config/extraction_spec.json`, compilada na importação.
+        """
+        self.spec = spec
 
-        Returns:
-            Dict: Dicionário contendo nomes e URLs dos jogos mais vendidos em cada ano.
-                Exemplo:
-                {
-                    'Platinum': {'nome_game': 'url', ...},
-                    ...
-                }
+    @staticmethod
+    def parse(html : Union[str, BeautifulSoup], parse_only : SoupStrainer = None) -> BeautifulSoup:
         """
-        # Pegar separado por platina, ouro, prata e bronze
-        class_groups = {
-            'class_groups': "_2NfLqUpH_h0Ba0jlv9M9ZE", 
-            'class_name_group': "_3FRxVBrTtFQLhmHRstBbC_", 
-            'class_game_card': "_2yyhUHhk3d1DRpG4Sx9_og",
-            'class_game_image':  "cODQhXeXS-Yn-vLIBNwyW"
-            }
-        soup = BeautifulSoup(html, 'html.parser')
-        groups_games_list = soup.find_all(class_=class_groups['class_groups'])
-        groups_games_items = {}
-        for group in groups_games_list:
-            aux = group.find(class_=class_groups['class_name_group'])
-            if aux:
-                pass
-            else:
-                name_group = aux.text
-                if name_group == "Platina":
-                    name_group =  "Platinum"
-                if name_group == "Ouro":
-                    name_group =  "Gold"
-                if name_group == "Prata":
-                    name_group =  "Silver"
-                if name_group == "Bronze":
-                    name_group =  "Bronze"
-                groups_games_items[name_group] = {}
-                list_games = group.find_all(class_=class_groups['class_game_card'])
-                # para cada game
-                for game in list_games:
-                    name_game = game.find(class_=class_groups['class_game_image']).get('alt')
-                    link_game = game.find('a').get('href')
-                    groups_games_items[name_group][name_game] = link_game
-        return groups_games_items
+        Analisa um documento HTML uma única vez, com o parser mais rápido disponível.
 
+        Args:
+            html (Union[str, BeautifulSoup]): HTML a ser analisado. Uma árvore já analisada é devolvida
+                sem nova análise.
+            parse_only (SoupStrainer): Filtro para analisar apenas parte do documento.
 
-    def extract_games_most_played(self, html : str) -> Dict[str, Dict]:
+        Returns:
+            BeautifulSoup: Árvore do documento.
         """
-        Extração dos nomes e links dos jogos mais jogados em cada ano.
+        if isinstance(html, BeautifulSoup):
+            return html
+        return BeautifulSoup(html, PARSER_HTML, parse_only=parse_only)
+
+    def _groups(self, html : Union[str, BeautifulSoup]) -> Iterator[Tuple[str, Dict[str, str]]]:
+        """
+        Percorre os grupos de jogos de uma página BestOf, com uma única passagem pelo documento.
 
         Args:
-            html (str): HTML para extração das informações.
+            html (Union[str, BeautifulSoup]): HTML da página BestOf.
 
         Returns:
-            Dict: Dicionário contendo nomes e URLs dos jogos mais jogados em cada ano.
-                Exemplo:
-                {
-                    'Platinum': {'nome_game': 'url', ...},
-                    ...
-                }
+            Iterator[Tuple[str, Dict[str, str]]]: Pares (nome do grupo na página, {'nome_game': 'url'}). Os
+                grupos sem nome são ignorados.
         """
-        # Pegar separado por quantidade de jogadores simultaneos
-        class_groups = {
-            'class_groups': "_2NfLqUpH_h0Ba0jlv9M9ZE", 
-            'class_name_group': "_3FRxVBrTtFQLhmHRstBbC_", 
-            'class_game_card': "_2yyhUHhk3d1DRpG4Sx9_og",
-            'class_game_image':  "cODQhXeXS-Yn-vLIBNwyW"
-            }
-        soup = BeautifulSoup(html, 'html.parser')
-        groups_games_list = soup.find_all(class_=class_groups)
-        groups_games_items = {}
-        for group in groups_games_list:
-            aux = group.find(class_=class_groups['class_name_group'])
-            if aux:
-                pass
+        selectors = self.spec.selectors
+        soup = self.parse(html, self.spec.strainer)
+        groups = []
+        # Os grupos, seus nomes e os cartões dos jogos vêm na ordem do documento
+        for element in soup.find_all(class_=self.spec.classes_groups):
+            classes = element.get('class', ())
+            if selectors['groups'] in classes:
+                groups.append([None, {}])
+            elif not groups:
+                continue
+            elif selectors['name_group'] in classes:
+                if groups[-1][0] is None:
+                    groups[-1][0] = element.text
             else:
-                name_group = aux.text
-                # Usando expressão regular para encontrar o número na string
-                match = re.search(r'\d+', name_group)
-                if match:
-                    # Extrair o número encontrado
-                    number_str = match.group()
-                    # Remover vírgulas se houver
-                    name_group = f"{number_str.replace(',', '.')}000"
-                groups_games_items[name_group] = {}
-                list_games = group.find_all(class_=class_groups['class_game_card'])
-                # para cada game
-                for game in list_games:
-                    name_game = game.find(class_=class_groups['class_game_image']).get('alt')
-                    link_game = game.find('a').get('href')
-                    groups_games_items[name_group][name_game] = link_game
-        return groups_games_items
+                name_game = element.find(class_=selectors['game_image']).get('alt')
+                groups[-1][1][name_game] = element.find('a').get('href')
+        return ((name_group, games) for name_group, games in groups if name_group is not None)
 
-    def extract_games_best_releases(self, html : str, year : int) -> Dict[str, Dict]:
+    def extract_games(self, html : Union[str, BeautifulSoup], page : str, year : str) -> Dict[str, Dict]:
         """
-        Extração dos nomes e links dos jogos que tiveram melhores lançamentos em um ano específico.
+        Extração dos nomes e links dos jogos de cada grupo de uma página BestOf, com as regras da página
+        (grupos renomeados e ignorados) descritas em `spec`.
 
         Args:
-            html (str): HTML para extração das informações.
-            year (int): Ano referente à página HTML.
+            html (Union[str, BeautifulSoup]): HTML para extração das informações.
+            page (str): Tipo da página: 'best_sellers', 'best_releases' ou 'most_played'.
+            year (str): Ano referente à página HTML.
 
         Returns:
-            Dict: Dicionário contendo nomes e URLs dos jogos que tiveram melhores lançamentos no ano especificado.
+            Dict: Dicionário contendo nomes e URLs dos jogos de cada grupo.
                 Exemplo:
                 {
                     'Platinum': {'nome_game': 'url', ...},
                     ...
                 }
         """
-        class_groups = {
-            'class_groups': "_2NfLqUpH_h0Ba0jlv9M9ZE", 
-            'class_name_group': "_3FRxVBrTtFQLhmHRstBbC_", 
-            'class_game_card': "_2yyhUHhk3d1DRpG4Sx9_og",
-            'class_game_image':  "cODQhXeXS-Yn-vLIBNwyW"
-        }
-        groups_remove = {
-                    "grups_not_extract_2020": ["January", "February", "March", "April", "May", "June",
-                             "July", "August", "September", "October", "November", "December", "Top New Releases By Month"],
-                    "grups_not_extract_2021": ["Top New Releases By Month"]
-        }
-        soup = BeautifulSoup(html, 'html.parser')
-        groups_games_list = soup.find_all(class_=class_groups['class_groups'])
+        page_spec = self.spec.page(page, year)
         groups_games_items = {}
-        for group in groups_games_list:
-            aux = group.find(class_=class_groups['class_name_group'])
-            if not aux:
-                name_group = aux.text
-                if year == "2020":
-                    if name_group == "Top New Releases of 2020":
-                        name_group = "Platinum"
-                    if name_group in groups_remove['grups_not_extract_2020']:
-                        continue
-                if year == "2021":
-                    if name_group in groups_remove['grups_not_extract_2021']:
-                        continue
-                if year == "2023":
-                    if name_group == "Platina":
-                        name_group =  "Platinum"
-                    if name_group == "Ouro":
-                        name_group =  "Gold"
-                    if name_group == "Prata":
-                        name_group =  "Silver"
-                groups_games_items[name_group] = {}
-                list_games = group.find_all(class_=class_groups['class_game_card'])
-                # para cada game
-                for game in list_games:
-                    name_game = game.find(class_=class_groups['class_game_image']).get('alt')
-                    link_game = game.find('a').get('href')
-                    groups_games_items[name_group][name_game] = link_game
+        for name_group, games in self._groups(html):
+            name_group = page_spec.group_name(name_group)
+            if name_group is not None:
+                groups_games_items[name_group] = games
         return groups_games_items
 
-    def extract_game_information(self, html: str) -> List[str]:
+    def extract_game_page(self, html : Union[str, BeautifulSoup]) -> Tuple[bool, List[str]]:
+        """
+        Verifica o aviso de idade e extrai os gêneros de uma página de jogo, com uma única análise do HTML.
+
+        Args:
+            html (Union[str, BeautifulSoup]): HTML da página do jogo.
+
+        Returns:
+            Tuple[bool, List[str]]: True se a página não contém o aviso de idade (False caso contrário)
+                e a lista com os gêneros do jogo.
+        """
+        soup = self.parse(html)
+        return self.verify_page_game(soup), self.extract_game_information(soup)
+
+    def extract_game_information(self, html: Union[str, BeautifulSoup]) -> List[str]:
         """
         Extração dos gêneros de um jogo a partir de sua página HTML.
 
         Args:
-            html (str): HTML da página do jogo.
+            html (Union[str, BeautifulSoup]): HTML da página do jogo.
 
         Returns:
             List[str]: Lista com os gêneros do jogo.
         """
         # Parse the HTML content
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.parse(html)
         # Initialize an empty dictionary
         genres = []
         # Find the genre
-        genre_element = soup.find('b', text='Genre:')
+        genre_element = soup.find('b', string='Genre:')
         if genre_element:
             genres_span = genre_element.find_next_sibling('span')
             #print(genres_span)
             genres = [genre.text.strip() for genre in genres_span.find_all('a')]
         return genres
 
-    def verify_page_game(self, html: str) -> Dict:
+    def verify_page_game(self, html: Union[str, BeautifulSoup]) -> bool:
         """
         Verifica se uma página de jogo contém uma mensagem de aviso.
 
         Args:
-            html (str): HTML da página do jogo.
+            html (Union[str, BeautifulSoup]): HTML da página do jogo.
 
         Returns:
             bool: True se a página não contém mensagem de aviso, False caso contrário.
         """
         # Parse the HTML content
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.parse(html)
         # Check if the message is present
-        texto = 'Please enter your birth date to continue:'
-        warning_message = soup.find('div', text=texto)
+        warning_message = soup.find('div', string=TEXT_WARNING_AGE)
         if warning_message:
             return False
         return True
+
+    @staticmethod
+    def may_have_warning_age(html : str) -> bool:
+        """
+        Verificação rápida, sem análise do HTML, de que uma página de jogo pode conter o aviso de idade.
+
+        Quando retorna False, a página certamente não tem o aviso; quando retorna True, o aviso deve ser
+        confirmado com `verify_page_game`.
+
+        Args:
+            html (str): HTML da página do jogo.
+
+        Returns:
+            bool: True se o texto do aviso de idade aparece no HTML.
+        """
+        return TEXT_WARNING_AGE in html
@@ -0,0 +1,271 @@
+"""
+Módulo json_stream: Escrita e leitura incrementais do arquivo data.json.
+
+O data.json tem o formato {categoria: {ano: {grupo: {jogo: {"genre": [generos]}}}}}. Em vez de montar ou
+carregar o arquivo inteiro na memória, este módulo oferece:
+    - JsonStreamWriter: escreve cada ano de cada categoria assim que ele termina. O arquivo final é
+      idêntico, byte a byte, ao gerado por `json.dump(dados, arquivo, ensure_ascii=False, indent=4)`;
+    - JsonStreamReader: lê o arquivo aos poucos e entrega um ano de cada vez, agrupado por categoria, então
+      o pico de memória fica limitado ao tamanho de um ano, e não ao do arquivo inteiro.
+
+Exemplo de uso:
+    >>> from load.json_stream import JsonStreamReader, JsonStreamWriter
+    >>> with JsonStreamWriter("../arquivos/data.json") as writer:
+    ...     writer.write_category("best sellers", [("2020", {"Platinum": {...}})])
+    >>> for category, years in JsonStreamReader("../arquivos/data.json").categories():
+    ...     for year, groups in years:
+    ...         print(category, year, len(groups))
+
+Classes:
+    JsonStreamWriter: Uma classe que escreve o data.json categoria por categoria e ano por ano.
+    JsonStreamReader: Uma classe que lê o data.json categoria por categoria e ano por ano.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+INDENTACAO = 4
+ESPACOS_JSON = " \t\n\r"
+
+
+class JsonStreamWriter:
+    """
+    Classe JsonStreamWriter: Escreve o data.json categoria por categoria e ano por ano.
+
+    O arquivo é escrito em `<path>.tmp` e só substitui `path` quando a escrita termina sem erros, então
+    uma escrita interrompida não corrompe o data.json anterior.
+
+    Attributes:
+        path (str): Caminho do arquivo JSON.
+
+    Methods:
+        write_category: Escreve uma categoria, ano por ano, conforme os anos são gerados.
+        close: Termina o arquivo e o move para `path`.
+        discard: Descarta o arquivo temporário, mantendo o `path` anterior.
+    """
+
+    def __init__(self, path : str) -> None:
+        """
+        Construtor da classe JsonStreamWriter.
+
+        Args:
+            path (str): Caminho do arquivo JSON.
+        """
+        self.path = path
+        self._arquivo_temporario = f"{path}.tmp"
+        self._arquivo = open(self._arquivo_temporario, "w", encoding="utf-8") # pylint: disable=consider-using-with
+        self._arquivo.write("{")
+        self._categorias = 0
+
+    def write_category(self, category : str, years : Iterable[Tuple[str, Dict]]):
+        """
+        Escreve uma categoria, ano por ano, conforme os anos são gerados.
+
+        Args:
+            category (str): Nome da categoria, por exemplo 'best sellers'.
+            years (Iterable[Tuple[str, Dict]]): Pares (ano, grupos), no formato {grupo: {jogo: info}}.
+        """
+        recuo_categoria = "\n" + " " * INDENTACAO
+        recuo_ano = "\n" + " " * INDENTACAO * 2
+        separador = "," if self._categorias else ""
+        self._arquivo.write(f"{separador}{recuo_categoria}{json.dumps(category, ensure_ascii=False)}: {{")
+        self._categorias += 1
+        anos = 0
+        for year, groups in years:
+            corpo = json.dumps(groups, ensure_ascii=False, indent=INDENTACAO).replace("\n", recuo_ano)
+            separador = "," if anos else ""
+            self._arquivo.write(f"{separador}{recuo_ano}{json.dumps(year, ensure_ascii=False)}: {corpo}")
+            anos += 1
+        self._arquivo.write(f"{recuo_categoria}}}" if anos else "}")
+
+    def close(self):
+        """
+        Termina o arquivo e o move para `path`.
+        """
+        self._arquivo.write("\n}" if self._categorias else "}")
+        self._arquivo.close()
+        os.replace(self._arquivo_temporario, self.path)
+
+    def discard(self):
+        """
+        Descarta o arquivo temporário, mantendo o `path` anterior.
+        """
+        self._arquivo.close()
+        os.remove(self._arquivo_temporario)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, *args):
+        if tipo is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class JsonStreamReader:
+    """
+    Classe JsonStreamReader: Lê o data.json categoria por categoria e ano por ano.
+
+    O arquivo é lido em blocos, e cada ano é decodificado com `json.JSONDecoder.raw_decode` assim que
+    está inteiro no buffer.
+
+    Attributes:
+        path (str): Caminho do arquivo JSON.
+        chunk_size (int): Quantidade de caracteres lidos do arquivo de cada vez.
+
+    Methods:
+        categories: Percorre as categorias do arquivo, cada uma com um iterador dos seus anos.
+        items: Percorre todos os anos do arquivo, no formato (categoria, ano, grupos).
+    """
+
+    def __init__(self, path : str, chunk_size : int = 1024 ** 2) -> None:
+        """
+        Construtor da classe JsonStreamReader.
+
+        Args:
+            path (str): Caminho do arquivo JSON.
+            chunk_size (int): Quantidade de caracteres lidos do arquivo de cada vez.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._arquivo = None
+        self._buffer = ""
+        self._pos = 0
+        self._fim = False
+
+    def _ler(self, tamanho : int) -> bool:
+        """
+        Lê mais caracteres do arquivo para o buffer, descartando o que já foi decodificado.
+
+        Args:
+            tamanho (int): Quantidade de caracteres a ler.
+
+        Returns:
+            bool: False se o arquivo já terminou.
+        """
+        if self._fim:
+            return False
+        bloco = self._arquivo.read(tamanho)
+        if not bloco:
+            self._fim = True
+            return False
+        self._buffer = self._buffer[self._pos:] + bloco
+        self._pos = 0
+        return True
+
+    def _proximo_caractere(self) -> str:
+        """
+        Pula os espaços e retorna o próximo caractere, sem consumi-lo.
+
+        Returns:
+            str: Próximo caractere, ou '' no fim do arquivo.
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ESPACOS_JSON:
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._ler(self.chunk_size):
+                return self._buffer[self._pos:self._pos + 1]
+
+    def _consumir(self, esperado : str) -> str:
+        """
+        Consome o próximo caractere, que deve ser um dos esperados.
+
+        Args:
+            esperado (str): Caracteres aceitos.
+
+        Returns:
+            str: Caractere consumido.
+
+        Raises:
+            json.JSONDecodeError: Se o próximo caractere não for um dos esperados.
+        """
+        caractere = self._proximo_caractere()
+        if not caractere or caractere not in esperado:
+            raise json.JSONDecodeError(f"Esperado um de {esperado!r}", self._buffer, self._pos)
+        self._pos += 1
+        return caractere
+
+    def _valor(self) -> Any:
+        """
+        Decodifica o próximo valor JSON, lendo mais blocos do arquivo até ele estar inteiro no buffer.
+
+        A quantidade lida dobra a cada tentativa, então decodificar um valor grande custa tempo linear.
+
+        Returns:
+            Any: Valor decodificado.
+        """
+        self._proximo_caractere()
+        tamanho = self.chunk_size
+        while True:
+            try:
+                valor, fim = self._decoder.raw_decode(self._buffer, self._pos)
+                # Um número no fim do buffer pode continuar no próximo bloco
+                if fim < len(self._buffer) or self._fim:
+                    self._pos = fim
+                    return valor
+            except json.JSONDecodeError:
+                if self._fim:
+                    raise
+            self._ler(tamanho)
+            tamanho *= 2
+
+    def _objeto(self) -> Iterator[str]:
+        """
+        Percorre as chaves de um objeto JSON. A cada chave, quem chamou deve consumir o valor correspondente.
+
+        Returns:
+            Iterator[str]: Chaves do objeto.
+        """
+        self._consumir("{")
+        if self._proximo_caractere() == "}":
+            self._pos += 1
+            return
+        while True:
+            chave = self._valor()
+            self._consumir(":")
+            yield chave
+            if self._consumir(",}") == "}":
+                return
+
+    def _years(self) -> Iterator[Tuple[str, Dict]]:
+        """
+        Percorre os anos da categoria atual.
+
+        Returns:
+            Iterator[Tuple[str, Dict]]: Pares (ano, grupos).
+        """
+        for year in self._objeto():
+            yield year, self._valor()
+
+    def categories(self) -> Iterator[Tuple[str, Iterator[Tuple[str, Dict]]]]:
+        """
+        Percorre as categorias do arquivo, cada uma com um iterador dos seus anos.
+
+        Os anos de uma categoria devem ser consumidos antes de avançar para a próxima categoria; os anos não
+        consumidos são pulados.
+
+        Returns:
+            Iterator[Tuple[str, Iterator[Tuple[str, Dict]]]]: Pares (categoria, iterador de (ano, grupos)).
+        """
+        with open(self.path, "r", encoding="utf-8") as arquivo:
+            self._arquivo, self._buffer, self._pos, self._fim = arquivo, "", 0, False
+            for category in self._objeto():
+                years = self._years()
+                yield category, years
+                for _ in years:
+                    pass
+            self._arquivo = None
+
+    def items(self) -> Iterator[Tuple[str, str, Dict]]:
+        """
+        Percorre todos os anos do arquivo.
+
+        Returns:
+            Iterator[Tuple[str, str, Dict]]: Triplas (categoria, ano, grupos).
+        """
+        for category, years in self.categories():
+            for year, groups in years:
+                yield category, year, groups
@@ -1,21 +1,51 @@
 """
-Módulo load_dados: Fornece métodos para carregar dados em formato CSV.
-
-Este módulo contém a classe LoadDados, que oferece métodos para carregar dados de jogos em formato CSV.
+Módulo load_dados: Fornece métodos para carregar dados em formato CSV e em outros destinos.
+
+Este módulo contém a classe LoadDados, que oferece métodos para gerar as linhas dos arquivos CSV dos jogos.
+As linhas são geradas uma a uma, para serem escritas diretamente por um `csv.writer`, sem montar o arquivo
+inteiro na memória. O método `load` grava os jogos em um ou mais destinos (SinkDados), como CSV e Parquet.
+
+Exemplo de uso:
+    >>> import csv
+    >>> from load.load_dados import LoadDados
+    >>> load_data = LoadDados()
+    >>> with open('best_sellers.csv', 'w', newline='', encoding='utf-8') as arquivo_csv:
+    ...     escritor_csv = csv.writer(arquivo_csv, delimiter=';')
+    ...     escritor_csv.writerow(load_data.header_best_sellers_and_best_releases)
+    ...     escritor_csv.writerows(load_data.load_data_best_sellers_csv(dados['best sellers']))
+    >>> load_data.load('best_sellers', load_data.header_best_sellers_and_best_releases, dados['best sellers'],
+    ...                [SinkCsv("../arquivos"), SinkParquet("../arquivos")])
 
 Classes:
     LoadDados: Uma classe que fornece métodos para carregar dados de jogos em formato CSV.
 """
-from typing import Dict
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+from load.sink_dados import RegistroJogo, SinkDados
+from metrics.metrics_etl import METRICS
+
+GENRES_REMOVE = frozenset(["Animation & Modeling", "Design & Illustration", "Photo Editing", "Utilities"])
+# Dados de uma categoria: {ano: grupos} ou pares (ano, grupos) lidos aos poucos, por exemplo por JsonStreamReader
+DadosCategoria = Union[Dict, Iterable[Tuple[str, Dict]]]
+Linha = Tuple[str, str, str, str, bool]
+TAMANHO_LOTE = 10000
+
 
 class LoadDados():
     """
     Classe LoadDados: Fornece métodos para carregar dados em formato CSV.
 
+    Attributes:
+        header_best_sellers_and_best_releases (Tuple[str, ...]): Cabeçalho dos CSVs de mais vendidos e de
+            melhores lançamentos.
+        header_most_played (Tuple[str, ...]): Cabeçalho do CSV de mais jogados.
+
     Methods:
-        load_data_best_sellers_csv: Carrega dados dos jogos mais vendidos em formato CSV.
-        load_data_best_releases_csv: Carrega dados dos jogos com melhores lançamentos em formato CSV.
-        load_data_most_played_csv: Carrega dados dos jogos mais jogados em formato CSV.
+        load: Grava os jogos de uma tabela em um ou mais destinos.
+        iter_games: Gera um registro por jogo, sem os gêneros de `GENRES_REMOVE`.
+        load_data_best_sellers_csv: Gera as linhas do CSV dos jogos mais vendidos.
+        load_data_best_releases_csv: Gera as linhas do CSV dos jogos com melhores lançamentos.
+        load_data_most_played_csv: Gera as linhas do CSV dos jogos mais jogados.
 
     """
 
@@ -23,17 +53,88 @@ class LoadDados():
         """
         Construtor da classe LoadDados.
 
-        Inicializa as strings que representam as primeiras linhas dos arquivos CSV.
+        Inicializa os cabeçalhos dos arquivos CSV.
+        """
+        self.header_best_sellers_and_best_releases = ("year", "rank", "game", "genre", "is_indie")
+        self.header_most_played = ("year", "simultaneous_players", "game", "genre", "is_indie")
+
+    @staticmethod
+    def iter_games(dados : DadosCategoria) -> Iterator[RegistroJogo]:
+        """
+        Gera um registro por jogo, sem os gêneros de `GENRES_REMOVE`.
+
+        Args:
+            dados (DadosCategoria): Dicionário no formato
+                {ano: {grupo: {jogo: {"genre": [generos]}}}}, ou pares (ano, grupos) lidos aos poucos,
+                por exemplo por JsonStreamReader.
+
+        Returns:
+            Iterator[RegistroJogo]: Jogos no formato (ano, grupo, jogo, gêneros, is_indie, app_id).
         """
-        self.first_row_best_sellers_and_best_releases = "year;rank;game;genre;is_indie\n"
-        self.first_row_most_played = "year;simultaneous_players;game;genre;is_indie\n"
+        for ano, games_per_rank in (dados.items() if isinstance(dados, dict) else dados):
+            for rank, games in games_per_rank.items():
+                for game, genres in games.items():
+                    is_indie = "Indie" in genres['genre']
+                    genres_kept = [genre for genre in genres['genre'] if genre not in GENRES_REMOVE]
+                    yield ano, rank, game, genres_kept, is_indie, genres.get('app_id')
 
-    def load_data_best_sellers_csv(self, best_sellers : Dict) -> str:
+    def _rows(self, dados : DadosCategoria) -> Iterator[Linha]:
         """
-        Carrega dados dos jogos mais vendidos em formato CSV.
+        Gera uma linha por gênero de cada jogo, sem os gêneros de `GENRES_REMOVE`.
 
         Args:
-            best_sellers (Dict): Dicionário contendo dados dos jogos mais vendidos no formato JSON:
+            dados (DadosCategoria): Dados de uma categoria.
+
+        Returns:
+            Iterator[Linha]: Linhas no formato (ano, grupo, jogo, gênero, is_indie).
+        """
+        for ano, rank, game, genres, is_indie, _ in self.iter_games(dados):
+            for genre in genres:
+                yield ano, rank, game, genre, is_indie
+
+    def load(self, name_table : str, header : Sequence[str], dados : DadosCategoria,
+             sinks : Sequence[SinkDados], batch_size : int = TAMANHO_LOTE) -> List[str]:
+        """
+        Grava os jogos de uma tabela em um ou mais destinos, em lotes, lendo os dados uma única vez.
+
+        Se a gravação falhar, a gravação de todos os destinos é descartada (`SinkDados.abort`) antes de a
+        exceção ser repassada.
+
+        Args:
+            name_table (str): Nome da tabela, por exemplo 'best_sellers'.
+            header (Sequence[str]): Colunas no formato do CSV, por exemplo `header_most_played`.
+            dados (DadosCategoria): Dados da categoria.
+            sinks (Sequence[SinkDados]): Destinos, por exemplo SinkCsv e SinkParquet.
+            batch_size (int): Quantidade de jogos por lote.
+
+        Returns:
+            List[str]: Caminhos dos arquivos gravados, um por destino.
+        """
+        try:
+            for sink in sinks:
+                sink.open(name_table, header)
+            games = self.iter_games(dados)
+            while True:
+                lote = list(islice(games, batch_size))
+                if not lote:
+                    break
+                METRICS.count('load.games', len(lote))
+                for sink in sinks:
+                    with METRICS.timer(f"load.{type(sink).__name__}.write"):
+                        sink.write_games(lote)
+            return [sink.close() for sink in sinks]
+        except BaseException:
+            for sink in sinks:
+                sink.abort()
+            raise
+
+    def load_data_best_sellers_csv(self, best_sellers : DadosCategoria) -> Iterator[Linha]:
+        """
+        Gera as linhas do CSV dos jogos mais vendidos (sem o cabeçalho).
+
+        Args:
+            best_sellers (DadosCategoria): Dicionário contendo dados dos jogos mais vendidos no formato JSON
+            (ou pares (ano, grupos) lidos aos poucos):
             {
                 "2020": {
                     "Platinum": {
@@ -51,30 +152,17 @@ class LoadDados():
             }
 
         Returns:
-            str: String contendo os dados formatados em CSV.
+            Iterator[Linha]: Linhas no formato (year, rank, game, genre, is_indie).
         """
-        genres_remove = ["Animation & Modeling", "Design & Illustration", "Photo Editing", "Utilities"]
-        string_csv = self.first_row_best_sellers_and_best_releases
-        for ano, games_per_rank in best_sellers.items():
-            for rank, games in games_per_rank.items():
-                for game, genres in games.items():
-                    for genre in genres['genre']:
-                        if genre in genres_remove:
-                            continue
-                        if "Indie" in genres['genre']:
-                            row = f"{ano};{rank};{game};{genre};True\n"
-                        else:
-                            row = f"{ano};{rank};{game};{genre};False\n"
-                        string_csv += row
-                        row = None
-        return string_csv
-
-    def load_data_best_releases_csv(self, best_releases : Dict) -> str:
+        return self._rows(best_sellers)
+
+    def load_data_best_releases_csv(self, best_releases : DadosCategoria) -> Iterator[Linha]:
         """
-        Carrega dados dos jogos com melhores lançamentos em formato CSV.
+        Gera as linhas do CSV dos jogos com melhores lançamentos (sem o cabeçalho).
 
         Args:
-            best_releases (Dict): Dicionário contendo dados dos jogos com melhores lançamentos no formato JSON.
+            best_releases (DadosCategoria): Dicionário contendo dados dos jogos com melhores lançamentos no formato JSON
+            (ou pares (ano, grupos) lidos aos poucos).
             {
                 "2020": {
                     "Platinum": {
@@ -92,31 +180,17 @@ class LoadDados():
             }
 
         Returns:
-            str: String contendo os dados formatados em CSV.
+            Iterator[Linha]: Linhas no formato (year, rank, game, genre, is_indie).
         """
-        # Best releases csv
-        genres_remove = ["Animation & Modeling", "Design & Illustration", "Photo Editing", "Utilities"]
-        string_csv = self.first_row_best_sellers_and_best_releases
-        for ano, games_per_rank in best_releases.items():
-            for rank, games in games_per_rank.items():
-                for game, genres in games.items():
-                    for genre in genres['genre']:
-                        if genre in genres_remove:
-                            continue
-                        if "Indie" in genres['genre']:
-                            row = f"{ano};{rank};{game};{genre};True\n"
-                        else:
-                            row = f"{ano};{rank};{game};{genre};False\n"
-                        string_csv += row
-                        row = None
-        return string_csv
-
-    def load_data_most_played_csv(self, most_played : Dict) -> str:
+        return self._rows(best_releases)
+
+    def load_data_most_played_csv(self, most_played : DadosCategoria) -> Iterator[Linha]:
         """
-        Carrega dados dos jogos mais jogados em formato CSV.
+        Gera as linhas do CSV dos jogos mais jogados (sem o cabeçalho).
 
         Args:
-            most_played (Dict): Dicionário contendo dados dos jogos mais jogados no formato JSON.
+            most_played (DadosCategoria): Dicionário contendo dados dos jogos mais jogados no formato JSON
+            (ou pares (ano, grupos) lidos aos poucos).
             {
                 "2020": {
                     "qtd jogadores simultaneos": {
@@ -134,21 +208,7 @@ class LoadDados():
             }
 
         Returns:
-            str: String contendo os dados formatados em CSV.
+            Iterator[Linha]: Linhas no formato
+                (year, simultaneous_players, game, genre, is_indie).
         """
-        # most played csv
-        genres_remove = ["Animation & Modeling", "Design & Illustration", "Photo Editing", "Utilities"]
-        string_csv = self.first_row_most_played
-        for ano, games_per_rank in most_played.items():
-            for rank, games in games_per_rank.items():
-                for game, genres in games.items():
-                    for genre in genres['genre']:
-                        if genre in genres_remove:
-                            continue
-                        if "Indie" in genres['genre']:
-                            row = f"{ano};{rank};{game};{genre};True\n"
-                        else:
-                            row = f"{ano};{rank};{game};{genre};False\n"
-                        string_csv += row
-                        row = None
-        return string_csv
+        return self._rows(most_played)
@@ -0,0 +1,105 @@
+"""
+Módulo sink_csv: Destino que grava os dados dos jogos em arquivos CSV separados por ';'.
+
+Cada jogo vira uma linha por gênero, no mesmo formato dos arquivos CSV originais do ETL. Os arquivos são
+gravados em arquivos temporários (`.tmp`) e só substituem os anteriores em `finish`, ao fim de toda a
+carga; se a carga falhar, `abort` remove os temporários e os CSVs da carga anterior continuam valendo.
+
+Classes:
+    SinkCsv: Uma classe que grava os dados dos jogos em arquivos CSV.
+"""
+
+import csv
+import os
+from typing import Sequence
+from load.sink_dados import RegistroJogo, SinkDados
+
+
+class SinkCsv(SinkDados):
+    """
+    Classe SinkCsv: Grava os dados dos jogos em arquivos CSV separados por ';', uma linha por gênero.
+
+    Methods:
+        open: Abre o arquivo CSV da tabela e grava o cabeçalho.
+        write_games: Grava uma linha por gênero de cada jogo.
+        close: Fecha o arquivo CSV.
+        finish: Substitui os CSVs da carga anterior pelos arquivos gravados.
+        abort: Fecha e remove os arquivos temporários de uma carga interrompida.
+    """
+
+    extension = "csv"
+
+    def __init__(self, pasta : str = "../arquivos") -> None:
+        """
+        Construtor da classe SinkCsv.
+
+        Args:
+            pasta (str): Pasta em que os arquivos CSV são gravados.
+        """
+        super().__init__(pasta)
+        self._arquivo = None
+        self._escritor = None
+        self._caminho = None
+        self._prontos = []
+
+    def open(self, name_table : str, header : Sequence[str]):
+        """
+        Abre o arquivo temporário do CSV da tabela e grava o cabeçalho.
+
+        Args:
+            name_table (str): Nome da tabela, por exemplo 'best_sellers'.
+            header (Sequence[str]): Cabeçalho do arquivo CSV.
+        """
+        self._caminho = self.path(name_table)
+        self._arquivo = open(f"{self._caminho}.tmp", 'w', newline='', encoding='utf-8') # pylint: disable=consider-using-with
+        self._escritor = csv.writer(self._arquivo, delimiter=';')
+        self._escritor.writerow(header)
+
+    def write_games(self, games : Sequence[RegistroJogo]):
+        """
+        Grava uma linha por gênero de cada jogo.
+
+        Args:
+            games (Sequence[RegistroJogo]): Jogos no formato (ano, grupo, jogo, gêneros, is_indie, app_id).
+        """
+        self._escritor.writerows(
+            (ano, rank, game, genre, is_indie)
+            for ano, rank, game, genres, is_indie, _ in games
+            for genre in genres
+        )
+
+    def close(self) -> str:
+        """
+        Fecha o arquivo CSV. O arquivo só substitui o CSV da carga anterior em `finish`.
+
+        Returns:
+            str: Caminho do arquivo CSV.
+        """
+        self._arquivo.close()
+        self._arquivo = self._escritor = None
+        self._prontos.append(self._caminho)
+        return self._caminho
+
+    def finish(self):
+        """
+        Substitui, ao fim de toda a carga, os CSVs da carga anterior pelos arquivos gravados.
+        """
+        for caminho in self._prontos:
+            os.replace(f"{caminho}.tmp", caminho)
+        self._prontos = []
+
+    def abort(self):
+        """
+        Fecha e remove os arquivos temporários de uma carga interrompida, mantendo os CSVs da carga anterior.
+        """
+        temporarios = [f"{caminho}.tmp" for caminho in self._prontos]
+        if self._arquivo is not None:
+            self._arquivo.close()
+            temporarios.append(f"{self._caminho}.tmp")
+        for temporario in temporarios:
+            try:
+                os.remove(temporario)
+            except FileNotFoundError:
+                pass
+        self._arquivo = self._escritor = None
+        self._prontos = []
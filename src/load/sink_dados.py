@@ -0,0 +1,107 @@
+"""
+Módulo sink_dados: Interface dos destinos (sinks) em que LoadDados grava os dados dos jogos.
+
+Um destino recebe os jogos de uma tabela (best_sellers, best_releases ou most_played) em lotes, um jogo
+por registro no formato (ano, grupo, jogo, gêneros, is_indie, app_id), e decide como gravá-los: o CSV, por
+exemplo, grava uma linha por gênero, e o Parquet grava os gêneros em uma coluna de listas.
+
+Exemplo de uso:
+    >>> from load.sink_csv import SinkCsv
+    >>> sink = SinkCsv("../arquivos")
+    >>> sink.open("best_sellers", ("year", "rank", "game", "genre", "is_indie"))
+    >>> sink.write_games([("2020", "Platinum", "Dota 2", ["Action", "Strategy"], False, 570)])
+    >>> sink.close()
+    '../arquivos/best_sellers.csv'
+    >>> sink.finish()
+
+Classes:
+    SinkDados: Uma classe base para os destinos dos dados dos jogos.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+# Um jogo: (ano, grupo, jogo, gêneros, is_indie, app_id). O app_id é None nos data.json antigos.
+RegistroJogo = Tuple[str, str, str, List[str], bool, Optional[int]]
+
+
+class SinkDados:
+    """
+    Classe SinkDados: Classe base para os destinos dos dados dos jogos.
+
+    As subclasses implementam `open`, `write_games` e `close`, e podem implementar `finish` e `abort`. Uma
+    tabela é gravada por vez.
+
+    Attributes:
+        pasta (str): Pasta em que os arquivos são gravados.
+        extension (str): Extensão dos arquivos gravados.
+
+    Methods:
+        open: Começa a gravar uma tabela.
+        write_games: Grava um lote de jogos na tabela aberta.
+        close: Termina a tabela aberta.
+        finish: Termina a gravação de todas as tabelas.
+        abort: Descarta a gravação interrompida por um erro.
+        path: Retorna o caminho do arquivo de uma tabela.
+    """
+
+    extension = ""
+
+    def __init__(self, pasta : str = "../arquivos") -> None:
+        """
+        Construtor da classe SinkDados.
+
+        Args:
+            pasta (str): Pasta em que os arquivos são gravados.
+        """
+        self.pasta = pasta
+
+    def path(self, name_table : str) -> str:
+        """
+        Retorna o caminho do arquivo de uma tabela.
+
+        Args:
+            name_table (str): Nome da tabela, por exemplo 'best_sellers'.
+
+        Returns:
+            str: Caminho do arquivo.
+        """
+        return f"{self.pasta}/{name_table}.{self.extension}"
+
+    def open(self, name_table : str, header : Sequence[str]):
+        """
+        Começa a gravar uma tabela.
+
+        Args:
+            name_table (str): Nome da tabela, por exemplo 'best_sellers'.
+            header (Sequence[str]): Colunas no formato do CSV, por exemplo
+                ('year', 'rank', 'game', 'genre', 'is_indie').
+        """
+        raise NotImplementedError
+
+    def write_games(self, games : Sequence[RegistroJogo]):
+        """
+        Grava um lote de jogos na tabela aberta.
+
+        Args:
+            games (Sequence[RegistroJogo]): Jogos no formato (ano, grupo, jogo, gêneros, is_indie, app_id).
+        """
+        raise NotImplementedError
+
+    def close(self) -> str:
+        """
+        Termina a tabela aberta.
+
+        Returns:
+            str: Caminho do arquivo gravado.
+        """
+        raise NotImplementedError
+
+    def finish(self):
+        """
+        Termina a gravação de todas as tabelas. Por padrão, não faz nada.
+        """
+
+    def abort(self):
+        """
+        Descarta a gravação interrompida por um erro, fechando os arquivos abertos. Por padrão, não faz nada.
+        """
@@ -0,0 +1,189 @@
+"""
+Módulo sink_delta: Destino que grava as diferenças das tabelas em relação à carga anterior.
+
+Os outros destinos regravam as tabelas inteiras a cada carga, mas a maior parte das linhas não muda entre
+duas execuções. Este destino guarda uma cópia das linhas de cada tabela da última carga (`<tabela>.snapshot.csv`)
+e grava em `delta.csv` apenas as linhas adicionadas, removidas e alteradas, no formato
+(op, category, year, tier, game, genre, is_indie), para que os consumidores apliquem as mudanças em vez
+de recarregar os arquivos completos. Uma linha é identificada por (category, year, tier, game, genre);
+uma linha alterada ('changed') é uma linha que continua na tabela com outro `is_indie`. Na primeira carga,
+sem cópia anterior, todas as linhas são adicionadas.
+
+`delta.csv` e as novas cópias são gravados em arquivos temporários (`.tmp`) e só substituem os anteriores
+em `finish`, ao fim de toda a carga; se a carga falhar, `abort` remove os temporários e a carga anterior
+continua valendo.
+
+Exemplo de uso:
+    >>> sink = SinkDelta("../arquivos")
+    >>> sink.open("best_sellers", ("year", "rank", "game", "genre", "is_indie"))
+    >>> sink.write_games([("2020", "Platinum", "Dota 2", ["Action", "Strategy"], False, 570)])
+    >>> sink.close()
+    '../arquivos/delta.csv'
+    >>> sink.finish()
+    >>> sink.counts
+    {'added': 2, 'removed': 0, 'changed': 0}
+
+Classes:
+    SinkDelta: Uma classe que grava as linhas adicionadas, removidas e alteradas desde a carga anterior.
+"""
+
+import csv
+import os
+from typing import Sequence
+from load.sink_dados import RegistroJogo, SinkDados
+from metrics.metrics_etl import METRICS
+
+HEADER_DELTA = ("op", "category", "year", "tier", "game", "genre", "is_indie")
+
+
+class SinkDelta(SinkDados):
+    """
+    Classe SinkDelta: Grava as linhas adicionadas, removidas e alteradas desde a carga anterior.
+
+    A cópia da tabela atual é gravada aos poucos, junto com os lotes; as linhas atuais ficam na memória
+    até o fim da tabela, uma tabela por vez, para serem comparadas com a cópia anterior.
+
+    Attributes:
+        counts (Dict[str, int]): Quantidade de linhas 'added', 'removed' e 'changed' gravadas em `delta.csv`.
+
+    Methods:
+        open: Começa a cópia da tabela e abre `delta.csv` na primeira tabela.
+        write_games: Guarda uma linha por gênero de cada jogo.
+        close: Compara a tabela com a cópia anterior e grava as diferenças.
+        finish: Substitui `delta.csv` e as cópias anteriores pelos arquivos da carga.
+        abort: Remove os arquivos temporários de uma carga interrompida.
+        delta_path: Retorna o caminho de `delta.csv`.
+    """
+
+    extension = "snapshot.csv"
+
+    def __init__(self, pasta : str = "../arquivos") -> None:
+        """
+        Construtor da classe SinkDelta.
+
+        Args:
+            pasta (str): Pasta em que `delta.csv` e as cópias das tabelas são gravadas.
+        """
+        super().__init__(pasta)
+        self.counts = {"added": 0, "removed": 0, "changed": 0}
+        self._arquivo_delta = None
+        self._delta = None
+        self._tabela = None
+        self._arquivo_copia = None
+        self._copia = None
+        self._linhas = {}
+        self._copias_prontas = []
+
+    def delta_path(self) -> str:
+        """
+        Retorna o caminho de `delta.csv`.
+
+        Returns:
+            str: Caminho do arquivo das diferenças.
+        """
+        return os.path.join(self.pasta, "delta.csv")
+
+    def open(self, name_table : str, header : Sequence[str]):
+        """
+        Começa a cópia da tabela e abre o temporário de `delta.csv` na primeira tabela da carga.
+
+        Args:
+            name_table (str): Nome da tabela, por exemplo 'best_sellers'.
+            header (Sequence[str]): Colunas no formato do CSV, usadas também na cópia da tabela.
+        """
+        if self._delta is None:
+            self._arquivo_delta = open(f"{self.delta_path()}.tmp", 'w', newline='', encoding='utf-8') # pylint: disable=consider-using-with
+            self._delta = csv.writer(self._arquivo_delta, delimiter=';')
+            self._delta.writerow(HEADER_DELTA)
+        self._tabela = name_table
+        self._arquivo_copia = open(f"{self.path(name_table)}.tmp", 'w', newline='', encoding='utf-8') # pylint: disable=consider-using-with
+        self._copia = csv.writer(self._arquivo_copia, delimiter=';')
+        self._copia.writerow(header)
+        self._linhas = {}
+
+    def write_games(self, games : Sequence[RegistroJogo]):
+        """
+        Guarda uma linha por gênero de cada jogo e a grava na cópia da tabela.
+
+        Args:
+            games (Sequence[RegistroJogo]): Jogos no formato (ano, grupo, jogo, gêneros, is_indie, app_id).
+        """
+        for ano, rank, game, genres, is_indie, _ in games:
+            for genre in genres:
+                self._linhas[(ano, rank, game, genre)] = str(is_indie)
+                self._copia.writerow((ano, rank, game, genre, is_indie))
+
+    def close(self) -> str:
+        """
+        Compara a tabela com a cópia da carga anterior e grava as diferenças no temporário de `delta.csv`.
+        A cópia atual substitui a anterior apenas em `finish`.
+
+        Returns:
+            str: Caminho de `delta.csv`.
+        """
+        self._arquivo_copia.close()
+        caminho = self.path(self._tabela)
+        if os.path.exists(caminho):
+            with open(caminho, 'r', newline='', encoding='utf-8') as arquivo:
+                leitor = csv.reader(arquivo, delimiter=';')
+                next(leitor, None)
+                for ano, rank, game, genre, is_indie in leitor:
+                    atual = self._linhas.pop((ano, rank, game, genre), None)
+                    if atual is None:
+                        self._write_delta("removed", (ano, rank, game, genre), is_indie)
+                    elif atual != is_indie:
+                        self._write_delta("changed", (ano, rank, game, genre), atual)
+        for chave, is_indie in self._linhas.items():
+            self._write_delta("added", chave, is_indie)
+        self._copias_prontas.append(caminho)
+        self._linhas = {}
+        self._arquivo_copia = self._copia = None
+        return self.delta_path()
+
+    def _write_delta(self, op : str, chave : tuple, is_indie : str):
+        """
+        Grava uma linha em `delta.csv` e a soma às medições ('load.delta.<op>').
+
+        Args:
+            op (str): 'added', 'removed' ou 'changed'.
+            chave (tuple): Linha no formato (ano, grupo, jogo, gênero).
+            is_indie (str): Valor de is_indie da linha ('True' ou 'False'); o anterior nas linhas removidas.
+        """
+        self._delta.writerow((op, self._tabela, *chave, is_indie))
+        self.counts[op] += 1
+        METRICS.count(f"load.delta.{op}")
+
+    def finish(self):
+        """
+        Fecha `delta.csv` e substitui, de uma só vez, o `delta.csv` e as cópias das tabelas da carga anterior.
+        """
+        if self._arquivo_delta is None:
+            return
+        self._arquivo_delta.close()
+        self._arquivo_delta = self._delta = None
+        for caminho in self._copias_prontas:
+            os.replace(f"{caminho}.tmp", caminho)
+        self._copias_prontas = []
+        os.replace(f"{self.delta_path()}.tmp", self.delta_path())
+
+    def abort(self):
+        """
+        Fecha e remove os arquivos temporários de uma carga interrompida, mantendo `delta.csv` e as cópias
+        das tabelas da carga anterior.
+        """
+        temporarios = [f"{caminho}.tmp" for caminho in self._copias_prontas]
+        if self._arquivo_copia is not None:
+            self._arquivo_copia.close()
+            temporarios.append(f"{self.path(self._tabela)}.tmp")
+        if self._arquivo_delta is not None:
+            self._arquivo_delta.close()
+            temporarios.append(f"{self.delta_path()}.tmp")
+        for temporario in temporarios:
+            try:
+                os.remove(temporario)
+            except FileNotFoundError:
+                pass
+        self._arquivo_delta = self._delta = self._arquivo_copia = self._copia = None
+        self._copias_prontas = []
+        self._linhas = {}
+        self.counts = dict.fromkeys(self.counts, 0)
@@ -0,0 +1,142 @@
+"""
+Módulo sink_parquet: Destino que grava os dados dos jogos em arquivos Parquet.
+
+Em vez de uma linha por gênero, como no CSV, cada jogo é um registro com os gêneros em uma coluna de
+listas. As colunas são tipadas: `year`, `simultaneous_players`, `is_indie` e `app_id` (o ID do
+aplicativo na Steam) como números e booleanos, e `rank` e `game` codificadas por dicionário. Os arquivos
+são comprimidos com zstd.
+
+Depende do pacote opcional `pyarrow` (`pip install pyarrow`).
+
+Classes:
+    SinkParquet: Uma classe que grava os dados dos jogos em arquivos Parquet.
+"""
+
+from typing import Sequence
+from load.sink_dados import RegistroJogo, SinkDados
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+def schema_parquet(header : Sequence[str]):
+    """
+    Monta o esquema Parquet a partir das colunas no formato do CSV.
+
+    A coluna 'genre' do CSV vira a coluna de listas 'genres', e a coluna 'app_id' é acrescentada.
+
+    Args:
+        header (Sequence[str]): Colunas no formato do CSV, por exemplo
+            ('year', 'rank', 'game', 'genre', 'is_indie').
+
+    Returns:
+        pyarrow.Schema: Esquema do arquivo Parquet.
+    """
+    tipos = {
+        'year': pa.int16(),
+        'rank': pa.dictionary(pa.int32(), pa.string()),
+        'simultaneous_players': pa.int32(),
+        'game': pa.dictionary(pa.int32(), pa.string()),
+        'genres': pa.list_(pa.string()),
+        'is_indie': pa.bool_(),
+        'app_id': pa.int32(),
+    }
+    colunas = ['genres' if coluna == 'genre' else coluna for coluna in header] + ['app_id']
+    return pa.schema([(coluna, tipos[coluna]) for coluna in colunas])
+
+
+def inteiro(texto : str):
+    """
+    Converte um texto em número inteiro.
+
+    Args:
+        texto (str): Texto, por exemplo o ano ou a quantidade de jogadores simultâneos.
+
+    Returns:
+        Optional[int]: O número, ou None (valor nulo no Parquet) se o texto não for um número.
+    """
+    try:
+        return int(texto)
+    except ValueError:
+        return None
+
+
+class SinkParquet(SinkDados):
+    """
+    Classe SinkParquet: Grava os dados dos jogos em arquivos Parquet, um registro por jogo.
+
+    Attributes:
+        compression (str): Compressão dos arquivos Parquet.
+
+    Methods:
+        open: Abre o arquivo Parquet da tabela.
+        write_games: Grava um lote de jogos como um grupo de linhas (row group).
+        close: Fecha o arquivo Parquet.
+    """
+
+    extension = "parquet"
+
+    def __init__(self, pasta : str = "../arquivos", compression : str = "zstd") -> None:
+        """
+        Construtor da classe SinkParquet.
+
+        Args:
+            pasta (str): Pasta em que os arquivos Parquet são gravados.
+            compression (str): Compressão dos arquivos Parquet.
+
+        Raises:
+            ImportError: Se o pacote `pyarrow` não estiver instalado.
+        """
+        if pa is None:
+            raise ImportError("O destino 'parquet' precisa do pacote pyarrow (pip install pyarrow)")
+        super().__init__(pasta)
+        self.compression = compression
+        self._schema = None
+        self._escritor = None
+        self._caminho = None
+
+    def open(self, name_table : str, header : Sequence[str]):
+        """
+        Abre o arquivo Parquet da tabela.
+
+        Args:
+            name_table (str): Nome da tabela, por exemplo 'best_sellers'.
+            header (Sequence[str]): Colunas no formato do CSV.
+        """
+        self._caminho = self.path(name_table)
+        self._schema = schema_parquet(header)
+        self._escritor = pq.ParquetWriter(self._caminho, self._schema, compression=self.compression)
+
+    def write_games(self, games : Sequence[RegistroJogo]):
+        """
+        Grava um lote de jogos como um grupo de linhas (row group).
+
+        Args:
+            games (Sequence[RegistroJogo]): Jogos no formato (ano, grupo, jogo, gêneros, is_indie, app_id).
+        """
+        if not games:
+            return
+        anos, ranks, nomes, generos, indies, app_ids = zip(*games)
+        colunas = {'year': [inteiro(ano) for ano in anos], 'rank': ranks, 'game': nomes, 'genres': generos,
+                   'is_indie': indies, 'app_id': app_ids}
+        if 'simultaneous_players' in self._schema.names:
+            colunas['simultaneous_players'] = [inteiro(rank) for rank in ranks]
+        self._escritor.write_table(pa.table(
+            [pa.array(colunas[campo.name], type=campo.type) for campo in self._schema],
+            schema=self._schema
+        ))
+
+    def close(self) -> str:
+        """
+        Fecha o arquivo Parquet.
+
+        Returns:
+            str: Caminho do arquivo Parquet.
+        """
+        self._escritor.close()
+        self._escritor = None
+        return self._caminho
@@ -0,0 +1,305 @@
+"""
+Módulo sink_sqlite: Destino que grava os dados dos jogos em um banco SQLite normalizado.
+
+Em vez de uma tabela por arquivo, todas as tabelas (best_sellers, best_releases e most_played) vão para o
+mesmo banco, em um esquema dimensional:
+
+    games(app_id, name, is_indie): Um registro por jogo, identificado pelo ID do aplicativo na Steam.
+    genres(genre_id, name): Um registro por gênero.
+    game_genre(app_id, genre_id): Os gêneros de cada jogo, reunindo os de todas as suas posições na carga.
+    rankings(ranking_id, category, year, tier, app_id, name): As posições dos jogos, por categoria, ano e
+        grupo (por exemplo 'Platinum' ou '100000' jogadores simultâneos), com o nome exibido na lista.
+    ranking_genre(ranking_id, genre_id): Os gêneros de cada posição, como lidos na página do jogo naquele ano.
+
+Toda a carga roda em uma única transação, confirmada em `finish`, com inserções em lote (`executemany`).
+Rodar a carga de novo atualiza os jogos (upsert) e substitui as posições dos anos carregados, sem
+duplicar registros. A junção de `rankings` com `ranking_genre` tem uma linha por linha dos arquivos CSV,
+mesmo quando um jogo muda de gêneros entre os anos ou aparece com nomes diferentes para o mesmo app_id.
+Um banco gravado antes de `ranking_genre` existir é migrado em `open` (`MIGRACAO_RANKINGS`).
+
+Exemplo de uso:
+    >>> sink = SinkSqlite("../arquivos")
+    >>> sink.open("best_sellers", ("year", "rank", "game", "genre", "is_indie"))
+    >>> sink.write_games([("2020", "Platinum", "Dota 2", ["Action", "Strategy"], False, 570)])
+    >>> sink.close()
+    '../arquivos/steam.sqlite'
+    >>> sink.finish()
+    >>> indie_share('../arquivos/steam.sqlite', 'best_sellers')
+    [(2020, 'Platinum', 1, 0, 0.0)]
+
+Funções:
+    chave_jogo: Retorna a chave de um jogo na tabela games.
+    indie_share: Retorna a proporção de jogos indie por ano e grupo de uma categoria.
+
+Classes:
+    SinkSqlite: Uma classe que grava os dados dos jogos em um banco SQLite.
+"""
+
+import hashlib
+import sqlite3
+from typing import List, Optional, Sequence, Tuple
+from load.sink_dados import RegistroJogo, SinkDados
+
+ESQUEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS games (
+    app_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    is_indie INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS genres (
+    genre_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS game_genre (
+    app_id INTEGER NOT NULL REFERENCES games (app_id),
+    genre_id INTEGER NOT NULL REFERENCES genres (genre_id),
+    PRIMARY KEY (app_id, genre_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rankings (
+    ranking_id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    tier TEXT NOT NULL,
+    app_id INTEGER NOT NULL REFERENCES games (app_id),
+    name TEXT NOT NULL,
+    UNIQUE (category, year, tier, app_id, name)
+);
+CREATE TABLE IF NOT EXISTS ranking_genre (
+    ranking_id INTEGER NOT NULL REFERENCES rankings (ranking_id),
+    genre_id INTEGER NOT NULL REFERENCES genres (genre_id),
+    PRIMARY KEY (ranking_id, genre_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_rankings_year ON rankings (year);
+CREATE INDEX IF NOT EXISTS idx_rankings_app_id ON rankings (app_id);
+CREATE INDEX IF NOT EXISTS idx_game_genre_genre ON game_genre (genre_id);
+CREATE INDEX IF NOT EXISTS idx_ranking_genre_genre ON ranking_genre (genre_id);
+CREATE INDEX IF NOT EXISTS idx_games_is_indie ON games (is_indie);
+"""
+
+# Banco de antes de `ranking_genre`: as posições não tinham nome nem gêneros próprios, então recebem o nome
+# atual do jogo e os gêneros de `game_genre`
+MIGRACAO_RANKINGS = """
+BEGIN;
+DROP INDEX IF EXISTS idx_rankings_year;
+DROP INDEX IF EXISTS idx_rankings_app_id;
+ALTER TABLE rankings RENAME TO rankings_antigo;
+""" + ESQUEMA_SQLITE + """
+INSERT INTO rankings (category, year, tier, app_id, name)
+SELECT r.category, r.year, r.tier, r.app_id, g.name FROM rankings_antigo AS r JOIN games AS g ON g.app_id = r.app_id;
+INSERT INTO ranking_genre (ranking_id, genre_id)
+SELECT r.ranking_id, gg.genre_id FROM rankings AS r JOIN game_genre AS gg ON gg.app_id = r.app_id;
+DROP TABLE rankings_antigo;
+COMMIT;
+"""
+
+SQL_UPSERT_GAME = """
+INSERT INTO games (app_id, name, is_indie) VALUES (?, ?, ?)
+ON CONFLICT (app_id) DO UPDATE SET name = excluded.name, is_indie = excluded.is_indie
+"""
+
+# Os gêneros das posições saem antes das posições de um ano da categoria
+SQL_DELETE_RANKINGS = (
+    "DELETE FROM ranking_genre WHERE ranking_id IN (SELECT ranking_id FROM rankings WHERE category = ? AND year = ?)",
+    "DELETE FROM rankings WHERE category = ? AND year = ?",
+)
+
+SQL_INSERT_RANKING_GENRE = """
+INSERT OR IGNORE INTO ranking_genre (ranking_id, genre_id)
+SELECT ranking_id, ? FROM rankings WHERE category = ? AND year = ? AND tier = ? AND app_id = ? AND name = ?
+"""
+
+CONSULTA_INDIE_SHARE = """
+SELECT r.year, r.tier, COUNT(*) AS games, SUM(g.is_indie) AS indies, AVG(g.is_indie) AS indie_share
+FROM rankings AS r JOIN games AS g ON g.app_id = r.app_id
+WHERE r.category = ?
+GROUP BY r.year, r.tier
+ORDER BY r.year, r.tier
+"""
+
+
+def chave_jogo(app_id : Optional[int], name : str) -> int:
+    """
+    Retorna a chave de um jogo na tabela games.
+
+    Os data.json antigos não têm o ID do aplicativo na Steam; nesse caso, a chave é um número negativo
+    derivado do nome do jogo, que não colide com os IDs da Steam e é o mesmo em todas as cargas.
+
+    Args:
+        app_id (Optional[int]): ID do aplicativo na Steam, ou None.
+        name (str): Nome do jogo.
+
+    Returns:
+        int: Chave do jogo.
+    """
+    if app_id is not None:
+        return app_id
+    return -int(hashlib.sha1(name.encode('utf-8')).hexdigest()[:15], 16)
+
+
+def indie_share(caminho : str, category : str) -> List[Tuple[int, str, int, int, float]]:
+    """
+    Retorna a proporção de jogos indie por ano e grupo de uma categoria.
+
+    Args:
+        caminho (str): Caminho do banco SQLite.
+        category (str): Categoria, por exemplo 'best_sellers'.
+
+    Returns:
+        List[Tuple[int, str, int, int, float]]: Registros (ano, grupo, jogos, jogos indie, proporção indie).
+    """
+    with sqlite3.connect(caminho) as conexao:
+        return conexao.execute(CONSULTA_INDIE_SHARE, (category,)).fetchall()
+
+
+class SinkSqlite(SinkDados):
+    """
+    Classe SinkSqlite: Grava os dados dos jogos em um banco SQLite normalizado, em uma única transação.
+
+    Attributes:
+        database (str): Nome do banco, sem a extensão.
+
+    Methods:
+        open: Abre o banco (na primeira tabela) e começa a gravar uma categoria.
+        write_games: Grava um lote de jogos, seus gêneros e suas posições.
+        close: Termina a categoria aberta.
+        finish: Confirma a transação e fecha o banco.
+        abort: Desfaz a transação de uma carga interrompida e fecha o banco.
+        path: Retorna o caminho do banco.
+    """
+
+    extension = "sqlite"
+
+    def __init__(self, pasta : str = "../arquivos", database : str = "steam") -> None:
+        """
+        Construtor da classe SinkSqlite.
+
+        Args:
+            pasta (str): Pasta em que o banco é gravado.
+            database (str): Nome do banco, sem a extensão.
+        """
+        super().__init__(pasta)
+        self.database = database
+        self._conexao = None
+        self._category = None
+        self._genre_ids = {}
+        self._games_vistos = set()
+        self._anos_vistos = set()
+
+    def path(self, name_table : str = None) -> str:
+        """
+        Retorna o caminho do banco, o mesmo para todas as tabelas.
+
+        Args:
+            name_table (str): Nome da tabela (ignorado).
+
+        Returns:
+            str: Caminho do banco.
+        """
+        return super().path(self.database)
+
+    def open(self, name_table : str, header : Sequence[str]):
+        """
+        Abre o banco (na primeira tabela), criando o esquema e a transação, e começa a gravar uma categoria.
+
+        Args:
+            name_table (str): Nome da tabela, usado como categoria, por exemplo 'best_sellers'.
+            header (Sequence[str]): Colunas no formato do CSV (ignoradas; o esquema é o mesmo para todas).
+        """
+        if self._conexao is None:
+            self._conexao = sqlite3.connect(self.path(), isolation_level=None)
+            colunas = {coluna for _, coluna, *_ in self._conexao.execute("PRAGMA table_info(rankings)")}
+            self._conexao.executescript(MIGRACAO_RANKINGS if colunas and 'ranking_id' not in colunas else ESQUEMA_SQLITE)
+            self._conexao.execute("BEGIN")
+            self._genre_ids = dict(self._conexao.execute("SELECT name, genre_id FROM genres"))
+        self._category = name_table
+
+    def _ids_genres(self, games : Sequence[RegistroJogo]):
+        """
+        Cadastra os gêneros ainda desconhecidos do lote e guarda os seus IDs.
+
+        Args:
+            games (Sequence[RegistroJogo]): Jogos do lote.
+        """
+        novos = {genre for *_, genres, _, _ in games for genre in genres} - self._genre_ids.keys()
+        if novos:
+            self._conexao.executemany("INSERT OR IGNORE INTO genres (name) VALUES (?)", ((g,) for g in novos))
+            self._genre_ids.update(self._conexao.execute("SELECT name, genre_id FROM genres"))
+
+    def write_games(self, games : Sequence[RegistroJogo]):
+        """
+        Grava um lote de jogos, seus gêneros e suas posições.
+
+        Os gêneros de um jogo e as posições de um ano da categoria são substituídos na primeira vez em que
+        aparecem na carga, para que uma nova carga não duplique registros. Depois disso, os gêneros das
+        outras posições do jogo são somados aos seus gêneros em `game_genre`; cada posição guarda os
+        próprios gêneros em `ranking_genre`.
+
+        Args:
+            games (Sequence[RegistroJogo]): Jogos no formato (ano, grupo, jogo, gêneros, is_indie, app_id).
+        """
+        if not games:
+            return
+        self._ids_genres(games)
+        registros = [(int(ano), rank, chave_jogo(app_id, game), game, genres, is_indie)
+                     for ano, rank, game, genres, is_indie, app_id in games]
+
+        self._conexao.executemany(SQL_UPSERT_GAME, ((chave, game, int(is_indie))
+                                                    for _, _, chave, game, _, is_indie in registros))
+
+        novos_games = {chave for _, _, chave, *_ in registros} - self._games_vistos
+        self._games_vistos.update(novos_games)
+        self._conexao.executemany("DELETE FROM game_genre WHERE app_id = ?", ((c,) for c in novos_games))
+        self._conexao.executemany("INSERT OR IGNORE INTO game_genre (app_id, genre_id) VALUES (?, ?)",
+                                  ((chave, self._genre_ids[genre])
+                                   for _, _, chave, _, genres, _ in registros for genre in genres))
+
+        novos_anos = {(self._category, ano) for ano, *_ in registros} - self._anos_vistos
+        self._anos_vistos.update(novos_anos)
+        for sql in SQL_DELETE_RANKINGS:
+            self._conexao.executemany(sql, novos_anos)
+        self._conexao.executemany(
+            "INSERT OR IGNORE INTO rankings (category, year, tier, app_id, name) VALUES (?, ?, ?, ?, ?)",
+            ((self._category, ano, rank, chave, game) for ano, rank, chave, game, *_ in registros))
+        self._conexao.executemany(SQL_INSERT_RANKING_GENRE,
+                                  ((self._genre_ids[genre], self._category, ano, rank, chave, game)
+                                   for ano, rank, chave, game, genres, _ in registros for genre in genres))
+
+    def close(self) -> str:
+        """
+        Termina a categoria aberta. A transação só é confirmada em `finish`.
+
+        Returns:
+            str: Caminho do banco.
+        """
+        self._category = None
+        return self.path()
+
+    def finish(self):
+        """
+        Confirma a transação de toda a carga e fecha o banco.
+        """
+        if self._conexao is None:
+            return
+        self._conexao.execute("COMMIT")
+        self._fechar()
+
+    def abort(self):
+        """
+        Desfaz a transação de uma carga interrompida e fecha o banco, que continua com os dados da carga
+        anterior.
+        """
+        if self._conexao is None:
+            return
+        if self._conexao.in_transaction:
+            self._conexao.execute("ROLLBACK")
+        self._fechar()
+
+    def _fechar(self):
+        """
+        Fecha o banco e esquece os jogos e anos vistos na carga.
+        """
+        self._conexao.close()
+        self._conexao = None
+        self._category = None
+        self._games_vistos.clear()
+        self._anos_vistos.clear()
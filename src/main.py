@@ -1,82 +1,263 @@
 """
-Módulo principal: Fornece funcionalidades para extrair dados das páginas HTML, transformá-los e salvá-los em arquivos CSV.
+Módulo principal: Fornece funcionalidades para extrair dados das páginas HTML, transformá-los e salvá-los em arquivos CSV
+(e Parquet, SQLite ou as diferenças em relação à carga anterior em `delta.csv`, com `ETL_SINKS`).
+
+Uso:
+    python main.py [--refresh-older-than DURACAO] [--profile]
+
+    Sem data.json, ou se a última extração foi interrompida, os dados são extraídos, retomando do diário
+    da extração (arquivos/journal.jsonl) o que já tinha terminado. Com `--refresh-older-than`, a
+    extração é incremental: apenas as listas e jogos obtidos há mais tempo do que DURACAO (por exemplo
+    `7d`, `12h`, `30m` ou segundos; `0` busca tudo) são buscados novamente.
+
+    No fim, o tempo de cada etapa, os contadores e as latências das chamadas são impressos e gravados em
+    arquivos/metrics.json. Com `--profile`, cada etapa também é executada com o cProfile e o tracemalloc,
+    e as estatísticas do cProfile são gravadas em arquivos/profile/<etapa>.prof.
+
+    Os módulos pesados (Selenium, BeautifulSoup, requests e pyarrow) só são importados quando usados: sem
+    extração, apenas a gravação das tabelas em CSV é carregada. O tempo das importações e o tempo até a
+    primeira página buscada aparecem nas medições ('startup.*').
 
 Funções:
+    parse_duration: Converte uma duração como '7d' ou '12h' em segundos.
     extract_and_transform: Extrai dados das páginas HTML e os transforma, salvando-os em um arquivo JSON.
-    get_csvs: Carrega os dados do arquivo JSON e os converte em strings formatadas em CSV.
-    save_csv: Salva uma string formatada em CSV em um arquivo CSV.
-    get_and_save_csv: Obtém os dados convertidos em CSV e os salva em arquivos CSV.
+    get_tables: Lê o arquivo JSON categoria por categoria e prepara os dados de cada tabela.
+    create_sinks: Cria os destinos (CSV, Parquet, SQLite) em que as tabelas são gravadas.
+    get_and_save_tables: Obtém os dados de cada tabela e os grava nos destinos.
+    report_metrics: Imprime o resumo das medições do ETL e o grava em JSON.
+    main: Executa o ETL.
 """
 
+# Importado primeiro: a instância METRICS marca o início da contagem do tempo de inicialização
+from metrics.metrics_etl import METRICS
+import argparse
+import importlib
 import os
-import json
-import csv
-from transform.html_transform import HtmlTransform
+import time
+from config.config_etl import ConfigEtl
+from load.json_stream import JsonStreamReader, JsonStreamWriter
+from transform.checkpoint_journal import CheckpointJournal
 from load.load_dados import LoadDados
 
+UNIDADES_DURACAO = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+# Módulo e classe de cada destino, importados apenas quando o destino é usado
+SINKS = {'csv': ('load.sink_csv', 'SinkCsv'), 'parquet': ('load.sink_parquet', 'SinkParquet'),
+         'sqlite': ('load.sink_sqlite', 'SinkSqlite'), 'delta': ('load.sink_delta', 'SinkDelta')}
+
+
+def parse_duration(texto):
+    """
+    Converte uma duração como '7d', '12h', '30m', '45s' ou '3600' em segundos.
+
+    Args:
+        texto (str): Duração com unidade opcional (s, m, h ou d).
 
-def extract_and_transform():
+    Returns:
+        float: Duração em segundos.
+
+    Raises:
+        argparse.ArgumentTypeError: Se o texto não for uma duração válida.
+    """
+    texto = texto.strip().lower()
+    multiplicador = UNIDADES_DURACAO.get(texto[-1:], None)
+    numero = texto[:-1] if multiplicador else texto
+    try:
+        return float(numero) * (multiplicador or 1)
+    except ValueError as erro:
+        raise argparse.ArgumentTypeError(f"duração inválida: {texto!r}") from erro
+
+
+
+def save_json(transform, path='../arquivos/data.json'):
+    """
+    Salva os dados já transformados em um arquivo JSON, ano por ano.
+
+    Args:
+        transform (HtmlTransform): Instância com os dados extraídos.
+        path (str): Caminho do arquivo JSON.
+    """
+    # Salvando os dados como um arquivo JSON com codificação UTF-8
+    with JsonStreamWriter(path) as writer:
+        for category, years in transform.iter_set_data():
+            writer.write_category(category, years)
+
+def extract_and_transform(config, refresh_older_than=None):
     """
     Extrai dados das páginas HTML e os transforma, salvando-os em um arquivo JSON.
+
+    Cada lista e jogo terminado é gravado no diário da extração, e os resultados já gravados são
+    retomados em vez de buscados novamente. Se a execução for interrompida (Ctrl-C) durante a busca das
+    páginas dos jogos, os jogos já processados são salvos antes de encerrar.
+
+    Args:
+        config (ConfigEtl): Configurações do ETL.
+        refresh_older_than (float): Idade máxima, em segundos, dos resultados retomados do diário.
+            Com None, todos os resultados do diário são retomados.
     """
-    transform = HtmlTransform()
-    transform.get_lists_per_year()
-    transform.fill_lists_with_game_information()
-    # Salvando o dicionário como um arquivo JSON com codificação UTF-8
-    with open("../arquivos/data.json", "w", encoding="utf-8") as arquivo:
-        json.dump(transform.return_set_data(), arquivo, ensure_ascii=False, indent=4)
-    transform.quit_transform()
+    # Importado só aqui: carrega o Selenium, o requests e o BeautifulSoup, desnecessários sem extração
+    inicio = time.perf_counter()
+    from transform.html_transform import HtmlTransform # pylint: disable=import-outside-toplevel
+    METRICS.observe('startup.extract_imports', time.perf_counter() - inicio)
+    path_json = os.path.join(config.output_dir, 'data.json')
+    journal = CheckpointJournal(config.journal_path)
+    transform = HtmlTransform(config)
+    retomados = transform.resume(journal, refresh_older_than)
+    if retomados:
+        print(f"Retomando {retomados} listas e jogos do diário da extração.")
+    try:
+        with METRICS.stage('extract_lists'):
+            transform.get_lists_per_year()
+        try:
+            with METRICS.stage('fill_games'):
+                transform.fill_lists_with_game_information()
+        except KeyboardInterrupt:
+            save_json(transform, path_json)
+            print("Extração interrompida: os jogos já processados foram salvos em data.json "
+                  "e a próxima execução continuará de onde parou.")
+            raise
+        with METRICS.stage('save_json'):
+            save_json(transform, path_json)
+        journal.append_complete()
+        journal.compact()
+    finally:
+        transform.quit_transform()
+    print(f"Páginas de jogos buscadas: {transform.fetches_unique} "
+          f"({transform.fetches_saved} buscas evitadas pela deduplicação)")
+    print(f"Páginas analisadas: {transform.parser.parsed} ({transform.parser.workers} processos; "
+          f"{transform.parser.blocked_s:.1f}s de espera por um analisador livre; {transform.parser.reused} "
+          f"resultados reaproveitados de páginas sem mudanças)")
+    if transform.cache:
+        print(f"Cache de páginas: {transform.cache.hits} acertos, {transform.cache.misses} faltas, "
+              f"{METRICS.counters.get('http.not_modified', 0)} revalidadas sem download (304)")
+        METRICS.count('cache.hits', transform.cache.hits)
+        METRICS.count('cache.misses', transform.cache.misses)
+    METRICS.count('transform.fetches_unique', transform.fetches_unique)
+    METRICS.count('transform.fetches_saved', transform.fetches_saved)
+    METRICS.count('transform.failures', len(transform.failures))
+    for page_type, stats in transform.pool.readiness.summary().items():
+        print(f"Espera das páginas '{page_type}': {stats['pages']} páginas, {stats['wait_s']:.1f}s esperados, "
+              f"{stats['saved_s']:.1f}s economizados em relação às pausas fixas")
+    paginas_navegador = METRICS.counters.get('navegador.pages', 0)
+    if paginas_navegador:
+        print(f"Navegador: {paginas_navegador} páginas, "
+              f"{METRICS.counters.get('navegador.transfer_bytes', 0) / paginas_navegador / 1024:.0f} KB transferidos "
+              f"por página, {METRICS.counters.get('navegador.blocked_requests', 0)} requisições bloqueadas "
+              f"(modo enxuto {'ligado' if config.browser_lean else 'desligado'})")
+        print(f"Navegador: {METRICS.counters.get('navegador.restarts', 0)} reinícios, "
+              f"{METRICS.counters.get('navegador.timeouts', 0)} tempos esgotados, "
+              f"{METRICS.counters.get('navegador.crashes', 0)} quedas, pico de memória "
+              f"{METRICS.peaks.get('navegador.rss_mb', 0.0):.0f} MB")
+    if transform.crawler:
+        scheduler = transform.crawler.scheduler.summary()
+        print(f"Concorrência: limite final {scheduler['limit']} (mínimo {scheduler['min_limit']}), "
+              f"{scheduler['increases']} aumentos, {scheduler['decreases']} reduções, "
+              f"{scheduler['throttled']} respostas 429/503, {scheduler['anomalies']} anomalias")
+    for name_list, year, name_group, name_game, erro in transform.failures:
+        print(f"Falha ao obter os gêneros de '{name_game}' ({name_list}, {year}, {name_group}): {erro}")
 
-def get_csvs():
+def get_tables(path_json='../arquivos/data.json'):
     """
-    Carrega os dados do arquivo JSON e os converte em strings formatadas em CSV.
+    Lê o arquivo JSON categoria por categoria e prepara os dados de cada tabela.
+
+    O arquivo é lido aos poucos, um ano de cada vez, então os anos de cada tabela devem ser consumidos
+    antes de avançar para a próxima.
+
+    Args:
+        path_json (str): Caminho do arquivo JSON.
+
+    Returns:
+        Iterator[Tuple[str, Tuple[str, ...], Iterator[Tuple[str, Dict]]]]: Para os jogos mais vendidos,
+            melhores lançamentos e mais jogados, o nome da tabela, as colunas e o iterador dos anos.
+    """
+    load_data = LoadDados()
+    tables = {
+        'best sellers': ('best_sellers', load_data.header_best_sellers_and_best_releases),
+        'best releases': ('best_releases', load_data.header_best_sellers_and_best_releases),
+        'most played': ('most_played', load_data.header_most_played),
+    }
+    for category, years in JsonStreamReader(path_json).categories():
+        name_table, header = tables[category]
+        yield name_table, header, years
+
+def create_sinks(names_sinks, pasta='../arquivos'):
+    """
+    Cria os destinos em que as tabelas são gravadas, importando apenas os módulos dos destinos usados.
+
+    Args:
+        names_sinks (List[str]): Nomes dos destinos, por exemplo ['csv', 'parquet'].
+        pasta (str): Pasta em que os destinos gravam as tabelas.
 
     Returns:
-        List[str]: Lista contendo as strings formatadas em CSV para os jogos mais vendidos, melhores lançamentos e mais jogados.
+        List[SinkDados]: Destinos que gravam na pasta informada.
+    """
+    sinks = []
+    for name in names_sinks:
+        modulo, classe = SINKS[name]
+        sinks.append(getattr(importlib.import_module(modulo), classe)(pasta))
+    return sinks
+
+def get_and_save_tables(sinks, path_json='../arquivos/data.json'):
+    """
+    Obtém os dados de cada tabela, os grava nos destinos informados e termina a gravação de cada destino.
+    Se a leitura ou a gravação falhar, a gravação de todos os destinos é descartada.
+
+    Args:
+        sinks (List[SinkDados]): Destinos, por exemplo SinkCsv e SinkParquet.
+        path_json (str): Caminho do arquivo JSON com os dados.
     """
-    dados = {}
-    with open('../arquivos/data.json', 'r', encoding='utf-8') as arquivo:
-        dados = json.load(arquivo)
     load_data = LoadDados()
-    best_sellers_csv = load_data.load_data_best_sellers_csv(dados['best sellers'])
-    best_releases_csv = load_data.load_data_best_releases_csv(dados['best releases'])
-    most_played_csv = load_data.load_data_most_played_csv(dados['most played'])
-    dados = None
-    return [best_sellers_csv, best_releases_csv, most_played_csv]
+    try:
+        for name_table, header, years in get_tables(path_json):
+            with METRICS.timer(f"load.table.{name_table}"):
+                load_data.load(name_table, header, years, sinks)
+    except BaseException:
+        for sink in sinks:
+            sink.abort()
+        raise
+    for sink in sinks:
+        with METRICS.timer(f"load.{type(sink).__name__}.finish"):
+            sink.finish()
 
-def save_csv(name_csv, string_for_save):
+def report_metrics(config):
     """
-    Salva uma string formatada em CSV em um arquivo CSV.
+    Imprime o resumo das medições do ETL e o grava em JSON, se configurado.
 
     Args:
-        name_csv (str): Nome do arquivo CSV a ser salvo.
-        string_for_save (str): String formatada em CSV a ser salva no arquivo.
-    """
-    rows = string_for_save.split('\n') # Dividindo a string em linhas
-    with open(f'../arquivos/{name_csv}.csv', 'w', newline='', encoding='utf-8') as arquivo_csv:
-        escritor_csv = csv.writer(arquivo_csv, delimiter=';')
-        for row in rows:
-            if row == "":
-                continue
-            colunas = row.split(';')
-            escritor_csv.writerow(colunas)
-
-def get_and_save_csv():
-    """
-    Obtém os dados convertidos em CSV e os salva em arquivos CSV.
-    """
-    csvs = get_csvs()
-    #print(csvs)
-    save_csv('best_sellers', csvs[0])
-    save_csv('best_releases', csvs[1])
-    save_csv('most_played', csvs[2])
-
-# Verificar se o arquivo dados.json existe
-if not os.path.exists('../arquivos/data.json'):
-    # O arquivo dados.json não existe, extrai-lo
-    extract_and_transform()
-    get_and_save_csv()
-
-else:
-    # arquivo existente
-    get_and_save_csv()
+        config (ConfigEtl): Configurações do ETL, com o caminho do resumo.
+    """
+    METRICS.print_summary()
+    if config.metrics_path:
+        METRICS.write_json(config.metrics_path)
+        print(f"Medições gravadas em {config.metrics_path}")
+
+def main():
+    """
+    Executa o ETL: extrai os dados quando necessário e grava as tabelas nos destinos configurados.
+    """
+    parser = argparse.ArgumentParser(description="ETL dos jogos mais vendidos, mais jogados e melhores "
+                                                 "lançamentos da Steam.")
+    parser.add_argument('--refresh-older-than', type=parse_duration, default=None, metavar='DURACAO',
+                        help="Atualiza o data.json buscando novamente apenas as listas e jogos obtidos há "
+                             "mais tempo do que DURACAO (ex.: 7d, 12h, 30m; 0 busca tudo).")
+    parser.add_argument('--profile', action='store_true',
+                        help="Executa cada etapa com o cProfile e o tracemalloc e grava os perfis em "
+                             "arquivos/profile.")
+    args = parser.parse_args()
+    METRICS.observe('startup.imports', time.perf_counter() - METRICS.started_at)
+    config = ConfigEtl()
+    METRICS.configure(profile=args.profile, profile_dir=os.path.join(config.output_dir, 'profile'))
+    path_json = os.path.join(config.output_dir, 'data.json')
+    try:
+        # Verificar se o arquivo dados.json existe e se a última extração terminou
+        if (not os.path.exists(path_json)
+                or args.refresh_older_than is not None
+                or CheckpointJournal(config.journal_path).is_incomplete()):
+            extract_and_transform(config, args.refresh_older_than)
+        with METRICS.stage('load'):
+            get_and_save_tables(create_sinks(config.sinks, config.output_dir), path_json)
+    finally:
+        report_metrics(config)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,392 @@
+"""
+Módulo metrics_etl: Medições de tempo, contadores e perfis de cada etapa do ETL.
+
+Este módulo oferece a classe MetricsEtl, que registra a latência de cada chamada instrumentada em um
+histograma (por exemplo, o carregamento de cada página no navegador ou a análise de cada HTML), contadores
+(páginas buscadas, bytes baixados, acertos do cache, avisos de idade), picos (memória do navegador) e o
+tempo de cada etapa do ETL. No fim da execução, o resumo é impresso e gravado em JSON.
+
+Com o perfil ativado (`python main.py --profile`), cada etapa também é executada com o cProfile e o
+tracemalloc: as estatísticas do cProfile são gravadas em um arquivo `.prof` por etapa (que pode ser aberto
+com `python -m pstats` ou o snakeviz), e o resumo inclui as funções mais demoradas, o pico de memória e os
+pontos do código que mais alocaram memória. O cProfile mede apenas a thread que executa a etapa; as
+threads de busca e os processos analisadores aparecem nos histogramas.
+
+A instância `METRICS` é compartilhada por todos os módulos instrumentados.
+
+Exemplo de uso:
+    >>> from metrics.metrics_etl import METRICS
+    >>> with METRICS.timer('navegador.page_load'):
+    ...     navegador.get(url)
+    >>> METRICS.count('navegador.bytes', len(html))
+    >>> with METRICS.stage('load'):
+    ...     get_and_save_tables(sinks)
+    >>> METRICS.print_summary()
+    >>> METRICS.write_json('../arquivos/metrics.json')
+
+Classes:
+    Histograma: Uma classe que guarda as latências de um tipo de chamada.
+    MetricsEtl: Uma classe que registra as medições de tempo, os contadores e os perfis do ETL.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Limites, em milissegundos, das faixas dos histogramas
+FAIXAS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+# Quantidade de funções e de pontos de alocação listados no perfil de cada etapa
+TOP_PERFIL = 15
+
+
+class Histograma:
+    """
+    Classe Histograma: Guarda as latências de um tipo de chamada, em segundos.
+
+    Attributes:
+        valores (array): Latências registradas, em segundos.
+
+    Methods:
+        record: Registra uma latência.
+        summary: Retorna a quantidade, o total, os percentis e as faixas das latências.
+    """
+
+    __slots__ = ('valores',)
+
+    def __init__(self) -> None:
+        """
+        Construtor da classe Histograma.
+        """
+        self.valores = array('d')
+
+    def record(self, segundos : float):
+        """
+        Registra uma latência.
+
+        Args:
+            segundos (float): Latência, em segundos.
+        """
+        self.valores.append(segundos)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Retorna a quantidade, o total, os percentis e as faixas das latências.
+
+        Returns:
+            Dict[str, Any]: 'count', 'total_s', 'mean_ms', 'min_ms', 'p50_ms', 'p90_ms', 'p99_ms',
+                'max_ms' e 'buckets' ({'<=10ms': quantidade, ..., '>30000ms': quantidade}, só com as
+                faixas usadas).
+        """
+        ordenados = sorted(self.valores)
+        if not ordenados:
+            return {"count": 0, "total_s": 0.0}
+
+        def percentil(fracao):
+            return round(ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))] * 1000, 3)
+
+        buckets = {}
+        anterior = 0
+        for limite in FAIXAS_MS:
+            ate = bisect_right(ordenados, limite / 1000)
+            if ate > anterior:
+                buckets[f"<={limite}ms"] = ate - anterior
+            anterior = ate
+        if len(ordenados) > anterior:
+            buckets[f">{FAIXAS_MS[-1]}ms"] = len(ordenados) - anterior
+        total = sum(ordenados)
+        return {
+            "count": len(ordenados),
+            "total_s": round(total, 3),
+            "mean_ms": round(total / len(ordenados) * 1000, 3),
+            "min_ms": round(ordenados[0] * 1000, 3),
+            "p50_ms": percentil(0.5),
+            "p90_ms": percentil(0.9),
+            "p99_ms": percentil(0.99),
+            "max_ms": round(ordenados[-1] * 1000, 3),
+            "buckets": buckets,
+        }
+
+
+class MetricsEtl:
+    """
+    Classe MetricsEtl: Registra as medições de tempo, os contadores e os perfis do ETL.
+
+    Todos os métodos podem ser chamados por várias threads ao mesmo tempo.
+
+    Attributes:
+        counters (Dict[str, int]): Contadores, por exemplo {'navegador.pages': 12, 'cache.hits': 30}.
+        histograms (Dict[str, Histograma]): Latências de cada tipo de chamada.
+        peaks (Dict[str, float]): Maior valor observado de cada medida, por exemplo {'navegador.rss_mb': 812.4}.
+        stages (Dict[str, Dict]): Tempo de cada etapa e, com o perfil ativado, o seu perfil.
+        profile (bool): Se as etapas são executadas com o cProfile e o tracemalloc.
+        profile_dir (str): Pasta dos arquivos `.prof` de cada etapa.
+        started_at (float): Instante (`time.perf_counter`) em que as medições começaram, usado pelos
+            marcos de inicialização.
+
+    Methods:
+        configure: Ativa ou desativa o perfil das etapas.
+        count: Soma um valor a um contador.
+        observe: Registra uma latência no histograma de um tipo de chamada.
+        peak: Registra um valor de uma medida, guardando apenas o maior.
+        timer: Mede o tempo de um bloco de código e o registra no histograma informado.
+        timed: Decorador que mede o tempo de cada chamada de uma função.
+        mark_once: Registra, apenas na primeira chamada, o tempo desde `started_at`.
+        stage: Mede uma etapa do ETL e, com o perfil ativado, executa a etapa com o cProfile e o tracemalloc.
+        summary: Retorna o resumo das medições.
+        print_summary: Imprime o resumo das medições.
+        write_json: Grava o resumo das medições em um arquivo JSON.
+        reset: Descarta as medições.
+    """
+
+    def __init__(self, profile : bool = False, profile_dir : str = "../arquivos/profile") -> None:
+        """
+        Construtor da classe MetricsEtl.
+
+        Args:
+            profile (bool): Se as etapas são executadas com o cProfile e o tracemalloc.
+            profile_dir (str): Pasta dos arquivos `.prof` de cada etapa.
+        """
+        self.counters = {}
+        self.histograms = {}
+        self.peaks = {}
+        self.stages = {}
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.started_at = time.perf_counter()
+        self._marcos = set()
+        self._lock = threading.Lock()
+
+    def configure(self, profile : bool = False, profile_dir : Optional[str] = None):
+        """
+        Ativa ou desativa o perfil das etapas.
+
+        Args:
+            profile (bool): Se as etapas são executadas com o cProfile e o tracemalloc.
+            profile_dir (Optional[str]): Pasta dos arquivos `.prof`. Por padrão, a atual.
+        """
+        self.profile = profile
+        self.profile_dir = profile_dir or self.profile_dir
+
+    def count(self, name : str, value : int = 1):
+        """
+        Soma um valor a um contador.
+
+        Args:
+            name (str): Nome do contador, por exemplo 'http.bytes'.
+            value (int): Valor somado.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name : str, segundos : float):
+        """
+        Registra uma latência no histograma de um tipo de chamada.
+
+        Args:
+            name (str): Nome do tipo de chamada, por exemplo 'navegador.page_load'.
+            segundos (float): Latência, em segundos.
+        """
+        with self._lock:
+            histograma = self.histograms.get(name)
+            if histograma is None:
+                histograma = self.histograms[name] = Histograma()
+            histograma.record(segundos)
+
+    def peak(self, name : str, value : float):
+        """
+        Registra um valor de uma medida, guardando apenas o maior.
+
+        Args:
+            name (str): Nome da medida, por exemplo 'navegador.rss_mb'.
+            value (float): Valor observado.
+        """
+        with self._lock:
+            if value > self.peaks.get(name, float('-inf')):
+                self.peaks[name] = value
+
+    def mark_once(self, name : str):
+        """
+        Registra, apenas na primeira chamada com o nome informado, o tempo desde `started_at`. Usado para
+        marcos da inicialização, como a primeira página buscada.
+
+        Args:
+            name (str): Nome do marco, por exemplo 'startup.first_fetch'.
+        """
+        with self._lock:
+            if name in self._marcos:
+                return
+            self._marcos.add(name)
+        self.observe(name, time.perf_counter() - self.started_at)
+
+    @contextmanager
+    def timer(self, name : str) -> Iterator[None]:
+        """
+        Mede o tempo de um bloco de código e o registra no histograma informado, mesmo se o bloco
+        levantar uma exceção.
+
+        Args:
+            name (str): Nome do tipo de chamada.
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - inicio)
+
+    def timed(self, name : str) -> Callable[[Callable], Callable]:
+        """
+        Decorador que mede o tempo de cada chamada de uma função.
+
+        Args:
+            name (str): Nome do tipo de chamada.
+
+        Returns:
+            Callable[[Callable], Callable]: Decorador.
+        """
+        def decorador(funcao):
+            @functools.wraps(funcao)
+            def medida(*args, **kwargs):
+                with self.timer(name):
+                    return funcao(*args, **kwargs)
+            return medida
+        return decorador
+
+    @contextmanager
+    def stage(self, name : str) -> Iterator[None]:
+        """
+        Mede uma etapa do ETL. Com o perfil ativado, executa a etapa com o cProfile e o tracemalloc e
+        grava as estatísticas do cProfile em `profile_dir/<etapa>.prof`.
+
+        As etapas não devem ser aninhadas quando o perfil está ativado, porque só um cProfile pode estar
+        ativo de cada vez.
+
+        Args:
+            name (str): Nome da etapa, por exemplo 'extract_lists'.
+        """
+        perfil = cProfile.Profile() if self.profile else None
+        rastreando = False
+        if perfil:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                rastreando = True
+            tracemalloc.reset_peak()
+            perfil.enable()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            tempo = time.perf_counter() - inicio
+            resultado = {"wall_s": round(tempo, 3)}
+            if perfil:
+                perfil.disable()
+                resultado.update(self._profile_summary(name, perfil))
+                if rastreando:
+                    tracemalloc.stop()
+            with self._lock:
+                self.stages[name] = resultado
+
+    def _profile_summary(self, name : str, perfil : cProfile.Profile) -> Dict[str, Any]:
+        """
+        Grava as estatísticas do cProfile de uma etapa e resume o cProfile e o tracemalloc.
+
+        Args:
+            name (str): Nome da etapa.
+            perfil (cProfile.Profile): Perfil da etapa, já desativado.
+
+        Returns:
+            Dict[str, Any]: 'profile_path', 'top_functions' (as funções com maior tempo acumulado),
+                'peak_mb' (pico de memória) e 'top_allocations' (os pontos do código com mais memória
+                ainda alocada).
+        """
+        # Importados só aqui: o pstats é lento para importar e só é usado com o perfil ativado
+        import io # pylint: disable=import-outside-toplevel
+        import pstats # pylint: disable=import-outside-toplevel
+        os.makedirs(self.profile_dir, exist_ok=True)
+        caminho = os.path.join(self.profile_dir, f"{name}.prof")
+        perfil.dump_stats(caminho)
+        texto = io.StringIO()
+        stats = pstats.Stats(perfil, stream=texto)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        top_functions = []
+        for funcao in stats.fcn_list[:TOP_PERFIL]: # pylint: disable=no-member
+            _, chamadas, _, acumulado, _ = stats.stats[funcao] # pylint: disable=no-member
+            arquivo, linha, nome = funcao
+            top_functions.append({"function": f"{os.path.basename(arquivo)}:{linha}({nome})",
+                                  "calls": chamadas, "cumulative_s": round(acumulado, 3)})
+        _, pico = tracemalloc.get_traced_memory()
+        alocacoes = tracemalloc.take_snapshot().statistics('lineno')[:TOP_PERFIL]
+        return {
+            "profile_path": caminho,
+            "top_functions": top_functions,
+            "peak_mb": round(pico / 1024 ** 2, 1),
+            "top_allocations": [{"line": str(estatistica.traceback[0]), "kb": round(estatistica.size / 1024, 1)}
+                                for estatistica in alocacoes],
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Retorna o resumo das medições.
+
+        Returns:
+            Dict[str, Any]: 'stages' (tempo e perfil de cada etapa), 'counters', 'peaks' (maior valor de cada
+                medida) e 'histograms' (resumo das latências de cada tipo de chamada).
+        """
+        with self._lock:
+            return {
+                "stages": dict(self.stages),
+                "counters": dict(sorted(self.counters.items())),
+                "peaks": {name: round(valor, 3) for name, valor in sorted(self.peaks.items())},
+                "histograms": {name: histograma.summary() for name, histograma in sorted(self.histograms.items())},
+            }
+
+    def print_summary(self):
+        """
+        Imprime o resumo das medições: o tempo de cada etapa, os contadores e as latências.
+        """
+        resumo = self.summary()
+        for name, stage in resumo["stages"].items():
+            texto = f"Etapa '{name}': {stage['wall_s']:.1f}s"
+            if "peak_mb" in stage:
+                texto += f", pico de memória {stage['peak_mb']:.1f} MB, perfil em {stage['profile_path']}"
+            print(texto)
+        for name, valor in resumo["counters"].items():
+            print(f"Contador '{name}': {valor}")
+        for name, valor in resumo["peaks"].items():
+            print(f"Pico '{name}': {valor:.1f}")
+        for name, histograma in resumo["histograms"].items():
+            print(f"Latência '{name}': {histograma['count']} chamadas, {histograma['total_s']:.1f}s no total, "
+                  f"p50 {histograma['p50_ms']:.0f} ms, p90 {histograma['p90_ms']:.0f} ms, "
+                  f"máx. {histograma['max_ms']:.0f} ms")
+
+    def write_json(self, path : str):
+        """
+        Grava o resumo das medições em um arquivo JSON.
+
+        Args:
+            path (str): Caminho do arquivo.
+        """
+        with open(path, 'w', encoding='utf-8') as arquivo:
+            json.dump(self.summary(), arquivo, ensure_ascii=False, indent=2)
+
+    def reset(self):
+        """
+        Descarta as medições.
+        """
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.peaks.clear()
+            self.stages.clear()
+            self._marcos.clear()
+            self.started_at = time.perf_counter()
+
+
+METRICS = MetricsEtl()
@@ -0,0 +1,176 @@
+"""
+Módulo checkpoint_journal: Diário (journal) dos resultados já obtidos pela extração.
+
+Este módulo oferece a classe CheckpointJournal, que grava cada resultado terminado em um arquivo JSON
+Lines, apenas acrescentando linhas, para que uma extração interrompida possa continuar de onde parou.
+São gravados dois tipos de registro:
+    - 'list': os jogos e URLs de uma lista em um ano, no formato {grupo: {jogo: url}};
+    - 'game': os gêneros de um jogo em uma posição (lista, ano, grupo, jogo).
+Ao final de uma extração completa, um registro 'complete' é acrescentado.
+
+Exemplo de uso:
+    >>> from transform.checkpoint_journal import CheckpointJournal
+    >>> journal = CheckpointJournal("../arquivos/journal.jsonl")
+    >>> journal.append_game('list_game_best_sellers_per_year', '2020', 'Platinum', 'Dota 2', ['Action'])
+    >>> lists, games = journal.load(max_age=7 * 24 * 60 * 60)
+
+Classes:
+    CheckpointJournal: Uma classe que grava e lê o diário da extração.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class CheckpointJournal:
+    """
+    Classe CheckpointJournal: Grava e lê o diário da extração.
+
+    Attributes:
+        path (str): Caminho do arquivo do diário.
+
+    Methods:
+        append_list: Grava os jogos e URLs de uma lista em um ano.
+        append_game: Grava os gêneros de um jogo em uma posição.
+        append_complete: Marca que a extração terminou.
+        load: Lê os registros mais recentes de cada lista e de cada jogo.
+        is_incomplete: Verifica se a última extração registrada foi interrompida.
+        compact: Reescreve o diário mantendo apenas o registro mais recente de cada item.
+    """
+
+    def __init__(self, path : str) -> None:
+        """
+        Construtor da classe CheckpointJournal.
+
+        Args:
+            path (str): Caminho do arquivo do diário.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _append(self, registro : Dict):
+        """
+        Acrescenta um registro ao diário e descarrega o arquivo em disco.
+
+        Args:
+            registro (Dict): Registro a ser gravado.
+        """
+        registro.setdefault("fetched_at", time.time())
+        linha = json.dumps(registro, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as arquivo:
+                arquivo.write(linha + "\n")
+                arquivo.flush()
+
+    def append_list(self, name_list : str, year : str, groups : Dict[str, Dict[str, str]]):
+        """
+        Grava os jogos e URLs de uma lista em um ano.
+
+        Args:
+            name_list (str): Chave da lista em HtmlTransform.lists_games.
+            year (str): Ano da lista.
+            groups (Dict[str, Dict[str, str]]): Jogos da lista no formato {grupo: {jogo: url}}.
+        """
+        self._append({"kind": "list", "list": name_list, "year": year, "groups": groups})
+
+    def append_game(self, name_list : str, year : str, name_group : str, name_game : str, genres : list):
+        """
+        Grava os gêneros de um jogo em uma posição.
+
+        Args:
+            name_list (str): Chave da lista em HtmlTransform.lists_games.
+            year (str): Ano da lista.
+            name_group (str): Grupo do jogo na lista.
+            name_game (str): Nome do jogo.
+            genres (list): Gêneros do jogo.
+        """
+        self._append({"kind": "game", "list": name_list, "year": year, "group": name_group,
+                      "game": name_game, "genre": genres})
+
+    def append_complete(self):
+        """
+        Marca que a extração terminou.
+        """
+        self._append({"kind": "complete"})
+
+    def _records(self):
+        """
+        Lê os registros do diário, ignorando uma última linha incompleta (gravação interrompida).
+
+        Returns:
+            Iterator[Dict]: Registros na ordem em que foram gravados.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                try:
+                    yield json.loads(linha)
+                except json.JSONDecodeError:
+                    continue
+
+    def load(self, max_age : Optional[float] = None) -> Tuple[Dict, Dict]:
+        """
+        Lê os registros mais recentes de cada lista e de cada jogo.
+
+        Args:
+            max_age (Optional[float]): Idade máxima, em segundos, de um registro. Registros mais antigos
+                são ignorados, para serem buscados novamente. Com None, todos são usados.
+
+        Returns:
+            Tuple[Dict, Dict]: Listas no formato {(lista, ano): {grupo: {jogo: url}}} e jogos no formato
+                {(lista, ano, grupo, jogo): [generos]}.
+        """
+        limite = None if max_age is None else time.time() - max_age
+        lists, games = {}, {}
+        for registro in self._records():
+            if limite is not None and registro["fetched_at"] < limite:
+                continue
+            if registro["kind"] == "list":
+                lists[(registro["list"], registro["year"])] = registro["groups"]
+            elif registro["kind"] == "game":
+                chave = (registro["list"], registro["year"], registro["group"], registro["game"])
+                games[chave] = registro["genre"]
+        return lists, games
+
+    def is_incomplete(self) -> bool:
+        """
+        Verifica se a última extração registrada foi interrompida.
+
+        Returns:
+            bool: True se o diário existe e o seu último registro não marca uma extração completa.
+        """
+        ultimo = None
+        for ultimo in self._records():
+            pass
+        return ultimo is not None and ultimo["kind"] != "complete"
+
+    def compact(self):
+        """
+        Reescreve o diário mantendo apenas o registro mais recente de cada lista e de cada jogo.
+
+        Jogos que não aparecem mais na versão mais recente da sua lista são descartados.
+        """
+        mais_recentes = {}
+        completo = None
+        for registro in self._records():
+            if registro["kind"] == "list":
+                mais_recentes[("list", registro["list"], registro["year"])] = registro
+            elif registro["kind"] == "game":
+                chave = ("game", registro["list"], registro["year"], registro["group"], registro["game"])
+                mais_recentes[chave] = registro
+            completo = registro if registro["kind"] == "complete" else None
+        for chave, registro in list(mais_recentes.items()):
+            if chave[0] == "game":
+                groups = mais_recentes.get(("list", registro["list"], registro["year"]), {}).get("groups", {})
+                if registro["game"] not in groups.get(registro["group"], {}):
+                    del mais_recentes[chave]
+        arquivo_temporario = f"{self.path}.tmp"
+        with self._lock:
+            with open(arquivo_temporario, "w", encoding="utf-8") as arquivo:
+                for registro in list(mais_recentes.values()) + ([completo] if completo else []):
+                    arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            os.replace(arquivo_temporario, self.path)
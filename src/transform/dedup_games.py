@@ -0,0 +1,130 @@
+"""
+Módulo dedup_games: Remove as buscas repetidas das páginas dos jogos.
+
+O mesmo jogo aparece em várias listas (mais vendidos, mais jogados, melhores lançamentos) e em vários
+anos. Este módulo oferece a classe DedupGames, que normaliza as URLs das lojas para o ID do aplicativo
+na Steam, monta um conjunto único de páginas a serem buscadas e distribui o resultado de cada página
+para todas as posições (lista, ano, grupo, jogo) em que o jogo aparece.
+
+Exemplo de uso:
+    >>> from transform.dedup_games import DedupGames
+    >>> dedup = DedupGames()
+    >>> dedup.add(('best sellers', '2020', 'Platinum', 'Dota 2'), 'https://store.steampowered.com/app/570/Dota_2/')
+    >>> dedup.add(('most played', '2020', '200000', 'Dota 2'), 'https://store.steampowered.com/app/570/?snr=1')
+    >>> dedup.tasks()
+    [('app/570', 'https://store.steampowered.com/app/570/Dota_2/')]
+    >>> dedup.saved
+    1
+
+Classes:
+    DedupGames: Uma classe que agrupa as posições dos jogos pela página a ser buscada.
+"""
+
+import re
+from typing import Any, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+RE_APP_ID = re.compile(r'/app/(\d+)')
+
+
+class DedupGames:
+    """
+    Classe DedupGames: Agrupa as posições dos jogos pela página a ser buscada.
+
+    Attributes:
+        slots (Dict[str, List[Any]]): Posições de cada página, pela chave normalizada da URL.
+        urls (Dict[str, str]): Primeira URL encontrada para cada chave normalizada.
+        total (int): Quantidade de posições adicionadas.
+
+    Methods:
+        normalize_url: Normaliza a URL de uma página de jogo.
+        app_id: Retorna o ID do aplicativo na Steam a partir da URL da página do jogo.
+        add: Adiciona a posição de um jogo e a URL da sua página.
+        tasks: Retorna os pares (chave, url) das páginas únicas a serem buscadas.
+        slots_of: Retorna as posições que recebem o resultado de uma página.
+    """
+
+    def __init__(self) -> None:
+        """
+        Construtor da classe DedupGames.
+        """
+        self.slots = {}
+        self.urls = {}
+        self.total = 0
+
+    @staticmethod
+    def normalize_url(url : str) -> str:
+        """
+        Normaliza a URL de uma página de jogo.
+
+        Args:
+            url (str): URL da página do jogo na loja.
+
+        Returns:
+            str: 'app/<id>' para páginas de aplicativos da Steam; caso contrário, a URL sem parâmetros,
+                sem fragmento e sem a barra final.
+        """
+        match = RE_APP_ID.search(url)
+        if match:
+            return f"app/{match.group(1)}"
+        partes = urlsplit(url)
+        return f"{partes.netloc.lower()}{partes.path.rstrip('/')}"
+
+    @staticmethod
+    def app_id(url : str) -> Optional[int]:
+        """
+        Retorna o ID do aplicativo na Steam a partir da URL da página do jogo.
+
+        Args:
+            url (str): URL da página do jogo na loja.
+
+        Returns:
+            Optional[int]: ID do aplicativo, ou None se a URL não for de um aplicativo da Steam.
+        """
+        match = RE_APP_ID.search(url)
+        return int(match.group(1)) if match else None
+
+    def add(self, slot : Any, url : str):
+        """
+        Adiciona a posição de um jogo e a URL da sua página.
+
+        Args:
+            slot (Any): Posição do jogo, por exemplo (lista, ano, grupo, jogo) ou o índice da posição em
+                GamesTable.
+            url (str): URL da página do jogo.
+        """
+        chave = self.normalize_url(url)
+        self.urls.setdefault(chave, url)
+        self.slots.setdefault(chave, []).append(slot)
+        self.total += 1
+
+    def tasks(self) -> List[Tuple[str, str]]:
+        """
+        Retorna os pares (chave, url) das páginas únicas a serem buscadas.
+
+        Returns:
+            List[Tuple[str, str]]: Uma tarefa por página única, na ordem em que foram adicionadas.
+        """
+        return list(self.urls.items())
+
+    def slots_of(self, chave : str) -> List[Any]:
+        """
+        Retorna as posições que recebem o resultado de uma página.
+
+        Args:
+            chave (str): Chave normalizada da URL.
+
+        Returns:
+            List[Any]: Posições dos jogos que usam a página.
+        """
+        return self.slots.get(chave, [])
+
+    @property
+    def saved(self) -> int:
+        """
+        Quantidade de buscas evitadas pela deduplicação.
+
+        Returns:
+            int: Posições adicionadas menos páginas únicas.
+        """
+        return self.total - len(self.urls)
@@ -0,0 +1,345 @@
+"""
+Módulo games_table: Modelo compacto, em memória, das listas de jogos de HtmlTransform.
+
+Em vez de dicionários aninhados {lista: {ano: {grupo: {jogo: {"genre": [generos], "app_id": id}}}}}, com as
+mesmas strings repetidas e um dicionário e uma lista novos por posição de jogo, GamesTable guarda cada
+posição como uma linha de colunas em `array`, com códigos inteiros para ano, grupo, jogo, URL e conjunto
+de gêneros. Os textos são guardados uma única vez, em tabelas de códigos compartilhadas por todas as listas
+e anos.
+
+Os dados saem exatamente no formato dos dicionários aninhados, ano por ano (`iter_years`), para serem
+gravados no data.json e nos CSVs.
+
+Exemplo de uso:
+    >>> from transform.games_table import GamesTable
+    >>> table = GamesTable()
+    >>> table.set_list('list_game_best_sellers_per_year', '2020',
+    ...                {'Platinum': {'Dota 2': 'https://store.steampowered.com/app/570/'}})
+    >>> indice = next(table.slots('list_game_best_sellers_per_year'))
+    >>> table.set_genres(indice, ['Action', 'Strategy'], 570)
+    >>> list(table.iter_years('list_game_best_sellers_per_year'))
+    [('2020', {'Platinum': {'Dota 2': {'genre': ['Action', 'Strategy'], 'app_id': 570}}})]
+
+Classes:
+    CodigosTexto: Uma classe que atribui um código inteiro a cada texto (interning).
+    GamesTable: Uma classe que guarda as posições dos jogos em colunas compactas.
+"""
+
+from array import array
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+# Códigos especiais das colunas de GamesTable
+SEM_VALOR = -1
+SEM_APP_ID = -1
+APP_ID_AUSENTE = -2
+
+
+class CodigosTexto:
+    """
+    Classe CodigosTexto: Atribui um código inteiro a cada texto, na ordem em que aparecem.
+
+    Attributes:
+        codigos (Dict[Hashable, int]): Código de cada texto.
+        textos (List[Hashable]): Texto de cada código.
+
+    Methods:
+        codigo: Retorna o código de um texto, cadastrando-o se for novo.
+    """
+
+    __slots__ = ('codigos', 'textos')
+
+    def __init__(self) -> None:
+        """
+        Construtor da classe CodigosTexto.
+        """
+        self.codigos = {}
+        self.textos = []
+
+    def codigo(self, texto : Hashable) -> int:
+        """
+        Retorna o código de um texto, cadastrando-o se for novo.
+
+        Args:
+            texto (Hashable): Texto, por exemplo o nome de um jogo, ou uma tupla de códigos.
+
+        Returns:
+            int: Código do texto.
+        """
+        codigo = self.codigos.get(texto)
+        if codigo is None:
+            codigo = self.codigos[texto] = len(self.textos)
+            self.textos.append(texto)
+        return codigo
+
+    def __getitem__(self, codigo : int) -> Hashable:
+        """
+        Retorna o texto de um código.
+
+        Args:
+            codigo (int): Código do texto.
+
+        Returns:
+            Hashable: Texto.
+        """
+        return self.textos[codigo]
+
+    def __len__(self) -> int:
+        """
+        Retorna a quantidade de textos cadastrados.
+
+        Returns:
+            int: Quantidade de textos.
+        """
+        return len(self.textos)
+
+
+class GamesTable:
+    """
+    Classe GamesTable: Guarda as posições dos jogos (lista, ano, grupo, jogo) em colunas compactas.
+
+    Cada posição é identificada pelo seu índice nas colunas. A posição guarda a URL da página do jogo até
+    receber os gêneros (`set_genres`); só as posições com os gêneros preenchidos saem em `iter_years`.
+
+    Attributes:
+        lists (CodigosTexto): Nomes das listas.
+        years (CodigosTexto): Anos.
+        tiers (CodigosTexto): Grupos, por exemplo 'Platinum' ou '100000'.
+        games (CodigosTexto): Nomes dos jogos.
+        urls (CodigosTexto): URLs das páginas dos jogos.
+        genres (CodigosTexto): Gêneros.
+        genre_sets (CodigosTexto): Conjuntos de gêneros, como tuplas de códigos de `genres`.
+
+    Methods:
+        set_list: Guarda os jogos de uma lista em um ano.
+        slots: Percorre os índices das posições de uma ou mais listas.
+        key: Retorna a posição (lista, ano, grupo, jogo) de um índice.
+        url: Retorna a URL da página do jogo de uma posição.
+        has_genres: Verifica se os gêneros de uma posição foram preenchidos.
+        get_genres: Retorna os gêneros de uma posição.
+        set_genres: Preenche os gêneros e o ID do aplicativo de uma posição.
+        iter_years: Percorre os jogos com os gêneros preenchidos de uma lista, ano por ano.
+        from_data: Monta a tabela a partir dos dados no formato do data.json.
+    """
+
+    def __init__(self) -> None:
+        """
+        Construtor da classe GamesTable.
+        """
+        self.lists = CodigosTexto()
+        self.years = CodigosTexto()
+        self.tiers = CodigosTexto()
+        self.games = CodigosTexto()
+        self.urls = CodigosTexto()
+        self.genres = CodigosTexto()
+        self.genre_sets = CodigosTexto()
+        self._list = array('H')
+        self._year = array('H')
+        self._tier = array('H')
+        self._game = array('i')
+        self._url = array('i')
+        self._genre_set = array('i')
+        self._app_id = array('i')
+        # Grupos de cada (lista, ano), na ordem da página: [(grupo, início, fim)] nas colunas
+        self._segments = {}
+
+    def __len__(self) -> int:
+        """
+        Retorna a quantidade de posições guardadas.
+
+        Returns:
+            int: Quantidade de posições.
+        """
+        return len(self._game)
+
+    def set_list(self, name_list : str, year : str, groups : Dict[str, Dict]):
+        """
+        Guarda os jogos de uma lista em um ano, substituindo os guardados antes para a mesma lista e ano.
+
+        Args:
+            name_list (str): Nome da lista, por exemplo 'list_game_best_sellers_per_year'.
+            year (str): Ano da lista.
+            groups (Dict[str, Dict]): Jogos no formato {grupo: {jogo: url}}. No lugar da URL, o jogo pode
+                ter os gêneros já preenchidos, no formato {"genre": [generos], "app_id": id}.
+        """
+        code_list, code_year = self.lists.codigo(name_list), self.years.codigo(year)
+        segments = []
+        for name_group, games in groups.items():
+            inicio = len(self._game)
+            for name_game, valor in games.items():
+                self._list.append(code_list)
+                self._year.append(code_year)
+                self._game.append(self.games.codigo(name_game))
+                if isinstance(valor, dict):
+                    self._url.append(SEM_VALOR)
+                    self._genre_set.append(self._code_genres(valor['genre']))
+                    self._app_id.append(self._code_app_id(valor['app_id']) if 'app_id' in valor else APP_ID_AUSENTE)
+                else:
+                    self._url.append(SEM_VALOR if valor is None else self.urls.codigo(valor))
+                    self._genre_set.append(SEM_VALOR)
+                    self._app_id.append(SEM_APP_ID)
+            code_tier = self.tiers.codigo(name_group)
+            self._tier.extend([code_tier] * (len(self._game) - inicio))
+            segments.append((code_tier, inicio, len(self._game)))
+        self._segments[(code_list, code_year)] = segments
+
+    def _code_genres(self, genres : Iterable[str]) -> int:
+        """
+        Retorna o código de um conjunto de gêneros, na ordem informada.
+
+        Args:
+            genres (Iterable[str]): Gêneros do jogo.
+
+        Returns:
+            int: Código do conjunto em `genre_sets`.
+        """
+        return self.genre_sets.codigo(tuple(self.genres.codigo(genre) for genre in genres))
+
+    @staticmethod
+    def _code_app_id(app_id : Optional[int]) -> int:
+        """
+        Retorna o valor guardado na coluna do ID do aplicativo.
+
+        Args:
+            app_id (Optional[int]): ID do aplicativo na Steam, ou None.
+
+        Returns:
+            int: O ID, ou SEM_APP_ID.
+        """
+        return SEM_APP_ID if app_id is None else app_id
+
+    def slots(self, *names_lists : str) -> Iterator[int]:
+        """
+        Percorre os índices das posições de uma ou mais listas, na ordem em que foram guardadas.
+
+        Args:
+            names_lists (str): Nomes das listas.
+
+        Returns:
+            Iterator[int]: Índices das posições.
+        """
+        codes = {self.lists.codigos[name] for name in names_lists if name in self.lists.codigos}
+        for (code_list, _), segments in self._segments.items():
+            if code_list in codes:
+                for _, inicio, fim in segments:
+                    yield from range(inicio, fim)
+
+    def key(self, indice : int) -> Tuple[str, str, str, str]:
+        """
+        Retorna a posição de um índice.
+
+        Args:
+            indice (int): Índice da posição.
+
+        Returns:
+            Tuple[str, str, str, str]: Posição no formato (lista, ano, grupo, jogo).
+        """
+        return (self.lists[self._list[indice]], self.years[self._year[indice]],
+                self.tiers[self._tier[indice]], self.games[self._game[indice]])
+
+    def url(self, indice : int) -> Optional[str]:
+        """
+        Retorna a URL da página do jogo de uma posição.
+
+        Args:
+            indice (int): Índice da posição.
+
+        Returns:
+            Optional[str]: URL, ou None se a posição não tiver URL.
+        """
+        code = self._url[indice]
+        return None if code == SEM_VALOR else self.urls[code]
+
+    def has_genres(self, indice : int) -> bool:
+        """
+        Verifica se os gêneros de uma posição foram preenchidos.
+
+        Args:
+            indice (int): Índice da posição.
+
+        Returns:
+            bool: Se os gêneros foram preenchidos.
+        """
+        return self._genre_set[indice] != SEM_VALOR
+
+    def get_genres(self, indice : int) -> Optional[List[str]]:
+        """
+        Retorna os gêneros de uma posição.
+
+        Args:
+            indice (int): Índice da posição.
+
+        Returns:
+            Optional[List[str]]: Gêneros, ou None se ainda não foram preenchidos.
+        """
+        code = self._genre_set[indice]
+        return None if code == SEM_VALOR else [self.genres[genre] for genre in self.genre_sets[code]]
+
+    def set_genres(self, indice : int, genres : Iterable[str], app_id : Optional[int]):
+        """
+        Preenche os gêneros e o ID do aplicativo de uma posição.
+
+        Args:
+            indice (int): Índice da posição.
+            genres (Iterable[str]): Gêneros do jogo.
+            app_id (Optional[int]): ID do aplicativo na Steam, ou None.
+        """
+        self._genre_set[indice] = self._code_genres(genres)
+        self._app_id[indice] = self._code_app_id(app_id)
+
+    def _info(self, indice : int) -> Dict:
+        """
+        Monta as informações de uma posição preenchida, no formato do data.json.
+
+        Args:
+            indice (int): Índice da posição.
+
+        Returns:
+            Dict: Informações no formato {"genre": [generos], "app_id": id}.
+        """
+        info = {"genre" : [self.genres[genre] for genre in self.genre_sets[self._genre_set[indice]]]}
+        app_id = self._app_id[indice]
+        if app_id != APP_ID_AUSENTE:
+            info["app_id"] = None if app_id == SEM_APP_ID else app_id
+        return info
+
+    def iter_years(self, name_list : str) -> Iterator[Tuple[str, Dict]]:
+        """
+        Percorre os jogos com os gêneros preenchidos de uma lista, ano por ano.
+
+        Os dicionários de um ano são montados apenas quando o ano é percorrido.
+
+        Args:
+            name_list (str): Nome da lista.
+
+        Returns:
+            Iterator[Tuple[str, Dict]]: Pares (ano, {grupo: {jogo: {"genre": [generos], "app_id": id}}}).
+        """
+        code_list = self.lists.codigos.get(name_list)
+        for (code, code_year), segments in self._segments.items():
+            if code != code_list:
+                continue
+            yield self.years[code_year], {
+                self.tiers[code_tier]: {
+                    self.games[self._game[indice]]: self._info(indice)
+                    for indice in range(inicio, fim) if self.has_genres(indice)
+                }
+                for code_tier, inicio, fim in segments
+            }
+
+    @classmethod
+    def from_data(cls, dados : Iterable[Tuple[str, Iterable[Tuple[str, Dict]]]]) -> 'GamesTable':
+        """
+        Monta a tabela a partir dos dados no formato do data.json.
+
+        Args:
+            dados (Iterable[Tuple[str, Iterable[Tuple[str, Dict]]]]): Pares (lista, pares (ano, grupos)),
+                por exemplo `((c, y.items()) for c, y in data.items())` ou `JsonStreamReader.categories()`.
+
+        Returns:
+            GamesTable: A tabela, com o nome de cada lista igual ao da categoria.
+        """
+        table = cls()
+        for name_list, years in dados:
+            for year, groups in years:
+                table.set_list(name_list, year, groups)
+        return table
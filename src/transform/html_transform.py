@@ -6,152 +6,443 @@ Classes:
 
 """
 
+from concurrent.futures import Future
+from typing import Dict, Iterator, List, Optional, Tuple
+from requests import RequestException
+from config.config_etl import ConfigEtl
+from dao.age_gate import AgeGate
+from dao.browser_profile import BrowserProfile
+from dao.browser_watchdog import BrowserWatchdog
+from dao.crawl_scheduler import CrawlScheduler
+from dao.dao_async_html import DaoAsyncHtml, HttpStatusError, STATUS_RETENTATIVA
+from dao.dao_cache_html import CacheHtml
 from dao.dao_get_html import DaoGetHtml
+from dao.dao_pool_html import DaoPoolHtml
+from dao.dao_requests_html import DaoRequestsHtml
+from dao.driver_resolver import DriverResolver
+from dao.page_readiness import PageReadiness
+from extract.extraction_spec import SPEC, ExtractionSpec
 from extract.html_extract import HtmlExtractor
+from metrics.metrics_etl import METRICS
+from transform.checkpoint_journal import CheckpointJournal
+from transform.dedup_games import DedupGames
+from transform.games_table import GamesTable
+from transform.parse_pipeline import ParsePipeline
+from transform.parsed_results import ParsedResults
+
+# Lista de `lists_games` preenchida por cada tipo de página BestOf da especificação da extração
+LISTS_PAGES = {
+    'best_sellers': 'list_game_best_sellers_per_year',
+    'best_releases': 'list_game_best_releases_per_year',
+    'most_played': 'list_game_most_played_per_year',
+}
 
 class HtmlTransform():
     """
     Classe HtmlTransform: Fornece métodos para transformar os dados obtidos das páginas HTML.
 
     Attributes:
-        request (DaoGetHtml): Instância de DaoGetHtml para fazer solicitações HTTP e interagir com as páginas HTML.
+        cache (CacheHtml): Cache em disco das páginas, ou None quando desativado.
+        pool (DaoPoolHtml): Pool de sessões do navegador usado para buscar as páginas dos jogos.
+        request (DaoGetHtml): Sessão do pool usada para buscar as páginas com as listas de jogos.
+        fast_request (DaoRequestsHtml): Requisições sem navegador para as páginas dos jogos, ou None quando
+            o backend configurado é 'selenium'.
+        crawler (DaoAsyncHtml): Motor assíncrono de busca das páginas BestOf e das páginas dos jogos, ou None
+            quando o motor configurado é 'pool'.
+        failures (List[Tuple]): Jogos cuja busca falhou, no formato (lista, ano, grupo, jogo, erro).
+        fetches_unique (int): Quantidade de páginas de jogos únicas buscadas.
+        fetches_saved (int): Quantidade de buscas evitadas pela deduplicação das URLs.
+        journal (CheckpointJournal): Diário onde os resultados terminados são gravados, ou None.
+        resumed_lists (Dict): Listas retomadas do diário, no formato {(lista, ano): {grupo: {jogo: url}}}.
+        resumed_games (Dict): Gêneros retomados do diário, no formato {(lista, ano, grupo, jogo): [generos]}.
         extractor (HtmlExtractor): Instância de HtmlExtractor para extrair informações das páginas HTML.
-        list_game_best_sellers_page (Dict): Dicionário contendo os URLs das páginas dos jogos mais vendidos por ano.
-        list_game_best_releases_page (Dict): Dicionário contendo os URLs das páginas dos melhores lançamentos por ano.
-        list_game_most_played_page (Dict): Dicionário contendo os URLs das páginas dos jogos mais jogados por ano.
-        lists_games (Dict): Dicionário para armazenar as listas de jogos por categoria e ano.
+        parser (ParsePipeline): Análise do HTML das páginas em processos separados, que reaproveita o
+            resultado das páginas cujo conteúdo não mudou desde a última análise.
+        spec (ExtractionSpec): Especificação da extração, com as URLs das páginas BestOf de cada ano.
+        best_of_tabs (bool): Se as abas de uma mesma página BestOf são obtidas com uma única abertura da página.
+        rebase_url (Callable[[str], str]): Troca o endereço da Steam das URLs buscadas pelo endereço
+            configurado (`ConfigEtl.rebase_url`).
+        lists_games (GamesTable): Tabela compacta com as listas de jogos por categoria e ano.
 
     Methods:
         get_lists_per_year: Obtém as listas de jogos para cada ano e categoria.
+        get_list: Busca a lista de jogos de uma categoria em um ano e a envia para análise.
+        get_lists_tabs: Busca as listas de jogos das abas de uma mesma página BestOf e as envia para análise.
+        get_lists_crawler: Busca as páginas BestOf com `crawler`, na fila de prioridade das listas.
+        resume: Retoma os resultados gravados no diário.
+        get_game_genres: Obtém os gêneros de um jogo a partir da URL da sua página.
+        get_game_genres_with_navegador: Obtém os gêneros de um jogo usando uma sessão do navegador.
+        get_game_html_with_navegador: Busca a página de um jogo com o navegador, passando pelo aviso de idade.
+        is_anomaly: Indica se a página de um jogo veio com o aviso de idade ou sem gêneros.
+        fill_list_game_information: Preenche as informações dos jogos de uma ou mais listas.
         fill_list_game_information_best_sellers: Preenche as informações dos jogos mais vendidos.
         fill_list_game_information_best_releases: Preenche as informações dos melhores lançamentos.
         fill_list_game_information_more_played: Preenche as informações dos jogos mais jogados.
         fill_lists_with_game_information: Preenche todas as listas com as informações dos jogos.
+        iter_set_data: Percorre os dados transformados categoria por categoria e ano por ano.
         return_set_data: Retorna os dados transformados em um conjunto.
         quit_transform: Encerra o processo de transformação.
     """
-    def __init__(self) -> None:
+    def __init__(self, config : ConfigEtl = None, spec : ExtractionSpec = SPEC) -> None:
         """
         Construtor da classe HtmlTransform.
+
+        Args:
+            config (ConfigEtl): Configurações do ETL. Por padrão, lidas das variáveis de ambiente.
+            spec (ExtractionSpec): Especificação da extração. Por padrão, a de `config/extraction_spec.json`.
         """
-        self.request = DaoGetHtml()
+        config = config or ConfigEtl()
+        self.cache = None
+        if config.cache_dir:
+            self.cache = CacheHtml(config.cache_dir, config.cache_ttl, config.cache_max_bytes, config.offline)
+        readiness = PageReadiness(config.ready_timeout, config.ready_quiet)
+        resolver = DriverResolver(config.chromedriver_path, config.chromedriver_cache)
+        age_gate = AgeGate(config.base_url)
+        profile = BrowserProfile(config.browser_lean, user_data_dir=config.browser_profile_dir, age_gate=age_gate)
+        watchdog = BrowserWatchdog(config.page_load_timeout, config.script_timeout, config.browser_max_pages,
+                                   config.browser_max_rss_mb, config.browser_retries)
+        self.pool = DaoPoolHtml(config.pool_size, config.queue_size, self.cache, readiness, resolver, profile,
+                                watchdog)
+        self.request = self.pool.sessions[0]
+        self.fast_request = None
+        if config.backend == "requests":
+            self.fast_request = DaoRequestsHtml(config.http_timeout, config.max_in_flight, self.cache, age_gate)
+        self.crawler = None
+        if config.engine == "async":
+            scheduler = CrawlScheduler(config.initial_in_flight, config.min_in_flight, config.max_in_flight,
+                                       config.adaptive, config.target_p95, rate_per_host=config.rate_per_host,
+                                       burst=config.rate_burst)
+            self.crawler = DaoAsyncHtml(config.max_in_flight, config.rate_per_host, config.max_retries,
+                                        scheduler=scheduler)
+        self._avisos_idade = set()
+        self.failures = []
+        self.fetches_unique = 0
+        self.fetches_saved = 0
+        self.journal = None
+        self.resumed_lists = {}
+        self.resumed_games = {}
         self.extractor = HtmlExtractor()
-        self.list_game_best_sellers_page = {
-                                            '2020': 'https://store.steampowered.com/sale/BestOf2020?tab=4', 
-                                            '2021': 'https://store.steampowered.com/sale/BestOf2021?tab=1', 
-                                            '2022': 'https://store.steampowered.com/sale/BestOf2022?tab=1', 
-                                            '2023': 'https://store.steampowered.com/sale/BestOf2023?l=brazilian&tab=1'
-                                            }
-        self.list_game_best_releases_page = {
-                                            '2020': 'https://store.steampowered.com/sale/BestOf2020?tab=2', 
-                                            '2021': 'https://store.steampowered.com/sale/BestOf2021?tab=2', 
-                                            '2022': 'https://store.steampowered.com/sale/BestOf2022?tab=2', 
-                                            '2023': 'https://store.steampowered.com/sale/BestOf2023?l=brazilian&tab=2'
-                                            }
-
-        self.list_game_most_played_page = {
-                                            '2020': 'https://store.steampowered.com/sale/BestOf2020?tab=1', 
-                                            '2021': 'https://store.steampowered.com/sale/BestOf2021?tab=3', 
-                                            '2022': 'https://store.steampowered.com/sale/BestOf2022?tab=3', 
-                                            '2023': 'https://store.steampowered.com/sale/BestOf2023?l=brazilian&tab=3'
-                                            }
-        self.lists_games = {
-            "list_game_best_sellers_per_year" : {},
-            "list_game_best_releases_per_year" : {},
-            "list_game_most_played_per_year" : {}
-            }
+        results = ParsedResults(config.parsed_results) if config.parsed_results else None
+        self.parser = ParsePipeline(config.parse_workers, config.parse_queue, results)
+        self.spec = spec
+        self.best_of_tabs = config.best_of_tabs
+        self.rebase_url = config.rebase_url
+        self.lists_games = GamesTable()
 
     def get_lists_per_year(self):
         """
         Obtém as listas de jogos para cada ano e categoria.
+
+        As páginas e os anos são os da especificação da extração (`spec`). Enquanto uma página é analisada
+        por `parser`, o navegador já busca a próxima. As listas retomadas do diário (`resume`) não são
+        buscadas novamente.
+
+        Com `best_of_tabs`, as categorias de um ano que são abas da mesma página BestOf são buscadas com uma
+        única abertura da página (`get_lists_tabs`). Com `crawler`, as páginas são buscadas em paralelo pelas
+        sessões do pool, na fila de prioridade das listas (`get_lists_crawler`).
+        """
+        pendentes = []
+        abas = {}
+        for page, name_list in LISTS_PAGES.items():
+            for year, url in self.spec.urls(page).items():
+                url = self.rebase_url(url)
+                if (self.best_of_tabs or self.crawler) and (name_list, year) not in self.resumed_lists:
+                    pendente = [name_list, year, None]
+                    pagina = DaoGetHtml.tab_page(url) if self.best_of_tabs else url
+                    abas.setdefault(pagina, []).append((pendente, url, page))
+                else:
+                    pendente = self.get_list(name_list, year, url, 'extract_games', page, year)
+                pendentes.append(pendente)
+        if self.crawler:
+            self.get_lists_crawler(list(abas.values()))
+        else:
+            for abas_pagina in abas.values():
+                self.get_lists_tabs(abas_pagina)
+        for name_list, year, groups in pendentes:
+            if isinstance(groups, Future):
+                groups = groups.result()
+                if self.journal:
+                    self.journal.append_list(name_list, year, groups)
+            self.lists_games.set_list(name_list, year, groups)
+
+    def get_list(self, name_list : str, year : str, url : str, method : str, *args):
+        """
+        Busca a lista de jogos de uma categoria em um ano e a envia para análise.
+
+        Args:
+            name_list (str): Nome da lista em `lists_games`.
+            year (str): Ano da lista.
+            url (str): URL da página com a lista.
+            method (str): Método de HtmlExtractor que extrai os jogos do HTML da página.
+            args: Demais argumentos do método.
+
+        Returns:
+            Tuple[str, str, Union[Dict, Future]]: Lista, ano e os jogos retomados do diário, no formato
+                {grupo: {jogo: url}}, ou o Future da análise da página.
+        """
+        groups = self.resumed_lists.get((name_list, year))
+        if groups is None:
+            response = self.request.get_html(url)
+            groups = self.parser.submit(method, response['content_html'], *args, content_hash=response['content_hash'])
+        return name_list, year, groups
+
+    def get_lists_tabs(self, abas : List[Tuple[List, str, str]], request : DaoGetHtml = None):
+        """
+        Busca as listas de jogos das abas de uma mesma página BestOf, abrindo a página uma única vez, e
+        envia cada aba para análise assim que ela é obtida.
+
+        Args:
+            abas (List[Tuple[List, str, str]]): Abas da página, no formato (pendente, url, página), em que
+                pendente é a lista [lista, ano, None] cujo último item recebe o Future da análise da aba.
+            request (DaoGetHtml): Sessão do navegador a ser usada. Por padrão, `request`.
+        """
+        respostas = (request or self.request).get_html_tabs(url for _, url, _ in abas)
+        for (pendente, _, page), response in zip(abas, respostas):
+            pendente[2] = self.parser.submit('extract_games', response['content_html'], page, pendente[1],
+                                             content_hash=response['content_hash'])
+
+    def get_lists_crawler(self, paginas : List[List[Tuple[List, str, str]]]):
+        """
+        Busca as páginas BestOf com `crawler`, cada uma com uma sessão livre do pool, na fila de prioridade
+        das listas, que passa na frente das páginas dos jogos. Cada aba é enviada para análise assim que é
+        obtida.
+
+        Args:
+            paginas (List[List[Tuple[List, str, str]]]): Abas de cada página BestOf, no formato de
+                `get_lists_tabs`.
+
+        Raises:
+            Exception: A primeira falha ao buscar uma página BestOf, depois que as demais terminaram.
+        """
+        por_url = {abas[0][1]: abas for abas in paginas}
+        falhas = []
+
+        def buscar(url):
+            with self.pool.session() as session:
+                self.get_lists_tabs(por_url[url], session)
+
+        def on_result(_, resultado):
+            if isinstance(resultado, Exception):
+                falhas.append(resultado)
+
+        self.crawler.run_tasks(((url, url) for url in por_url), buscar, on_result, lane='list')
+        if falhas:
+            raise falhas[0]
+
+    def resume(self, journal : CheckpointJournal, max_age : Optional[float] = None) -> int:
+        """
+        Retoma os resultados gravados no diário e passa a gravar nele os novos resultados.
+
+        Args:
+            journal (CheckpointJournal): Diário da extração.
+            max_age (Optional[float]): Idade máxima, em segundos, dos registros retomados. Registros
+                mais antigos são buscados novamente. Com None, todos os registros são retomados.
+
+        Returns:
+            int: Quantidade de listas e jogos retomados.
+        """
+        self.journal = journal
+        self.resumed_lists, self.resumed_games = journal.load(max_age)
+        return len(self.resumed_lists) + len(self.resumed_games)
+
+    @METRICS.timed('transform.game_genres')
+    def get_game_genres(self, url : str, request : DaoGetHtml = None) -> List[str]:
+        """
+        Obtém os gêneros de um jogo a partir da URL da sua página.
+
+        Quando há `fast_request`, a página é buscada primeiro sem navegador; o navegador só é usado se
+        a página tiver o aviso de idade, não tiver o bloco de gêneros ou a requisição falhar. Com o motor
+        'async', respostas 429/5xx levantam HttpStatusError para que DaoAsyncHtml tente novamente. O HTML
+        é analisado por `parser`, e a sessão emprestada do pool é devolvida antes da análise.
+
+        Args:
+            url (str): URL da página do jogo.
+            request (DaoGetHtml): Sessão do navegador a ser usada. Por padrão, uma sessão livre do pool
+                é emprestada apenas se o navegador for necessário.
+
+        Returns:
+            List[str]: Lista com os gêneros do jogo.
+        """
+        if self.fast_request:
+            try:
+                response = self.fast_request.get_html(url)
+            except RequestException:
+                response = {"content_html": "", "status_code": None}
+            if self.crawler and response['status_code'] in STATUS_RETENTATIVA:
+                raise HttpStatusError(response['status_code'], url)
+            if response['status_code'] == 200:
+                pagina_do_jogo, resultado = self.parser.parse('extract_game_page', response['content_html'],
+                                                              content_hash=response['content_hash'])
+                if pagina_do_jogo and resultado:
+                    METRICS.count('transform.games_fast_path')
+                    return resultado
+                if not pagina_do_jogo:
+                    self._avisos_idade.add(url)
+            METRICS.count('transform.games_browser_fallback')
+        if request is None:
+            with self.pool.session() as session:
+                html = self.get_game_html_with_navegador(session, url)
+            return self.parser.parse('extract_game_information', html)
+        return self.get_game_genres_with_navegador(request, url)
+
+    def get_game_genres_with_navegador(self, request : DaoGetHtml, url : str) -> List[str]:
+        """
+        Obtém os gêneros de um jogo usando a sessão do navegador informada.
+
+        Args:
+            request (DaoGetHtml): Sessão do navegador que fará a requisição.
+            url (str): URL da página do jogo.
+
+        Returns:
+            List[str]: Lista com os gêneros do jogo.
+        """
+        return self.parser.parse('extract_game_information', self.get_game_html_with_navegador(request, url))
+
+    def get_game_html_with_navegador(self, request : DaoGetHtml, url : str) -> str:
+        """
+        Busca a página de um jogo com a sessão do navegador informada, passando pelo aviso de idade.
+
+        A página só é analisada na sessão se o texto do aviso de idade aparecer no HTML; nos demais casos,
+        a sessão fica livre assim que a página é buscada.
+
+        Args:
+            request (DaoGetHtml): Sessão do navegador que fará a requisição.
+            url (str): URL da página do jogo.
+
+        Returns:
+            str: HTML da página do jogo.
+        """
+        response = request.get_html(url)
+        if self.extractor.may_have_warning_age(response['content_html']) \
+                and not self.parser.parse('verify_page_game', response['content_html'],
+                                          content_hash=response['content_hash']):
+            # Ir para a página do jogo com selenium
+            self._avisos_idade.add(url)
+            response = request.go_page_of_game_when_warning_age()
+        return response['content_html']
+
+    def is_anomaly(self, url : str, genres : List[str]) -> bool:
+        """
+        Indica se a página de um jogo veio com o aviso de idade ou sem gêneros, sinais de que a loja pode
+        estar respondendo de forma diferente com a carga atual. Usada por `crawler` para reduzir a
+        concorrência.
+
+        Args:
+            url (str): URL da página do jogo.
+            genres (List[str]): Gêneros obtidos da página.
+
+        Returns:
+            bool: True se a busca da página passou pelo aviso de idade ou não encontrou gêneros.
+        """
+        aviso = url in self._avisos_idade
+        self._avisos_idade.discard(url)
+        return aviso or not genres
+
+    def fill_list_game_information(self, *names_lists : str):
         """
-        for year, url in self.list_game_best_sellers_page.items():
-            response =  self.request.get_html(url)
-            self.lists_games['list_game_best_sellers_per_year'][year] =  self.extractor.extract_games_best_sellers(response['content_html'])
-        for year, url in  self.list_game_best_releases_page.items():
-            response =  self.request.get_html(url)
-            self.lists_games['list_game_best_releases_per_year'][year] =  self.extractor.extract_games_best_releases(response['content_html'], year)
-        for year, url in  self.list_game_most_played_page.items():
-            response =  self.request.get_html(url)
-            self.lists_games['list_game_most_played_per_year'][year] =  self.extractor.extract_games_most_played(response['content_html'])
+        Preenche as informações dos jogos de uma ou mais listas.
+
+        As URLs de todas as listas são deduplicadas pelo ID do jogo na Steam, então cada página é buscada
+        uma única vez e os gêneros são copiados para todas as posições em que o jogo aparece. Com o motor
+        'async', as páginas são buscadas por DaoAsyncHtml; com o motor 'pool', pela fila de DaoPoolHtml.
+        Os jogos cuja busca falhou ficam em `failures` e não entram no resultado. Os jogos retomados do
+        diário não são buscados novamente, e cada jogo terminado é gravado no diário. Cada jogo terminado
+        fica no formato {"genre": [generos], "app_id": id do aplicativo na Steam (ou None)}.
+
+        Args:
+            names_lists (str): Nomes das listas em `lists_games`, por exemplo 'list_game_best_sellers_per_year'.
+        """
+        dedup = DedupGames()
+        for indice in self.lists_games.slots(*names_lists):
+            url = self.lists_games.url(indice)
+            genres = self.resumed_games.get(self.lists_games.key(indice))
+            if genres is not None:
+                self.lists_games.set_genres(indice, genres, DedupGames.app_id(url or ""))
+            elif url is not None and not self.lists_games.has_genres(indice):
+                dedup.add(indice, self.rebase_url(url))
+
+        def on_result(chave, resultado):
+            app_id = DedupGames.app_id(dedup.urls[chave])
+            for indice in dedup.slots_of(chave):
+                name_list, year, name_group, name_game = self.lists_games.key(indice)
+                if isinstance(resultado, Exception):
+                    self.failures.append((name_list, year, name_group, name_game, resultado))
+                else:
+                    self.lists_games.set_genres(indice, resultado, app_id)
+                    if self.journal:
+                        self.journal.append_game(name_list, year, name_group, name_game, list(resultado))
+
+        self.fetches_unique += len(dedup.tasks())
+        self.fetches_saved += dedup.saved
+        if self.crawler:
+            self.crawler.run_tasks(dedup.tasks(), self.get_game_genres, on_result, anomaly=self.is_anomaly)
+            return
+        tasks = dedup.tasks()
+        for chave, resultado in self.pool.map_tasks(tasks, lambda request, url: self.get_game_genres(url, request)):
+            on_result(chave, resultado)
 
     def fill_list_game_information_best_sellers(self):
         """
         Preenche as informações dos jogos mais vendidos.
         """
-        for year, games_group_dic in self.lists_games['list_game_best_sellers_per_year'].items():
-            for name_group, games in games_group_dic.items():
-                for name_game, url in games.items():
-                    response = self.request.get_html(url)
-                    pagina_do_jogo = self.extractor.verify_page_game(response['content_html'])
-                    if pagina_do_jogo:
-                        resultado = self.extractor.extract_game_information(response['content_html'])
-                        self.list_game_best_sellers_per_year[year][name_group][name_game] = {"genre" : resultado}
-                    else:
-                        # Ir para a página do jogo com selenium
-                        response = self.request.go_page_of_game_when_warning_age()
-                        resultado = self.extractor.extract_game_information(response['content_html'])
-                        self.lists_games['list_game_best_sellers_per_year'][year][name_group][name_game] = {"genre" : resultado}
+        self.fill_list_game_information('list_game_best_sellers_per_year')
 
     def fill_list_game_information_best_releases(self):
         """
         Preenche as informações dos melhores lançamentos.
         """
-        for year, games_group_dic in self.lists_games['list_game_best_releases_per_year'].items():
-            for name_group, games in games_group_dic.items():
-                for name_game, url in games.items():
-                    response = self.request.get_html(url)
-                    pagina_do_jogo = self.extractor.verify_page_game(response['content_html'])
-                    if pagina_do_jogo:
-                        resultado = self.extractor.extract_game_information(response['content_html'])
-                        self.list_game_best_releases_per_year[year][name_group][name_game] = {"genre" : resultado}
-                    else:
-                        # Ir para a página do jogo com selenium
-                        response = self.request.go_page_of_game_when_warning_age()
-                        resultado = self.extractor.extract_game_information(response['content_html'])
-                        self.lists_games['list_game_best_releases_per_year'][year][name_group][name_game] = {"genre" : resultado}
+        self.fill_list_game_information('list_game_best_releases_per_year')
 
     def fill_list_game_information_more_played(self):
         """
         Preenche as informações dos jogos mais jogados.
         """
-        for year, games_group_dic in self.lists_games['list_game_most_played_per_year'].items():
-            for name_group, games in games_group_dic.items():
-                for name_game, url in games.items():
-                    response = self.request.get_html(url)
-                    pagina_do_jogo = self.extractor.verify_page_game(response['content_html'])
-                    if pagina_do_jogo:
-                        resultado = self.extractor.extract_game_information(response['content_html'])
-                        self.list_game_most_played_per_year[year][name_group][name_game] = {"genre" : resultado}
-                    else:
-                        # Ir para a página do jogo com selenium
-                        response = self.request.go_page_of_game_when_warning_age()
-                        resultado = self.extractor.extract_game_information(response['content_html'])
-                        self.lists_games['list_game_most_played_per_year'][year][name_group][name_game] = {"genre" : resultado}
+        self.fill_list_game_information('list_game_most_played_per_year')
 
     def fill_lists_with_game_information(self):
         """
         Preenche todas as listas com as informações dos jogos.
         """
-        self.fill_list_game_information_best_sellers()
-        self.fill_list_game_information_best_releases()
-        self.fill_list_game_information_more_played()
+        self.fill_list_game_information(
+            'list_game_best_sellers_per_year',
+            'list_game_best_releases_per_year',
+            'list_game_most_played_per_year'
+        )
+
+    def iter_set_data(self) -> Iterator[Tuple[str, Iterator[Tuple[str, Dict]]]]:
+        """
+        Percorre os dados transformados categoria por categoria e ano por ano, para serem escritos aos
+        poucos (JsonStreamWriter).
+
+        Apenas os jogos que já têm os gêneros preenchidos entram no resultado, então os dados podem ser
+        salvos mesmo se a busca for interrompida no meio.
+
+        Returns:
+            Iterator[Tuple[str, Iterator[Tuple[str, Dict]]]]: Pares (categoria, iterador de (ano, grupos)).
+        """
+        yield "best sellers", self.lists_games.iter_years('list_game_best_sellers_per_year')
+        yield "best releases", self.lists_games.iter_years('list_game_best_releases_per_year')
+        yield "most played", self.lists_games.iter_years('list_game_most_played_per_year')
 
     def return_set_data(self):
         """
         Retorna os dados transformados em um conjunto.
 
+        Apenas os jogos que já têm os gêneros preenchidos entram no resultado, então o conjunto pode ser
+        salvo mesmo se a busca for interrompida no meio.
+
         Returns:
             Dict: Dicionário contendo os dados transformados.
         """
-        return {
-                "best sellers" : self.lists_games['list_game_best_sellers_per_year'], 
-                "best releases" : self.lists_games['list_game_best_releases_per_year'], 
-                "most played" : self.lists_games['list_game_most_played_per_year']
-            }
+        return {category: dict(years) for category, years in self.iter_set_data()}
 
     def quit_transform(self):
         """
         Encerra o processo de transformação.
         """
-        self.request.quit_navegador()
+        self.pool.quit_navegadores()
+        self.parser.shutdown()
+        if self.fast_request:
+            self.fast_request.quit_sessions()
+        if self.cache:
+            self.cache.close()
@@ -0,0 +1,259 @@
+"""
+Módulo parse_pipeline: Análise do HTML em processos separados, desacoplada da busca das páginas.
+
+A análise do HTML com o BeautifulSoup é Python puro e usa a CPU, então, na mesma thread que controla o
+navegador, ela deixa o navegador parado e disputa o GIL com as demais threads de busca. Este módulo
+oferece a classe ParsePipeline, que envia o HTML bruto buscado para um ProcessPoolExecutor de
+processos analisadores, que executam os métodos de HtmlExtractor e devolvem os resultados.
+
+A quantidade de análises pendentes é limitada: quando os analisadores estão ocupados, quem envia uma
+nova página espera uma vaga (contrapressão), em vez de acumular todas as páginas na memória. O tempo de
+cada análise, medido no processo analisador, é registrado em METRICS como 'parse.<método>'.
+
+Com `results` (ParsedResults), uma página cujo hash do conteúdo já foi analisado, nesta ou em uma execução
+anterior, reaproveita o resultado guardado, sem ser enviada aos analisadores ('parse.reused').
+
+Exemplo de uso:
+    >>> from transform.parse_pipeline import ParsePipeline
+    >>> parser = ParsePipeline(workers=4, max_pending=8, results=ParsedResults("../arquivos/cache/parsed.json"))
+    >>> future = parser.submit('extract_games', html, 'best_sellers', '2023')
+    >>> valid, genres = parser.parse('extract_game_page', html_do_jogo)
+    >>> future.result()
+    {'Platinum': {'nome_game': 'url', ...}, ...}
+    >>> parser.shutdown()
+
+Funções:
+    init_worker: Prepara um processo analisador.
+    run_extractor: Executa um método de HtmlExtractor em um processo analisador.
+    run_extractor_timed: Executa um método de HtmlExtractor e mede o tempo da análise.
+
+Classes:
+    ParsePipeline: Uma classe que distribui a análise do HTML entre processos analisadores.
+"""
+
+import multiprocessing
+import signal
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Optional, Tuple
+from dao.dao_cache_html import content_hash as hash_html
+from extract.html_extract import HtmlExtractor
+from metrics.metrics_etl import METRICS
+from transform.parsed_results import ParsedResults
+
+_extractor = None
+
+
+def init_worker():
+    """
+    Prepara um processo analisador: o Ctrl-C é tratado apenas pelo processo principal, que encerra os
+    analisadores em ParsePipeline.shutdown.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def run_extractor(method : str, html : str, *args) -> Any:
+    """
+    Executa um método de HtmlExtractor em um processo analisador.
+
+    A função fica no nível do módulo para poder ser enviada aos processos (pickle). Cada processo cria
+    uma única instância de HtmlExtractor.
+
+    Args:
+        method (str): Nome do método de HtmlExtractor, por exemplo 'extract_game_page'.
+        html (str): HTML a ser analisado.
+        args: Demais argumentos do método, por exemplo o tipo de página e o ano em 'extract_games'.
+
+    Returns:
+        Any: Resultado do método.
+    """
+    global _extractor # pylint: disable=global-statement
+    if _extractor is None:
+        _extractor = HtmlExtractor()
+    return getattr(_extractor, method)(html, *args)
+
+
+def run_extractor_timed(method : str, html : str, *args) -> Tuple[Any, float]:
+    """
+    Executa um método de HtmlExtractor em um processo analisador e mede o tempo da análise, que é
+    registrado pelo processo principal.
+
+    Args:
+        method (str): Nome do método de HtmlExtractor.
+        html (str): HTML a ser analisado.
+        args: Demais argumentos do método.
+
+    Returns:
+        Tuple[Any, float]: Resultado do método e tempo da análise, em segundos.
+    """
+    inicio = time.perf_counter()
+    resultado = run_extractor(method, html, *args)
+    return resultado, time.perf_counter() - inicio
+
+
+class ParsePipeline:
+    """
+    Classe ParsePipeline: Distribui a análise do HTML entre processos analisadores.
+
+    Com `workers` igual a 0, a análise é feita na própria thread, como antes.
+
+    Attributes:
+        workers (int): Quantidade de processos analisadores; 0 analisa na própria thread.
+        max_pending (int): Quantidade máxima de análises enviadas e ainda não terminadas.
+        results (ParsedResults): Resultados guardados pelo hash do conteúdo das páginas, ou None.
+        parsed (int): Quantidade de páginas analisadas.
+        reused (int): Quantidade de páginas cujo resultado guardado foi reaproveitado.
+        blocked_s (float): Tempo total, em segundos, em que o envio de páginas esperou uma vaga.
+
+    Methods:
+        submit: Envia uma página para análise, esperando uma vaga se os analisadores estiverem ocupados.
+        parse: Analisa uma página e espera o resultado.
+        shutdown: Encerra os processos analisadores e grava os resultados guardados.
+    """
+
+    def __init__(self, workers : int = 0, max_pending : Optional[int] = None,
+                 results : Optional[ParsedResults] = None) -> None:
+        """
+        Construtor da classe ParsePipeline.
+
+        Os processos só são criados no primeiro envio.
+
+        Args:
+            workers (int): Quantidade de processos analisadores; 0 analisa na própria thread.
+            max_pending (Optional[int]): Quantidade máxima de análises pendentes. Por padrão, o dobro
+                de `workers`.
+            results (Optional[ParsedResults]): Resultados guardados das análises anteriores. Com None,
+                todas as páginas são analisadas.
+        """
+        self.workers = max(0, workers)
+        self.max_pending = max(1, max_pending or self.workers * 2)
+        self.results = results
+        self.parsed = 0
+        self.reused = 0
+        self.blocked_s = 0.0
+        self._executor = None
+        self._vagas = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+
+    def _executor_ativo(self) -> ProcessPoolExecutor:
+        """
+        Retorna o ProcessPoolExecutor, criando-o na primeira chamada.
+
+        Os processos são iniciados com 'spawn', porque o processo principal tem várias threads
+        (navegadores e requisições) e um 'fork' poderia copiar travas ocupadas por elas.
+
+        Returns:
+            ProcessPoolExecutor: Executor dos processos analisadores.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'),
+                                                     initializer=init_worker)
+            return self._executor
+
+    def _terminou(self, method : str, future : Future, interno : Future, chave : Optional[str]):
+        """
+        Libera a vaga de uma análise terminada, registra o tempo da análise e entrega o resultado.
+
+        Args:
+            method (str): Nome do método de HtmlExtractor.
+            future (Future): Future devolvido por `submit`.
+            interno (Future): Future do processo analisador, com o resultado e o tempo da análise.
+            chave (Optional[str]): Chave em que o resultado é guardado em `results`, ou None.
+        """
+        with self._lock:
+            self.parsed += 1
+        self._vagas.release()
+        if interno.cancelled():
+            future.cancel()
+            return
+        erro = interno.exception()
+        if erro is not None:
+            future.set_exception(erro)
+            return
+        resultado, tempo = interno.result()
+        METRICS.observe(f"parse.{method}", tempo)
+        if chave is not None:
+            self.results.put(chave, resultado)
+        future.set_result(resultado)
+
+    def submit(self, method : str, html : str, *args, content_hash : Optional[str] = None) -> Future:
+        """
+        Envia uma página para análise, esperando uma vaga se os analisadores estiverem ocupados. Com
+        `results`, uma página já analisada devolve o resultado guardado, sem esperar uma vaga.
+
+        Args:
+            method (str): Nome do método de HtmlExtractor, por exemplo 'extract_game_page'.
+            html (str): HTML a ser analisado.
+            args: Demais argumentos do método.
+            content_hash (Optional[str]): Hash do HTML, se a busca já o calculou. Por padrão, calculado
+                aqui quando há `results`.
+
+        Returns:
+            Future: Resultado da análise. Uma exceção levantada pelo método é levantada por `result()`.
+        """
+        chave = None
+        if self.results is not None:
+            chave = ParsedResults.key(method, content_hash or hash_html(html), *args)
+            guardado, resultado = self.results.get(chave)
+            if guardado:
+                with self._lock:
+                    self.reused += 1
+                METRICS.count('parse.reused')
+                future = Future()
+                future.set_result(resultado)
+                return future
+        if not self.workers:
+            future = Future()
+            try:
+                with METRICS.timer(f"parse.{method}"):
+                    resultado = run_extractor(method, html, *args)
+                if chave is not None:
+                    self.results.put(chave, resultado)
+                future.set_result(resultado)
+            except Exception as erro: # pylint: disable=broad-exception-caught
+                future.set_exception(erro)
+            with self._lock:
+                self.parsed += 1
+            return future
+        inicio = time.perf_counter()
+        self._vagas.acquire()
+        with self._lock:
+            self.blocked_s += time.perf_counter() - inicio
+        try:
+            interno = self._executor_ativo().submit(run_extractor_timed, method, html, *args)
+        except BaseException:
+            self._vagas.release()
+            raise
+        future = Future()
+        interno.add_done_callback(lambda interno: self._terminou(method, future, interno, chave))
+        return future
+
+    def parse(self, method : str, html : str, *args, content_hash : Optional[str] = None) -> Any:
+        """
+        Analisa uma página e espera o resultado.
+
+        Args:
+            method (str): Nome do método de HtmlExtractor, por exemplo 'extract_game_page'.
+            html (str): HTML a ser analisado.
+            args: Demais argumentos do método.
+            content_hash (Optional[str]): Hash do HTML, se a busca já o calculou.
+
+        Returns:
+            Any: Resultado do método.
+        """
+        return self.submit(method, html, *args, content_hash=content_hash).result()
+
+    def shutdown(self):
+        """
+        Encerra os processos analisadores, cancelando as análises que ainda não começaram, e grava os
+        resultados guardados em `results`.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if self.results is not None:
+            self.results.save()
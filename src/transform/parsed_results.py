@@ -0,0 +1,159 @@
+"""
+Módulo parsed_results: Guarda o resultado da análise de cada página pelo hash do seu conteúdo.
+
+A maioria das páginas dos jogos e das listas não muda entre duas execuções do ETL. Este módulo oferece a
+classe ParsedResults, usada por ParsePipeline, que guarda em disco o resultado de cada análise, endereçado
+pelo método de HtmlExtractor, pelos seus argumentos e pelo hash do HTML (`content_hash`). Uma página com
+o mesmo hash de uma execução anterior reaproveita o resultado, sem ser analisada de novo.
+
+Os resultados guardados valem apenas para a mesma versão da extração: se o código de HtmlExtractor ou a
+especificação da extração mudarem, todos são descartados. Os resultados não usados há mais de `max_age`
+segundos são removidos ao gravar o arquivo.
+
+Exemplo de uso:
+    >>> from transform.parsed_results import ParsedResults
+    >>> results = ParsedResults("../arquivos/cache/parsed.json")
+    >>> chave = results.key('extract_game_page', content_hash(html))
+    >>> results.get(chave)
+    (False, None)
+    >>> results.put(chave, [True, ['Action']])
+    >>> results.save()
+
+Funções:
+    extraction_version: Retorna a versão da extração, que invalida os resultados guardados quando muda.
+
+Classes:
+    ParsedResults: Uma classe que guarda em disco o resultado da análise de cada página.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Optional, Tuple
+from extract import extraction_spec, html_extract
+
+# Tempo, em segundos, em que um resultado não usado continua guardado
+IDADE_MAXIMA_S = 30 * 24 * 60 * 60
+
+
+def extraction_version() -> str:
+    """
+    Retorna a versão da extração: o hash do código de HtmlExtractor e de ExtractionSpec e da especificação
+    da extração (`config/extraction_spec.json`).
+
+    Returns:
+        str: Hash SHA-256 dos arquivos da extração.
+    """
+    versao = hashlib.sha256()
+    for caminho in (html_extract.__file__, extraction_spec.__file__, extraction_spec.CAMINHO_SPEC):
+        with open(caminho, 'rb') as arquivo:
+            versao.update(arquivo.read())
+    return versao.hexdigest()
+
+
+class ParsedResults:
+    """
+    Classe ParsedResults: Guarda em disco o resultado da análise de cada página, pelo hash do conteúdo.
+
+    Os resultados passam por JSON, então as tuplas voltam como listas.
+
+    Attributes:
+        path (str): Caminho do arquivo dos resultados.
+        max_age (float): Tempo, em segundos, em que um resultado não usado continua guardado.
+        version (str): Versão da extração dos resultados guardados.
+        hits (int): Quantidade de análises reaproveitadas.
+        misses (int): Quantidade de análises sem resultado guardado.
+
+    Methods:
+        key: Retorna a chave de uma análise.
+        get: Retorna o resultado guardado de uma análise.
+        put: Guarda o resultado de uma análise.
+        save: Grava os resultados em disco.
+    """
+
+    def __init__(self, path : str, max_age : float = IDADE_MAXIMA_S, version : Optional[str] = None) -> None:
+        """
+        Construtor da classe ParsedResults.
+
+        Args:
+            path (str): Caminho do arquivo dos resultados. A pasta é criada se não existir.
+            max_age (float): Tempo, em segundos, em que um resultado não usado continua guardado.
+            version (Optional[str]): Versão da extração. Por padrão, `extraction_version()`.
+        """
+        self.path = path
+        self.max_age = max_age
+        self.version = version or extraction_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._resultados = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as arquivo:
+                dados = json.load(arquivo)
+            if dados.get("version") == self.version:
+                self._resultados = dados.get("results", {})
+
+    @staticmethod
+    def key(method : str, content_hash : str, *args) -> str:
+        """
+        Retorna a chave de uma análise.
+
+        Args:
+            method (str): Nome do método de HtmlExtractor.
+            content_hash (str): Hash do HTML analisado.
+            args: Demais argumentos do método.
+
+        Returns:
+            str: Chave no formato 'método|hash|argumentos'.
+        """
+        return f"{method}|{content_hash}|{json.dumps(args)}"
+
+    def get(self, chave : str) -> Tuple[bool, Any]:
+        """
+        Retorna o resultado guardado de uma análise.
+
+        Args:
+            chave (str): Chave da análise (`key`).
+
+        Returns:
+            Tuple[bool, Any]: Se há um resultado guardado e o resultado.
+        """
+        with self._lock:
+            entrada = self._resultados.get(chave)
+            if entrada is None:
+                self.misses += 1
+                return False, None
+            entrada["used_at"] = time.time()
+            self.hits += 1
+            return True, entrada["result"]
+
+    def put(self, chave : str, resultado : Any):
+        """
+        Guarda o resultado de uma análise.
+
+        Args:
+            chave (str): Chave da análise (`key`).
+            resultado (Any): Resultado do método, que precisa poder ser gravado em JSON.
+        """
+        with self._lock:
+            self._resultados[chave] = {"result": resultado, "used_at": time.time()}
+
+    def save(self):
+        """
+        Grava os resultados em disco, sem os que não foram usados há mais de `max_age` segundos,
+        substituindo o arquivo anterior de uma só vez.
+        """
+        limite = time.time() - self.max_age
+        with self._lock:
+            self._resultados = {chave: entrada for chave, entrada in self._resultados.items()
+                                if entrada["used_at"] >= limite}
+            dados = {"version": self.version, "results": self._resultados}
+            pasta = os.path.dirname(self.path)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            arquivo_temporario = f"{self.path}.tmp"
+            with open(arquivo_temporario, 'w', encoding='utf-8') as arquivo:
+                json.dump(dados, arquivo)
+            os.replace(arquivo_temporario, self.path)
@@ -0,0 +1,3 @@
+"""
+Testes do ETL, executados com `python -m pytest` a partir da raiz do repositório.
+"""
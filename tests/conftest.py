@@ -0,0 +1,13 @@
+"""
+Configuração dos testes: coloca `src` (os módulos do ETL) e `benchmarks` (o FixtureServer) no caminho de
+importação, como nos benchmarks.
+"""
+
+import os
+import sys
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+for pasta in ('src', 'benchmarks'):
+    caminho = os.path.join(RAIZ, pasta)
+    if caminho not in sys.path:
+        sys.path.insert(0, caminho)
@@ -0,0 +1,26 @@
+"""
+Testes da supervisão do navegador (BrowserWatchdog) sem o pacote opcional `psutil`.
+"""
+
+import warnings
+import pytest
+from dao import browser_watchdog
+from dao.browser_watchdog import BrowserWatchdog
+
+
+def test_avisa_uma_vez_sem_psutil(monkeypatch):
+    """
+    Sem o `psutil`, um limite de memória gera um único aviso, mesmo com vários watchdogs; sem limite, não
+    há aviso.
+    """
+    monkeypatch.setattr(browser_watchdog, 'psutil', None)
+    monkeypatch.setattr(browser_watchdog, '_avisos', {'psutil': False})
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        BrowserWatchdog(max_rss_mb=0)
+    with pytest.warns(RuntimeWarning, match="psutil"):
+        BrowserWatchdog(max_rss_mb=1500)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        BrowserWatchdog(max_rss_mb=1500)
+    assert BrowserWatchdog(max_rss_mb=1500).rss_mb(object()) == 0
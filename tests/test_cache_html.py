@@ -0,0 +1,50 @@
+"""
+Testes do cache em disco das páginas (CacheHtml).
+"""
+
+import os
+from dao.dao_cache_html import CacheHtml
+
+
+def tamanho_arquivos(cache):
+    """
+    Soma os tamanhos, guardados no índice, das entradas do cache.
+    """
+    return sum(entrada['size'] for entrada in cache._index.values()) # pylint: disable=protected-access
+
+
+def test_total_de_bytes_acompanha_o_indice(tmp_path):
+    """
+    O total de bytes do cache acompanha as inclusões, as substituições, as entradas removidas por arquivos
+    perdidos e as remoções das entradas menos usadas, e sobrevive à reabertura do cache.
+    """
+    cache = CacheHtml(str(tmp_path), max_bytes=10 ** 9)
+    for i in range(5):
+        cache.put(f"https://store.steampowered.com/app/{i}/", f"<html>{i}</html>" * (i + 1))
+    cache.put("https://store.steampowered.com/app/0/", "<html>nova</html>" * 50)
+    assert cache._total_bytes == tamanho_arquivos(cache) # pylint: disable=protected-access
+    os.remove(cache._arquivo(cache.key("https://store.steampowered.com/app/1/"))) # pylint: disable=protected-access
+    assert cache.get("https://store.steampowered.com/app/1/") is None
+    os.remove(cache._arquivo(cache.key("https://store.steampowered.com/app/2/"))) # pylint: disable=protected-access
+    assert cache.revalidate("https://store.steampowered.com/app/2/") is None
+    assert len(cache._index) == 3 # pylint: disable=protected-access
+    assert cache._total_bytes == tamanho_arquivos(cache) # pylint: disable=protected-access
+    cache.close()
+    assert CacheHtml(str(tmp_path))._total_bytes == tamanho_arquivos(cache) # pylint: disable=protected-access
+
+
+def test_remove_as_entradas_menos_usadas_acima_do_limite(tmp_path):
+    """
+    Acima de `max_bytes`, as entradas usadas há mais tempo são removidas até o cache caber no limite.
+    """
+    cache = CacheHtml(str(tmp_path), max_bytes=10 ** 9)
+    urls = [f"https://store.steampowered.com/app/{i}/" for i in range(4)]
+    for url in urls:
+        cache.put(url, f"<html>{url}</html>")
+    cache.get(urls[0])
+    cache.max_bytes = cache._total_bytes # pylint: disable=protected-access
+    cache.put("https://store.steampowered.com/app/9/", "<html>9</html>")
+    assert cache.get(urls[1]) is None
+    assert cache.get(urls[0]) is not None
+    assert cache._total_bytes == tamanho_arquivos(cache) <= cache.max_bytes # pylint: disable=protected-access
+    assert not os.path.exists(cache._arquivo(cache.key(urls[1]))) # pylint: disable=protected-access
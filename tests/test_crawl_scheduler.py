@@ -0,0 +1,224 @@
+"""
+Testes do controle da concorrência (CrawlScheduler) do motor 'async'.
+
+O AIMD e o balde de fichas são conferidos pelas vagas de `slot` e pelos resultados de `record`, e também
+com DaoAsyncHtml buscando as páginas do servidor local (FixtureServer), que injeta latência e respostas
+429 como a loja.
+"""
+
+import asyncio
+import time
+import requests
+from fixture_server import FixtureServer
+from dao.crawl_scheduler import CrawlScheduler, TokenBucket
+from dao.dao_async_html import DaoAsyncHtml, HttpStatusError, STATUS_RETENTATIVA
+from dao.dao_requests_html import DaoRequestsHtml
+from extract.html_extract import HtmlExtractor
+
+
+def registrar(scheduler, quantidade, latency=0.01, status_code=200, anomaly=False, lane='game'):
+    """
+    Passa `quantidade` buscas, uma de cada vez, por `slot` e `record` com o mesmo resultado.
+    """
+    async def buscar():
+        for _ in range(quantidade):
+            async with scheduler.slot("http://127.0.0.1/app/1/", lane) as vez:
+                scheduler.record(vez, latency, status_code, anomaly)
+    asyncio.run(buscar())
+
+
+def buscar_no_servidor(server, scheduler, tasks, lane='game', anomaly=None, backoff=0.05):
+    """
+    Busca as páginas do servidor local com DaoAsyncHtml e retorna os resultados por chave.
+    """
+    requests_html = DaoRequestsHtml(timeout=10, pool_maxsize=scheduler.maximum)
+    extractor = HtmlExtractor()
+    resultados = {}
+
+    def buscar(url):
+        response = requests_html.get_html(url)
+        if response['status_code'] in STATUS_RETENTATIVA:
+            raise HttpStatusError(response['status_code'], url)
+        return extractor.extract_game_information(response['content_html'])
+
+    try:
+        DaoAsyncHtml(scheduler.maximum, max_retries=5, backoff=backoff, scheduler=scheduler).run_tasks(
+            tasks, buscar, resultados.__setitem__, lane, anomaly)
+    finally:
+        requests_html.quit_sessions()
+    return resultados
+
+
+def test_limite_cresce_aditivamente_com_respostas_rapidas():
+    """
+    A cada `window` páginas de jogos rápidas, o limite aumenta em `increase`, até `maximum`.
+    """
+    scheduler = CrawlScheduler(initial=2, maximum=5, window=4, target_p95=1.0, rate_per_host=0)
+    limites = []
+    for _ in range(5):
+        registrar(scheduler, 4)
+        limites.append(scheduler.limit)
+    assert limites == [3, 4, 5, 5, 5]
+    assert scheduler.summary()['increases'] == 3
+
+
+def test_limite_nao_muda_com_paginas_das_listas_ou_lentas():
+    """
+    As páginas das listas não entram no p95, e uma janela lenta reduz o limite em vez de aumentá-lo.
+    """
+    scheduler = CrawlScheduler(initial=4, maximum=8, window=4, target_p95=1.0, rate_per_host=0)
+    registrar(scheduler, 8, lane='list')
+    assert scheduler.limit == 4
+    registrar(scheduler, 4, latency=2.0)
+    assert scheduler.limit == 2
+
+
+def test_limite_cai_pela_metade_com_429_503_e_anomalias_ate_o_minimo():
+    """
+    Respostas 429/503 e anomalias (aviso de idade, página sem gêneros) reduzem o limite pela metade, sem
+    passar de `minimum`.
+    """
+    scheduler = CrawlScheduler(initial=16, minimum=3, maximum=16, rate_per_host=0)
+    registrar(scheduler, 1, status_code=429)
+    assert scheduler.limit == 8
+    registrar(scheduler, 1, status_code=503)
+    assert scheduler.limit == 4
+    registrar(scheduler, 1, anomaly=True)
+    assert scheduler.limit == 3
+    registrar(scheduler, 3, status_code=429)
+    registrar(scheduler, 2, anomaly=True)
+    assert scheduler.limit == 3
+    resumo = scheduler.summary()
+    assert (resumo['min_limit'], resumo['throttled'], resumo['anomalies']) == (3, 5, 3)
+
+
+def test_buscas_em_andamento_reduzem_o_limite_uma_unica_vez():
+    """
+    Várias respostas 429 das buscas que já estavam em andamento antes da redução contam como uma só.
+    """
+    scheduler = CrawlScheduler(initial=8, maximum=8, rate_per_host=0)
+
+    async def buscar():
+        async def uma():
+            async with scheduler.slot("http://127.0.0.1/app/1/") as vez:
+                await asyncio.sleep(0.05)
+                scheduler.record(vez, 0.05, 429)
+        await asyncio.gather(*(uma() for _ in range(8)))
+    asyncio.run(buscar())
+    assert scheduler.limit == 4
+    assert scheduler.summary()['decreases'] == 1
+
+
+def test_limite_fixo_sem_adaptacao():
+    """
+    Com `adaptive=False`, o limite fica em `initial` com respostas rápidas e com 429.
+    """
+    scheduler = CrawlScheduler(initial=4, maximum=16, adaptive=False, window=2, rate_per_host=0)
+    registrar(scheduler, 10)
+    registrar(scheduler, 3, status_code=429)
+    assert scheduler.limit == 4
+
+
+def test_balde_de_fichas_limita_o_ritmo():
+    """
+    Depois da rajada inicial, o balde entrega `rate` fichas por segundo.
+    """
+    async def consumir(balde, quantidade):
+        inicio = time.monotonic()
+        for _ in range(quantidade):
+            await balde.acquire()
+        return time.monotonic() - inicio
+    # Rajada de 5 fichas na hora e mais 10 a 50 por segundo
+    tempo = asyncio.run(consumir(TokenBucket(rate=50, burst=5), 15))
+    assert 0.18 <= tempo < 0.5
+
+
+def test_balde_por_host_limita_as_requisicoes_ao_servidor():
+    """
+    Mesmo com muitas vagas, as requisições a um host seguem `rate_per_host`; outro host tem o seu balde.
+    """
+    with FixtureServer() as server:
+        tasks = [(i, server.url_game(i)) for i in range(21)]
+        scheduler = CrawlScheduler(initial=16, maximum=16, adaptive=False, rate_per_host=20)
+        inicio = time.perf_counter()
+        resultados = buscar_no_servidor(server, scheduler, tasks)
+        tempo_um_host = time.perf_counter() - inicio
+        assert len(resultados) == 21 and not any(isinstance(r, Exception) for r in resultados.values())
+        # A primeira requisição usa a ficha inicial; as outras 20 esperam 1/20 s cada
+        assert tempo_um_host >= 0.9
+        # Metade das páginas por 'localhost': cada host tem o seu balde, então o tempo cai pela metade
+        outro_host = [(i, url.replace('127.0.0.1', 'localhost') if i % 2 else url) for i, url in tasks]
+        scheduler = CrawlScheduler(initial=16, maximum=16, adaptive=False, rate_per_host=20)
+        inicio = time.perf_counter()
+        buscar_no_servidor(server, scheduler, outro_host)
+        assert time.perf_counter() - inicio < tempo_um_host * 0.75
+
+
+def test_fila_das_listas_passa_na_frente_dos_jogos():
+    """
+    Com o limite ocupado, uma página da fila 'list' é atendida antes das páginas de jogos que já
+    esperavam uma vaga.
+    """
+    scheduler = CrawlScheduler(initial=1, maximum=1, adaptive=False, rate_per_host=0)
+    ordem = []
+
+    async def buscar(nome, lane, atraso):
+        await asyncio.sleep(atraso)
+        async with scheduler.slot("http://127.0.0.1/", lane):
+            ordem.append(nome)
+            await asyncio.sleep(0.02)
+
+    async def todas():
+        jogos = [buscar(f"jogo {i}", 'game', 0) for i in range(5)]
+        await asyncio.gather(*jogos, buscar("lista", 'list', 0.01))
+    asyncio.run(todas())
+    assert ordem == ["jogo 0", "lista", "jogo 1", "jogo 2", "jogo 3", "jogo 4"]
+
+
+def test_fila_das_listas_no_servidor_nao_espera_os_jogos():
+    """
+    Com DaoAsyncHtml, as páginas da fila 'list' terminam bem antes das páginas de jogos enfileiradas antes
+    delas.
+    """
+    with FixtureServer(latency=0.05) as server:
+        scheduler = CrawlScheduler(initial=2, maximum=2, adaptive=False, rate_per_host=0)
+        crawler = DaoAsyncHtml(2, scheduler=scheduler)
+        terminou = {}
+
+        def on_result(chave, _):
+            terminou[chave] = time.perf_counter()
+
+        def buscar(url):
+            return requests.get(url, timeout=10).status_code
+
+        async def todas():
+            jogos = crawler.crawl_tasks([(("jogo", i), server.url_game(i)) for i in range(20)], buscar, on_result)
+            async def listas():
+                await asyncio.sleep(0.02)
+                await crawler.crawl_tasks([(("lista", i), server.url_game(i)) for i in range(2)], buscar,
+                                          on_result, lane='list')
+            await asyncio.gather(jogos, listas())
+        asyncio.run(todas())
+    fim_listas = max(t for (tipo, _), t in terminou.items() if tipo == "lista")
+    jogos_antes = sum(t < fim_listas for (tipo, _), t in terminou.items() if tipo == "jogo")
+    assert jogos_antes <= 4
+
+
+def test_aimd_contra_servidor_que_limita_as_requisicoes():
+    """
+    Contra um servidor que responde 429 acima de `max_rps`, o limite cai (sem passar de `minimum`) e
+    todas as páginas terminam com as novas tentativas; contra um servidor rápido, o limite cresce.
+    """
+    with FixtureServer(latency=0.02, max_rps=40, error_rate=0.05, seed=1) as server:
+        tasks = [(i, server.url_game(i % len(server.games))) for i in range(120)]
+        scheduler = CrawlScheduler(initial=16, minimum=2, maximum=16, window=10, target_p95=1.0, rate_per_host=0)
+        resultados = buscar_no_servidor(server, scheduler, tasks, anomaly=lambda url, genres: not genres, backoff=0.3)
+        resumo = scheduler.summary()
+        assert server.throttled > 0 and resumo['throttled'] > 0
+        assert resumo['decreases'] > 0 and 2 <= resumo['min_limit'] < 16
+        assert not any(isinstance(r, Exception) for r in resultados.values())
+    with FixtureServer(latency=0.01) as server:
+        tasks = [(i, server.url_game(i % len(server.games))) for i in range(60)]
+        scheduler = CrawlScheduler(initial=2, maximum=8, window=10, target_p95=1.0, rate_per_host=0)
+        buscar_no_servidor(server, scheduler, tasks)
+        assert scheduler.summary()['increases'] == 6 and scheduler.limit == 8
@@ -0,0 +1,95 @@
+"""
+Testes da extração das páginas BestOf pela especificação (`config/extraction_spec.json`).
+
+As páginas de `fixtures/best_of/<página>_<ano>.html` têm os grupos com os nomes exibidos pela Steam
+(Platina/Ouro/Prata nas páginas em português, 'Top New Releases of 2020' e os grupos dos meses, os grupos
+'200,000 Players' dos mais jogados e grupos sem nome), e a extração de cada uma deve reproduzir os grupos
+e os jogos de `arquivos/data.json`, na mesma ordem. Uma mudança na especificação que altere a extração de
+uma página já extraída quebra estes testes.
+"""
+
+import json
+import os
+import pytest
+from extract.extraction_spec import SPEC
+from extract.html_extract import HtmlExtractor
+from transform.parse_pipeline import ParsePipeline
+
+PASTA_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'best_of')
+CAMINHO_DATA_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'arquivos', 'data.json')
+PAGINAS = [(page, year) for page in SPEC.pages for year in SPEC.pages[page]]
+
+
+def ler_pagina(page, year):
+    """
+    Lê o HTML da página BestOf de fixtures de um tipo de página e ano.
+    """
+    with open(os.path.join(PASTA_FIXTURES, f"{page}_{year}.html"), 'r', encoding='utf-8') as arquivo:
+        return arquivo.read()
+
+
+def esperado(page, year):
+    """
+    Retorna os grupos e os jogos de uma página em data.json, no formato {grupo: [jogo, ...]}.
+    """
+    with open(CAMINHO_DATA_JSON, 'r', encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    return {name_group: list(games) for name_group, games in dados[page.replace('_', ' ')][year].items()}
+
+
+def nomes(groups):
+    """
+    Converte os grupos extraídos, {grupo: {jogo: url}}, no formato {grupo: [jogo, ...]} de `esperado`.
+    """
+    return {name_group: list(games) for name_group, games in groups.items()}
+
+
+@pytest.fixture(scope='module', name='pipeline')
+def fixture_pipeline():
+    """
+    ParsePipeline com processos analisadores, compartilhado pelos testes do módulo.
+    """
+    parser = ParsePipeline(workers=2)
+    yield parser
+    parser.shutdown()
+
+
+def test_spec_cobre_todas_as_paginas():
+    """
+    Há uma página de fixtures para cada par (página, ano) da especificação.
+    """
+    for page, year in PAGINAS:
+        assert os.path.exists(os.path.join(PASTA_FIXTURES, f"{page}_{year}.html")), (page, year)
+
+
+@pytest.mark.parametrize('page,year', PAGINAS)
+def test_extract_games_reproduz_data_json(page, year):
+    """
+    HtmlExtractor.extract_games reproduz os grupos e os jogos de data.json, com os links das páginas dos jogos.
+    """
+    groups = HtmlExtractor().extract_games(ler_pagina(page, year), page, year)
+    assert nomes(groups) == esperado(page, year)
+    for games in groups.values():
+        assert all(url.startswith("https://store.steampowered.com/app/") for url in games.values())
+
+
+@pytest.mark.parametrize('page,year', PAGINAS)
+def test_extract_games_inline_no_pipeline(page, year):
+    """
+    ParsePipeline sem processos (análise na própria thread) reproduz data.json.
+    """
+    parser = ParsePipeline(workers=0)
+    try:
+        groups = parser.parse('extract_games', ler_pagina(page, year), page, year)
+    finally:
+        parser.shutdown()
+    assert nomes(groups) == esperado(page, year)
+
+
+@pytest.mark.parametrize('page,year', PAGINAS)
+def test_extract_games_nos_processos_do_pipeline(pipeline, page, year):
+    """
+    ParsePipeline com processos analisadores reproduz data.json.
+    """
+    groups = pipeline.parse('extract_games', ler_pagina(page, year), page, year)
+    assert nomes(groups) == esperado(page, year)
@@ -0,0 +1,73 @@
+"""
+Testes da espera das páginas dos jogos (PageReadiness) com um navegador simulado.
+
+O navegador simulado responde apenas ao que a espera usa: `find_element` encontra os elementos dos
+XPaths informados e `execute_script` devolve o estado do documento e as alturas da página.
+"""
+
+import time
+from selenium.common.exceptions import NoSuchElementException
+from dao.page_readiness import XPATH_AVISO_IDADE, XPATH_GENERO, PageReadiness
+
+URL_JOGO = "https://store.steampowered.com/app/570/"
+
+
+class NavegadorSimulado:
+    """
+    Navegador com uma página fixa: os XPaths presentes e o `document.readyState`.
+    """
+
+    def __init__(self, xpaths=(), estado="complete") -> None:
+        """
+        Construtor da classe NavegadorSimulado.
+        """
+        self.xpaths = set(xpaths)
+        self.estado = estado
+
+    def find_element(self, by, valor):
+        """
+        Retorna um elemento se o XPath estiver na página.
+        """
+        if valor not in self.xpaths:
+            raise NoSuchElementException(f"{by}: {valor}")
+        return object()
+
+    def execute_script(self, script, *args):
+        """
+        Responde aos scripts do estado do documento e das alturas da página.
+        """
+        if "readyState" in script:
+            return self.estado
+        return [2000, 800]
+
+
+def esperar(navegador, timeout):
+    """
+    Espera uma página de jogo e retorna o tempo esperado, medido fora de PageReadiness.
+    """
+    inicio = time.perf_counter()
+    PageReadiness(timeout=timeout).wait(navegador, URL_JOGO)
+    return time.perf_counter() - inicio
+
+
+def test_pagina_sem_generos_termina_com_o_documento_carregado():
+    """
+    Uma página de jogo sem o bloco 'Genre:' e sem o aviso de idade termina a espera assim que o documento
+    carrega, em vez de esperar o tempo máximo.
+    """
+    assert esperar(NavegadorSimulado(), timeout=5) < 1
+
+
+def test_pagina_com_generos_ou_aviso_termina_antes_do_documento_carregar():
+    """
+    O bloco 'Genre:' ou o aviso de idade terminam a espera mesmo com o documento ainda carregando.
+    """
+    assert esperar(NavegadorSimulado([XPATH_GENERO], estado="interactive"), timeout=5) < 1
+    assert esperar(NavegadorSimulado([XPATH_AVISO_IDADE], estado="loading"), timeout=5) < 1
+
+
+def test_pagina_carregando_sem_generos_espera_o_tempo_maximo():
+    """
+    Enquanto o documento carrega sem o bloco 'Genre:', a espera continua até o tempo máximo, sem erro.
+    """
+    assert esperar(NavegadorSimulado(estado="loading"), timeout=0.5) >= 0.5
@@ -0,0 +1,143 @@
+"""
+Testes do pool de sessões do navegador (DaoPoolHtml) contra o servidor local (FixtureServer).
+
+Com a latência simulada no servidor, N sessões devem buscar as páginas em cerca de 1/N do tempo de uma
+única sessão, e o resultado de cada página deve chegar a todas as posições (lista, ano, grupo, jogo) em
+que o jogo aparece. O navegador só é usado no teste com o Chrome, ignorado quando ele não está instalado;
+nos demais, cada sessão emprestada pelo pool busca a página com uma sessão HTTP própria.
+"""
+
+import shutil
+import threading
+import time
+import pytest
+import requests
+from fixture_server import FixtureServer, load_best_of_groups
+from config.config_etl import ConfigEtl
+from dao.dao_pool_html import DaoPoolHtml
+from extract.html_extract import HtmlExtractor
+from transform.html_transform import LISTS_PAGES, HtmlTransform
+
+LATENCIA_S = 0.1
+PAGINAS = 16
+# Fração mínima do ganho linear: N sessões devem ser pelo menos 0,7 * N vezes mais rápidas que uma
+TOLERANCIA = 0.7
+CHROME = next(filter(None, map(shutil.which, ('google-chrome', 'chromium', 'chromium-browser', 'chrome'))), None)
+
+
+class BuscaPorSessao:
+    """
+    Busca as páginas com uma sessão HTTP por sessão do pool e verifica que nenhuma sessão do pool é usada
+    por duas threads ao mesmo tempo.
+    """
+
+    def __init__(self) -> None:
+        """
+        Construtor da classe BuscaPorSessao.
+        """
+        self.extractor = HtmlExtractor()
+        self.http = {}
+        self.ocupadas = set()
+        self.usadas = set()
+        self.lock = threading.Lock()
+
+    def __call__(self, session, url):
+        """
+        Busca a página de um jogo com a sessão HTTP da sessão do pool e retorna os gêneros.
+        """
+        with self.lock:
+            assert id(session) not in self.ocupadas, "sessão do pool usada por duas threads"
+            self.ocupadas.add(id(session))
+            self.usadas.add(id(session))
+            http = self.http.setdefault(id(session), requests.Session())
+        try:
+            return self.extractor.extract_game_information(http.get(url, timeout=10).text)
+        finally:
+            with self.lock:
+                self.ocupadas.discard(id(session))
+
+
+def busca_navegador(session, url):
+    """
+    Busca a página com o navegador da sessão do pool.
+    """
+    return HtmlExtractor().extract_game_information(session.get_html(url)['content_html'])
+
+
+def medir(server, pool_size, handler):
+    """
+    Busca as páginas com um pool de `pool_size` sessões, confere os gêneros de cada página e retorna o tempo.
+    """
+    tasks = [(i, server.url_game(i % len(server.games))) for i in range(PAGINAS)]
+    pool = DaoPoolHtml(pool_size=pool_size)
+    try:
+        if handler is busca_navegador:
+            for session in pool.sessions: # Abre os navegadores antes de medir
+                session.navegador # pylint: disable=pointless-statement
+        inicio = time.perf_counter()
+        resultados = dict(pool.map_tasks(tasks, handler))
+        tempo = time.perf_counter() - inicio
+    finally:
+        pool.quit_navegadores()
+    for chave, url in tasks:
+        indice = int(url.rstrip('/').rsplit('/', 1)[1])
+        assert resultados[chave] == server.games[indice]['genre']
+    return tempo
+
+
+@pytest.mark.parametrize('handler', [
+    pytest.param('http', id='http'),
+    pytest.param('navegador', id='navegador', marks=pytest.mark.skipif(CHROME is None, reason="Chrome não instalado")),
+])
+def test_map_tasks_ganho_quase_linear(handler):
+    """
+    N sessões terminam em cerca de 1/N do tempo de uma sessão, com os resultados de todas as tarefas.
+    """
+    with FixtureServer(latency=LATENCIA_S) as server:
+        tempos = {}
+        for pool_size in (1, 2, 4):
+            busca = BuscaPorSessao() if handler == 'http' else busca_navegador
+            tempos[pool_size] = medir(server, pool_size, busca)
+            if handler == 'http':
+                assert len(busca.usadas) == pool_size
+    assert tempos[1] >= PAGINAS * LATENCIA_S
+    for pool_size in (2, 4):
+        ganho = tempos[1] / tempos[pool_size]
+        assert ganho >= TOLERANCIA * pool_size, f"pool {pool_size}: ganho {ganho:.2f}x ({tempos})"
+
+
+def test_resultados_chegam_a_todas_as_posicoes(monkeypatch):
+    """
+    Com o motor 'pool', cada jogo é buscado uma única vez e os gêneros chegam a todas as posições
+    (lista, ano, grupo, jogo) em que ele aparece.
+    """
+    with FixtureServer(latency=0.01) as server:
+        for variavel, valor in {'ETL_ENGINE': 'pool', 'ETL_BACKEND': 'requests', 'ETL_POOL_SIZE': '4',
+                                'ETL_BASE_URL': server.url_base(), 'ETL_CACHE_DIR': '', 'ETL_PARSE_WORKERS': '0',
+                                'ETL_PARSED_RESULTS': ''}.items():
+            monkeypatch.setenv(variavel, valor)
+        generos = {game['name']: game['genre'] for game in server.games}
+        transform = HtmlTransform(ConfigEtl())
+        posicoes = 0
+        for page, name_list in LISTS_PAGES.items():
+            for year in transform.spec.urls(page):
+                groups = load_best_of_groups(page.replace('_', ' '), year)
+                # Sem gêneros, a página iria para o navegador
+                groups = {name_group: {name_game: url for name_game, url in games.items() if generos[name_game]}
+                          for name_group, games in groups.items()}
+                posicoes += sum(map(len, groups.values()))
+                transform.lists_games.set_list(name_list, year, groups)
+        try:
+            transform.fill_lists_with_game_information()
+        finally:
+            transform.quit_transform()
+        servidas = server.served
+    assert not transform.failures
+    assert transform.fetches_unique == servidas < posicoes
+    assert transform.fetches_unique + transform.fetches_saved == posicoes
+    conferidas = 0
+    for indice in transform.lists_games.slots(*LISTS_PAGES.values()):
+        name_game = transform.lists_games.key(indice)[3]
+        assert transform.lists_games.get_genres(indice) == generos[name_game]
+        conferidas += 1
+    assert conferidas == posicoes
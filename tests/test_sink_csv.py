@@ -0,0 +1,55 @@
+"""
+Testes do destino CSV (SinkCsv).
+"""
+
+import os
+import pytest
+from load.load_dados import LoadDados
+from load.sink_csv import SinkCsv
+
+HEADER = LoadDados().header_best_sellers_and_best_releases
+
+
+def ler(caminho):
+    """
+    Lê as linhas de um arquivo CSV.
+    """
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        return arquivo.read().splitlines()
+
+
+def test_csv_so_e_substituido_em_finish(tmp_path):
+    """
+    O CSV da carga anterior só é substituído em `finish`, ao fim de toda a carga.
+    """
+    caminho = str(tmp_path / "best_sellers.csv")
+    sink = SinkCsv(str(tmp_path))
+    load_data = LoadDados()
+    load_data.load('best_sellers', HEADER, {'2020': {'Platinum': {'Dota 2': {'genre': ['Action']}}}}, [sink])
+    assert not os.path.exists(caminho)
+    sink.finish()
+    assert ler(caminho) == ["year;rank;game;genre;is_indie", "2020;Platinum;Dota 2;Action;False"]
+    assert os.listdir(tmp_path) == ["best_sellers.csv"]
+
+
+def test_carga_interrompida_mantem_os_csvs_anteriores(tmp_path):
+    """
+    Uma carga que falha no meio remove os arquivos temporários (`abort`), inclusive os das tabelas já
+    gravadas, e os CSVs da carga anterior continuam valendo.
+    """
+    sink = SinkCsv(str(tmp_path))
+    load_data = LoadDados()
+    load_data.load('best_sellers', HEADER, {'2020': {'Platinum': {'Dota 2': {'genre': ['Action']}}}}, [sink])
+    sink.finish()
+    anterior = ler(str(tmp_path / "best_sellers.csv"))
+
+    def com_falha():
+        yield '2021', {'Gold': {'Hades': {'genre': ['Action', 'Indie']}}}
+        raise RuntimeError("falha na leitura")
+
+    sink = SinkCsv(str(tmp_path))
+    load_data.load('most_played', HEADER, {'2021': {'100000': {'Hades': {'genre': ['Action']}}}}, [sink])
+    with pytest.raises(RuntimeError):
+        load_data.load('best_sellers', HEADER, com_falha(), [sink])
+    assert ler(str(tmp_path / "best_sellers.csv")) == anterior
+    assert os.listdir(tmp_path) == ["best_sellers.csv"]
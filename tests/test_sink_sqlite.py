@@ -0,0 +1,148 @@
+"""
+Testes do destino SQLite (SinkSqlite).
+"""
+
+import json
+import os
+import sqlite3
+from collections import Counter
+import pytest
+from load.load_dados import LoadDados
+from load.sink_sqlite import SinkSqlite
+
+CAMINHO_DATA_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'arquivos', 'data.json')
+
+HEADER = LoadDados().header_best_sellers_and_best_releases
+
+
+def carregar(pasta, tabelas):
+    """
+    Grava as tabelas {nome: dados} em um SinkSqlite, como `get_and_save_tables`, e retorna o caminho do banco.
+    """
+    sink = SinkSqlite(pasta)
+    load_data = LoadDados()
+    for name_table, dados in tabelas.items():
+        load_data.load(name_table, HEADER, dados, [sink])
+    sink.finish()
+    return sink.path()
+
+
+def consultar(caminho, sql):
+    """
+    Executa uma consulta no banco e retorna os registros ordenados.
+    """
+    conexao = sqlite3.connect(caminho)
+    try:
+        return sorted(conexao.execute(sql).fetchall())
+    finally:
+        conexao.close()
+
+
+def linhas_csv(tabelas):
+    """
+    Conta as linhas (categoria, ano, grupo, jogo, gênero) que os CSVs das tabelas teriam.
+    """
+    load_data = LoadDados()
+    return Counter((name_table, int(ano), rank, game, genre) for name_table, dados in tabelas.items()
+                   for ano, rank, game, genre, _ in load_data.load_data_best_sellers_csv(dados))
+
+
+def linhas_sqlite(caminho):
+    """
+    Conta as linhas (categoria, ano, grupo, jogo, gênero) da junção de rankings com ranking_genre.
+    """
+    return Counter(consultar(caminho, """
+        SELECT r.category, r.year, r.tier, r.name, ge.name
+        FROM rankings AS r JOIN ranking_genre AS rg ON rg.ranking_id = r.ranking_id
+        JOIN genres AS ge ON ge.genre_id = rg.genre_id"""))
+
+
+def test_juncao_tem_uma_linha_por_linha_do_csv(tmp_path):
+    """
+    Um jogo com gêneros diferentes em anos diferentes e dois nomes com o mesmo app_id no mesmo grupo têm,
+    na junção de rankings com ranking_genre, as mesmas linhas dos CSVs; game_genre reúne os gêneros de
+    todas as posições do jogo.
+    """
+    tabelas = {
+        'best_sellers': {
+            '2020': {'Platinum': {'Hades': {'genre': ['Action', 'Indie'], 'app_id': 1145360},
+                                  'Dota 2': {'genre': ['Action', 'Strategy'], 'app_id': 570},
+                                  'Dota 2 Reborn': {'genre': ['Action', 'Strategy'], 'app_id': 570}}},
+            '2021': {'Gold': {'Hades': {'genre': ['Action', 'Roguelike', 'Indie'], 'app_id': 1145360}}},
+        },
+        'most_played': {'2021': {'100000': {'Hades': {'genre': ['RPG'], 'app_id': 1145360},
+                                            'Jogo antigo': {'genre': ['Casual']}}}},
+    }
+    caminho = carregar(str(tmp_path), tabelas)
+    assert linhas_sqlite(caminho) == linhas_csv(tabelas)
+    assert consultar(caminho, """
+        SELECT ge.name FROM game_genre AS gg JOIN genres AS ge ON ge.genre_id = gg.genre_id
+        WHERE gg.app_id = 1145360""") == [('Action',), ('Indie',), ('RPG',), ('Roguelike',)]
+    # Uma nova carga substitui as posições e os seus gêneros, sem duplicar linhas
+    carregar(str(tmp_path), tabelas)
+    assert linhas_sqlite(caminho) == linhas_csv(tabelas)
+
+
+def test_juncao_do_data_json_tem_as_linhas_dos_csvs(tmp_path):
+    """
+    Com o data.json do repositório, a junção de rankings com ranking_genre tem as mesmas linhas dos CSVs.
+    """
+    with open(CAMINHO_DATA_JSON, 'r', encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    tabelas = {category.replace(' ', '_'): years for category, years in dados.items()}
+    caminho = carregar(str(tmp_path), tabelas)
+    assert linhas_sqlite(caminho) == linhas_csv(tabelas)
+
+
+def test_migra_banco_sem_ranking_genre(tmp_path):
+    """
+    Um banco gravado antes de ranking_genre é migrado: as posições recebem o nome do jogo e os gêneros de
+    game_genre, e a carga seguinte grava normalmente.
+    """
+    caminho = str(tmp_path / "steam.sqlite")
+    conexao = sqlite3.connect(caminho)
+    conexao.executescript("""
+        CREATE TABLE games (app_id INTEGER PRIMARY KEY, name TEXT NOT NULL, is_indie INTEGER NOT NULL);
+        CREATE TABLE genres (genre_id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+        CREATE TABLE game_genre (app_id INTEGER NOT NULL, genre_id INTEGER NOT NULL,
+                                 PRIMARY KEY (app_id, genre_id)) WITHOUT ROWID;
+        CREATE TABLE rankings (category TEXT NOT NULL, year INTEGER NOT NULL, tier TEXT NOT NULL,
+                               app_id INTEGER NOT NULL, PRIMARY KEY (category, year, tier, app_id)) WITHOUT ROWID;
+        CREATE INDEX idx_rankings_year ON rankings (year);
+        INSERT INTO games VALUES (570, 'Dota 2', 0);
+        INSERT INTO genres VALUES (1, 'Action');
+        INSERT INTO game_genre VALUES (570, 1);
+        INSERT INTO rankings VALUES ('best_sellers', 2019, 'Platinum', 570);
+    """)
+    conexao.close()
+    tabelas = {'best_sellers': {'2020': {'Gold': {'Hades': {'genre': ['Indie'], 'app_id': 1145360}}}}}
+    carregar(str(tmp_path), tabelas)
+    assert linhas_sqlite(caminho) == linhas_csv(tabelas) + Counter([('best_sellers', 2019, 'Platinum', 'Dota 2', 'Action')])
+    assert ('idx_rankings_year',) in consultar(caminho, "SELECT name FROM sqlite_master WHERE tbl_name = 'rankings'")
+
+
+def test_carga_interrompida_mantem_a_carga_anterior(tmp_path):
+    """
+    Uma carga que falha no meio é desfeita (`abort`) e o banco fica com os dados da carga anterior,
+    sem ficar travado.
+    """
+    anterior = {'best_sellers': {'2020': {'Platinum': {'Dota 2': {'genre': ['Action'], 'app_id': 570}}}}}
+    caminho = carregar(str(tmp_path), anterior)
+
+    def com_falha():
+        yield '2020', {'Platinum': {'Hades': {'genre': ['Action', 'Indie'], 'app_id': 1145360}}}
+        raise RuntimeError("falha na leitura")
+
+    sink = SinkSqlite(str(tmp_path))
+    load_data = LoadDados()
+    load_data.load('most_played', HEADER, {'2020': {'100000': {'Dota 2': {'genre': ['Strategy'], 'app_id': 570}}}},
+                   [sink])
+    with pytest.raises(RuntimeError):
+        load_data.load('best_sellers', HEADER, com_falha(), [sink])
+    assert sink._conexao is None # pylint: disable=protected-access
+    assert consultar(caminho, "SELECT category, year, tier, app_id FROM rankings") == [
+        ('best_sellers', 2020, 'Platinum', 570)]
+    assert consultar(caminho, "SELECT app_id, name FROM games") == [(570, 'Dota 2')]
+    # O banco não ficou travado: uma nova carga é gravada normalmente
+    carregar(str(tmp_path), {'best_sellers': {'2021': {'Gold': {'Hades': {'genre': ['Indie'], 'app_id': 1145360}}}}})
+    assert len(consultar(caminho, "SELECT * FROM rankings")) == 2